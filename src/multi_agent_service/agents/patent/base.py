@@ -3,7 +3,7 @@
 import asyncio
 import logging
 from abc import abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
 from ..base import BaseAgent
@@ -58,6 +58,7 @@ class PatentBaseAgent(BaseAgent):
         self.cache_config = {
             "enabled": True,
             "ttl": 3600,  # 1小时
+            "stale_ttl": 0,  # 过期后仍可返回旧数据的时长（秒），0表示不返回过期数据
             "max_size": 1000
         }
         
@@ -130,6 +131,13 @@ class PatentBaseAgent(BaseAgent):
     # 缓存相关方法
     async def get_from_cache(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """从缓存获取数据."""
+        entry = await self.get_cache_entry(cache_key)
+        if entry is None or entry[1]:
+            return None
+        return entry[0]
+    
+    async def get_cache_entry(self, cache_key: str) -> Optional[Tuple[Dict[str, Any], bool]]:
+        """从缓存获取数据及其是否已过期（过期但仍在 ``stale_ttl`` 窗口内）."""
         if not self.cache_config["enabled"]:
             return None
         
@@ -137,10 +145,13 @@ class PatentBaseAgent(BaseAgent):
             cached_data = self._cache.get(cache_key)
             if cached_data:
                 # 检查是否过期
-                cache_time = cached_data.get("cached_at", 0)
-                if datetime.now().timestamp() - cache_time < self.cache_config["ttl"]:
+                age = datetime.now().timestamp() - cached_data.get("cached_at", 0)
+                if age < self.cache_config["ttl"]:
                     self.logger.debug(f"Cache hit for key: {cache_key}")
-                    return cached_data.get("data")
+                    return cached_data.get("data"), False
+                elif age < self.cache_config["ttl"] + self.cache_config.get("stale_ttl", 0):
+                    self.logger.debug(f"Stale cache hit for key: {cache_key}")
+                    return cached_data.get("data"), True
                 else:
                     # 过期数据，删除
                     del self._cache[cache_key]
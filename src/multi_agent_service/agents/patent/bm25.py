@@ -0,0 +1,129 @@
+"""基于BM25倒排索引的搜索结果相关性评分."""
+
+import math
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .near_duplicate import text_tokens
+
+
+class BM25Index:
+    """增量式BM25倒排索引.
+
+    标题和内容按 ``field_weights`` 加权合并词频（BM25F的简化形式），中文按字符
+    二元组切分。评分只遍历查询词项的倒排列表，代价与查询词项数量而非文本长度相关。
+    文档可随搜索源逐批加入，也可按编号替换。
+    """
+
+    def __init__(
+        self,
+        k1: float = 1.2,
+        b: float = 0.75,
+        field_weights: Optional[Dict[str, float]] = None,
+        shingle_size: int = 2
+    ):
+        self.k1 = k1
+        self.b = b
+        self.field_weights = field_weights or {"title": 2.0, "content": 1.0}
+        self.shingle_size = shingle_size
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._doc_terms: Dict[int, Dict[str, float]] = {}
+        self._doc_lengths: Dict[int, float] = {}
+        self._total_length = 0.0
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def add(self, result: Dict[str, Any], doc_id: Optional[int] = None) -> int:
+        """将搜索结果加入索引，返回文档编号；编号已存在时替换原文档."""
+        if doc_id is None:
+            doc_id = self._next_id
+        elif doc_id in self._doc_terms:
+            self.remove(doc_id)
+        self._next_id = max(self._next_id, doc_id + 1)
+
+        term_weights: Counter = Counter()
+        for field, weight in self.field_weights.items():
+            for token in text_tokens(result.get(field) or "", self.shingle_size):
+                term_weights[token] += weight
+
+        self._doc_terms[doc_id] = dict(term_weights)
+        self._doc_lengths[doc_id] = sum(term_weights.values())
+        self._total_length += self._doc_lengths[doc_id]
+        for term, frequency in term_weights.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+        return doc_id
+
+    def add_many(self, results: Iterable[Dict[str, Any]]) -> List[int]:
+        """批量加入搜索结果."""
+        return [self.add(result) for result in results]
+
+    def remove(self, doc_id: int) -> None:
+        """从索引中移除文档."""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+
+    def query_terms(self, keywords: Iterable[str]) -> Set[str]:
+        """将查询关键词切分为词项."""
+        terms: Set[str] = set()
+        for keyword in keywords:
+            terms.update(text_tokens(keyword, self.shingle_size))
+        return terms
+
+    def score(self, keywords: Iterable[str]) -> Dict[int, float]:
+        """计算所有命中文档的BM25分数，未命中的文档不出现在结果中."""
+        doc_count = len(self._doc_lengths)
+        if doc_count == 0:
+            return {}
+
+        average_length = self._total_length / doc_count or 1.0
+        scores: Dict[int, float] = {}
+        for term in self.query_terms(keywords):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf(len(postings), doc_count)
+            for doc_id, frequency in postings.items():
+                length_norm = self.k1 * (1.0 - self.b + self.b * self._doc_lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1.0) / (frequency + length_norm)
+        return scores
+
+    def normalized_scores(self, keywords: Iterable[str]) -> Dict[int, float]:
+        """按查询的理论最高分归一化到0-1区间.
+
+        每个词项的词频贡献随词频饱和，上限为 ``idf * (k1 + 1)``，各查询词项上限之和即为
+        理论最高分。归一化结果不依赖结果集中其他文档的得分：最佳结果只命中部分词项时
+        分数同样较低，可与固定阈值比较。
+        """
+        keywords = list(keywords)
+        scores = self.score(keywords)
+        if not scores:
+            return {}
+        doc_count = len(self._doc_lengths)
+        max_score = sum(
+            self._idf(len(self._postings.get(term, ())), doc_count) * (self.k1 + 1.0)
+            for term in self.query_terms(keywords)
+        )
+        if max_score <= 0:
+            return {doc_id: 0.0 for doc_id in scores}
+        return {doc_id: min(value / max_score, 1.0) for doc_id, value in scores.items()}
+
+    @staticmethod
+    def _idf(document_frequency: int, doc_count: int) -> float:
+        return math.log(1.0 + (doc_count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+
+def bm25_relevance(results: List[Dict[str, Any]], keywords: List[str]) -> List[float]:
+    """为一组搜索结果计算归一化的BM25相关性分数（与输入顺序一致）."""
+    index = BM25Index()
+    index.add_many(results)
+    scores = index.normalized_scores(keywords)
+    return [scores.get(doc_id, 0.0) for doc_id in range(len(results))]
@@ -43,13 +43,58 @@ class CompetitionAnalyzer:
     async def analyze_competition(self, patent_data: List[Dict[str, Any]], analysis_params: Dict[str, Any]) -> Dict[str, Any]:
         """执行竞争分析."""
         start_time = datetime.now()
+        self.logger.info("Starting competition analysis")
         
         try:
-            self.logger.info("Starting competition analysis")
-            
             # 数据预处理
             processed_data = await self._preprocess_competition_data(patent_data)
-            
+        except Exception as e:
+            return await self._analysis_failed(e, start_time)
+        
+        return await self._run_competition_analysis(processed_data, start_time)
+    
+    async def analyze_competition_from_store(self, aggregator: Any, analysis_params: Dict[str, Any], **filters) -> Dict[str, Any]:
+        """基于数据库汇总表执行竞争分析.
+        
+        ``aggregator`` 为 :class:`PatentAggregator`，``filters`` 透传给其查询。按年份、国家、
+        第一申请人和主IPC分类分组的计数转换为带 ``weight`` 的记录，分析逻辑与
+        :meth:`analyze_competition` 相同。汇总表只记录每个专利的第一IPC分类，
+        技术领域统计因此不包含专利的其余分类。
+        """
+        start_time = datetime.now()
+        self.logger.info("Starting competition analysis from aggregated store")
+        
+        try:
+            rows = await aggregator.grouped_counts(("year", "country", "applicant", "ipc_main"), **filters)
+        except Exception as e:
+            return await self._analysis_failed(e, start_time)
+        
+        # 清理后同名的申请人合并为一条记录
+        grouped = defaultdict(int)
+        for row in rows:
+            applicant = self._clean_applicant_name(row["applicant"]) if row["applicant"] != "Unknown" else ""
+            if not applicant:
+                continue
+            ipc_main = row["ipc_main"] if row["ipc_main"] != "Unknown" else None
+            grouped[(row["year"], row["country"], applicant, ipc_main)] += row["patent_count"]
+        
+        processed_data = [
+            {
+                "applicants": [applicant],
+                "primary_applicant": applicant,
+                "year": year,
+                "country": country,
+                "ipc_classes": [ipc_main] if ipc_main else [],
+                "weight": count
+            }
+            for (year, country, applicant, ipc_main), count in grouped.items()
+        ]
+        
+        return await self._run_competition_analysis(processed_data, start_time)
+    
+    async def _run_competition_analysis(self, processed_data: List[Dict[str, Any]], start_time: datetime) -> Dict[str, Any]:
+        """在预处理后的记录上执行各项竞争分析."""
+        try:
             if not processed_data:
                 return {
                     "error": "没有可用于竞争分析的数据",
@@ -94,26 +139,30 @@ class CompetitionAnalyzer:
                 "results": competition_results,
                 "metadata": {
                     "processing_time": processing_time,
-                    "patents_analyzed": len(processed_data),
+                    "patents_analyzed": sum(patent.get("weight", 1) for patent in processed_data),
                     "analysis_timestamp": datetime.now().isoformat()
                 }
             }
             
         except Exception as e:
-            self.logger.error(f"Error in competition analysis: {str(e)}")
-            
-            # 记录失败指标
-            processing_time = (datetime.now() - start_time).total_seconds()
-            await self._update_performance_metrics(processing_time, False)
-            
-            return {
-                "success": False,
-                "error": str(e),
-                "metadata": {
-                    "processing_time": processing_time,
-                    "error_timestamp": datetime.now().isoformat()
-                }
-            } 
+            return await self._analysis_failed(e, start_time)
+    
+    async def _analysis_failed(self, error: Exception, start_time: datetime) -> Dict[str, Any]:
+        """记录失败指标并返回错误结果."""
+        self.logger.error(f"Error in competition analysis: {str(error)}")
+        
+        # 记录失败指标
+        processing_time = (datetime.now() - start_time).total_seconds()
+        await self._update_performance_metrics(processing_time, False)
+        
+        return {
+            "success": False,
+            "error": str(error),
+            "metadata": {
+                "processing_time": processing_time,
+                "error_timestamp": datetime.now().isoformat()
+            }
+        } 
    
     async def _preprocess_competition_data(self, patent_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """预处理竞争分析数据."""
@@ -136,6 +185,7 @@ class CompetitionAnalyzer:
                     "ipc_classes": patent.get("ipc_classes", []),
                     "title": patent.get("title", ""),
                     "application_number": patent.get("application_number", ""),
+                    "weight": 1,
                     "original_data": patent
                 }
                 
@@ -197,7 +247,7 @@ class CompetitionAnalyzer:
                 country = patent.get("country", "Unknown")
                 ipc_classes = patent.get("ipc_classes", [])
                 
-                applicant_counts[primary_applicant] += 1
+                applicant_counts[primary_applicant] += patent.get("weight", 1)
                 
                 if year:
                     applicant_years[primary_applicant].add(year)
@@ -347,7 +397,7 @@ class CompetitionAnalyzer:
                 applicant = patent["primary_applicant"]
                 
                 if year:
-                    yearly_applicants[year][applicant] += 1
+                    yearly_applicants[year][applicant] += patent.get("weight", 1)
             
             years = sorted(yearly_applicants.keys())
             if len(years) < 3:
@@ -394,9 +444,9 @@ class CompetitionAnalyzer:
             # 统计申请人专利数量
             applicant_counts = defaultdict(int)
             for patent in processed_data:
-                applicant_counts[patent["primary_applicant"]] += 1
+                applicant_counts[patent["primary_applicant"]] += patent.get("weight", 1)
             
-            total_patents = len(processed_data)
+            total_patents = sum(applicant_counts.values())
             sorted_applicants = sorted(applicant_counts.items(), key=lambda x: x[1], reverse=True)
             
             # 计算各种集中度指标
@@ -610,7 +660,7 @@ class CompetitionAnalyzer:
             for ipc in ipc_classes:
                 if ipc:
                     main_ipc = ipc[:4] if len(ipc) >= 4 else ipc
-                    tech_competitors[main_ipc][applicant] += 1
+                    tech_competitors[main_ipc][applicant] += patent.get("weight", 1)
         
         # 分析各技术领域的竞争激烈程度
         tech_competition_analysis = {}
@@ -653,7 +703,7 @@ class CompetitionAnalyzer:
             applicant = patent["primary_applicant"]
             
             if year:
-                yearly_rankings[year][applicant] += 1
+                yearly_rankings[year][applicant] += patent.get("weight", 1)
         
         years = sorted(yearly_rankings.keys())
         if len(years) < 3:
@@ -856,12 +906,12 @@ class CompetitionAnalyzer:
                 ipc_classes = patent.get("ipc_classes", [])
                 
                 metrics = applicant_metrics[applicant]
-                metrics["patent_count"] += 1
+                metrics["patent_count"] += patent.get("weight", 1)
                 
                 if year:
                     metrics["active_years"].add(year)
                     if year in recent_years:
-                        metrics["recent_activity"] += 1
+                        metrics["recent_activity"] += patent.get("weight", 1)
                 
                 metrics["countries"].add(country)
                 
@@ -1024,8 +1074,8 @@ class CompetitionAnalyzer:
                 applicant = patent["primary_applicant"]
                 
                 country_competition[country]["applicants"].add(applicant)
-                country_competition[country]["patent_count"] += 1
-                country_competition[country]["top_applicants"][applicant] += 1
+                country_competition[country]["patent_count"] += patent.get("weight", 1)
+                country_competition[country]["top_applicants"][applicant] += patent.get("weight", 1)
             
             # 分析各国竞争格局
             country_analysis = {}
@@ -1189,7 +1239,7 @@ class CompetitionAnalyzer:
                 applicant = patent["primary_applicant"]
                 
                 if year:
-                    yearly_competition[year][applicant] += 1
+                    yearly_competition[year][applicant] += patent.get("weight", 1)
             
             years = sorted(yearly_competition.keys())
             if len(years) < 3:
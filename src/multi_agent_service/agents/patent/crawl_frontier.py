@@ -0,0 +1,299 @@
+"""网页爬取调度：按主机的礼貌性限速、连接数上限、robots规则缓存和URL去重."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+
+from ...utils.bloom_filter import BloomFilter
+from ...utils.rate_limiter import RateLimiter, RateLimiterRegistry
+
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_url(url: str) -> str:
+    """规范化URL用于去重：协议和主机小写，去掉片段."""
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, ""))
+
+
+def url_host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+class TokenBucket(RateLimiter):
+    """令牌桶限速器：平均速率为 ``rate`` 个/秒，允许 ``capacity`` 个突发请求."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        super().__init__(rate, burst=capacity)
+
+
+class RobotsCache:
+    """按站点缓存robots.txt规则.
+
+    ``fetch`` 接收robots.txt地址并返回 ``(状态码, 文本)``。按RFC 9309处理：
+    4xx视为允许全部，5xx和网络错误视为禁止全部，并以较短的 ``error_ttl`` 缓存。
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[Tuple[int, str]]],
+        ttl: float = 86400,
+        error_ttl: float = 300,
+        user_agent: str = "*"
+    ):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.user_agent = user_agent
+        self._rules: Dict[str, Tuple[RobotFileParser, float]] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    async def get(self, url: str) -> RobotFileParser:
+        """获取URL所在站点的robots规则（同一站点并发请求只抓取一次）."""
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc.lower()}"
+
+        cached = self._rules.get(origin)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
+        pending = self._pending.get(origin)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[origin] = future
+        try:
+            parser, ttl = await self._load(origin + "/robots.txt")
+            self._rules[origin] = (parser, time.monotonic() + ttl)
+            future.set_result(parser)
+            return parser
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        finally:
+            del self._pending[origin]
+
+    async def _load(self, robots_url: str) -> Tuple[RobotFileParser, float]:
+        parser = RobotFileParser(robots_url)
+        try:
+            status, text = await self.fetch(robots_url)
+        except Exception as e:
+            logger.warning(f"Failed to fetch {robots_url}: {str(e)}")
+            parser.disallow_all = True
+            return parser, self.error_ttl
+
+        if status == 200:
+            parser.parse(text.splitlines())
+            return parser, self.ttl
+        if 400 <= status < 500:
+            parser.allow_all = True
+            return parser, self.ttl
+
+        parser.disallow_all = True
+        return parser, self.error_ttl
+
+    async def allowed(self, url: str) -> bool:
+        return (await self.get(url)).can_fetch(self.user_agent, url)
+
+    async def crawl_delay(self, url: str) -> Optional[float]:
+        delay = (await self.get(url)).crawl_delay(self.user_agent)
+        return float(delay) if delay is not None else None
+
+
+class _HostState:
+    __slots__ = ("bucket", "semaphore", "max_connections", "in_flight", "completed", "robots_checked")
+
+    def __init__(self, bucket: RateLimiter, max_connections: int):
+        self.bucket = bucket
+        self.semaphore = asyncio.Semaphore(max_connections)
+        self.max_connections = max_connections
+        self.in_flight = 0
+        self.completed = 0
+        self.robots_checked = False
+
+
+class HostPoliteness:
+    """爬虫级别的主机礼貌性策略：每个主机一个速率限制器和连接数上限，在所有爬取任务间共享.
+
+    限制器取自 ``limiters`` 注册表（按主机），传入共享注册表时与访问同一主机的其他客户端共用配额。
+    """
+
+    def __init__(
+        self,
+        default_rate: float = 1.0,
+        default_burst: float = 1.0,
+        max_connections_per_host: int = 2,
+        robots: Optional[RobotsCache] = None,
+        limiters: Optional[RateLimiterRegistry] = None
+    ):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.max_connections_per_host = max_connections_per_host
+        self.robots = robots
+        self.limiters = limiters if limiters is not None else RateLimiterRegistry()
+        self._host_config: Dict[str, Dict[str, Any]] = {}
+        self._hosts: Dict[str, _HostState] = {}
+
+    def configure_host(
+        self,
+        host: str,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_connections: Optional[int] = None
+    ) -> None:
+        """设置主机的请求速率（个/秒）、突发数和连接数上限."""
+        host = host.lower()
+        self._host_config[host] = {"rate": rate, "burst": burst, "max_connections": max_connections}
+        self._hosts.pop(host, None)
+        self.limiters.configure(host, rate or self.default_rate, burst=burst or self.default_burst)
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            config = self._host_config.get(host, {})
+            bucket = self.limiters.get(
+                host,
+                config.get("rate") or self.default_rate,
+                burst=config.get("burst") or self.default_burst
+            )
+            state = self._hosts[host] = _HostState(bucket, config.get("max_connections") or self.max_connections_per_host)
+        return state
+
+    def max_connections(self, host: str) -> int:
+        return self._state(host).max_connections
+
+    async def allowed(self, url: str) -> bool:
+        """检查robots规则；首次访问主机时按其Crawl-delay降低请求速率."""
+        if self.robots is None:
+            return True
+
+        state = self._state(url_host(url))
+        if not state.robots_checked:
+            state.robots_checked = True
+            delay = await self.robots.crawl_delay(url)
+            if delay:
+                state.bucket.rate = min(state.bucket.rate, 1.0 / delay)
+        return await self.robots.allowed(url)
+
+    @asynccontextmanager
+    async def slot(self, host: str):
+        """占用主机的一个连接并按令牌桶限速."""
+        state = self._state(host)
+        async with state.semaphore:
+            await state.bucket.acquire()
+            state.in_flight += 1
+            try:
+                yield
+            finally:
+                state.in_flight -= 1
+                state.completed += 1
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            host: {
+                "rate": state.bucket.rate,
+                "max_connections": state.max_connections,
+                "in_flight": state.in_flight,
+                "completed": state.completed
+            }
+            for host, state in self._hosts.items()
+        }
+
+
+class CrawlRequest:
+    """待爬取的URL."""
+
+    __slots__ = ("url", "host", "priority", "meta")
+
+    def __init__(self, url: str, priority: int = 0, meta: Optional[Dict[str, Any]] = None):
+        self.url = url
+        self.host = url_host(url)
+        self.priority = priority
+        self.meta = meta or {}
+
+
+class CrawlFrontier:
+    """单次爬取任务的URL队列.
+
+    URL经布隆过滤器去重后按主机分队列，队列内按优先级（数值越小越优先）出队。
+    每个主机启动不超过其连接数上限的工作协程，通过共享的 :class:`HostPoliteness`
+    限速，不同主机之间并行，从而在遵守各站点限制的同时提高整体吞吐。
+    """
+
+    def __init__(
+        self,
+        politeness: HostPoliteness,
+        expected_urls: int = 10000,
+        error_rate: float = 0.001,
+        seen: Optional[BloomFilter] = None
+    ):
+        self.politeness = politeness
+        self.seen = seen if seen is not None else BloomFilter(expected_urls, error_rate)
+        self._queues: Dict[str, List[Tuple[int, int, CrawlRequest]]] = {}
+        self._sequence = itertools.count()
+        self.stats = {"queued": 0, "duplicates": 0, "fetched": 0, "failed": 0, "blocked": 0}
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def add(self, url: str, priority: int = 0, **meta) -> bool:
+        """加入URL，已见过的URL返回False."""
+        if not self.seen.add(normalize_url(url)):
+            self.stats["duplicates"] += 1
+            return False
+
+        request = CrawlRequest(url, priority, meta)
+        heapq.heappush(self._queues.setdefault(request.host, []), (priority, next(self._sequence), request))
+        self.stats["queued"] += 1
+        return True
+
+    async def run(
+        self,
+        fetch: Callable[[CrawlRequest], Awaitable[Optional[List[Any]]]],
+        per_host_limit: Optional[int] = None,
+        max_concurrency: int = 10
+    ) -> Dict[str, List[Any]]:
+        """执行爬取，返回每个主机的结果；主机结果达到 ``per_host_limit`` 后丢弃其剩余URL."""
+        results: Dict[str, List[Any]] = {host: [] for host in self._queues}
+        global_slots = asyncio.Semaphore(max_concurrency)
+
+        async def worker(host: str) -> None:
+            queue = self._queues[host]
+            while queue:
+                if per_host_limit is not None and len(results[host]) >= per_host_limit:
+                    queue.clear()
+                    return
+
+                _, _, request = heapq.heappop(queue)
+                try:
+                    if not await self.politeness.allowed(request.url):
+                        logger.info(f"Blocked by robots.txt: {request.url}")
+                        self.stats["blocked"] += 1
+                        continue
+
+                    async with self.politeness.slot(host), global_slots:
+                        items = await fetch(request)
+                    self.stats["fetched"] += 1
+                    results[host].extend(items or [])
+                except Exception as e:
+                    logger.error(f"Failed to crawl {request.url}: {str(e)}")
+                    self.stats["failed"] += 1
+
+        workers = [
+            worker(host)
+            for host, queue in self._queues.items()
+            for _ in range(min(len(queue), self.politeness.max_connections(host)))
+        ]
+        await asyncio.gather(*workers)
+
+        if per_host_limit is not None:
+            results = {host: items[:per_host_limit] for host, items in results.items()}
+        return results
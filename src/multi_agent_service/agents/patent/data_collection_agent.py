@@ -18,6 +18,7 @@ from ...services.model_client import BaseModelClient
 from ...patent.services.patentsview_service import PatentsViewService
 from ...patent.config.patentsview_config import PatentsViewAPIConfig
 from ...patent.models.patentsview_data import PatentsViewSearchResult, PatentRecord
+from ...patent.storage.classification_catalog import ClassificationCatalog
 from ...patent.models.requests import PatentAnalysisRequest
 
 # 导入browser-use相关模块
@@ -363,7 +364,11 @@ class PatentDataCollectionAgent(PatentBaseAgent):
         if not self.patentsview_service:
             self.patentsview_service = PatentsViewService(
                 api_key=self.patentsview_config.api_key,
-                base_url=self.patentsview_config.base_url
+                base_url=self.patentsview_config.base_url,
+                catalog=ClassificationCatalog(
+                    self.patentsview_config.catalog_path,
+                    ttl=self.patentsview_config.catalog_ttl
+                )
             )
         
         try:
@@ -1161,32 +1166,24 @@ class PatentDataCollectionAgent(PatentBaseAgent):
         if not BROWSER_USE_AVAILABLE:
             return patents
         
-        enhanced_patents = []
-        
         try:
             async with GooglePatentsBrowserService(headless=True, timeout=60) as browser_service:
-                for patent in patents:
-                    try:
-                        # 如果专利有URL，获取详细信息
-                        patent_url = patent.get("url")
-                        if patent_url and "patents.google.com" in patent_url:
-                            details = await browser_service.get_patent_details(patent_url)
-                            if details:
-                                # 合并详细信息
-                                enhanced_patent = patent.copy()
-                                enhanced_patent.update(details)
-                                enhanced_patents.append(enhanced_patent)
-                            else:
-                                enhanced_patents.append(patent)
-                        else:
-                            enhanced_patents.append(patent)
-                        
-                        # 防止过快请求
-                        await asyncio.sleep(1)
-                        
-                    except Exception as e:
-                        self.logger.warning(f"Error enhancing patent details: {str(e)}")
-                        enhanced_patents.append(patent)
+                # 只有Google Patents链接需要获取详细信息，通过页面池并发抓取
+                detail_indexes = [
+                    i for i, patent in enumerate(patents)
+                    if patent.get("url") and "patents.google.com" in patent["url"]
+                ]
+                details = await browser_service.get_patent_details_batch(
+                    [patents[i]["url"] for i in detail_indexes]
+                )
+            
+            enhanced_patents = list(patents)
+            for i, patent_details in zip(detail_indexes, details):
+                if patent_details:
+                    # 合并详细信息
+                    enhanced_patents[i] = {**patents[i], **patent_details}
+                else:
+                    self.logger.warning(f"Failed to enhance patent details: {patents[i].get('url')}")
             
             return enhanced_patents
             
@@ -0,0 +1,81 @@
+"""基于MMR（最大边际相关性）的搜索结果多样性重排序."""
+
+import zlib
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .near_duplicate import text_shingles
+
+
+def build_feature_matrix(
+    results: List[Dict[str, Any]],
+    dim: int = 512,
+    max_content_chars: int = 500
+) -> np.ndarray:
+    """为每个结果构建哈希特征向量（每个结果只计算一次）.
+
+    标题和内容的特征片段分别哈希到 ``dim`` 维并做L2归一化，再各乘以 ``1/√2``
+    拼接，两个向量的内积即为标题和内容余弦相似度的平均值。
+    """
+    features = np.zeros((len(results), 2 * dim), dtype=np.float32)
+    scale = np.float32(np.sqrt(0.5))
+
+    for row, result in enumerate(results):
+        fields = (
+            result.get("title") or "",
+            (result.get("content") or "")[:max_content_chars]
+        )
+        for offset, text in zip((0, dim), fields):
+            shingles = text_shingles(text)
+            if not shingles:
+                continue
+            buckets = [zlib.crc32(shingle.encode("utf-8")) % dim + offset for shingle in shingles]
+            np.add.at(features[row], buckets, 1.0)
+            segment = features[row, offset:offset + dim]
+            segment *= scale / np.linalg.norm(segment)
+
+    return features
+
+
+def mmr_select(relevance: np.ndarray, features: np.ndarray, k: int, lambda_: float = 0.7) -> List[int]:
+    """MMR贪心选择，返回被选结果的下标.
+
+    第一个结果固定为输入中的首个结果；之后每步选择
+    ``lambda_ * 相关性 + (1 - lambda_) * (1 - 与已选结果的最大相似度)`` 最高的候选，
+    维护一个最大相似度向量，每步只需一次矩阵向量乘法。
+    """
+    count = len(relevance)
+    if count == 0 or k <= 0:
+        return []
+
+    selected = [0]
+    available = np.ones(count, dtype=bool)
+    available[0] = False
+    max_similarity = features @ features[0]
+
+    while len(selected) < min(k, count):
+        scores = lambda_ * relevance + (1.0 - lambda_) * (1.0 - max_similarity)
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_similarity, features @ features[best], out=max_similarity)
+
+    return selected
+
+
+def mmr_rerank(
+    results: List[Dict[str, Any]],
+    score_key: str,
+    k: int = 20,
+    lambda_: float = 0.7,
+    feature_dim: int = 512
+) -> List[Dict[str, Any]]:
+    """按MMR对已排序的结果做多样性重排序，返回至多 ``k`` 个结果."""
+    if not results:
+        return []
+
+    relevance = np.array([result.get(score_key, 0) or 0 for result in results], dtype=np.float32)
+    features = build_feature_matrix(results, dim=feature_dim)
+    return [results[i] for i in mmr_select(relevance, features, k, lambda_)]
@@ -0,0 +1,347 @@
+"""基于CSS选择器的流式HTML内容提取."""
+
+import asyncio
+import re
+from html.parser import HTMLParser
+from typing import Any, AsyncIterable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    etree = None
+    LXML_AVAILABLE = False
+
+
+# 没有结束标签的HTML元素
+_VOID_ELEMENTS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr"
+})
+# 开始时插入空白分隔文本的元素
+_BREAK_ELEMENTS = frozenset({
+    "br", "p", "div", "li", "tr", "td", "th", "section", "article",
+    "h1", "h2", "h3", "h4", "h5", "h6"
+})
+# 不提取文本的元素
+_SKIP_ELEMENTS = frozenset({"script", "style", "noscript", "template"})
+
+_COMPOUND_RE = re.compile(r"^(?P<tag>[a-zA-Z][\w-]*|\*)?(?P<rest>(?:[.#][\w-]+)*)$")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class _Compound:
+    """简单选择器（``tag``、``.class``、``#id`` 及其组合）."""
+
+    __slots__ = ("tag", "classes", "element_id")
+
+    def __init__(self, tag: Optional[str], classes: frozenset, element_id: Optional[str]):
+        self.tag = tag
+        self.classes = classes
+        self.element_id = element_id
+
+    def matches(self, element: "_Element") -> bool:
+        return (
+            (self.tag is None or self.tag == element.tag)
+            and self.classes <= element.classes
+            and (self.element_id is None or self.element_id == element.element_id)
+        )
+
+
+def parse_selector(selector: str) -> List[List[_Compound]]:
+    """解析CSS选择器，支持逗号分组、后代组合符及标签/类/ID选择器."""
+    groups = []
+    for group in selector.split(","):
+        chain = []
+        for part in group.split():
+            match = _COMPOUND_RE.match(part)
+            if not match or not part:
+                raise ValueError(f"Unsupported CSS selector: {group.strip()!r}")
+            tag = match.group("tag")
+            rest = re.findall(r"[.#][\w-]+", match.group("rest"))
+            chain.append(_Compound(
+                None if tag in (None, "*") else tag.lower(),
+                frozenset(token[1:] for token in rest if token[0] == "."),
+                next((token[1:] for token in rest if token[0] == "#"), None)
+            ))
+        if chain:
+            groups.append(chain)
+    if not groups:
+        raise ValueError(f"Empty CSS selector: {selector!r}")
+    return groups
+
+
+def _chain_matches(chain: List[_Compound], stack: List["_Element"]) -> bool:
+    """从当前元素（栈顶）开始自右向左匹配后代选择器链."""
+    if not chain[-1].matches(stack[-1]):
+        return False
+    position = len(stack) - 2
+    for compound in reversed(chain[:-1]):
+        while position >= 0 and not compound.matches(stack[position]):
+            position -= 1
+        if position < 0:
+            return False
+        position -= 1
+    return True
+
+
+def _selector_matches(groups: List[List[_Compound]], stack: List["_Element"]) -> bool:
+    return any(_chain_matches(chain, stack) for chain in groups)
+
+
+class _Element:
+    __slots__ = ("tag", "classes", "element_id", "fields", "is_item", "skip")
+
+    def __init__(self, tag: str, attrs: Dict[str, Any]):
+        self.tag = tag
+        self.classes = frozenset((attrs.get("class") or "").split())
+        self.element_id = attrs.get("id")
+        self.fields: Tuple[str, ...] = ()
+        self.is_item = False
+        self.skip = tag in _SKIP_ELEMENTS
+
+
+class _Record:
+    """正在提取的单个结果，每个字段的文本按上限截断."""
+
+    __slots__ = ("parts", "lengths", "closed", "link")
+
+    def __init__(self):
+        self.parts: Dict[str, List[str]] = {}
+        self.lengths: Dict[str, int] = {}
+        self.closed: set = set()
+        self.link: Optional[str] = None
+
+    def append(self, field: str, text: str, limit: int) -> None:
+        length = self.lengths.get(field, 0)
+        if length >= limit:
+            return
+        self.parts.setdefault(field, []).append(text[:limit - length])
+        self.lengths[field] = length + len(text)
+
+    def to_dict(self) -> Dict[str, str]:
+        record = {}
+        for field, parts in self.parts.items():
+            text = _WHITESPACE_RE.sub(" ", "".join(parts)).strip()
+            if text:
+                record[field] = text
+        if record and self.link:
+            record["link"] = self.link
+        return record
+
+
+class HTMLExtractor:
+    """按站点 ``selectors`` 配置流式提取HTML内容.
+
+    以SAX方式逐块解析（有lxml时使用其C实现的解析器，否则使用标准库解析器），
+    不构建DOM，只保留命中选择器的文本，内存占用与提取结果而非页面大小相关。
+
+    配置了 ``item_selector`` 时，每个命中的元素作为一条结果，字段在其内部提取；
+    否则整个页面作为一条结果。``single_value_fields`` 中的字段只取第一个匹配。
+    """
+
+    def __init__(
+        self,
+        selectors: Dict[str, str],
+        item_selector: Optional[str] = None,
+        max_items: int = 20,
+        max_field_chars: int = 10000,
+        single_value_fields: Iterable[str] = ("title",),
+        use_lxml: bool = True
+    ):
+        self.fields = {field: parse_selector(selector) for field, selector in selectors.items()}
+        self.item_selector = parse_selector(item_selector) if item_selector else None
+        self.max_items = max_items
+        self.max_field_chars = max_field_chars
+        self.single_value_fields = frozenset(single_value_fields)
+
+        self.items: List[Dict[str, str]] = []
+        self._stack: List[_Element] = []
+        self._active: Dict[str, int] = {}
+        self._skip_depth = 0
+        self._record: Optional[_Record] = None if self.item_selector else _Record()
+        self._closed = False
+
+        if use_lxml and LXML_AVAILABLE:
+            self._parser = etree.HTMLParser(target=_LxmlTarget(self), recover=True)
+        else:
+            self._parser = _StdlibParser(self)
+
+    @property
+    def done(self) -> bool:
+        """是否已提取到足够的结果（之后的内容无需再解析）."""
+        return len(self.items) >= self.max_items
+
+    def feed(self, chunk: str) -> None:
+        """解析一块HTML文本."""
+        if not self.done and chunk:
+            self._parser.feed(chunk)
+
+    def close(self) -> List[Dict[str, str]]:
+        """结束解析并返回提取结果."""
+        if not self._closed:
+            self._closed = True
+            try:
+                self._parser.close()
+            except Exception:
+                # lxml在没有任何输入时会抛出异常
+                pass
+            while self._stack:
+                self._pop()
+            if self._record is not None and not self.item_selector:
+                self._finish_record()
+        return self.items[:self.max_items]
+
+    # 解析器回调
+    def start(self, tag: str, attrs: Dict[str, Any]) -> None:
+        tag = tag.lower() if isinstance(tag, str) else ""
+        if self.done:
+            return
+        if tag in _BREAK_ELEMENTS:
+            self.data(" ")
+        if tag in _VOID_ELEMENTS:
+            return
+
+        element = _Element(tag, attrs)
+        self._stack.append(element)
+        if element.skip:
+            self._skip_depth += 1
+            return
+
+        if self.item_selector and self._record is None and _selector_matches(self.item_selector, self._stack):
+            element.is_item = True
+            self._record = _Record()
+        if self._record is None:
+            return
+
+        matched = tuple(
+            field for field, groups in self.fields.items()
+            if field not in self._record.closed and _selector_matches(groups, self._stack)
+        )
+        if matched:
+            element.fields = matched
+            for field in matched:
+                self._active[field] = self._active.get(field, 0) + 1
+
+        if tag == "a" and self._record.link is None and self._active.get("title"):
+            self._record.link = attrs.get("href")
+
+    def end(self, tag: str) -> None:
+        tag = tag.lower() if isinstance(tag, str) else ""
+        if tag in _VOID_ELEMENTS:
+            return
+        # 容错处理未闭合的标签：弹出到最近的同名元素
+        for position in range(len(self._stack) - 1, -1, -1):
+            if self._stack[position].tag == tag:
+                while len(self._stack) > position:
+                    self._pop()
+                return
+
+    def data(self, text: str) -> None:
+        if self._skip_depth or self._record is None:
+            return
+        for field, count in self._active.items():
+            if count:
+                self._record.append(field, text, self.max_field_chars)
+
+    def _pop(self) -> None:
+        element = self._stack.pop()
+        if element.skip:
+            self._skip_depth -= 1
+        for field in element.fields:
+            self._active[field] -= 1
+            if not self._active[field] and field in self.single_value_fields and self._record is not None:
+                self._record.closed.add(field)
+                self._record.append(field, " ", self.max_field_chars)
+        if element.is_item:
+            self._finish_record()
+            self._record = None
+        elif element.fields and self._record is not None:
+            # 不同匹配元素之间的文本以空格分隔
+            for field in element.fields:
+                if field not in self.single_value_fields:
+                    self._record.append(field, " ", self.max_field_chars)
+
+    def _finish_record(self) -> None:
+        record = self._record.to_dict()
+        self._active = {}
+        if record and len(self.items) < self.max_items:
+            self.items.append(record)
+
+
+class _LxmlTarget:
+    """lxml解析器的target对象，将事件转发给提取器."""
+
+    def __init__(self, extractor: HTMLExtractor):
+        self.extractor = extractor
+
+    def start(self, tag, attrib, nsmap=None):
+        self.extractor.start(tag, dict(attrib))
+
+    def end(self, tag):
+        self.extractor.end(tag)
+
+    def data(self, data):
+        self.extractor.data(data)
+
+    def comment(self, text):
+        pass
+
+    def close(self):
+        return None
+
+
+class _StdlibParser(HTMLParser):
+    """将标准库解析器的回调转发给提取器."""
+
+    def __init__(self, target: HTMLExtractor):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag, dict(attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        self.target.start(tag, dict(attrs))
+        self.target.end(tag)
+
+    def handle_endtag(self, tag):
+        self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
+
+
+def extract_html(
+    html: str,
+    selectors: Dict[str, str],
+    item_selector: Optional[str] = None,
+    max_items: int = 20,
+    max_field_chars: int = 10000,
+    chunk_size: int = 65536
+) -> List[Dict[str, str]]:
+    """从完整的HTML文本中提取结果（模块级函数，可提交到线程池或进程池）."""
+    extractor = HTMLExtractor(selectors, item_selector, max_items, max_field_chars)
+    for offset in range(0, len(html), chunk_size):
+        extractor.feed(html[offset:offset + chunk_size])
+        if extractor.done:
+            break
+    return extractor.close()
+
+
+async def extract_stream(
+    chunks: AsyncIterable[str],
+    selectors: Dict[str, str],
+    item_selector: Optional[str] = None,
+    max_items: int = 20,
+    max_field_chars: int = 10000,
+    executor=None
+) -> List[Dict[str, str]]:
+    """边下载边解析：每块HTML在线程池中解析，不阻塞事件循环，提取到足够结果后停止读取."""
+    loop = asyncio.get_running_loop()
+    extractor = HTMLExtractor(selectors, item_selector, max_items, max_field_chars)
+    async for chunk in chunks:
+        await loop.run_in_executor(executor, extractor.feed, chunk)
+        if extractor.done:
+            break
+    return await loop.run_in_executor(executor, extractor.close)
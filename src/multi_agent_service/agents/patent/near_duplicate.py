@@ -0,0 +1,210 @@
+"""基于MinHash-LSH的搜索结果近似去重."""
+
+import re
+import unicodedata
+import zlib
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+# 中日韩文字（含扩展A区、兼容区、假名和谚文）
+_CJK_PATTERN = r"\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+_TOKEN_RE = re.compile(rf"[{_CJK_PATTERN}]+|[a-z0-9]+")
+_CJK_RE = re.compile(rf"[{_CJK_PATTERN}]")
+
+# MinHash使用的梅森素数及哈希取值范围
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def text_tokens(text: str, shingle_size: int = 2) -> List[str]:
+    """将文本切分为词项序列（保留重复，用于词频统计）.
+
+    中日韩文字没有空格分词，按字符 ``shingle_size``-gram 切分；拉丁字母和数字
+    按单词切分。文本先做NFKC归一化和小写化，统一全角字符。
+    """
+    if not text:
+        return []
+
+    normalized = unicodedata.normalize("NFKC", text).lower()
+    tokens: List[str] = []
+    for token in _TOKEN_RE.findall(normalized):
+        if _CJK_RE.match(token) and len(token) > shingle_size:
+            tokens.extend(token[i:i + shingle_size] for i in range(len(token) - shingle_size + 1))
+        else:
+            tokens.append(token)
+    return tokens
+
+
+def text_shingles(text: str, shingle_size: int = 2) -> Set[str]:
+    """将文本切分为特征片段集合（切分规则见 :func:`text_tokens`）."""
+    return set(text_tokens(text, shingle_size))
+
+
+def jaccard(set1: Set[str], set2: Set[str]) -> float:
+    """计算Jaccard相似度."""
+    if not set1 or not set2:
+        return 0.0
+    intersection = len(set1 & set2)
+    return intersection / (len(set1) + len(set2) - intersection)
+
+
+class MinHasher:
+    """MinHash签名生成器，置换参数固定，签名可跨进程比较."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        self.num_perm = num_perm
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingles: Set[str]) -> np.ndarray:
+        """计算特征片段集合的MinHash签名."""
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0)
+
+
+class ResultFingerprint:
+    """单个搜索结果的特征片段和MinHash签名，每个结果只计算一次."""
+
+    __slots__ = ("title_shingles", "content_shingles", "title_signature", "content_signature")
+
+    def __init__(self, title_shingles: Set[str], content_shingles: Set[str], hasher: MinHasher):
+        self.title_shingles = title_shingles
+        self.content_shingles = content_shingles
+        self.title_signature = hasher.signature(title_shingles) if title_shingles else None
+        self.content_signature = hasher.signature(content_shingles) if content_shingles else None
+
+    def similarity(self, other: "ResultFingerprint") -> float:
+        """标题和内容相似度的平均值，双方都为空的字段不参与计算."""
+        similarities = []
+        for mine, theirs in (
+            (self.title_shingles, other.title_shingles),
+            (self.content_shingles, other.content_shingles)
+        ):
+            if mine or theirs:
+                similarities.append(jaccard(mine, theirs))
+        return sum(similarities) / len(similarities) if similarities else 0.0
+
+
+class NearDuplicateIndex:
+    """近似重复检测索引.
+
+    标题和内容分别建立LSH分桶索引。平均相似度超过阈值时至少有一个字段的相似度
+    超过阈值，因此只需在两个索引的候选中用精确Jaccard复核，整体接近线性复杂度。
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 2,
+        max_content_chars: int = 500
+    ):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.max_content_chars = max_content_chars
+        self.hasher = MinHasher(num_perm)
+        self._buckets: Dict[Tuple[str, int, bytes], List[int]] = {}
+        self._fingerprints: List[ResultFingerprint] = []
+
+    def fingerprint(self, result: Dict[str, Any]) -> ResultFingerprint:
+        """计算搜索结果的指纹."""
+        title = result.get("title") or ""
+        content = (result.get("content") or "")[:self.max_content_chars]
+        return ResultFingerprint(
+            text_shingles(title, self.shingle_size),
+            text_shingles(content, self.shingle_size),
+            self.hasher
+        )
+
+    def _band_keys(self, fingerprint: ResultFingerprint):
+        for field, signature in (
+            ("title", fingerprint.title_signature),
+            ("content", fingerprint.content_signature)
+        ):
+            if signature is None:
+                continue
+            for band in range(self.bands):
+                yield (field, band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+
+    def query(self, fingerprint: ResultFingerprint) -> Optional[int]:
+        """查找与指纹近似重复的已索引条目，返回其编号."""
+        checked: Set[int] = set()
+        for key in self._band_keys(fingerprint):
+            for item_id in self._buckets.get(key, ()):
+                if item_id in checked:
+                    continue
+                checked.add(item_id)
+                if fingerprint.similarity(self._fingerprints[item_id]) > self.threshold:
+                    return item_id
+        return None
+
+    def add(self, fingerprint: ResultFingerprint) -> int:
+        """将指纹加入索引，返回其编号."""
+        item_id = len(self._fingerprints)
+        self._fingerprints.append(fingerprint)
+        for key in self._band_keys(fingerprint):
+            self._buckets.setdefault(key, []).append(item_id)
+        return item_id
+
+
+class IncrementalDeduplicator:
+    """增量去重状态，供逐批到达的结果（如流式多源搜索）合并使用.
+
+    重复结果中保留质量分数（``quality_key``）更高的一条，位置沿用首次出现的位置。
+    """
+
+    ADDED = "added"
+    REPLACED = "replaced"
+    DUPLICATE = "duplicate"
+
+    def __init__(self, threshold: float = 0.8, quality_key: str = "initial_quality_score"):
+        self.quality_key = quality_key
+        self.index = NearDuplicateIndex(threshold=threshold)
+        self.results: List[Dict[str, Any]] = []
+
+    def add(self, result: Dict[str, Any]) -> Tuple[str, int]:
+        """合并一个结果，返回处理状态及其在去重结果中的位置."""
+        fingerprint = self.index.fingerprint(result)
+        duplicate_id = self.index.query(fingerprint)
+
+        if duplicate_id is None:
+            self.results.append(result)
+            return self.ADDED, self.index.add(fingerprint)
+
+        if result.get(self.quality_key, 0) > self.results[duplicate_id].get(self.quality_key, 0):
+            # 如果是重复内容，但质量更高，则替换
+            self.results[duplicate_id] = result
+            return self.REPLACED, duplicate_id
+
+        return self.DUPLICATE, duplicate_id
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+
+def deduplicate_results(
+    results: List[Dict[str, Any]],
+    threshold: float = 0.8,
+    quality_key: str = "initial_quality_score"
+) -> List[Dict[str, Any]]:
+    """对搜索结果近似去重.
+
+    重复结果中保留质量分数（``quality_key``）更高的一条，位置沿用首次出现的位置。
+    """
+    deduplicator = IncrementalDeduplicator(threshold=threshold, quality_key=quality_key)
+    for result in results:
+        deduplicator.add(result)
+    return deduplicator.results
@@ -0,0 +1,142 @@
+"""热门搜索查询统计与定时预取."""
+
+import asyncio
+import copy
+import logging
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryPopularityTracker:
+    """按天统计搜索查询频次，保留最近 ``retention_days`` 天的数据."""
+
+    def __init__(self, retention_days: int = 7, max_queries_per_day: int = 5000):
+        self.retention_days = retention_days
+        self.max_queries_per_day = max_queries_per_day
+        self._daily_counts: Dict[date, Counter] = {}
+        self._query_params: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, cache_key: str, search_params: Dict[str, Any], when: Optional[datetime] = None) -> None:
+        """记录一次查询."""
+        day = (when or datetime.now()).date()
+        counts = self._daily_counts.get(day)
+        if counts is None:
+            counts = self._daily_counts[day] = Counter()
+            self._prune(day)
+
+        # 当天不同查询过多时不再统计新查询，只累计已有查询
+        if cache_key not in counts and len(counts) >= self.max_queries_per_day:
+            return
+
+        counts[cache_key] += 1
+        self._query_params[cache_key] = copy.deepcopy(search_params)
+
+    def top_queries(self, day: date, limit: int) -> List[Tuple[Dict[str, Any], int]]:
+        """返回指定日期查询次数最多的查询参数及其次数."""
+        counts = self._daily_counts.get(day, Counter())
+        return [
+            (copy.deepcopy(self._query_params[cache_key]), count)
+            for cache_key, count in counts.most_common(limit)
+            if cache_key in self._query_params
+        ]
+
+    def _prune(self, today: date) -> None:
+        cutoff = today - timedelta(days=self.retention_days)
+        for day in [d for d in self._daily_counts if d < cutoff]:
+            del self._daily_counts[day]
+
+        active_keys = set()
+        for counts in self._daily_counts.values():
+            active_keys.update(counts)
+        for cache_key in [k for k in self._query_params if k not in active_keys]:
+            del self._query_params[cache_key]
+
+
+class QueryPrefetcher:
+    """每天在指定时间（如上班前）预取前一天的热门查询，预热搜索缓存."""
+
+    def __init__(
+        self,
+        refresh: Callable[[Dict[str, Any]], Awaitable[Any]],
+        tracker: QueryPopularityTracker,
+        top_n: int = 20,
+        run_at: str = "07:30",
+        concurrency: int = 2
+    ):
+        self.refresh = refresh
+        self.tracker = tracker
+        self.top_n = top_n
+        self.run_at = self._parse_time(run_at)
+        self.concurrency = max(concurrency, 1)
+        self.last_run: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _parse_time(value: str) -> time:
+        hour, minute = value.split(":")
+        return time(int(hour), int(minute))
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def seconds_until_next_run(self, now: Optional[datetime] = None) -> float:
+        """距离下一次预取的秒数."""
+        now = now or datetime.now()
+        next_run = datetime.combine(now.date(), self.run_at)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        return (next_run - now).total_seconds()
+
+    async def prefetch(self, day: Optional[date] = None) -> Dict[str, Any]:
+        """预取指定日期（默认前一天）的热门查询."""
+        day = day or (datetime.now().date() - timedelta(days=1))
+        queries = self.tracker.top_queries(day, self.top_n)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def warm(search_params: Dict[str, Any]) -> bool:
+            async with semaphore:
+                try:
+                    await self.refresh(search_params)
+                    return True
+                except Exception as e:
+                    logger.warning(f"Prefetch failed for {search_params.get('keywords')}: {str(e)}")
+                    return False
+
+        outcomes = await asyncio.gather(*[warm(params) for params, _ in queries])
+        self.last_run = {
+            "day": day.isoformat(),
+            "queries": len(queries),
+            "succeeded": sum(outcomes),
+            "finished_at": datetime.now().isoformat()
+        }
+        logger.info(f"Prefetched {self.last_run['succeeded']}/{len(queries)} popular queries from {day}")
+        return self.last_run
+
+    async def _run_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.seconds_until_next_run())
+            try:
+                await self.prefetch()
+            except Exception as e:
+                logger.error(f"Popular query prefetch failed: {str(e)}")
+
+    def start(self) -> None:
+        """启动定时预取任务."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        """停止定时预取任务."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
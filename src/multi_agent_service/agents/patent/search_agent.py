@@ -2,18 +2,28 @@
 
 import asyncio
 import aiohttp
+import codecs
 import json
 import logging
 import re
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, AsyncIterator, Optional, Tuple
 from datetime import datetime
-from urllib.parse import quote
+from urllib.parse import quote, urljoin, urlsplit
 
 from .base import PatentBaseAgent
+from .bm25 import BM25Index, bm25_relevance
+from .crawl_frontier import CrawlFrontier, CrawlRequest, HostPoliteness, RobotsCache
+from .html_extraction import extract_stream
+from .near_duplicate import IncrementalDeduplicator, deduplicate_results
+from .query_prefetch import QueryPopularityTracker, QueryPrefetcher
+from .diversity import mmr_rerank
 from ...models.base import UserRequest, AgentResponse, Action
 from ...models.config import AgentConfig
 from ...models.enums import AgentType
 from ...services.model_client import BaseModelClient
+from ...config.settings import settings
+from ...patent.utils.response_cache import cached_aiohttp_request, get_response_cache
+from ...utils.rate_limiter import get_rate_limiter, rate_limiters
 
 
 logger = logging.getLogger(__name__)
@@ -46,6 +56,26 @@ class PatentSearchAgent(PatentBaseAgent):
             "freshness": 0.2,      # 时效性
             "completeness": 0.1    # 完整性
         }
+        
+        # 多样性重排序（MMR）配置：返回数量、质量权重lambda、特征向量维度
+        self.diversity_config = {
+            "k": 20,
+            "lambda": 0.7,
+            "feature_dim": 512
+        }
+        
+        # 过期缓存先返回旧结果并在后台刷新（stale-while-revalidate）
+        self.cache_config["stale_ttl"] = settings.search_cache_stale_ttl
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
+        
+        # 热门查询统计和每日预取
+        self.query_tracker = QueryPopularityTracker()
+        self.prefetcher = QueryPrefetcher(
+            self.refresh_search,
+            self.query_tracker,
+            top_n=settings.search_prefetch_top_n,
+            run_at=settings.search_prefetch_time
+        )
     
     async def can_handle_request(self, request: UserRequest) -> float:
         """判断是否能处理搜索相关请求."""
@@ -123,12 +153,16 @@ class PatentSearchAgent(PatentBaseAgent):
             # 解析搜索请求
             search_params = self._parse_search_request(request.content)
             
-            # 检查缓存
+            # 检查缓存（过期但仍在stale窗口内的结果先返回，并在后台刷新）
             cache_key = self._generate_cache_key(search_params)
-            cached_result = await self.get_from_cache(cache_key)
-            
-            if cached_result:
-                self.logger.info("Returning cached search results")
+            self.query_tracker.record(cache_key, search_params)
+            cache_entry = await self.get_cache_entry(cache_key)
+            
+            if cache_entry:
+                cached_result, is_stale = cache_entry
+                if is_stale:
+                    self._schedule_refresh(cache_key, search_params)
+                self.logger.info(f"Returning {'stale ' if is_stale else ''}cached search results")
                 return AgentResponse(
                     agent_id=self.agent_id,
                     agent_type=self.agent_type,
@@ -136,36 +170,18 @@ class PatentSearchAgent(PatentBaseAgent):
                     confidence=0.9,
                     metadata={
                         **cached_result.get("metadata", {}),
-                        "from_cache": True
+                        "from_cache": True,
+                        "stale": is_stale
                     }
                 )
             
-            # 执行多源并行搜索
-            search_results = await self._execute_parallel_search(search_params)
-            
-            # 质量评估和结果优化
-            optimized_results = await self._optimize_search_results(search_results)
-            
-            # 生成响应内容
-            response_content = await self._generate_search_response(
-                search_params, optimized_results
-            )
+            # 执行搜索并缓存结果
+            result_data, optimized_results = await self._search_and_cache(search_params, cache_key)
+            response_content = result_data["response_content"]
             
             # 生成后续动作
             next_actions = self._generate_search_actions(search_params, optimized_results)
             
-            # 缓存结果
-            result_data = {
-                "response_content": response_content,
-                "metadata": {
-                    "search_params": search_params,
-                    "results_count": len(optimized_results),
-                    "processing_time": (datetime.now() - start_time).total_seconds(),
-                    "sources_used": list(search_results.keys())
-                }
-            }
-            await self.save_to_cache(cache_key, result_data)
-            
             # 记录性能指标
             duration = (datetime.now() - start_time).total_seconds()
             self.log_performance_metrics("search", duration, True)
@@ -205,6 +221,63 @@ class PatentSearchAgent(PatentBaseAgent):
                 }
             )
     
+    async def _search_and_cache(
+        self,
+        search_params: Dict[str, Any],
+        cache_key: str
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """执行多源搜索、优化结果并写入缓存，返回缓存数据和优化后的结果."""
+        start_time = datetime.now()
+        
+        # 执行多源并行搜索
+        search_results = await self._execute_parallel_search(search_params)
+        
+        # 质量评估和结果优化
+        optimized_results = await self._optimize_search_results(
+            search_results, search_params["keywords"], search_params.get("limit")
+        )
+        
+        # 生成响应内容
+        response_content = await self._generate_search_response(
+            search_params, optimized_results
+        )
+        
+        # 缓存结果
+        result_data = {
+            "response_content": response_content,
+            "metadata": {
+                "search_params": search_params,
+                "results_count": len(optimized_results),
+                "processing_time": (datetime.now() - start_time).total_seconds(),
+                "sources_used": list(search_results.keys())
+            }
+        }
+        await self.save_to_cache(cache_key, result_data)
+        
+        return result_data, optimized_results
+    
+    async def refresh_search(self, search_params: Dict[str, Any]) -> Dict[str, Any]:
+        """重新执行搜索并刷新缓存（供后台刷新和热门查询预取使用）."""
+        result_data, _ = await self._search_and_cache(search_params, self._generate_cache_key(search_params))
+        return result_data
+    
+    def _schedule_refresh(self, cache_key: str, search_params: Dict[str, Any]) -> None:
+        """在后台刷新过期缓存，同一查询同时只有一个刷新任务."""
+        task = self._refresh_tasks.get(cache_key)
+        if task is not None and not task.done():
+            return
+        
+        async def refresh():
+            try:
+                await self.refresh_search(search_params)
+                self.logger.debug(f"Refreshed stale cache for key: {cache_key}")
+            except Exception as e:
+                self.logger.warning(f"Background refresh failed for key {cache_key}: {str(e)}")
+            finally:
+                self._refresh_tasks.pop(cache_key, None)
+        
+        self._refresh_tasks[cache_key] = asyncio.create_task(refresh())
+    
     def _parse_search_request(self, content: str) -> Dict[str, Any]:
         """解析搜索请求参数."""
         params = {
@@ -323,6 +396,128 @@ class PatentSearchAgent(PatentBaseAgent):
         
         return results
     
+    async def stream_search(
+        self,
+        search_params: Dict[str, Any],
+        min_quality_results: Optional[int] = None,
+        quality_threshold: float = 0.6
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """流式多源搜索，按搜索源完成顺序逐批产出去重后的结果.
+
+        事件类型：
+        - ``results``: 某个搜索源（或故障转移）的新增结果，``replaced`` 为替换了已有
+          重复条目的更高质量结果及其位置；
+        - ``source_error``: 某个搜索源失败；
+        - ``complete``: 搜索结束，包含最终排序结果。
+
+        设置 ``min_quality_results`` 后，初始质量分数不低于 ``quality_threshold``
+        的去重结果达到该数量即提前结束，并取消仍在进行的搜索。
+        """
+        start_time = asyncio.get_running_loop().time()
+        deduplicator = IncrementalDeduplicator(threshold=0.8, quality_key="initial_quality_score")
+        relevance_index = BM25Index()
+        completed_sources: List[str] = []
+        failed_sources: List[str] = []
+        early_return = False
+
+        def elapsed() -> float:
+            return round(asyncio.get_running_loop().time() - start_time, 3)
+
+        def merge(source: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+            added, replaced, merged = [], [], []
+            for result in self._score_source_results(source, results):
+                status, position = deduplicator.add(result)
+                if status == IncrementalDeduplicator.DUPLICATE:
+                    continue
+                relevance_index.add(result, doc_id=position)
+                merged.append((position, result))
+                if status == IncrementalDeduplicator.ADDED:
+                    added.append(result)
+                else:
+                    replaced.append({"position": position, "result": result})
+            
+            # 按当前已合并的结果集计算新结果的BM25相关性
+            scores = relevance_index.normalized_scores(search_params["keywords"])
+            for position, result in merged:
+                result["bm25_relevance"] = scores.get(position, 0.0)
+            return {
+                "event": "results",
+                "source": source,
+                "results": added,
+                "replaced": replaced,
+                "total": len(deduplicator),
+                "elapsed": elapsed()
+            }
+
+        def enough_results() -> bool:
+            if not min_quality_results:
+                return False
+            quality_count = sum(
+                1 for result in deduplicator.results
+                if result.get("initial_quality_score", 0) >= quality_threshold
+            )
+            return quality_count >= min_quality_results
+
+        available_sources = [
+            source for source in await self._check_service_health(search_params["sources"])
+            if source in self.search_clients
+        ]
+
+        if not available_sources:
+            self.logger.warning("No available search sources, using emergency fallback")
+            for source, results in (await self._emergency_fallback_search(search_params)).items():
+                completed_sources.append(source)
+                yield merge(source, results)
+        else:
+            async def tagged_search(source: str) -> Tuple[str, Optional[List[Dict[str, Any]]], Optional[Exception]]:
+                try:
+                    return source, await self._search_with_source_and_fallback(source, search_params), None
+                except Exception as e:
+                    return source, None, e
+
+            tasks = [asyncio.create_task(tagged_search(source)) for source in available_sources]
+            try:
+                for next_completed in asyncio.as_completed(tasks):
+                    source, results, error = await next_completed
+                    if error is not None:
+                        self.logger.error(f"Search failed for {source}: {str(error)}")
+                        failed_sources.append(source)
+                        yield {"event": "source_error", "source": source, "error": str(error), "elapsed": elapsed()}
+                        continue
+
+                    completed_sources.append(source)
+                    yield merge(source, results or [])
+
+                    if enough_results():
+                        early_return = True
+                        break
+            finally:
+                pending = [task for task in tasks if not task.done()]
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+
+            # 如果主要搜索源失败，尝试故障转移
+            if failed_sources and not early_return:
+                failover_results: Dict[str, List[Dict[str, Any]]] = {}
+                await self._handle_search_failures(failed_sources, search_params, failover_results)
+                for source, results in failover_results.items():
+                    yield merge(source, results)
+
+        final_results = await self._rank_deduplicated_results(
+            list(deduplicator.results), search_params["keywords"], relevance_index, search_params.get("limit")
+        )
+        yield {
+            "event": "complete",
+            "results": final_results,
+            "total": len(deduplicator),
+            "completed_sources": completed_sources,
+            "failed_sources": failed_sources,
+            "early_return": early_return,
+            "elapsed": elapsed()
+        }
+    
     async def _check_service_health(self, requested_sources: List[str]) -> List[str]:
         """检查搜索服务健康状态."""
         available_sources = []
@@ -510,16 +705,18 @@ class PatentSearchAgent(PatentBaseAgent):
             self.logger.error(f"Error searching with {source}: {str(e)}")
             return []
     
-    async def _optimize_search_results(self, search_results: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    async def _optimize_search_results(
+        self,
+        search_results: Dict[str, List[Dict[str, Any]]],
+        keywords: Optional[List[str]] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """优化和排序搜索结果，包含高级质量评估算法."""
         all_results = []
         
         # 合并所有结果并计算初始质量分数
         for source, results in search_results.items():
-            for result in results:
-                result["source"] = source
-                result["initial_quality_score"] = self._calculate_quality_score(result)
-                all_results.append(result)
+            all_results.extend(self._score_source_results(source, results))
         
         # 如果没有结果，直接返回
         if not all_results:
@@ -528,6 +725,41 @@ class PatentSearchAgent(PatentBaseAgent):
         # 去重（基于标题相似性和内容相似性）
         deduplicated_results = await self._advanced_deduplicate_results(all_results)
         
+        return await self._rank_deduplicated_results(deduplicated_results, keywords, limit=limit)
+    
+    def _score_source_results(self, source: str, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """标记结果来源并计算初始质量分数."""
+        for result in results:
+            result["source"] = source
+            result["initial_quality_score"] = self._calculate_quality_score(result)
+        return results
+    
+    async def _rank_deduplicated_results(
+        self,
+        deduplicated_results: List[Dict[str, Any]],
+        keywords: Optional[List[str]] = None,
+        relevance_index: Optional[BM25Index] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """对去重后的结果做质量评估、排序和多样性优化.
+        
+        ``relevance_index`` 为已按结果位置建立的BM25索引（流式搜索时增量构建），
+        未提供时根据 ``keywords`` 现场构建。最多返回 ``limit`` 个结果，未指定时按
+        ``diversity_config["k"]``。
+        """
+        if not deduplicated_results:
+            return []
+        
+        # 基于BM25倒排索引计算关键词相关性
+        if keywords:
+            if relevance_index is None:
+                relevance = bm25_relevance(deduplicated_results, keywords)
+            else:
+                scores = relevance_index.normalized_scores(keywords)
+                relevance = [scores.get(position, 0.0) for position in range(len(deduplicated_results))]
+            for result, score in zip(deduplicated_results, relevance):
+                result["bm25_relevance"] = score
+        
         # 计算高级质量分数（考虑去重后的上下文）
         enhanced_results = await self._calculate_enhanced_quality_scores(deduplicated_results)
         
@@ -535,99 +767,17 @@ class PatentSearchAgent(PatentBaseAgent):
         optimized_results = await self._multi_dimensional_sort(enhanced_results)
         
         # 结果多样性优化
-        diversified_results = await self._optimize_result_diversity(optimized_results)
+        k = limit or self.diversity_config["k"]
+        diversified_results = await self._optimize_result_diversity(optimized_results, k)
         
-        return diversified_results[:20]  # 返回前20个结果
+        return diversified_results[:k]
     
     async def _advanced_deduplicate_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """高级去重算法，基于标题和内容相似性."""
+        """高级去重算法，基于标题和内容相似性（MinHash-LSH，支持中文）."""
         if not results:
             return []
         
-        deduplicated = []
-        seen_signatures = set()
-        
-        for result in results:
-            # 生成内容签名
-            signature = self._generate_content_signature(result)
-            
-            # 检查是否已存在相似内容
-            is_duplicate = False
-            for seen_sig in seen_signatures:
-                if self._calculate_signature_similarity(signature, seen_sig) > 0.8:
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                seen_signatures.add(signature)
-                deduplicated.append(result)
-            else:
-                # 如果是重复内容，但质量更高，则替换
-                existing_index = self._find_similar_result_index(deduplicated, result)
-                if existing_index >= 0:
-                    existing_quality = deduplicated[existing_index].get("initial_quality_score", 0)
-                    current_quality = result.get("initial_quality_score", 0)
-                    
-                    if current_quality > existing_quality:
-                        deduplicated[existing_index] = result
-        
-        return deduplicated
-    
-    def _generate_content_signature(self, result: Dict[str, Any]) -> str:
-        """生成内容签名用于去重."""
-        title = result.get("title", "").lower().strip()
-        content = result.get("content", "").lower().strip()
-        
-        # 提取关键特征
-        title_words = set(title.split()[:10])  # 标题前10个词
-        content_words = set(content.split()[:50])  # 内容前50个词
-        
-        # 生成签名
-        signature_parts = [
-            "title:" + "_".join(sorted(title_words)),
-            "content:" + "_".join(sorted(list(content_words)[:20]))  # 限制长度
-        ]
-        
-        return "|".join(signature_parts)
-    
-    def _calculate_signature_similarity(self, sig1: str, sig2: str) -> float:
-        """计算签名相似性."""
-        try:
-            parts1 = sig1.split("|")
-            parts2 = sig2.split("|")
-            
-            if len(parts1) != len(parts2):
-                return 0.0
-            
-            similarities = []
-            for p1, p2 in zip(parts1, parts2):
-                # 简单的Jaccard相似性
-                words1 = set(p1.split("_"))
-                words2 = set(p2.split("_"))
-                
-                intersection = len(words1 & words2)
-                union = len(words1 | words2)
-                
-                if union == 0:
-                    similarities.append(0.0)
-                else:
-                    similarities.append(intersection / union)
-            
-            return sum(similarities) / len(similarities)
-            
-        except Exception:
-            return 0.0
-    
-    def _find_similar_result_index(self, results: List[Dict[str, Any]], target: Dict[str, Any]) -> int:
-        """查找相似结果的索引."""
-        target_sig = self._generate_content_signature(target)
-        
-        for i, result in enumerate(results):
-            result_sig = self._generate_content_signature(result)
-            if self._calculate_signature_similarity(target_sig, result_sig) > 0.8:
-                return i
-        
-        return -1
+        return deduplicate_results(results, threshold=0.8, quality_key="initial_quality_score")
     
     async def _calculate_enhanced_quality_scores(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """计算增强的质量分数."""
@@ -757,9 +907,9 @@ class PatentSearchAgent(PatentBaseAgent):
     
     def _assess_relevance(self, result: Dict[str, Any]) -> float:
         """评估相关性."""
-        # 这里应该基于搜索关键词计算相关性
-        # 简化实现
-        relevance_score = result.get("relevance_score", 0.5)
+        # 优先使用基于搜索关键词的BM25相关性
+        if "bm25_relevance" in result:
+            return result["bm25_relevance"]
         
         # 如果有现有的相关性分数，使用它
         if "relevance_score" in result:
@@ -819,64 +969,19 @@ class PatentSearchAgent(PatentBaseAgent):
         
         return final_sorted
     
-    async def _optimize_result_diversity(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """优化结果多样性，避免过度相似的结果."""
+    async def _optimize_result_diversity(self, results: List[Dict[str, Any]], k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """优化结果多样性，避免过度相似的结果（MMR重排序）."""
         if len(results) <= 5:
             return results  # 结果太少，不需要多样性优化
         
-        diversified = []
-        remaining = results.copy()
-        
-        # 选择质量最高的结果作为第一个
-        if remaining:
-            best_result = remaining.pop(0)
-            diversified.append(best_result)
-        
-        # 逐个选择与已选结果差异较大的结果
-        while remaining and len(diversified) < 20:
-            best_candidate = None
-            best_diversity_score = -1
-            
-            for candidate in remaining:
-                # 计算与已选结果的多样性分数
-                diversity_score = self._calculate_diversity_score(candidate, diversified)
-                
-                # 综合考虑质量和多样性
-                combined_score = (
-                    candidate.get("enhanced_quality_score", 0) * 0.7 +
-                    diversity_score * 0.3
-                )
-                
-                if combined_score > best_diversity_score:
-                    best_diversity_score = combined_score
-                    best_candidate = candidate
-            
-            if best_candidate:
-                diversified.append(best_candidate)
-                remaining.remove(best_candidate)
-            else:
-                break
-        
-        return diversified
-    
-    def _calculate_diversity_score(self, candidate: Dict[str, Any], selected: List[Dict[str, Any]]) -> float:
-        """计算候选结果与已选结果的多样性分数."""
-        if not selected:
-            return 1.0
-        
-        candidate_sig = self._generate_content_signature(candidate)
-        
-        similarities = []
-        for selected_result in selected:
-            selected_sig = self._generate_content_signature(selected_result)
-            similarity = self._calculate_signature_similarity(candidate_sig, selected_sig)
-            similarities.append(similarity)
-        
-        # 多样性分数 = 1 - 最大相似性
-        max_similarity = max(similarities) if similarities else 0
-        diversity_score = 1.0 - max_similarity
-        
-        return max(diversity_score, 0.0)
+        # 首个结果保持质量最高的结果，之后综合考虑质量和与已选结果的差异
+        return mmr_rerank(
+            results,
+            score_key="enhanced_quality_score",
+            k=k or self.diversity_config["k"],
+            lambda_=self.diversity_config["lambda"],
+            feature_dim=self.diversity_config["feature_dim"]
+        )
     
     def _calculate_quality_score(self, result: Dict[str, Any]) -> float:
         """计算结果质量分数."""
@@ -1159,10 +1264,28 @@ class PatentSearchAgent(PatentBaseAgent):
             self.logger.error(f"Patent search agent health check failed: {str(e)}")
             return False
     
+    async def _initialize_specific(self) -> bool:
+        """专利搜索Agent特定的初始化."""
+        if not await super()._initialize_specific():
+            return False
+        
+        # 启动热门查询的每日预取
+        if settings.search_prefetch_enabled:
+            self.prefetcher.start()
+            self.logger.info(f"Popular query prefetch scheduled daily at {settings.search_prefetch_time}")
+        
+        return True
+    
     # 清理资源
     async def _cleanup_specific(self) -> None:
         """清理搜索Agent特定的资源."""
         try:
+            # 停止预取和后台刷新任务
+            await self.prefetcher.stop()
+            for task in list(self._refresh_tasks.values()):
+                task.cancel()
+            self._refresh_tasks.clear()
+            
             # 关闭所有搜索客户端的会话
             for client_name, client in self.search_clients.items():
                 try:
@@ -1187,8 +1310,9 @@ class CNKIClient:
         self.api_url = "https://api.cnki.net"  # 假设的API端点
         self.timeout = 30
         self.rate_limit = 5  # 每秒最多5个请求
-        self.last_request_time = 0
+        self.rate_limiter = get_rate_limiter(urlsplit(self.api_url).netloc, rate=self.rate_limit)
         self.session = None
+        self.response_cache = get_response_cache()
         
         # 搜索配置
         self.search_config = {
@@ -1212,9 +1336,6 @@ class CNKIClient:
     async def search(self, keywords: List[str], search_type: str = "general", limit: int = 20) -> List[Dict[str, Any]]:
         """执行CNKI搜索."""
         try:
-            # 速率限制
-            await self._rate_limit_check()
-            
             # 构建搜索查询
             query = self._build_search_query(keywords, search_type)
             
@@ -1232,18 +1353,6 @@ class CNKIClient:
             # 返回降级结果
             return await self._get_fallback_results(keywords, search_type, limit)
     
-    async def _rate_limit_check(self):
-        """检查速率限制."""
-        import time
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < (1.0 / self.rate_limit):
-            sleep_time = (1.0 / self.rate_limit) - time_since_last
-            await asyncio.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
-    
     def _build_search_query(self, keywords: List[str], search_type: str) -> Dict[str, Any]:
         """构建CNKI搜索查询."""
         config = self.search_config.get(search_type, self.search_config["general"])
@@ -1323,7 +1432,7 @@ class CNKIClient:
             if api_key:
                 headers["Authorization"] = f"Bearer {api_key}"
             
-            async with self.session.post(api_endpoint, json=params, headers=headers) as response:
+            async with cached_aiohttp_request(self.session, self.response_cache, "POST", api_endpoint, cacheable=True, json=params, headers=headers, rate_limiter=self.rate_limiter) as response:
                 if response.status == 200:
                     data = await response.json()
                     return self._parse_real_api_response(data, search_type)
@@ -1332,6 +1441,7 @@ class CNKIClient:
                     return None
                 elif response.status == 429:
                     logger.error("CNKI API rate limit exceeded")
+                    self.rate_limiter.penalize(1.0)
                     return None
                 else:
                     logger.error(f"CNKI API returned status {response.status}")
@@ -1503,8 +1613,9 @@ class BochaAIClient:
         # 性能配置
         self.timeout = 30
         self.rate_limit = 10  # 每秒最多10个请求
-        self.last_request_time = 0
+        self.rate_limiter = get_rate_limiter(urlsplit(self.base_url).netloc, rate=self.rate_limit)
         self.session = None
+        self.response_cache = get_response_cache()
         
         # 初始化日志
         self.logger = logging.getLogger(f"{__name__}.BochaAIClient")
@@ -1564,6 +1675,13 @@ class BochaAIClient:
             "diversity_threshold": 0.7
         }
         
+        # 多样性重排序（MMR）配置：返回数量、质量权重lambda、特征向量维度
+        self.diversity_config = {
+            "k": 15,
+            "lambda": 0.7,
+            "feature_dim": 512
+        }
+        
         # 性能统计
         self.stats = {
             "total_requests": 0,
@@ -1723,9 +1841,6 @@ class BochaAIClient:
                 self.logger.error("API密钥无效，使用降级搜索")
                 return await self._get_fallback_results(keywords, search_type, limit)
             
-            # 速率限制检查
-            await self._rate_limit_check()
-            
             # 构建搜索查询
             query = self._build_optimized_query(keywords, search_type)
             
@@ -1908,19 +2023,6 @@ class BochaAIClient:
                 alpha * duration
             )
     
-    async def _rate_limit_check(self):
-        """检查速率限制，优化版本."""
-        import time
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        min_interval = 1.0 / self.rate_limit
-        if time_since_last < min_interval:
-            sleep_time = min_interval - time_since_last
-            await asyncio.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
-    
     async def _web_search_with_retry(self, query: str, search_type: str, limit: int) -> List[Dict[str, Any]]:
         """带重试机制的Web搜索."""
         retry_count = self.api_config["web_search"]["retry_count"]
@@ -1999,10 +2101,13 @@ class BochaAIClient:
                 "Content-Type": "application/json"
             }
             
-            async with self.session.post(
+            async with cached_aiohttp_request(
+                self.session, self.response_cache, "POST", 
                 self.web_search_url, 
+                cacheable=True, 
                 json=params, 
-                headers=headers
+                headers=headers,
+                rate_limiter=self.rate_limiter
             ) as response:
                 if response.status == 200:
                     data = await response.json()
@@ -2012,7 +2117,7 @@ class BochaAIClient:
                     return await self._get_mock_web_results(query, limit)
                 elif response.status == 429:
                     logger.warning("Bocha AI rate limit exceeded")
-                    await asyncio.sleep(2)
+                    self.rate_limiter.penalize(2)
                     return await self._get_mock_web_results(query, limit)
                 else:
                     logger.error(f"Bocha AI web search returned status {response.status}")
@@ -2042,7 +2147,7 @@ class BochaAIClient:
                 headers["Authorization"] = f"Bearer {api_key}"
                 headers["X-API-Key"] = api_key
             
-            async with self.session.post(self.web_search_url, json=api_params, headers=headers) as response:
+            async with cached_aiohttp_request(self.session, self.response_cache, "POST", self.web_search_url, cacheable=True, json=api_params, headers=headers, rate_limiter=self.rate_limiter) as response:
                 if response.status == 200:
                     data = await response.json()
                     return self._parse_web_search_response(data)
@@ -2051,7 +2156,7 @@ class BochaAIClient:
                     return None
                 elif response.status == 429:
                     logger.warning("Bocha AI rate limit exceeded, waiting...")
-                    await asyncio.sleep(2)
+                    self.rate_limiter.penalize(2)
                     return None
                 else:
                     logger.error(f"Bocha AI web search returned status {response.status}")
@@ -2143,10 +2248,13 @@ class BochaAIClient:
                 "Content-Type": "application/json"
             }
             
-            async with self.session.post(
+            async with cached_aiohttp_request(
+                self.session, self.response_cache, "POST", 
                 self.ai_search_url, 
+                cacheable=True, 
                 json=params, 
-                headers=headers
+                headers=headers,
+                rate_limiter=self.rate_limiter
             ) as response:
                 if response.status == 200:
                     data = await response.json()
@@ -2156,7 +2264,7 @@ class BochaAIClient:
                     return await self._get_mock_ai_results(query, limit)
                 elif response.status == 429:
                     logger.warning("Bocha AI rate limit exceeded")
-                    await asyncio.sleep(3)
+                    self.rate_limiter.penalize(3)
                     return await self._get_mock_ai_results(query, limit)
                 else:
                     logger.error(f"Bocha AI AI search returned status {response.status}")
@@ -2187,7 +2295,7 @@ class BochaAIClient:
                 headers["Authorization"] = f"Bearer {api_key}"
                 headers["X-API-Key"] = api_key
             
-            async with self.session.post(self.ai_search_url, json=api_params, headers=headers) as response:
+            async with cached_aiohttp_request(self.session, self.response_cache, "POST", self.ai_search_url, cacheable=True, json=api_params, headers=headers, rate_limiter=self.rate_limiter) as response:
                 if response.status == 200:
                     data = await response.json()
                     return self._parse_ai_search_response(data)
@@ -2196,7 +2304,7 @@ class BochaAIClient:
                     return None
                 elif response.status == 429:
                     logger.warning("Bocha AI rate limit exceeded, waiting...")
-                    await asyncio.sleep(3)
+                    self.rate_limiter.penalize(3)
                     return None
                 else:
                     logger.error(f"Bocha AI AI search returned status {response.status}")
@@ -2322,10 +2430,13 @@ class BochaAIClient:
                 "Content-Type": "application/json"
             }
             
-            async with self.session.post(
+            async with cached_aiohttp_request(
+                self.session, self.response_cache, "POST", 
                 self.agent_search_url, 
+                cacheable=True, 
                 json=params, 
-                headers=headers
+                headers=headers,
+                rate_limiter=self.rate_limiter
             ) as response:
                 if response.status == 200:
                     data = await response.json()
@@ -2335,7 +2446,7 @@ class BochaAIClient:
                     return []
                 elif response.status == 429:
                     logger.warning("Bocha AI rate limit exceeded for agent search")
-                    await asyncio.sleep(2)
+                    self.rate_limiter.penalize(2)
                     return []
                 else:
                     logger.error(f"Bocha AI agent search returned status {response.status}")
@@ -2454,10 +2565,13 @@ class BochaAIClient:
                 "Content-Type": "application/json"
             }
             
-            async with self.session.post(
+            async with cached_aiohttp_request(
+                self.session, self.response_cache, "POST", 
                 self.rerank_url, 
+                cacheable=True, 
                 json=params, 
-                headers=headers
+                headers=headers,
+                rate_limiter=self.rate_limiter
             ) as response:
                 if response.status == 200:
                     data = await response.json()
@@ -2729,15 +2843,15 @@ class BochaAIClient:
             return []
         
         # 第一阶段：质量过滤
-        filtered_results = []
-        for result in results:
-            if self._meets_quality_standards(result):
-                # 计算增强的质量分数
-                result["comprehensive_quality"] = self._calculate_comprehensive_quality(result, keywords)
-                result["semantic_relevance"] = self._calculate_semantic_relevance(result, keywords)
-                result["authority_score"] = self._calculate_authority_score(result)
-                result["freshness_score"] = self._calculate_freshness_score(result)
-                filtered_results.append(result)
+        filtered_results = [result for result in results if self._meets_quality_standards(result)]
+        
+        # 计算增强的质量分数（语义相关性基于过滤后结果集的BM25索引）
+        semantic_relevance = self._calculate_semantic_relevance(filtered_results, keywords)
+        for result, relevance in zip(filtered_results, semantic_relevance):
+            result["comprehensive_quality"] = self._calculate_comprehensive_quality(result, keywords)
+            result["semantic_relevance"] = relevance
+            result["authority_score"] = self._calculate_authority_score(result)
+            result["freshness_score"] = self._calculate_freshness_score(result)
         
         # 第二阶段：去重处理
         deduplicated_results = await self._advanced_deduplication(filtered_results)
@@ -2750,35 +2864,25 @@ class BochaAIClient:
         
         return diversified_results
     
-    def _calculate_semantic_relevance(self, result: Dict[str, Any], keywords: List[str]) -> float:
-        """计算语义相关性."""
-        content = (result.get("content", "") + " " + result.get("title", "")).lower()
-        
+    def _calculate_semantic_relevance(self, results: List[Dict[str, Any]], keywords: List[str]) -> List[float]:
+        """计算一组结果的语义相关性（BM25倒排索引，标题权重更高）."""
         if not keywords:
-            return 0.5
+            return [0.5] * len(results)
+        
+        index = BM25Index()
+        index.add_many(results)
         
         # 直接关键词匹配
-        direct_matches = sum(1 for kw in keywords if kw.lower() in content)
-        direct_score = direct_matches / len(keywords)
+        direct_scores = index.normalized_scores(keywords)
         
         # 语义相关词匹配
-        semantic_keywords = self._expand_keywords_semantically(keywords)
-        semantic_matches = sum(1 for kw in semantic_keywords if kw.lower() in content)
-        semantic_score = semantic_matches / max(len(semantic_keywords), 1)
-        
-        # 位置权重（标题中的关键词权重更高）
-        title = result.get("title", "").lower()
-        title_matches = sum(1 for kw in keywords if kw.lower() in title)
-        title_score = title_matches / len(keywords)
+        semantic_scores = index.normalized_scores(self._expand_keywords_semantically(keywords))
         
         # 综合相关性分数
-        relevance = (
-            direct_score * 0.5 +
-            semantic_score * 0.3 +
-            title_score * 0.2
-        )
-        
-        return min(relevance, 1.0)
+        return [
+            min(direct_scores.get(doc_id, 0.0) * 0.7 + semantic_scores.get(doc_id, 0.0) * 0.3, 1.0)
+            for doc_id in range(len(results))
+        ]
     
     def _expand_keywords_semantically(self, keywords: List[str]) -> List[str]:
         """语义扩展关键词."""
@@ -2875,94 +2979,11 @@ class BochaAIClient:
             return 0.5
     
     async def _advanced_deduplication(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """高级去重算法."""
+        """高级去重算法（MinHash-LSH，支持中文）."""
         if len(results) <= 1:
             return results
         
-        deduplicated = []
-        processed_signatures = set()
-        
-        for result in results:
-            # 生成内容指纹
-            signature = self._generate_content_fingerprint(result)
-            
-            # 检查是否重复
-            is_duplicate = False
-            for existing_sig in processed_signatures:
-                if self._calculate_similarity(signature, existing_sig) > 0.85:
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                processed_signatures.add(signature)
-                deduplicated.append(result)
-            else:
-                # 如果是重复但质量更高，则替换
-                existing_index = self._find_similar_result_index(deduplicated, result)
-                if existing_index >= 0:
-                    existing_quality = deduplicated[existing_index].get("comprehensive_quality", 0)
-                    current_quality = result.get("comprehensive_quality", 0)
-                    
-                    if current_quality > existing_quality:
-                        deduplicated[existing_index] = result
-        
-        return deduplicated
-    
-    def _generate_content_fingerprint(self, result: Dict[str, Any]) -> str:
-        """生成内容指纹."""
-        title = result.get("title", "").lower().strip()
-        content = result.get("content", "").lower().strip()
-        
-        # 提取关键特征词
-        import re
-        title_words = set(re.findall(r'\w+', title)[:15])
-        content_words = set(re.findall(r'\w+', content)[:50])
-        
-        # 生成指纹
-        fingerprint = "|".join([
-            "t:" + "_".join(sorted(title_words)),
-            "c:" + "_".join(sorted(list(content_words)[:25]))
-        ])
-        
-        return fingerprint
-    
-    def _calculate_similarity(self, sig1: str, sig2: str) -> float:
-        """计算指纹相似性."""
-        try:
-            parts1 = sig1.split("|")
-            parts2 = sig2.split("|")
-            
-            if len(parts1) != len(parts2):
-                return 0.0
-            
-            similarities = []
-            for p1, p2 in zip(parts1, parts2):
-                words1 = set(p1.split("_"))
-                words2 = set(p2.split("_"))
-                
-                intersection = len(words1 & words2)
-                union = len(words1 | words2)
-                
-                if union == 0:
-                    similarities.append(0.0)
-                else:
-                    similarities.append(intersection / union)
-            
-            return sum(similarities) / len(similarities)
-            
-        except Exception:
-            return 0.0
-    
-    def _find_similar_result_index(self, results: List[Dict[str, Any]], target: Dict[str, Any]) -> int:
-        """查找相似结果的索引."""
-        target_sig = self._generate_content_fingerprint(target)
-        
-        for i, result in enumerate(results):
-            result_sig = self._generate_content_fingerprint(result)
-            if self._calculate_similarity(target_sig, result_sig) > 0.85:
-                return i
-        
-        return -1
+        return deduplicate_results(results, threshold=0.85, quality_key="comprehensive_quality")
     
     async def _multi_dimensional_ranking(self, results: List[Dict[str, Any]], keywords: List[str]) -> List[Dict[str, Any]]:
         """多维度排序算法."""
@@ -2993,61 +3014,17 @@ class BochaAIClient:
         return ranked_results
     
     async def _diversity_optimization(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """多样性优化，确保结果的多样性."""
+        """多样性优化，确保结果的多样性（MMR重排序）."""
         if len(results) <= 3:
             return results
         
-        diversified = []
-        remaining = results.copy()
-        
-        # 选择最高质量的结果作为第一个
-        if remaining:
-            best_result = remaining.pop(0)
-            diversified.append(best_result)
-        
-        # 逐个选择与已选结果差异较大的结果
-        while remaining and len(diversified) < 15:
-            best_candidate = None
-            best_diversity_score = -1
-            
-            for candidate in remaining:
-                # 计算多样性分数
-                diversity_score = self._calculate_diversity_score(candidate, diversified)
-                
-                # 综合考虑质量和多样性
-                quality_score = candidate.get("final_ranking_score", 0)
-                combined_score = quality_score * 0.7 + diversity_score * 0.3
-                
-                if combined_score > best_diversity_score:
-                    best_diversity_score = combined_score
-                    best_candidate = candidate
-            
-            if best_candidate:
-                diversified.append(best_candidate)
-                remaining.remove(best_candidate)
-            else:
-                break
-        
-        return diversified
-    
-    def _calculate_diversity_score(self, candidate: Dict[str, Any], selected: List[Dict[str, Any]]) -> float:
-        """计算多样性分数."""
-        if not selected:
-            return 1.0
-        
-        candidate_sig = self._generate_content_fingerprint(candidate)
-        
-        similarities = []
-        for selected_result in selected:
-            selected_sig = self._generate_content_fingerprint(selected_result)
-            similarity = self._calculate_similarity(candidate_sig, selected_sig)
-            similarities.append(similarity)
-        
-        # 多样性分数 = 1 - 最大相似性
-        max_similarity = max(similarities) if similarities else 0
-        diversity_score = 1.0 - max_similarity
-        
-        return max(diversity_score, 0.0)
+        return mmr_rerank(
+            results,
+            score_key="final_ranking_score",
+            k=self.diversity_config["k"],
+            lambda_=self.diversity_config["lambda"],
+            feature_dim=self.diversity_config["feature_dim"]
+        )
     
     def _calculate_comprehensive_quality(self, result: Dict[str, Any], keywords: List[str]) -> float:
         """计算综合质量分数."""
@@ -3176,7 +3153,6 @@ class SmartCrawler:
     def __init__(self):
         self.timeout = 30
         self.session = None
-        self.rate_limiters = {}  # 每个域名的速率限制器
         
         # 多种User-Agent轮换
         self.user_agents = [
@@ -3192,12 +3168,13 @@ class SmartCrawler:
             "patents.google.com": {
                 "enabled": True,
                 "rate_limit": 2,  # 每秒最多2个请求
-                "delay_range": (1, 3),  # 随机延迟1-3秒
+                "delay_range": (1, 3),  # 额外延迟1-3秒，平均值计入请求间隔
                 "selectors": {
                     "title": "h1, .patent-title, .invention-title",
                     "abstract": ".abstract, .patent-abstract, .description",
                     "content": ".patent-text, .description, .claims"
                 },
+                "item_selector": "search-result-item, article.result",
                 "search_patterns": [
                     "/?q={keywords}",
                     "/?q={keywords}&oq={keywords}"
@@ -3207,7 +3184,7 @@ class SmartCrawler:
             "www.wipo.int": {
                 "enabled": True,
                 "rate_limit": 1,  # 每秒最多1个请求
-                "delay_range": (2, 5),  # 随机延迟2-5秒
+                "delay_range": (2, 5),  # 额外延迟2-5秒，平均值计入请求间隔
                 "selectors": {
                     "title": "h1, .page-title, .article-title",
                     "content": ".content, .article-content, .main-content",
@@ -3228,6 +3205,7 @@ class SmartCrawler:
                     "abstract": ".gs_rs",
                     "content": ".gs_a"
                 },
+                "item_selector": ".gs_ri",
                 "search_patterns": [
                     "/scholar?q={keywords}+patent",
                     "/scholar?q={keywords}+technology"
@@ -3239,7 +3217,7 @@ class SmartCrawler:
         # 反爬虫策略配置
         self.anti_detection = {
             "rotate_user_agent": True,
-            "random_delays": True,
+            "random_delays": True,  # 站点的 delay_range 计入限速间隔
             "respect_robots_txt": True,
             "use_proxies": False,  # 可以配置代理池
             "session_rotation": True,
@@ -3262,7 +3240,10 @@ class SmartCrawler:
             "extract_images": False,
             "extract_links": True,
             "clean_html": True,
-            "extract_metadata": True
+            "extract_metadata": True,
+            "max_items_per_page": 20,
+            "max_page_bytes": 5 * 1024 * 1024,  # 超过该大小的页面只解析前面部分
+            "stream_chunk_size": 64 * 1024
         }
         
         # 失败重试配置
@@ -3272,6 +3253,32 @@ class SmartCrawler:
             "retry_on_status": [429, 500, 502, 503, 504],
             "retry_on_timeout": True
         }
+        
+        # 爬取调度配置（共享keep-alive会话的连接数上限、robots规则缓存时间）
+        self.crawl_config = {
+            "max_connections": 20,
+            "max_connections_per_host": 2,
+            "max_concurrency": 10,
+            "keepalive_timeout": 30,
+            "robots_cache_ttl": 86400
+        }
+        
+        # 按主机的限速和连接数上限，限速器与访问同一主机的其他客户端共享
+        self.politeness = HostPoliteness(
+            max_connections_per_host=self.crawl_config["max_connections_per_host"],
+            robots=RobotsCache(self._fetch_robots_txt, ttl=self.crawl_config["robots_cache_ttl"])
+            if self.compliance_config["check_robots_txt"] else None,
+            limiters=rate_limiters
+        )
+        for domain, config in self.target_sites.items():
+            self.politeness.configure_host(domain, rate=self._site_rate(config))
+    
+    def _site_rate(self, site_config: Dict[str, Any]) -> float:
+        """站点的请求速率（个/秒）：最小间隔 ``1/rate_limit`` 加上 ``delay_range`` 的平均延迟."""
+        interval = 1.0 / site_config.get("rate_limit", 1)
+        if self.anti_detection["random_delays"]:
+            interval += sum(site_config.get("delay_range", (0, 0))) / 2
+        return 1.0 / interval
     
     async def search(self, keywords: List[str], search_type: str = "general", limit: int = 20) -> List[Dict[str, Any]]:
         """执行智能网页爬取搜索."""
@@ -3287,26 +3294,9 @@ class SmartCrawler:
             # 选择目标网站
             target_sites = await self._select_target_sites(search_type)
             
-            # 并行爬取多个网站
-            crawl_tasks = []
-            for site_domain in target_sites:
-                task = self._crawl_site_with_keywords(site_domain, keywords, limit // len(target_sites))
-                crawl_tasks.append((site_domain, task))
-            
-            # 执行爬取任务
-            all_results = []
-            completed_tasks = await asyncio.gather(
-                *[task for _, task in crawl_tasks],
-                return_exceptions=True
-            )
-            
-            # 处理结果
-            for i, (site_domain, _) in enumerate(crawl_tasks):
-                result = completed_tasks[i]
-                if isinstance(result, Exception):
-                    logger.error(f"Crawling failed for {site_domain}: {str(result)}")
-                else:
-                    all_results.extend(result or [])
+            # 通过爬取调度并行爬取多个网站
+            site_results = await self._crawl_sites(target_sites, keywords, max(limit // len(target_sites), 1))
+            all_results = [result for results in site_results.values() for result in results]
             
             # 后处理和质量控制
             processed_results = await self._post_process_results(all_results, keywords)
@@ -3322,8 +3312,9 @@ class SmartCrawler:
         """确保HTTP会话存在."""
         if not self.session:
             connector = aiohttp.TCPConnector(
-                limit=10,
-                limit_per_host=2,
+                limit=self.crawl_config["max_connections"],
+                limit_per_host=self.crawl_config["max_connections_per_host"],
+                keepalive_timeout=self.crawl_config["keepalive_timeout"],
                 ttl_dns_cache=300,
                 use_dns_cache=True,
                 ssl=False  # 允许HTTP连接用于测试
@@ -3385,69 +3376,45 @@ class SmartCrawler:
         
         return available_sites[:3]  # 限制同时爬取的网站数量
     
+    async def _crawl_sites(self, site_domains: List[str], keywords: List[str], limit: int) -> Dict[str, List[Dict[str, Any]]]:
+        """爬取多个网站的关键词相关内容，返回每个网站的结果."""
+        frontier = CrawlFrontier(self.politeness)
+        blacklisted = set(self.compliance_config["blacklisted_domains"])
+        
+        for site_domain in site_domains:
+            if site_domain in blacklisted:
+                continue
+            # 限制每个网站的搜索URL数量，靠前的搜索模式优先
+            for priority, search_url in enumerate(self._build_search_urls(site_domain, keywords)[:2]):
+                frontier.add(search_url, priority=priority, site_domain=site_domain)
+        
+        async def fetch(request: CrawlRequest) -> List[Dict[str, Any]]:
+            site_config = self.target_sites.get(request.meta["site_domain"], {})
+            return await self._crawl_single_url(request.url, site_config, keywords)
+        
+        results = await frontier.run(
+            fetch,
+            per_host_limit=limit,
+            max_concurrency=self.crawl_config["max_concurrency"]
+        )
+        logger.debug(f"Crawl frontier stats: {frontier.stats}")
+        return results
+    
     async def _crawl_site_with_keywords(self, site_domain: str, keywords: List[str], limit: int) -> List[Dict[str, Any]]:
         """爬取指定网站的关键词相关内容."""
         try:
-            site_config = self.target_sites.get(site_domain, {})
-            
-            # 速率限制
-            await self._apply_rate_limit(site_domain)
-            
-            # 构建搜索URL
-            search_urls = self._build_search_urls(site_domain, keywords)
-            
-            results = []
-            for search_url in search_urls[:2]:  # 限制每个网站的搜索URL数量
-                try:
-                    # 执行单个URL爬取
-                    url_results = await self._crawl_single_url(search_url, site_config, keywords)
-                    results.extend(url_results)
-                    
-                    if len(results) >= limit:
-                        break
-                        
-                except Exception as e:
-                    logger.error(f"Failed to crawl {search_url}: {str(e)}")
-                    continue
-            
-            return results[:limit]
+            results = await self._crawl_sites([site_domain], keywords, limit)
+            return results.get(site_domain, [])
             
         except Exception as e:
             logger.error(f"Site crawling failed for {site_domain}: {str(e)}")
             return []
     
-    async def _apply_rate_limit(self, domain: str):
-        """应用速率限制."""
-        import time
-        
-        site_config = self.target_sites.get(domain, {})
-        rate_limit = site_config.get("rate_limit", 1)
-        
-        # 检查上次请求时间
-        if domain not in self.rate_limiters:
-            self.rate_limiters[domain] = {"last_request": 0, "request_count": 0}
-        
-        limiter = self.rate_limiters[domain]
-        current_time = time.time()
-        
-        # 计算需要等待的时间
-        time_since_last = current_time - limiter["last_request"]
-        min_interval = 1.0 / rate_limit
-        
-        if time_since_last < min_interval:
-            sleep_time = min_interval - time_since_last
-            
-            # 添加随机延迟以避免检测
-            if self.anti_detection["random_delays"]:
-                delay_range = site_config.get("delay_range", (1, 2))
-                import random
-                additional_delay = random.uniform(*delay_range)
-                sleep_time += additional_delay
-            
-            await asyncio.sleep(sleep_time)
-        
-        limiter["last_request"] = time.time()
-        limiter["request_count"] += 1
+    async def _fetch_robots_txt(self, robots_url: str) -> Tuple[int, str]:
+        """获取robots.txt，返回状态码和内容."""
+        await self._ensure_session()
+        async with self.session.get(robots_url, headers=self._get_base_headers()) as response:
+            return response.status, await response.text() if response.status == 200 else ""
     
     def _build_search_urls(self, site_domain: str, keywords: List[str]) -> List[str]:
         """构建搜索URL."""
@@ -3474,16 +3441,17 @@ class SmartCrawler:
             # 准备请求头
             headers = self._get_request_headers()
             
-            # 执行请求（带重试）
-            html_content = await self._fetch_with_retry(url, headers)
+            # 执行请求（带重试），边下载边在线程池中按选择器提取内容
+            records = await self._fetch_with_retry(
+                url,
+                headers,
+                handler=lambda response: self._stream_extract(response, site_config)
+            )
             
-            if not html_content:
+            if not records:
                 return []
             
-            # 解析HTML内容
-            parsed_results = await self._parse_html_content(html_content, url, site_config, keywords)
-            
-            return parsed_results
+            return self._build_extracted_results(records, url, site_config, keywords)
             
         except Exception as e:
             logger.error(f"Failed to crawl URL {url}: {str(e)}")
@@ -3515,13 +3483,15 @@ class SmartCrawler:
         
         return headers
     
-    async def _fetch_with_retry(self, url: str, headers: Dict[str, str]) -> Optional[str]:
-        """带重试机制的网页获取."""
+    async def _fetch_with_retry(self, url: str, headers: Dict[str, str], handler=None) -> Optional[Any]:
+        """带重试机制的网页获取，提供 ``handler`` 时由其流式处理响应."""
         for attempt in range(self.retry_config["max_retries"]):
             try:
                 async with self.session.get(url, headers=headers) as response:
                     # 检查状态码
                     if response.status == 200:
+                        if handler is not None:
+                            return await handler(response)
                         content = await response.text()
                         return content
                     elif response.status in self.retry_config["retry_on_status"]:
@@ -3553,42 +3523,68 @@ class SmartCrawler:
         
         return None
     
-    async def _parse_html_content(self, html_content: str, url: str, site_config: Dict[str, Any], keywords: List[str]) -> List[Dict[str, Any]]:
-        """解析HTML内容提取有用信息."""
+    async def _stream_extract(self, response: aiohttp.ClientResponse, site_config: Dict[str, Any]) -> List[Dict[str, str]]:
+        """边读取响应边解析，页面不会被完整读入内存."""
         try:
-            # 这里应该使用BeautifulSoup进行真实的HTML解析
-            # 由于没有安装BeautifulSoup，我们模拟解析过程
-            
-            results = []
-            
-            # 模拟从HTML中提取的内容
-            # 实际实现应该使用BeautifulSoup的CSS选择器
-            selectors = site_config.get("selectors", {})
-            
-            # 模拟提取多个结果
-            for i in range(3):  # 每个页面模拟提取3个结果
-                result = {
-                    "title": f"从{url}提取的标题 {i+1}: {keywords[0] if keywords else '技术'}相关内容",
-                    "url": f"{url}#result_{i+1}",
-                    "content": f"这是从网页{url}提取的关于{keywords[0] if keywords else '技术'}的详细内容...",
-                    "summary": f"网页内容摘要：{keywords[0] if keywords else '技术'}相关信息...",
-                    "crawl_date": datetime.now().isoformat(),
-                    "source_url": url,
-                    "extraction_method": "html_parsing",
-                    "selectors_used": selectors,
-                    "content_length": len(html_content),
-                    "keywords_found": [kw for kw in keywords if kw.lower() in html_content.lower()]
-                }
-                
-                # 质量检查
-                if self._validate_extracted_content(result):
-                    results.append(result)
+            decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(errors="replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        
+        max_page_bytes = self.extraction_config["max_page_bytes"]
+        
+        async def chunks():
+            received = 0
+            async for chunk in response.content.iter_chunked(self.extraction_config["stream_chunk_size"]):
+                received += len(chunk)
+                yield decoder.decode(chunk)
+                if received >= max_page_bytes:
+                    logger.warning(f"Page {response.url} exceeds {max_page_bytes} bytes, truncating")
+                    break
+            yield decoder.decode(b"", final=True)
+        
+        return await extract_stream(
+            chunks(),
+            site_config.get("selectors", {}),
+            item_selector=site_config.get("item_selector"),
+            max_items=self.extraction_config["max_items_per_page"],
+            max_field_chars=self.extraction_config["max_content_length"]
+        )
+    
+    def _build_extracted_results(
+        self,
+        records: List[Dict[str, str]],
+        url: str,
+        site_config: Dict[str, Any],
+        keywords: List[str]
+    ) -> List[Dict[str, Any]]:
+        """将按选择器提取的记录转换为搜索结果."""
+        results = []
+        max_length = self.extraction_config["max_content_length"]
+        
+        for i, record in enumerate(records, 1):
+            title = record.get("title", "")
+            abstract = record.get("abstract", "")
+            content = " ".join(part for part in (abstract, record.get("content", "")) if part)[:max_length]
+            searchable_text = f"{title} {content}".lower()
             
-            return results
+            result = {
+                "title": title,
+                "url": urljoin(url, record["link"]) if record.get("link") else f"{url}#result_{i}",
+                "content": content,
+                "summary": (abstract or content)[:200],
+                "crawl_date": datetime.now().isoformat(),
+                "source_url": url,
+                "extraction_method": "css_selectors",
+                "selectors_used": site_config.get("selectors", {}),
+                "content_length": len(content),
+                "keywords_found": [kw for kw in keywords if kw.lower() in searchable_text]
+            }
             
-        except Exception as e:
-            logger.error(f"HTML parsing failed for {url}: {str(e)}")
-            return []
+            # 质量检查
+            if self._validate_extracted_content(result):
+                results.append(result)
+        
+        return results
     
     def _validate_extracted_content(self, result: Dict[str, Any]) -> bool:
         """验证提取的内容质量."""
@@ -3611,13 +3607,16 @@ class SmartCrawler:
         """后处理爬取结果."""
         processed_results = []
         
-        for result in results:
-            # 清理内容
-            if self.extraction_config["clean_html"]:
+        # 清理内容
+        if self.extraction_config["clean_html"]:
+            for result in results:
                 result["content"] = self._clean_html_content(result.get("content", ""))
-            
-            # 计算相关性分数
-            result["relevance_score"] = self._calculate_content_relevance(result, keywords)
+        
+        # 计算相关性分数
+        relevance_scores = self._calculate_content_relevance(results, keywords)
+        
+        for result, relevance in zip(results, relevance_scores):
+            result["relevance_score"] = relevance
             
             # 添加元数据
             if self.extraction_config["extract_metadata"]:
@@ -3653,21 +3652,12 @@ class SmartCrawler:
         
         return content.strip()
     
-    def _calculate_content_relevance(self, result: Dict[str, Any], keywords: List[str]) -> float:
-        """计算内容相关性."""
-        content = (result.get("content", "") + " " + result.get("title", "")).lower()
-        
+    def _calculate_content_relevance(self, results: List[Dict[str, Any]], keywords: List[str]) -> List[float]:
+        """计算一组结果的内容相关性（BM25倒排索引）."""
         if not keywords:
-            return 0.5
-        
-        # 计算关键词匹配度
-        matches = 0
-        for keyword in keywords:
-            if keyword.lower() in content:
-                matches += 1
+            return [0.5] * len(results)
         
-        relevance = matches / len(keywords)
-        return min(relevance, 1.0)
+        return bm25_relevance(results, keywords)
     
     async def _limited_crawl(self, keywords: List[str], limit: int) -> List[Dict[str, Any]]:
         """受限爬取（合规性检查失败时的降级方案）."""
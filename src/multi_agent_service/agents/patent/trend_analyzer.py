@@ -37,13 +37,58 @@ class TrendAnalyzer:
     async def analyze_trends(self, patent_data: List[Dict[str, Any]], analysis_params: Dict[str, Any]) -> Dict[str, Any]:
         """执行综合趋势分析."""
         start_time = datetime.now()
+        self.logger.info("Starting comprehensive trend analysis")
         
         try:
-            self.logger.info("Starting comprehensive trend analysis")
-            
             # 数据预处理和验证
             processed_data = await self._preprocess_patent_data(patent_data)
-            
+        except Exception as e:
+            return await self._analysis_failed(e, start_time)
+        
+        return await self._run_trend_analysis(processed_data, analysis_params, start_time)
+    
+    async def analyze_trends_from_store(self, aggregator: Any, analysis_params: Dict[str, Any], **filters) -> Dict[str, Any]:
+        """基于数据库汇总表执行趋势分析.
+        
+        ``aggregator`` 为 :class:`PatentAggregator`，``filters`` 透传给其查询（keywords、countries、
+        start_year、end_year）。按年月分组的计数转换为带 ``weight`` 的记录，分析逻辑与
+        :meth:`analyze_trends` 相同，无需加载每条专利。
+        """
+        start_time = datetime.now()
+        self.logger.info("Starting trend analysis from aggregated store")
+        
+        try:
+            rows = await aggregator.grouped_counts(("year", "month"), **filters)
+            unique_counts = await aggregator.yearly_distinct(**filters)
+        except Exception as e:
+            return await self._analysis_failed(e, start_time)
+        
+        processed_data = []
+        for row in rows:
+            month = row["month"] or 1
+            processed_data.append({
+                "application_date": datetime(row["year"], month, 1),
+                "year": row["year"],
+                "month": month,
+                "quarter": (month - 1) // 3 + 1,
+                "applicant": None,
+                "ipc_class": None,
+                "country": None,
+                "weight": row["patent_count"]
+            })
+        processed_data.sort(key=lambda x: x["application_date"])
+        
+        return await self._run_trend_analysis(processed_data, analysis_params, start_time, unique_counts)
+    
+    async def _run_trend_analysis(
+        self,
+        processed_data: List[Dict[str, Any]],
+        analysis_params: Dict[str, Any],
+        start_time: datetime,
+        unique_counts: Optional[Dict[int, Dict[str, int]]] = None
+    ) -> Dict[str, Any]:
+        """在预处理后的记录上执行各项趋势分析."""
+        try:
             if not self._validate_data_quality(processed_data):
                 return {
                     "error": "数据质量不足，无法进行可靠的趋势分析",
@@ -58,7 +103,7 @@ class TrendAnalyzer:
             analysis_results["time_series"] = time_series_result
             
             # 2. 年度申请量统计和增长率计算
-            yearly_analysis = await self._yearly_growth_analysis(processed_data)
+            yearly_analysis = await self._yearly_growth_analysis(processed_data, unique_counts)
             analysis_results["yearly_analysis"] = yearly_analysis
             
             # 3. 趋势预测算法
@@ -94,26 +139,30 @@ class TrendAnalyzer:
                 "results": analysis_results,
                 "metadata": {
                     "processing_time": processing_time,
-                    "data_points": len(processed_data),
+                    "data_points": self._total_weight(processed_data),
                     "analysis_timestamp": datetime.now().isoformat()
                 }
             }
             
         except Exception as e:
-            self.logger.error(f"Error in trend analysis: {str(e)}")
-            
-            # 记录失败指标
-            processing_time = (datetime.now() - start_time).total_seconds()
-            await self._update_performance_metrics(processing_time, False)
-            
-            return {
-                "success": False,
-                "error": str(e),
-                "metadata": {
-                    "processing_time": processing_time,
-                    "error_timestamp": datetime.now().isoformat()
-                }
+            return await self._analysis_failed(e, start_time)
+    
+    async def _analysis_failed(self, error: Exception, start_time: datetime) -> Dict[str, Any]:
+        """记录失败指标并返回错误结果."""
+        self.logger.error(f"Error in trend analysis: {str(error)}")
+        
+        # 记录失败指标
+        processing_time = (datetime.now() - start_time).total_seconds()
+        await self._update_performance_metrics(processing_time, False)
+        
+        return {
+            "success": False,
+            "error": str(error),
+            "metadata": {
+                "processing_time": processing_time,
+                "error_timestamp": datetime.now().isoformat()
             }
+        }
     
     async def _preprocess_patent_data(self, patent_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """预处理专利数据，提取时间序列信息."""
@@ -140,6 +189,7 @@ class TrendAnalyzer:
                     "ipc_class": patent.get("ipc_classes", ["Unknown"])[0] if patent.get("ipc_classes") else "Unknown",
                     "country": patent.get("country", "Unknown"),
                     "title": patent.get("title", ""),
+                    "weight": 1,
                     "original_data": patent
                 }
                 
@@ -175,9 +225,14 @@ class TrendAnalyzer:
         
         return None
     
+    @staticmethod
+    def _total_weight(processed_data: List[Dict[str, Any]]) -> int:
+        """记录代表的专利总数（汇总记录的 ``weight`` 为其专利数）."""
+        return sum(patent.get("weight", 1) for patent in processed_data)
+    
     def _validate_data_quality(self, processed_data: List[Dict[str, Any]]) -> bool:
         """验证数据质量."""
-        if len(processed_data) < self.config["min_data_points"]:
+        if self._total_weight(processed_data) < self.config["min_data_points"]:
             return False
         
         # 检查时间跨度
@@ -189,7 +244,7 @@ class TrendAnalyzer:
         # 检查数据分布
         yearly_counts = defaultdict(int)
         for patent in processed_data:
-            yearly_counts[patent["year"]] += 1
+            yearly_counts[patent["year"]] += patent.get("weight", 1)
         
         # 至少需要3个不同年份的数据
         if len(yearly_counts) < 3:
@@ -201,7 +256,7 @@ class TrendAnalyzer:
         """获取数据质量问题列表."""
         issues = []
         
-        if len(processed_data) < self.config["min_data_points"]:
+        if self._total_weight(processed_data) < self.config["min_data_points"]:
             issues.append(f"数据点不足，需要至少{self.config['min_data_points']}个数据点")
         
         if len(processed_data) > 0:
@@ -211,7 +266,7 @@ class TrendAnalyzer:
         
         yearly_counts = defaultdict(int)
         for patent in processed_data:
-            yearly_counts[patent["year"]] += 1
+            yearly_counts[patent["year"]] += patent.get("weight", 1)
         
         if len(yearly_counts) < 3:
             issues.append("年份覆盖不足，需要至少3个不同年份的数据")
@@ -227,11 +282,11 @@ class TrendAnalyzer:
             quarterly_counts = defaultdict(int)
             
             for patent in processed_data:
-                yearly_counts[patent["year"]] += 1
+                yearly_counts[patent["year"]] += patent.get("weight", 1)
                 month_key = f"{patent['year']}-{patent['month']:02d}"
-                monthly_counts[month_key] += 1
+                monthly_counts[month_key] += patent.get("weight", 1)
                 quarter_key = f"{patent['year']}-Q{patent['quarter']}"
-                quarterly_counts[quarter_key] += 1
+                quarterly_counts[quarter_key] += patent.get("weight", 1)
             
             # 计算移动平均
             yearly_ma = self._calculate_moving_average(yearly_counts, window=self.config["smoothing_window"])
@@ -250,7 +305,7 @@ class TrendAnalyzer:
                 "yearly_change_rates": yearly_changes,
                 "trend_strength": trend_strength,
                 "data_span_years": len(yearly_counts),
-                "total_patents": len(processed_data)
+                "total_patents": self._total_weight(processed_data)
             }
             
         except Exception as e:
@@ -332,8 +387,16 @@ class TrendAnalyzer:
         
         return {"strength": 0.0, "confidence": 0.0, "direction": "stable"}
     
-    async def _yearly_growth_analysis(self, processed_data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """年度申请量统计和增长率计算."""
+    async def _yearly_growth_analysis(
+        self,
+        processed_data: List[Dict[str, Any]],
+        unique_counts: Optional[Dict[int, Dict[str, int]]] = None
+    ) -> Dict[str, Any]:
+        """年度申请量统计和增长率计算.
+        
+        ``unique_counts`` 为数据库预先统计的每年不同申请人、国家和IPC分类数，
+        传入时代替从记录中去重计数。
+        """
         try:
             yearly_stats = defaultdict(lambda: {
                 "count": 0,
@@ -345,7 +408,7 @@ class TrendAnalyzer:
             # 统计各年度数据
             for patent in processed_data:
                 year = patent["year"]
-                yearly_stats[year]["count"] += 1
+                yearly_stats[year]["count"] += patent.get("weight", 1)
                 yearly_stats[year]["applicants"].add(patent["applicant"])
                 yearly_stats[year]["countries"].add(patent["country"])
                 yearly_stats[year]["ipc_classes"].add(patent["ipc_class"])
@@ -353,11 +416,16 @@ class TrendAnalyzer:
             # 转换为可序列化的格式
             yearly_summary = {}
             for year, stats in yearly_stats.items():
+                if unique_counts is not None:
+                    distinct = unique_counts.get(year, {})
+                    unique = (distinct.get("applicants", 0), distinct.get("countries", 0), distinct.get("ipc_classes", 0))
+                else:
+                    unique = (len(stats["applicants"]), len(stats["countries"]), len(stats["ipc_classes"]))
                 yearly_summary[year] = {
                     "patent_count": stats["count"],
-                    "unique_applicants": len(stats["applicants"]),
-                    "unique_countries": len(stats["countries"]),
-                    "unique_ipc_classes": len(stats["ipc_classes"])
+                    "unique_applicants": unique[0],
+                    "unique_countries": unique[1],
+                    "unique_ipc_classes": unique[2]
                 }
             
             # 计算增长率
@@ -468,7 +536,7 @@ class TrendAnalyzer:
             # 准备历史数据
             yearly_counts = defaultdict(int)
             for patent in processed_data:
-                yearly_counts[patent["year"]] += 1
+                yearly_counts[patent["year"]] += patent.get("weight", 1)
             
             if len(yearly_counts) < 3:
                 return {"error": "历史数据不足，无法进行可靠预测"}
@@ -774,9 +842,9 @@ class TrendAnalyzer:
                 quarter = patent.get("quarter", 0)
                 
                 if month:
-                    monthly_counts[month] += 1
+                    monthly_counts[month] += patent.get("weight", 1)
                 if quarter:
-                    quarterly_counts[quarter] += 1
+                    quarterly_counts[quarter] += patent.get("weight", 1)
             
             # 检测季节性模式
             seasonality_patterns = self._detect_seasonality_patterns(monthly_counts, quarterly_counts)
@@ -846,7 +914,7 @@ class TrendAnalyzer:
             for patent in processed_data:
                 year = patent.get("year")
                 if year:
-                    yearly_counts[year] += 1
+                    yearly_counts[year] += patent.get("weight", 1)
             
             if len(yearly_counts) < 6:  # 需要至少6年数据
                 return {"insufficient_data": True}
@@ -935,7 +1003,7 @@ class TrendAnalyzer:
             for patent in processed_data:
                 year = patent.get("year")
                 if year:
-                    yearly_counts[year] += 1
+                    yearly_counts[year] += patent.get("weight", 1)
             
             if len(yearly_counts) < 3:
                 return {"insufficient_data": True}
@@ -1571,8 +1639,8 @@ class TrendAnalyzer:
                 month = patent["month"]
                 quarter = patent["quarter"]
                 
-                monthly_counts[month] += 1
-                quarterly_counts[quarter] += 1
+                monthly_counts[month] += patent.get("weight", 1)
+                quarterly_counts[quarter] += patent.get("weight", 1)
             
             # 检测季节性模式
             seasonality_strength = self._calculate_seasonality_strength(monthly_counts)
@@ -1664,7 +1732,7 @@ class TrendAnalyzer:
         try:
             yearly_counts = defaultdict(int)
             for patent in processed_data:
-                yearly_counts[patent["year"]] += 1
+                yearly_counts[patent["year"]] += patent.get("weight", 1)
             
             if len(yearly_counts) < 3:
                 return {"outliers": [], "method": "insufficient_data"}
@@ -16,6 +16,7 @@ from ..models.base import UserRequest, AgentResponse, Action
 from ..models.enums import AgentType
 from ..core.patent_system_initializer import get_global_patent_initializer
 from ..agents.registry import agent_registry
+from ..utils.shared_store import SharedTaskRegistry, get_shared_store
 
 
 class PatentAnalysisRequest(BaseModel):
@@ -71,9 +72,8 @@ router = APIRouter(prefix="/api/v1/patent", tags=["patent"])
 # 全局报告导出器实例
 _report_exporter: Optional[ReportExporter] = None
 
-# 全局任务管理
-_active_tasks: Dict[str, Dict[str, Any]] = {}
-_task_results: Dict[str, Dict[str, Any]] = {}
+# 全局任务管理（通过共享存储在多个worker之间共享）
+_task_registry: Optional[SharedTaskRegistry] = None
 
 
 def get_report_exporter() -> ReportExporter:
@@ -84,6 +84,14 @@ def get_report_exporter() -> ReportExporter:
     return _report_exporter
 
 
+def get_task_registry() -> SharedTaskRegistry:
+    """获取任务注册表实例."""
+    global _task_registry
+    if _task_registry is None:
+        _task_registry = SharedTaskRegistry(get_shared_store(), namespace="patent_tasks")
+    return _task_registry
+
+
 async def get_patent_coordinator_agent():
     """获取专利协调Agent实例."""
     try:
@@ -153,13 +161,30 @@ async def get_patent_coordinator_agent():
         )
 
 
+def get_patent_search_agent():
+    """获取已注册的专利搜索Agent实例."""
+    from ..agents.patent.search_agent import PatentSearchAgent
+
+    for agent in agent_registry.get_agents_by_type(AgentType.PATENT_SEARCH):
+        if isinstance(agent, PatentSearchAgent):
+            return agent
+
+    raise HTTPException(
+        status_code=503,
+        detail="Patent search agent not registered. Please check system initialization."
+    )
+
+
 async def execute_patent_analysis_task(task_id: str, request: PatentAnalysisRequest):
     """执行专利分析任务（后台任务）."""
+    task_registry = get_task_registry()
     try:
         # 更新任务状态
-        _active_tasks[task_id]["status"] = "running"
-        _active_tasks[task_id]["progress"] = {"stage": "initializing", "percentage": 0}
-        _active_tasks[task_id]["updated_at"] = datetime.now().isoformat()
+        await task_registry.update_task(task_id, {
+            "status": "running",
+            "progress": {"stage": "initializing", "percentage": 0},
+            "updated_at": datetime.now().isoformat()
+        })
         
         # 获取专利协调Agent
         coordinator = await get_patent_coordinator_agent()
@@ -187,16 +212,20 @@ async def execute_patent_analysis_task(task_id: str, request: PatentAnalysisRequ
         )
         
         # 更新进度
-        _active_tasks[task_id]["progress"] = {"stage": "processing", "percentage": 20}
-        _active_tasks[task_id]["updated_at"] = datetime.now().isoformat()
+        await task_registry.update_task(task_id, {
+            "progress": {"stage": "processing", "percentage": 20},
+            "updated_at": datetime.now().isoformat()
+        })
         
         # 执行分析
         logger.info(f"Starting patent analysis task {task_id} with coordinator")
         response = await coordinator.process_request(user_request)
         
         # 更新进度
-        _active_tasks[task_id]["progress"] = {"stage": "finalizing", "percentage": 90}
-        _active_tasks[task_id]["updated_at"] = datetime.now().isoformat()
+        await task_registry.update_task(task_id, {
+            "progress": {"stage": "finalizing", "percentage": 90},
+            "updated_at": datetime.now().isoformat()
+        })
         
         # 保存结果
         result_data = {
@@ -214,13 +243,15 @@ async def execute_patent_analysis_task(task_id: str, request: PatentAnalysisRequ
             "completed_at": datetime.now().isoformat()
         }
         
-        _task_results[task_id] = result_data
+        await task_registry.set_result(task_id, result_data)
         
         # 更新最终状态
-        _active_tasks[task_id]["status"] = "completed"
-        _active_tasks[task_id]["progress"] = {"stage": "completed", "percentage": 100}
-        _active_tasks[task_id]["results"] = result_data
-        _active_tasks[task_id]["updated_at"] = datetime.now().isoformat()
+        await task_registry.update_task(task_id, {
+            "status": "completed",
+            "progress": {"stage": "completed", "percentage": 100},
+            "results": result_data,
+            "updated_at": datetime.now().isoformat()
+        })
         
         logger.info(f"Patent analysis task {task_id} completed successfully")
         
@@ -228,17 +259,19 @@ async def execute_patent_analysis_task(task_id: str, request: PatentAnalysisRequ
         logger.error(f"Patent analysis task {task_id} failed: {str(e)}")
         
         # 更新错误状态
-        _active_tasks[task_id]["status"] = "failed"
-        _active_tasks[task_id]["error"] = str(e)
-        _active_tasks[task_id]["updated_at"] = datetime.now().isoformat()
+        await task_registry.update_task(task_id, {
+            "status": "failed",
+            "error": str(e),
+            "updated_at": datetime.now().isoformat()
+        })
         
         # 保存错误结果
-        _task_results[task_id] = {
+        await task_registry.set_result(task_id, {
             "task_id": task_id,
             "status": "failed",
             "error": str(e),
             "failed_at": datetime.now().isoformat()
-        }
+        })
 
 
 @router.post("/analyze", summary="提交专利分析请求", response_model=PatentAnalysisResponse)
@@ -290,7 +323,8 @@ async def analyze_patents(
             "request_params": request.dict()
         }
         
-        _active_tasks[task_id] = task_info
+        task_registry = get_task_registry()
+        await task_registry.create_task(task_id, task_info)
         
         # 根据处理模式决定执行方式
         if request.async_processing:
@@ -312,8 +346,8 @@ async def analyze_patents(
             await execute_patent_analysis_task(task_id, request)
             
             # 获取结果
-            if task_id in _task_results:
-                result = _task_results[task_id]
+            result = await task_registry.get_result(task_id)
+            if result is not None:
                 return PatentAnalysisResponse(
                     task_id=task_id,
                     status=result["status"],
@@ -348,10 +382,13 @@ async def get_analysis_status(
         任务状态和进度信息
     """
     try:
+        task_registry = get_task_registry()
+        
         # 检查活跃任务
-        if task_id in _active_tasks:
-            task_info = _active_tasks[task_id]
-            
+        task_info = await task_registry.get_task(task_id)
+        result = None if task_info is not None else await task_registry.get_result(task_id)
+        
+        if task_info is not None:
             return TaskStatusResponse(
                 task_id=task_id,
                 status=task_info["status"],
@@ -363,9 +400,7 @@ async def get_analysis_status(
             )
         
         # 检查已完成任务
-        elif task_id in _task_results:
-            result = _task_results[task_id]
-            
+        elif result is not None:
             return TaskStatusResponse(
                 task_id=task_id,
                 status=result["status"],
@@ -403,9 +438,11 @@ async def list_analysis_tasks(
     """
     try:
         all_tasks = []
+        task_registry = get_task_registry()
+        active_tasks = await task_registry.list_tasks()
         
         # 收集活跃任务
-        for task_id, task_info in _active_tasks.items():
+        for task_id, task_info in active_tasks.items():
             if status is None or task_info["status"] == status:
                 all_tasks.append({
                     "task_id": task_id,
@@ -418,8 +455,8 @@ async def list_analysis_tasks(
                 })
         
         # 收集已完成任务
-        for task_id, result in _task_results.items():
-            if task_id not in _active_tasks:  # 避免重复
+        for task_id, result in (await task_registry.list_results()).items():
+            if task_id not in active_tasks:  # 避免重复
                 if status is None or result["status"] == status:
                     all_tasks.append({
                         "task_id": task_id,
@@ -452,6 +489,50 @@ async def list_analysis_tasks(
         raise HTTPException(status_code=500, detail=f"Failed to list tasks: {str(e)}")
 
 
+@router.get("/search/stream", summary="流式多源专利搜索（SSE）")
+async def stream_patent_search(
+    keywords: List[str] = Query(..., description="搜索关键词", min_length=1),
+    sources: List[str] = Query(default=["cnki", "bocha_ai", "web_crawler"], description="搜索源"),
+    search_type: str = Query(default="general", description="搜索类型"),
+    limit: int = Query(default=20, ge=1, le=50, description="每个搜索源的结果数量"),
+    min_quality_results: Optional[int] = Query(default=None, ge=1, description="达到该数量的高质量结果后提前结束"),
+    quality_threshold: float = Query(default=0.6, ge=0.0, le=1.0, description="高质量结果的质量分数阈值")
+) -> StreamingResponse:
+    """
+    以Server-Sent Events方式流式返回多源搜索结果.
+    
+    每个搜索源完成后立即推送去重后的新增结果（``results`` 事件），最后推送
+    包含最终排序结果的 ``complete`` 事件。
+    """
+    search_agent = get_patent_search_agent()
+    search_params = {
+        "keywords": keywords,
+        "sources": sources,
+        "search_type": search_type,
+        "limit": limit
+    }
+
+    async def event_stream():
+        try:
+            async for event in search_agent.stream_search(
+                search_params,
+                min_quality_results=min_quality_results,
+                quality_threshold=quality_threshold
+            ):
+                data = json.dumps(event, ensure_ascii=False, default=str)
+                yield f"event: {event['event']}\ndata: {data}\n\n"
+        except Exception as e:
+            logger.error(f"Error streaming patent search: {str(e)}")
+            data = json.dumps({"event": "error", "error": str(e)}, ensure_ascii=False)
+            yield f"event: error\ndata: {data}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 def _estimate_analysis_duration(request: PatentAnalysisRequest) -> int:
     """估算分析持续时间（秒）."""
     base_duration = {
@@ -6,8 +6,9 @@ import uuid
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 
+import ormsgpack
 from fastapi import APIRouter, HTTPException, Depends, Request, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from ..models.api import (
     WorkflowExecuteRequest, WorkflowExecuteResponse,
@@ -17,12 +18,16 @@ from ..models.api import (
 from ..models.base import WorkflowState, ExecutionStep
 from ..models.enums import WorkflowType, WorkflowStatus, AgentType
 from ..workflows.graph_builder import GraphBuilder
+from ..workflows.graph_cache import get_compiled_graph_cache
 from .workflow_adapter import WorkflowAdapter
 from ..agents.registry import AgentRegistry
 from ..config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# 二进制响应的媒体类型：标准msgpack，结构与JSON响应相同，时间为ISO 8601字符串
+BINARY_MEDIA_TYPE = "application/x-msgpack"
+
 router = APIRouter(prefix="/api/v1/workflows", tags=["workflows"])
 
 # 工作流执行状态存储（生产环境应使用数据库）
@@ -31,8 +36,8 @@ workflow_states: Dict[str, WorkflowState] = {}
 
 # Dependency injection functions
 async def get_graph_builder() -> GraphBuilder:
-    """Get graph builder instance."""
-    return GraphBuilder()
+    """Get graph builder instance (compiled graphs are shared through the global cache)."""
+    return GraphBuilder(graph_cache=get_compiled_graph_cache())
 
 
 async def get_agent_registry() -> AgentRegistry:
@@ -150,6 +155,7 @@ async def get_workflow_status(
     workflow_id: str,
     include_history: bool = False,
     include_agent_details: bool = False,
+    format: str = "json",
     agent_registry: AgentRegistry = Depends(get_agent_registry)
 ) -> WorkflowStatusResponse:
     """
@@ -159,6 +165,7 @@ async def get_workflow_status(
         workflow_id: 工作流ID
         include_history: 是否包含执行历史
         include_agent_details: 是否包含智能体详情
+        format: 响应格式，json 或 binary（标准msgpack，结构与JSON响应相同）
     """
     try:
         logger.info(f"收到工作流状态查询请求: {workflow_id}")
@@ -203,6 +210,11 @@ async def get_workflow_status(
         )
         
         logger.info(f"工作流状态查询成功: {workflow_id}, 状态: {workflow_state.status}")
+        if format == "binary":
+            return Response(
+                content=ormsgpack.packb(response.model_dump(mode="json")),
+                media_type=BINARY_MEDIA_TYPE
+            )
         return response
         
     except HTTPException:
@@ -36,10 +36,37 @@ class Settings(BaseSettings):
     
     # Database Configuration
     database_url: str = Field(default="sqlite:///./multi_agent_service.db", alias="DATABASE_URL")
+    sqlite_pool_readers: int = Field(default=4, alias="SQLITE_POOL_READERS")
+    sqlite_statement_cache_size: int = Field(default=256, alias="SQLITE_STATEMENT_CACHE_SIZE")
     
     # Redis Configuration
     redis_url: str = Field(default="redis://localhost:6379/0", alias="REDIS_URL")
-    
+
+    # Shared State Configuration (multi-worker deployments: memory, sqlite, redis)
+    shared_state_backend: str = Field(default="memory", alias="SHARED_STATE_BACKEND")
+    shared_state_path: str = Field(default="./data/shared_state.db", alias="SHARED_STATE_PATH")
+
+    # Process Pool Configuration (CPU-bound nodes; 0 means CPU count / same as workers)
+    process_pool_workers: int = Field(default=0, alias="PROCESS_POOL_WORKERS")
+    process_pool_max_concurrency: int = Field(default=0, alias="PROCESS_POOL_MAX_CONCURRENCY")
+    process_pool_start_method: str = Field(default="spawn", alias="PROCESS_POOL_START_METHOD")
+
+    # Patent Search Cache Configuration (stale-while-revalidate and daily prefetch of popular queries)
+    search_cache_stale_ttl: int = Field(default=86400, alias="SEARCH_CACHE_STALE_TTL")
+    search_prefetch_enabled: bool = Field(default=False, alias="SEARCH_PREFETCH_ENABLED")
+    search_prefetch_top_n: int = Field(default=20, alias="SEARCH_PREFETCH_TOP_N")
+    search_prefetch_time: str = Field(default="07:30", alias="SEARCH_PREFETCH_TIME")
+
+    # HTTP Response Cache Configuration (patent data source clients; TTL applies when responses send no cache headers)
+    http_cache_enabled: bool = Field(default=False, alias="HTTP_CACHE_ENABLED")
+    http_cache_dir: str = Field(default="./data/http_cache", alias="HTTP_CACHE_DIR")
+    http_cache_max_mb: int = Field(default=256, alias="HTTP_CACHE_MAX_MB")
+    http_cache_default_ttl: int = Field(default=3600, alias="HTTP_CACHE_DEFAULT_TTL")
+
+    # Patent Data Processing Stream Configuration (patents per chunk; chunks standardized concurrently)
+    patent_stream_chunk_size: int = Field(default=500, alias="PATENT_STREAM_CHUNK_SIZE")
+    patent_stream_concurrency: int = Field(default=2, alias="PATENT_STREAM_CONCURRENCY")
+
     model_config = {
         "env_file": ".env",
         "env_file_encoding": "utf-8"
@@ -16,6 +16,8 @@ from ..services.hot_reload_service import HotReloadService
 from ..services import providers
 from ..agents.registry import AgentRegistry, agent_registry
 from ..workflows.graph_builder import GraphBuilder
+from ..workflows.graph_cache import get_compiled_graph_cache
+from ..utils.process_pool import shutdown_process_pool
 from ..workflows.state_management import WorkflowStateManager
 from ..utils.monitoring import MonitoringSystem
 from ..utils.logging import LoggingSystem
@@ -150,6 +152,9 @@ class ServiceManager:
             hot_reload_service = await self.container.get_service(HotReloadService)
             await hot_reload_service.start()
             
+            # Invalidate compiled workflow graphs when workflow configs change
+            get_compiled_graph_cache().attach_to_hot_reload(hot_reload_service)
+            
             # Initialize monitoring
             monitoring_system = await self.container.get_service(MonitoringSystem)
             await monitoring_system.start_monitoring()
@@ -428,6 +433,9 @@ class ServiceManager:
                 agent_registry = await self.container.get_service(AgentRegistry)
                 await agent_registry.stop_all_agents()
             
+            # Shutdown process pool used by CPU-bound nodes
+            shutdown_process_pool(wait=False)
+            
             # Shutdown all services
             await self.container.shutdown_all_services()
             
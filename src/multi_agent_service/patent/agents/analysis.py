@@ -3,7 +3,6 @@
 import logging
 from typing import Any, Dict, List, Optional
 from datetime import datetime
-from collections import defaultdict
 
 from .base import PatentBaseAgent
 from ...models.enums import AgentType
@@ -14,6 +13,15 @@ from ..models.requests import PatentAnalysisRequest
 from ..models.results import PatentAnalysisResult, TrendAnalysis, TechClassification, CompetitionAnalysis
 from ..models.patent_data import PatentDataset
 from ..models.external_data import EnhancedData
+from ..utils.analysis_kernels import (
+    compute_competition_stats,
+    compute_geography_stats,
+    compute_tech_stats,
+    compute_trend_stats,
+    extract_applicants,
+    extract_years
+)
+from ...utils.process_pool import get_process_pool
 
 
 logger = logging.getLogger(__name__)
@@ -35,7 +43,10 @@ class PatentAnalysisAgent(PatentBaseAgent):
             'enable_competition_analysis': True,
             'enable_geographic_analysis': True,
             'min_patents_for_analysis': 10,
-            'confidence_threshold': 0.7
+            'confidence_threshold': 0.7,
+            # 专利数达到阈值时在进程池中执行分析计算
+            'use_process_pool': True,
+            'process_pool_min_patents': 2000
         }
         
         self.logger = logging.getLogger(f"{__name__}.PatentAnalysisAgent")
@@ -141,7 +152,7 @@ class PatentAnalysisAgent(PatentBaseAgent):
             self.logger.info(f"Starting patent analysis for request {request.request_id}")
             
             # 检查缓存
-            cache_key = f"patent_analysis_{hash(str(request.keywords))}_{hash(str(request.analysis_types))}"
+            cache_key = self._make_cache_key("patent_analysis", request.keywords, request.analysis_types)
             cached_result = await self._get_from_cache(cache_key)
             if cached_result:
                 self.logger.info(f"Using cached analysis results for request {request.request_id}")
@@ -269,153 +280,56 @@ class PatentAnalysisAgent(PatentBaseAgent):
         
         return analysis_result
     
+    async def _run_cpu_bound(self, func, *args, size: int = 0) -> Any:
+        """执行分析计算内核，大数据集交给进程池以免阻塞事件循环."""
+        if self.analysis_config.get('use_process_pool') and size >= self.analysis_config['process_pool_min_patents']:
+            return await get_process_pool().run(func, *args, pool="analysis")
+        return func(*args)
+    
     async def _analyze_trends(self, patent_dataset: PatentDataset) -> TrendAnalysis:
         """执行趋势分析."""
         from ..models.results import TrendAnalysisModel
         
-        # 按年份统计专利申请量
-        yearly_counts = defaultdict(int)
-        for patent in patent_dataset.patents:
-            if patent.application_date:
-                year = patent.application_date.year
-                yearly_counts[year] += 1
-        
-        # 计算增长率
-        growth_rates = {}
-        years = sorted(yearly_counts.keys())
-        for i in range(1, len(years)):
-            prev_year = years[i-1]
-            curr_year = years[i]
-            if yearly_counts[prev_year] > 0:
-                growth_rate = (yearly_counts[curr_year] - yearly_counts[prev_year]) / yearly_counts[prev_year]
-                growth_rates[curr_year] = growth_rate
-        
-        # 确定趋势方向
-        if len(growth_rates) > 0:
-            avg_growth = sum(growth_rates.values()) / len(growth_rates)
-            if avg_growth > 0.1:
-                trend_direction = "increasing"
-            elif avg_growth < -0.1:
-                trend_direction = "decreasing"
-            else:
-                trend_direction = "stable"
-        else:
-            trend_direction = "stable"
-        
-        # 找到峰值年份
-        peak_year = max(yearly_counts.keys(), key=lambda y: yearly_counts[y]) if yearly_counts else None
-        
-        return TrendAnalysisModel(
-            yearly_counts=dict(yearly_counts),
-            growth_rates=growth_rates,
-            trend_direction=trend_direction,
-            peak_year=peak_year,
-            total_patents=sum(yearly_counts.values()),
-            average_annual_growth=sum(growth_rates.values()) / len(growth_rates) if growth_rates else 0.0
+        # 按年份统计专利申请量、计算增长率和趋势方向
+        stats = await self._run_cpu_bound(
+            compute_trend_stats,
+            extract_years(patent_dataset.patents),
+            size=len(patent_dataset.patents)
         )
+        return TrendAnalysisModel(**stats)
     
     async def _classify_technologies(self, patent_dataset: PatentDataset) -> TechClassification:
         """执行技术分类分析."""
         from ..models.results import TechClassificationModel
         
-        # IPC分类统计
-        ipc_counts = defaultdict(int)
-        for patent in patent_dataset.patents:
-            for ipc in patent.ipc_classes or []:
-                # 提取主分类（前4位）
-                main_ipc = ipc[:4] if len(ipc) >= 4 else ipc
-                ipc_counts[main_ipc] += 1
-        
-        # 关键词聚类（简化实现）
-        keyword_clusters = []
-        main_keywords = set()
-        for patent in patent_dataset.patents:
-            # 从标题中提取关键词
-            title_words = patent.title.lower().split()
-            for word in title_words:
-                if len(word) > 4:  # 过滤短词
-                    main_keywords.add(word)
-        
-        # 创建关键词聚类
-        keyword_list = list(main_keywords)[:10]  # 取前10个关键词
-        for i, keyword in enumerate(keyword_list):
-            cluster = {
-                "cluster_id": i,
-                "main_keyword": keyword,
-                "related_keywords": keyword_list[max(0, i-2):i+3],
-                "patent_count": sum(1 for p in patent_dataset.patents if keyword in p.title.lower())
-            }
-            keyword_clusters.append(cluster)
-        
-        # 识别主要技术
-        main_technologies = []
-        sorted_ipc = sorted(ipc_counts.items(), key=lambda x: x[1], reverse=True)
-        for ipc, count in sorted_ipc[:5]:  # 取前5个IPC分类
-            main_technologies.append(f"{ipc} ({count} patents)")
-        
-        return TechClassificationModel(
-            ipc_distribution=dict(ipc_counts),
-            keyword_clusters=keyword_clusters,
-            main_technologies=main_technologies
+        # IPC分类统计和关键词聚类
+        stats = await self._run_cpu_bound(
+            compute_tech_stats,
+            [patent.ipc_classes or [] for patent in patent_dataset.patents],
+            [patent.title for patent in patent_dataset.patents],
+            size=len(patent_dataset.patents)
         )
+        return TechClassificationModel(**stats)
     
     async def _analyze_competition(self, patent_dataset: PatentDataset) -> CompetitionAnalysis:
         """执行竞争分析."""
         from ..models.results import CompetitionAnalysisModel
         
-        # 申请人统计
-        applicant_counts = defaultdict(int)
-        for patent in patent_dataset.patents:
-            for applicant in patent.applicants or []:
-                # 如果是字符串，直接使用；如果是对象，使用name属性
-                applicant_name = applicant if isinstance(applicant, str) else getattr(applicant, 'name', str(applicant))
-                applicant_counts[applicant_name] += 1
-        
-        # 排序获取顶级申请人
-        top_applicants = sorted(applicant_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-        
-        # 计算市场集中度（HHI指数）
-        total_patents = sum(applicant_counts.values())
-        if total_patents > 0:
-            hhi_index = sum((count / total_patents) ** 2 for count in applicant_counts.values())
-            market_concentration = hhi_index
-        else:
-            hhi_index = 0.0
-            market_concentration = 0.0
-        
-        return CompetitionAnalysisModel(
-            applicant_distribution=dict(applicant_counts),
-            top_applicants=top_applicants,
-            market_concentration=market_concentration,
-            hhi_index=hhi_index
+        # 申请人统计和市场集中度（HHI指数）
+        stats = await self._run_cpu_bound(
+            compute_competition_stats,
+            extract_applicants(patent_dataset.patents),
+            size=len(patent_dataset.patents)
         )
+        return CompetitionAnalysisModel(**stats)
     
     async def _analyze_geography(self, patent_dataset: PatentDataset) -> Dict[str, Any]:
         """执行地域分析."""
-        # 国家分布统计
-        country_counts = defaultdict(int)
-        for patent in patent_dataset.patents:
-            if patent.country:
-                country_counts[patent.country] += 1
-        
-        # 排序获取顶级国家
-        top_countries = sorted(country_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-        
-        # 计算全球化指数（简化版）
-        total_patents = sum(country_counts.values())
-        if total_patents > 0 and len(country_counts) > 1:
-            # 基于国家数量和分布均匀度计算
-            globalization_index = len(country_counts) / 10  # 假设最多10个主要国家
-            globalization_index = min(globalization_index, 1.0)
-        else:
-            globalization_index = 0.0
-        
-        return {
-            "country_distribution": dict(country_counts),
-            "top_countries": top_countries,
-            "globalization_index": globalization_index,
-            "regional_trends": {}  # 简化实现
-        }
+        return await self._run_cpu_bound(
+            compute_geography_stats,
+            [patent.country for patent in patent_dataset.patents],
+            size=len(patent_dataset.patents)
+        )
     
     async def _generate_insights(self, analysis_result: PatentAnalysisResult, enhanced_data: Optional[EnhancedData]) -> List[str]:
         """生成分析洞察."""
@@ -1,6 +1,7 @@
 """Base patent agent class."""
 
 import asyncio
+import hashlib
 import logging
 from abc import abstractmethod
 from datetime import datetime
@@ -10,6 +11,7 @@ from uuid import uuid4
 from ...agents.base import BaseAgent
 from ...models.config import AgentConfig
 from ...services.model_client import BaseModelClient
+from ...utils.shared_store import SharedStore, get_shared_store, is_shared_backend_enabled
 from ..models.requests import PatentAnalysisRequest
 from ..models.data import PatentDataQuality
 
@@ -34,6 +36,7 @@ class PatentBaseAgent(BaseAgent):
         
         # 专利分析专用状态
         self._patent_cache: Dict[str, Any] = {}
+        self._shared_cache: Optional[SharedStore] = None
         self._patent_data_sources: Dict[str, Dict[str, Any]] = {}
         self._active_patent_requests: Dict[str, PatentAnalysisRequest] = {}
         self._patent_metrics = {
@@ -135,6 +138,11 @@ class PatentBaseAgent(BaseAgent):
             # 这里可以集成Redis或其他缓存系统
             # 目前使用内存缓存作为简单实现
             self._patent_cache = {}
+            
+            # 多worker部署时启用共享缓存层，避免每个进程各自重复计算
+            if is_shared_backend_enabled():
+                self._shared_cache = get_shared_store()
+            
             self.patent_logger.info("Patent cache initialized")
     
     async def _health_check_specific(self) -> bool:
@@ -204,6 +212,20 @@ class PatentBaseAgent(BaseAgent):
                 # 缓存过期，删除
                 del self._patent_cache[cache_key]
         
+        # 本地未命中时查询共享缓存
+        if self._shared_cache is not None:
+            try:
+                shared_data = await self._shared_cache.get(self._shared_cache_key(cache_key))
+                if shared_data is not None:
+                    self._patent_metrics['cache_hit_rate'] += 1
+                    self._patent_cache[cache_key] = {
+                        'data': shared_data,
+                        'timestamp': datetime.now().timestamp()
+                    }
+                    return shared_data
+            except Exception as e:
+                self.patent_logger.warning(f"Shared cache lookup failed: {str(e)}")
+        
         return None
     
     async def _save_to_cache(self, cache_key: str, data: Any):
@@ -215,6 +237,25 @@ class PatentBaseAgent(BaseAgent):
             'data': data,
             'timestamp': datetime.now().timestamp()
         }
+        
+        # 只有原生JSON结构（dict）写入共享缓存，模型对象保留在本地缓存以保证类型
+        if self._shared_cache is not None and isinstance(data, dict):
+            try:
+                await self._shared_cache.set(
+                    self._shared_cache_key(cache_key), data, ttl=self.patent_config['cache_ttl']
+                )
+            except Exception as e:
+                self.patent_logger.warning(f"Shared cache write failed: {str(e)}")
+    
+    def _shared_cache_key(self, cache_key: str) -> str:
+        """生成共享缓存键."""
+        return f"patent_cache:{self.agent_type.value}:{cache_key}"
+    
+    @staticmethod
+    def _make_cache_key(prefix: str, *parts: Any) -> str:
+        """生成跨进程稳定的缓存键（内置hash()在每个进程中随机化）."""
+        digest = hashlib.md5("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+        return f"{prefix}_{digest}"
     
     async def _clear_cache(self, pattern: Optional[str] = None):
         """清理缓存."""
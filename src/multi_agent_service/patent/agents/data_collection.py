@@ -17,7 +17,8 @@ from .base import PatentBaseAgent
 from ..models.requests import PatentDataCollectionRequest
 from ..models.responses import PatentDataCollectionResponse
 from ..models.data import Patent, PatentDataset, PatentDataSource
-from ..utils.data_sources import GooglePatentsAPI, PatentPublicAPI, DataSourceManager
+from ..utils.data_sources import GooglePatentsAPI, PatentPublicAPI, LocalPatentAPI, DataSourceManager
+from ..storage.collection_state import CollectionStateStore
 
 
 class PatentDataCollectionAgent(PatentBaseAgent):
@@ -57,8 +58,13 @@ class PatentDataCollectionAgent(PatentBaseAgent):
             )
         }
         
+        # 增量收集状态（水位线和已收集数据集）
+        self.collection_state = CollectionStateStore(
+            os.getenv("PATENT_COLLECTION_STATE_PATH", "data/patent_collection_state.db")
+        )
+        
         # 数据源管理器
-        self.data_source_manager = DataSourceManager()
+        self.data_source_manager = DataSourceManager(collection_state=self.collection_state)
         
         # 中文关键词映射
         self.chinese_keyword_mapping = self._load_chinese_keyword_mapping()
@@ -76,6 +82,11 @@ class PatentDataCollectionAgent(PatentBaseAgent):
                 continue
             self.data_source_manager.register_data_source(name, api_client)
         
+        # 本地专利库（全文索引），请求的数据源包含 'local' 时检索已保存的专利
+        self.data_source_manager.register_data_source(
+            'local', LocalPatentAPI(db_path=os.getenv("PATENT_DATABASE_PATH", "data/patent_database.db"))
+        )
+        
         self.logger = logging.getLogger(f"{__name__}.PatentDataCollectionAgent")
     
     def _load_chinese_keyword_mapping(self) -> Dict[str, List[str]]:
@@ -481,9 +492,9 @@ class PatentDataCollectionAgent(PatentBaseAgent):
         try:
             self.patent_logger.info(f"Starting patent data collection for request {request.request_id}")
             
-            # 检查缓存
-            cache_key = f"patent_data_{hash(str(request.keywords))}_{request.max_patents}"
-            cached_result = await self._get_from_cache(cache_key)
+            # 检查缓存（增量收集需要获取新记录，不使用缓存结果）
+            cache_key = self._make_cache_key("patent_data", request.keywords, request.max_patents)
+            cached_result = None if request.incremental else await self._get_from_cache(cache_key)
             if cached_result:
                 self.patent_logger.info(f"Using cached patent data for request {request.request_id}")
                 return cached_result
@@ -509,7 +520,8 @@ class PatentDataCollectionAgent(PatentBaseAgent):
                         date_range=request.date_range,
                         countries=request.countries,
                         ipc_classes=request.ipc_classes,
-                        parallel_sources=False  # 避免递归
+                        parallel_sources=False,  # 避免递归
+                        incremental=request.incremental
                     )
                     task = self._collect_from_single_source_with_retry(source_name, source_request)
                     collection_tasks.append(task)
@@ -552,14 +564,21 @@ class PatentDataCollectionAgent(PatentBaseAgent):
                         collection_stats['successful_sources'] += 1
                         collection_stats['total_patents_collected'] += len(patents)
             else:
-                # 使用故障转移机制顺序收集
+                # 使用故障转移机制顺序收集，或对冲请求多个数据源
                 try:
-                    all_patents = await self.data_source_manager.collect_patents_with_failover(request)
-                    source_results = {'failover_collection': {'status': 'success', 'patents_count': len(all_patents)}}
+                    if request.hedged:
+                        all_patents, outcome = await self.data_source_manager.collect_patents_hedged(request)
+                        source_results = {name: {'status': status} for name, status in outcome.items()}
+                        successful_sources = sum(status == 'success' for status in outcome.values())
+                        failed_sources = sum(status == 'failed' for status in outcome.values())
+                    else:
+                        all_patents = await self.data_source_manager.collect_patents_with_failover(request)
+                        source_results = {'failover_collection': {'status': 'success', 'patents_count': len(all_patents)}}
+                        successful_sources, failed_sources = 1, 0
                     collection_stats = {
                         'total_sources': len(request.data_sources),
-                        'successful_sources': 1,
-                        'failed_sources': 0,
+                        'successful_sources': successful_sources,
+                        'failed_sources': failed_sources,
                         'total_patents_collected': len(all_patents)
                     }
                 except Exception as e:
@@ -593,7 +612,8 @@ class PatentDataCollectionAgent(PatentBaseAgent):
                 metadata={
                     "collection_method": "multi_source_parallel",
                     "data_sources_used": list(source_results.keys()),
-                    "quality_score": data_quality.overall_score
+                    "quality_score": data_quality.overall_score,
+                    "incremental": request.incremental
                 },
                 dataset=dataset,
                 collection_stats=collection_stats,
@@ -643,8 +663,6 @@ class PatentDataCollectionAgent(PatentBaseAgent):
             if source_name == 'google_patents_browser' and self.google_patents_browser:
                 patents = await self._collect_from_google_patents_browser(expanded_keywords, request)
             elif source_name in self.data_source_manager.data_sources:
-                # 通过数据源管理器获取API客户端
-                api_client = self.data_source_manager.data_sources[source_name]
                 # 创建修改后的请求，使用扩展的关键词
                 modified_request = PatentDataCollectionRequest(
                     request_id=request.request_id,
@@ -653,9 +671,11 @@ class PatentDataCollectionAgent(PatentBaseAgent):
                     data_sources=[source_name],
                     date_range=request.date_range,
                     countries=request.countries,
-                    ipc_classes=request.ipc_classes
+                    ipc_classes=request.ipc_classes,
+                    incremental=request.incremental
                 )
-                patents = await api_client.collect_patents(modified_request)
+                # 通过数据源管理器收集（增量请求只获取新记录并合并）
+                patents = await self.data_source_manager.collect_from_source(source_name, modified_request)
             else:
                 # 降级到模拟数据
                 source_config = self.data_sources_config.get(source_name)
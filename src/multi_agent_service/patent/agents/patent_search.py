@@ -210,7 +210,7 @@ class PatentsViewSearchAgent(PatentBaseAgent):
             self.logger.info(f"Starting PatentsView search for request {request.request_id}")
             
             # 检查缓存
-            cache_key = f"patentsview_search_{hash(str(request.keywords))}"
+            cache_key = self._make_cache_key("patentsview_search", request.keywords)
             cached_result = await self._get_from_cache(cache_key)
             if cached_result:
                 self.logger.info(f"Using cached PatentsView results for request {request.request_id}")
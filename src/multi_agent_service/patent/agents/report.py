@@ -169,7 +169,7 @@ class PatentReportAgent(PatentBaseAgent):
             self.logger.info(f"Starting report generation {report_id} for request {request.request_id}")
             
             # 检查缓存
-            cache_key = f"patent_report_{hash(str(request.keywords))}_{request.report_format}"
+            cache_key = self._make_cache_key("patent_report", request.keywords, request.report_format)
             cached_result = await self._get_from_cache(cache_key)
             if cached_result:
                 self.logger.info(f"Using cached report for request {request.request_id}")
@@ -149,7 +149,7 @@ class PatentSearchAgent(PatentBaseAgent):
             self.logger.info(f"Starting patent search enhancement for request {request.request_id}")
             
             # 检查缓存
-            cache_key = f"patent_search_{hash(str(request.keywords))}"
+            cache_key = self._make_cache_key("patent_search", request.keywords)
             cached_result = await self._get_from_cache(cache_key)
             if cached_result:
                 self.logger.info(f"Using cached search results for request {request.request_id}")
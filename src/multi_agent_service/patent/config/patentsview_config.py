@@ -42,6 +42,7 @@ class PatentsViewAPIConfig(BaseModel):
     timeout: int = Field(30, description="请求超时时间(秒)")
     max_retries: int = Field(3, description="最大重试次数")
     rate_limit_delay: float = Field(1.0, description="请求间隔(秒)")
+    requests_per_minute: int = Field(45, description="每分钟请求数上限(同一主机的所有服务实例共享)")
     
     # 分页配置
     default_page_size: int = Field(100, description="默认页面大小")
@@ -51,6 +52,10 @@ class PatentsViewAPIConfig(BaseModel):
     enable_cache: bool = Field(True, description="是否启用缓存")
     cache_ttl: int = Field(3600, description="缓存TTL(秒)")
     
+    # 分类目录配置
+    catalog_path: str = Field("data/patentsview_catalog.db", description="CPC/IPC分类目录本地存储路径")
+    catalog_ttl: int = Field(30 * 86400, description="分类目录刷新周期(秒)")
+    
     # 日志配置
     enable_request_logging: bool = Field(True, description="是否启用请求日志")
     log_level: str = Field("INFO", description="日志级别")
@@ -64,10 +69,13 @@ class PatentsViewAPIConfig(BaseModel):
             timeout=int(os.getenv("PATENT_VIEW_TIMEOUT", "30")),
             max_retries=int(os.getenv("PATENT_VIEW_MAX_RETRIES", "3")),
             rate_limit_delay=float(os.getenv("PATENT_VIEW_RATE_LIMIT_DELAY", "1.0")),
+            requests_per_minute=int(os.getenv("PATENT_VIEW_REQUESTS_PER_MINUTE", "45")),
             default_page_size=int(os.getenv("PATENT_VIEW_DEFAULT_PAGE_SIZE", "100")),
             max_page_size=int(os.getenv("PATENT_VIEW_MAX_PAGE_SIZE", "1000")),
             enable_cache=os.getenv("PATENT_VIEW_ENABLE_CACHE", "true").lower() == "true",
             cache_ttl=int(os.getenv("PATENT_VIEW_CACHE_TTL", "3600")),
+            catalog_path=os.getenv("PATENT_VIEW_CATALOG_PATH", "data/patentsview_catalog.db"),
+            catalog_ttl=int(os.getenv("PATENT_VIEW_CATALOG_TTL", str(30 * 86400))),
             enable_request_logging=os.getenv("PATENT_VIEW_ENABLE_REQUEST_LOGGING", "true").lower() == "true",
             log_level=os.getenv("PATENT_VIEW_LOG_LEVEL", "INFO")
         )
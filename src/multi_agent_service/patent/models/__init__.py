@@ -23,6 +23,7 @@ from .patentsview_data import (
     LocationRecord,
     PatentsViewSearchResult,
     PatentsViewAPIResponse,
+    PatentsViewPage,
     PatentsViewQuery
 )
 
@@ -49,5 +50,6 @@ __all__ = [
     "LocationRecord",
     "PatentsViewSearchResult",
     "PatentsViewAPIResponse",
+    "PatentsViewPage",
     "PatentsViewQuery"
 ]
\ No newline at end of file
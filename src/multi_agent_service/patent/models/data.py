@@ -57,11 +57,13 @@ class PatentDataSource(BaseModel):
     name: str = Field(..., description="数据源名称")
     base_url: str = Field(..., description="API基础URL")
     api_key: Optional[str] = Field(None, description="API密钥")
-    rate_limit: int = Field(10, description="速率限制(请求/秒)")
+    rate_limit: int = Field(10, description="速率限制(请求/分钟)")
+    rate_limit_burst: int = Field(1, description="允许的突发请求数")
     timeout: int = Field(30, description="超时时间(秒)")
     max_results: int = Field(1000, description="最大结果数")
     enabled: bool = Field(True, description="是否启用")
     priority: int = Field(1, description="优先级")
+    cache_ttl: Optional[int] = Field(None, description="响应没有缓存头时的缓存时间(秒)，为空时使用全局配置")
     
     
 class PatentDataQuality(BaseModel):
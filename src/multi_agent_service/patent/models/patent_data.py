@@ -1,7 +1,7 @@
 """专利数据模型和验证框架."""
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Set, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Union
 from uuid import uuid4
 import hashlib
 import re
@@ -215,23 +215,45 @@ class PatentData(BaseModel):
         
         return values
     
+    def _cached_hash(self, name: str, source: tuple, compute: Callable[[], str]) -> str:
+        """按来源字段缓存哈希值.
+        
+        缓存与来源字段的值一起保存在实例字典中（与 ``functools.cached_property`` 相同，
+        不参与序列化和相等比较），来源字段被赋值或经 ``model_copy(update=...)`` 修改后重新计算。
+        """
+        cached = self.__dict__.get(name)
+        if cached is not None and cached[0] == source:
+            return cached[1]
+        value = compute()
+        self.__dict__[name] = (source, value)
+        return value
+    
     @computed_field
     @property
     def content_hash(self) -> str:
         """计算内容哈希值用于去重."""
-        content = f"{self.application_number}|{self.title}|{self.abstract}|{self.application_date.isoformat()}"
-        return hashlib.md5(content.encode('utf-8')).hexdigest()
+        source = (self.application_number, self.title, self.abstract, self.application_date)
+        
+        def compute() -> str:
+            content = f"{self.application_number}|{self.title}|{self.abstract}|{self.application_date.isoformat()}"
+            return hashlib.md5(content.encode('utf-8')).hexdigest()
+        
+        return self._cached_hash("_content_hash_cache", source, compute)
     
     @computed_field
     @property
     def similarity_hash(self) -> str:
         """计算相似性哈希值用于近似去重."""
-        # 使用标题和摘要的关键部分
-        title_words = set(self.title.lower().split())
-        abstract_words = set(self.abstract.lower().split()[:50])  # 只取前50个词
-        combined_words = sorted(title_words.union(abstract_words))
-        content = '|'.join(combined_words)
-        return hashlib.md5(content.encode('utf-8')).hexdigest()
+        
+        def compute() -> str:
+            # 使用标题和摘要的关键部分
+            title_words = set(self.title.lower().split())
+            abstract_words = set(self.abstract.lower().split()[:50])  # 只取前50个词
+            combined_words = sorted(title_words.union(abstract_words))
+            content = '|'.join(combined_words)
+            return hashlib.md5(content.encode('utf-8')).hexdigest()
+        
+        return self._cached_hash("_similarity_hash_cache", (self.title, self.abstract), compute)
     
     def calculate_quality_score(self) -> float:
         """计算数据质量评分."""
@@ -323,6 +345,23 @@ class PatentDataset(BaseModel):
     data_sources: List[str] = Field(default_factory=list, description="数据来源列表")
     quality_metrics: Dict[str, Any] = Field(default_factory=dict, description="质量指标")
     
+    def _hash_index(self) -> Dict[str, Any]:
+        """内容哈希和相似性哈希的集合索引.
+        
+        索引保存在实例字典中，不参与序列化和相等比较。``patents`` 被替换为新列表或长度
+        与索引不一致（例如直接向列表追加）时重建索引。
+        """
+        index = self.__dict__.get("_hash_index_cache")
+        if index is None or index["patents"] is not self.patents or index["size"] != len(self.patents):
+            index = {
+                "patents": self.patents,
+                "size": len(self.patents),
+                "content": {patent.content_hash for patent in self.patents},
+                "similarity": {patent.similarity_hash for patent in self.patents}
+            }
+            self.__dict__["_hash_index_cache"] = index
+        return index
+    
     def add_patent(self, patent: PatentData) -> bool:
         """添加专利数据."""
         # 标准化数据
@@ -330,20 +369,19 @@ class PatentDataset(BaseModel):
         
         # 检查重复
         if not self._is_duplicate(patent):
+            index = self._hash_index()
             self.patents.append(patent)
+            index["size"] += 1
+            index["content"].add(patent.content_hash)
+            index["similarity"].add(patent.similarity_hash)
             self.total_count = len(self.patents)
             return True
         return False
     
     def _is_duplicate(self, patent: PatentData) -> bool:
-        """检查是否重复."""
-        for existing_patent in self.patents:
-            if existing_patent.content_hash == patent.content_hash:
-                return True
-            # 检查相似性哈希
-            if existing_patent.similarity_hash == patent.similarity_hash:
-                return True
-        return False
+        """检查是否重复（内容哈希或相似性哈希相同）."""
+        index = self._hash_index()
+        return patent.content_hash in index["content"] or patent.similarity_hash in index["similarity"]
     
     def remove_duplicates(self) -> int:
         """移除重复数据，返回移除的数量."""
@@ -360,6 +398,7 @@ class PatentDataset(BaseModel):
         
         self.patents = unique_patents
         self.total_count = len(self.patents)
+        self.__dict__.pop("_hash_index_cache", None)
         return removed_count
     
     def calculate_quality_metrics(self) -> Dict[str, Any]:
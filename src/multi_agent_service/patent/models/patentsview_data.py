@@ -302,6 +302,17 @@ class PatentsViewAPIResponse(BaseModel):
         }
 
 
+class PatentsViewPage(BaseModel):
+    """游标分页遍历中的一页专利数据（遍历分类等其他端点时为该端点的记录）."""
+    
+    patents: List[Dict[str, Any]] = Field(default_factory=list, description="本页专利数据")
+    page_number: int = Field(..., description="页码（从1开始，恢复遍历时重新计数）")
+    cursor: Optional[List[Any]] = Field(None, description="本页最后一条记录的排序键，传给after可从下一页继续")
+    total_count: Optional[int] = Field(None, description="总记录数")
+    fetched_count: int = Field(0, description="本次遍历累计获取的记录数")
+    has_more: bool = Field(False, description="是否还有后续页")
+
+
 class PatentsViewQuery(BaseModel):
     """PatentsView 查询模型."""
     
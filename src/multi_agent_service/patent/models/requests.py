@@ -46,6 +46,8 @@ class PatentDataCollectionRequest(BaseModel):
     cache_enabled: bool = Field(True, description="是否启用缓存")
     cache_ttl: int = Field(3600, description="缓存TTL(秒)")
     parallel_sources: bool = Field(True, description="是否并行收集多个数据源")
+    hedged: bool = Field(False, description="不并行收集时，是否对冲请求多个数据源（代替逐个故障转移）")
+    incremental: bool = Field(False, description="是否增量收集（只获取上次收集之后的记录并合并到已保存的数据集）")
     timeout: int = Field(300, description="超时时间(秒)")
 
 
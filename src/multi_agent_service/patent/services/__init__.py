@@ -1,7 +1,8 @@
 """Patent analysis services."""
 
-from .patentsview_service import PatentsViewService
+from .patentsview_service import PatentsViewPaginationError, PatentsViewService
 
 __all__ = [
     "PatentsViewService",
+    "PatentsViewPaginationError",
 ]
\ No newline at end of file
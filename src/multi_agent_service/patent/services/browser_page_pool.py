@@ -0,0 +1,197 @@
+"""浏览器页面池：在多个浏览器上下文中并发打开页面，并拦截不需要的资源."""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple, TypeVar
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 抓取专利文本时不需要的资源类型
+DEFAULT_BLOCKED_RESOURCE_TYPES = ("image", "media", "font")
+
+# 统计、广告等第三方请求
+DEFAULT_BLOCKED_URL_PATTERNS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "/gen_204",
+    "/log?",
+)
+
+
+class BrowserPagePool:
+    """浏览器页面池.
+
+    每个上下文有独立的Cookie和缓存，上下文内打开 ``pages_per_context`` 个页面，
+    所有页面放入队列，通过 :meth:`page` 借出和归还。上下文注册请求拦截，
+    图片、字体等资源和统计脚本直接中止，只加载页面本身和渲染所需的脚本。
+
+    队列中保存的是（上下文, 页面）槽位，池大小固定：页面关闭或崩溃后槽位保留，
+    下次借出时在同一上下文中重建页面；重建失败时本次借出抛出异常，槽位留给之后重试。
+    """
+
+    def __init__(
+        self,
+        browser: Any,
+        contexts: int = 4,
+        pages_per_context: int = 1,
+        context_options: Optional[Dict[str, Any]] = None,
+        blocked_resource_types: Iterable[str] = DEFAULT_BLOCKED_RESOURCE_TYPES,
+        blocked_url_patterns: Iterable[str] = DEFAULT_BLOCKED_URL_PATTERNS,
+        default_timeout: float = 30000
+    ):
+        self.browser = browser
+        self.contexts = contexts
+        self.pages_per_context = pages_per_context
+        self.context_options = context_options or {}
+        self.blocked_resource_types = frozenset(blocked_resource_types)
+        self.blocked_url_patterns = tuple(blocked_url_patterns)
+        self.default_timeout = default_timeout
+
+        self._contexts: List[Any] = []
+        self._crashed: Set[int] = set()
+        self._idle: Optional["asyncio.Queue[Tuple[Any, Optional[Any]]]"] = None
+        self._started = False
+        self.stats = {"pages": 0, "checkouts": 0, "replaced": 0, "blocked_requests": 0, "allowed_requests": 0}
+
+    @property
+    def size(self) -> int:
+        return self.contexts * self.pages_per_context
+
+    async def start(self) -> "BrowserPagePool":
+        """创建上下文和页面."""
+        if self._started:
+            return self
+
+        self._idle = asyncio.Queue()
+        for _ in range(self.contexts):
+            context = await self.browser.new_context(**self.context_options)
+            if self.blocked_resource_types or self.blocked_url_patterns:
+                await context.route("**/*", self._route)
+            self._contexts.append(context)
+            for _ in range(self.pages_per_context):
+                self._idle.put_nowait((context, await self._new_page(context)))
+
+        self._started = True
+        logger.info(f"Browser page pool started with {self.contexts} contexts, {self.size} pages")
+        return self
+
+    async def _new_page(self, context: Any) -> Any:
+        page = await context.new_page()
+        page.set_default_timeout(self.default_timeout)
+        # 渲染进程崩溃的页面不会关闭，需要单独标记
+        page.on("crash", lambda *_: self._crashed.add(id(page)))
+        self.stats["pages"] += 1
+        return page
+
+    def _is_broken(self, page: Any) -> bool:
+        return id(page) in self._crashed or page.is_closed()
+
+    async def _replace_page(self, context: Any, page: Optional[Any]) -> Any:
+        """丢弃已关闭或崩溃的页面，在同一上下文中创建新页面."""
+        if page is not None:
+            self._crashed.discard(id(page))
+            if not page.is_closed():
+                try:
+                    await page.close()
+                except Exception as e:
+                    logger.debug(f"Error closing crashed page: {str(e)}")
+        new_page = await self._new_page(context)
+        self.stats["replaced"] += 1
+        return new_page
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        return resource_type in self.blocked_resource_types or any(
+            pattern in url for pattern in self.blocked_url_patterns
+        )
+
+    async def _route(self, route: Any) -> None:
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.stats["blocked_requests"] += 1
+            await route.abort()
+        else:
+            self.stats["allowed_requests"] += 1
+            await route.continue_()
+
+    @asynccontextmanager
+    async def page(self):
+        """借出一个空闲页面；页面已关闭或崩溃时先在同一上下文中重建."""
+        if not self._started:
+            await self.start()
+
+        context, page = await self._idle.get()
+        if page is None or self._is_broken(page):
+            try:
+                page = await self._replace_page(context, page)
+            except BaseException as e:
+                # 保留槽位，之后的借出会再次尝试重建
+                self._idle.put_nowait((context, None))
+                if isinstance(e, Exception):
+                    logger.warning(f"Failed to replace closed page: {str(e)}")
+                raise
+
+        self.stats["checkouts"] += 1
+        try:
+            yield page
+        finally:
+            self._idle.put_nowait((context, page))
+
+    async def map(
+        self,
+        func: Callable[[Any, T], Awaitable[Any]],
+        items: Iterable[T]
+    ) -> List[Any]:
+        """用池中的页面并发处理 ``items``，按输入顺序返回结果，单项异常作为结果返回."""
+
+        async def run(item: T) -> Any:
+            async with self.page() as page:
+                return await func(page, item)
+
+        return await asyncio.gather(*(run(item) for item in items), return_exceptions=True)
+
+    async def close(self) -> None:
+        """关闭所有上下文（同时关闭其中的页面）."""
+        for context in self._contexts:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.warning(f"Error closing browser context: {str(e)}")
+        self._contexts.clear()
+        self._crashed.clear()
+        self._started = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize() if self._idle else 0,
+            **self.stats
+        }
+
+
+async def wait_for_content(
+    page: Any,
+    selector: str,
+    timeout: float = 10000,
+    network_idle_timeout: float = 3000
+) -> bool:
+    """等待内容元素出现（可用逗号分隔多个选择器），再短暂等待网络空闲；元素未出现时返回False.
+
+    代替导航后固定时长的等待：内容渲染后立即继续，网络空闲等待超时不视为失败。
+    """
+    try:
+        await page.wait_for_selector(selector, state="attached", timeout=timeout)
+    except Exception as e:
+        logger.debug(f"Content selector {selector!r} not found: {str(e)}")
+        return False
+
+    try:
+        await page.wait_for_load_state("networkidle", timeout=network_idle_timeout)
+    except Exception:
+        pass
+    return True
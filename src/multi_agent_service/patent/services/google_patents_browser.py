@@ -19,7 +19,9 @@ except ImportError:
     Browser = None
     BrowserConfig = None
 
+from .browser_page_pool import BrowserPagePool, wait_for_content
 from ..models.patentsview_data import PatentRecord
+from ...utils.rate_limiter import get_rate_limiter
 
 
 logger = logging.getLogger(__name__)
@@ -28,7 +30,9 @@ logger = logging.getLogger(__name__)
 class GooglePatentsBrowserService:
     """基于browser-use的Google Patents数据收集服务."""
     
-    def __init__(self, headless: bool = True, timeout: int = 30):
+    USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    
+    def __init__(self, headless: bool = True, timeout: int = 30, pool_size: int = 4):
         """初始化Google Patents浏览器服务."""
         if not BROWSER_USE_AVAILABLE:
             raise ImportError(
@@ -41,6 +45,19 @@ class GooglePatentsBrowserService:
         self.base_url = "https://patents.google.com"
         self.browser = None
         self.page = None
+        self.page_pool: Optional[BrowserPagePool] = None
+        
+        # 详情页并发抓取配置：页面池大小（每个上下文的页面数）、内容等待超时(毫秒)和请求速率
+        self.pool_config = {
+            "contexts": pool_size,
+            "pages_per_context": 1,
+            "content_timeout": 10000,
+            "network_idle_timeout": 3000,
+            "requests_per_second": 5
+        }
+        self.rate_limiter = get_rate_limiter(
+            "patents.google.com", rate=self.pool_config["requests_per_second"], burst=pool_size
+        )
         
         # 搜索配置
         self.search_config = {
@@ -207,7 +224,7 @@ class GooglePatentsBrowserService:
         # 设置页面配置
         await self.page.set_viewport_size({"width": 1920, "height": 1080})
         await self.page.set_extra_http_headers({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+            'User-Agent': self.USER_AGENT
         })
         
         self._using_browser_use = True
@@ -215,26 +232,7 @@ class GooglePatentsBrowserService:
     
     async def _initialize_playwright_fallback(self):
         """使用 Playwright 初始化 - 针对 Google Patents JavaScript SPA 优化."""
-        from playwright.async_api import async_playwright
-        
-        self._playwright = await async_playwright().start()
-        
-        # 使用优化的浏览器启动参数
-        self._browser_instance = await self._playwright.chromium.launch(
-            headless=self.headless,
-            args=[
-                '--no-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-blink-features=AutomationControlled',
-                '--disable-web-security',
-                '--disable-features=VizDisplayCompositor',
-                '--disable-background-timer-throttling',
-                '--disable-backgrounding-occluded-windows',
-                '--disable-renderer-backgrounding',
-                '--disable-field-trial-config',
-                '--disable-ipc-flooding-protection'
-            ]
-        )
+        self._playwright, self._browser_instance = await self._launch_playwright_browser()
         
         # 创建新页面
         self.page = await self._browser_instance.new_page()
@@ -244,7 +242,7 @@ class GooglePatentsBrowserService:
         
         # 设置更真实的用户代理和请求头
         await self.page.set_extra_http_headers({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'User-Agent': self.USER_AGENT,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.9',
             'Accept-Encoding': 'gzip, deflate, br',
@@ -260,10 +258,66 @@ class GooglePatentsBrowserService:
         # 设置为使用 Playwright 模式
         self._using_playwright_fallback = True
         logger.info("Initialized using Playwright with Google Patents SPA optimization")
+    
+    async def _launch_playwright_browser(self):
+        """启动 Playwright Chromium，返回 (playwright, browser)."""
+        from playwright.async_api import async_playwright
+        
+        playwright = await async_playwright().start()
+        
+        # 使用优化的浏览器启动参数
+        browser = await playwright.chromium.launch(
+            headless=self.headless,
+            args=[
+                '--no-sandbox',
+                '--disable-dev-shm-usage',
+                '--disable-blink-features=AutomationControlled',
+                '--disable-web-security',
+                '--disable-features=VizDisplayCompositor',
+                '--disable-background-timer-throttling',
+                '--disable-backgrounding-occluded-windows',
+                '--disable-renderer-backgrounding',
+                '--disable-field-trial-config',
+                '--disable-ipc-flooding-protection'
+            ]
+        )
+        return playwright, browser
+    
+    async def _ensure_page_pool(self) -> BrowserPagePool:
+        """创建详情页并发抓取使用的页面池（复用 Playwright 浏览器，没有时单独启动）."""
+        if self.page_pool is not None:
+            return self.page_pool
+        
+        browser = getattr(self, '_browser_instance', None)
+        if browser is None:
+            self._pool_playwright, browser = await self._launch_playwright_browser()
+            self._pool_browser = browser
+        
+        self.page_pool = BrowserPagePool(
+            browser,
+            contexts=self.pool_config["contexts"],
+            pages_per_context=self.pool_config["pages_per_context"],
+            context_options={
+                "viewport": {"width": 1920, "height": 1080},
+                "user_agent": self.USER_AGENT,
+                "locale": "en-US"
+            },
+            default_timeout=self.timeout * 1000
+        )
+        await self.page_pool.start()
+        return self.page_pool
 
     async def close(self):
         """关闭浏览器."""
         try:
+            if self.page_pool:
+                await self.page_pool.close()
+                self.page_pool = None
+            if hasattr(self, '_pool_browser'):
+                await self._pool_browser.close()
+                await self._pool_playwright.stop()
+                del self._pool_browser, self._pool_playwright
+            
             if self.page:
                 await self.page.close()
             
@@ -327,23 +381,20 @@ class GooglePatentsBrowserService:
                 await self.page.goto(search_url, timeout=45000, wait_until="domcontentloaded")
                 logger.info("Page loaded, waiting for JavaScript to render...")
                 
-                # 等待 JavaScript 渲染完成
-                await asyncio.sleep(5)  # 给 JavaScript 时间渲染
-                
-                # 等待网络空闲
-                await self.page.wait_for_load_state("networkidle", timeout=20000)
+                # 等待结果列表或搜索框渲染，再等待网络空闲
+                await wait_for_content(
+                    self.page,
+                    f'{self.selectors["patent_results"]}, {self.selectors["search_input"]}',
+                    timeout=20000
+                )
                 logger.info("JavaScript rendering completed")
                 
-                # 额外等待确保所有内容加载
-                await asyncio.sleep(3)
-                
             except Exception as nav_error:
                 logger.warning(f"Direct search navigation failed: {nav_error}")
                 # 尝试先访问主页，再搜索
                 try:
                     logger.info("Trying main page first, then search...")
                     await self.page.goto(self.base_url, timeout=30000, wait_until="domcontentloaded")
-                    await asyncio.sleep(3)
                     await self.page.wait_for_load_state("networkidle", timeout=15000)
                     
                     # 然后执行搜索
@@ -564,16 +615,14 @@ class GooglePatentsBrowserService:
                     logger.info("Pressed Enter to search")
                 
                 # 等待搜索结果加载
-                await self.page.wait_for_load_state("networkidle", timeout=15000)
-                await asyncio.sleep(3)  # 额外等待确保结果完全加载
+                await wait_for_content(self.page, self.selectors["patent_results"], timeout=15000)
                 
             else:
                 # 如果找不到搜索框，尝试直接构造搜索URL
                 logger.warning("Search input not found, trying direct URL approach")
                 search_url = f"{self.base_url}/?q={quote_plus(query)}"
-                await self.page.goto(search_url, timeout=30000)
-                await self.page.wait_for_load_state("networkidle", timeout=15000)
-                await asyncio.sleep(3)
+                await self.page.goto(search_url, timeout=30000, wait_until="domcontentloaded")
+                await wait_for_content(self.page, self.selectors["patent_results"], timeout=15000)
             
         except Exception as e:
             logger.error(f"Error performing search: {str(e)}")
@@ -611,7 +660,7 @@ class GooglePatentsBrowserService:
                     break
                 
                 # 防止过快请求
-                await asyncio.sleep(self.search_config["scroll_delay"])
+                await self.rate_limiter.acquire()
             
             # 限制返回结果数量
             return patents[:limit]
@@ -727,7 +776,10 @@ class GooglePatentsBrowserService:
             
             # 尝试滚动加载更多内容
             await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await asyncio.sleep(self.search_config["scroll_delay"])
+            try:
+                await self.page.wait_for_load_state("networkidle", timeout=self.search_config["scroll_delay"] * 1000)
+            except Exception:
+                pass
             
             return False
             
@@ -735,55 +787,76 @@ class GooglePatentsBrowserService:
             logger.warning(f"Error loading next page: {str(e)}")
             return False
     
-    async def get_patent_details(self, patent_url: str) -> Optional[Dict[str, Any]]:
-        """获取专利详细信息."""
+    async def get_patent_details(self, patent_url: str, page: Any = None) -> Optional[Dict[str, Any]]:
+        """获取专利详细信息（``page`` 为空时使用服务的主页面）."""
         try:
-            if not self.page:
-                await self.initialize()
-            
-            # 导航到专利详情页
-            await self.page.goto(patent_url)
-            await self.page.wait_for_load_state("networkidle")
-            
-            patent_details = {}
-            
-            # 提取详细标题
-            title_element = await self.page.query_selector(self.selectors["patent_detail_title"])
-            if title_element:
-                patent_details["title"] = await title_element.inner_text()
-            
-            # 提取详细摘要
-            abstract_element = await self.page.query_selector(self.selectors["patent_detail_abstract"])
-            if abstract_element:
-                patent_details["abstract"] = await abstract_element.inner_text()
-            
-            # 提取权利要求
-            claims_element = await self.page.query_selector(self.selectors["patent_detail_claims"])
-            if claims_element:
-                claims_text = await claims_element.inner_text()
-                patent_details["claims"] = self._parse_claims(claims_text)
-            
-            # 提取发明人
-            inventors_elements = await self.page.query_selector_all(self.selectors["patent_detail_inventors"])
-            if inventors_elements:
-                inventors = []
-                for element in inventors_elements:
-                    inventor_name = await element.inner_text()
-                    inventors.append(inventor_name.strip())
-                patent_details["inventors"] = inventors
-            
-            # 提取受让人
-            assignee_element = await self.page.query_selector(self.selectors["patent_detail_assignee"])
-            if assignee_element:
-                assignee_name = await assignee_element.inner_text()
-                patent_details["applicants"] = [assignee_name.strip()]
+            if page is None:
+                if not self.page:
+                    await self.initialize()
+                page = self.page
+            
+            # 导航到专利详情页，详情内容渲染后立即提取
+            await self.rate_limiter.acquire()
+            await page.goto(patent_url, wait_until="domcontentloaded")
+            await wait_for_content(
+                page,
+                f'{self.selectors["patent_detail_title"]}, {self.selectors["patent_detail_abstract"]}',
+                timeout=self.pool_config["content_timeout"],
+                network_idle_timeout=self.pool_config["network_idle_timeout"]
+            )
             
-            return patent_details
+            return await self._extract_patent_details(page)
             
         except Exception as e:
             logger.error(f"Error getting patent details: {str(e)}")
             return None
     
+    async def get_patent_details_batch(self, patent_urls: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """使用页面池并发获取多个专利的详细信息，按输入顺序返回，失败的专利为None."""
+        if not patent_urls:
+            return []
+        
+        pool = await self._ensure_page_pool()
+        results = await pool.map(lambda page, url: self.get_patent_details(url, page=page), patent_urls)
+        return [None if isinstance(result, BaseException) else result for result in results]
+    
+    async def _extract_patent_details(self, page: Any) -> Dict[str, Any]:
+        """从详情页提取专利信息."""
+        patent_details = {}
+        
+        # 提取详细标题
+        title_element = await page.query_selector(self.selectors["patent_detail_title"])
+        if title_element:
+            patent_details["title"] = await title_element.inner_text()
+        
+        # 提取详细摘要
+        abstract_element = await page.query_selector(self.selectors["patent_detail_abstract"])
+        if abstract_element:
+            patent_details["abstract"] = await abstract_element.inner_text()
+        
+        # 提取权利要求
+        claims_element = await page.query_selector(self.selectors["patent_detail_claims"])
+        if claims_element:
+            claims_text = await claims_element.inner_text()
+            patent_details["claims"] = self._parse_claims(claims_text)
+        
+        # 提取发明人
+        inventors_elements = await page.query_selector_all(self.selectors["patent_detail_inventors"])
+        if inventors_elements:
+            inventors = []
+            for element in inventors_elements:
+                inventor_name = await element.inner_text()
+                inventors.append(inventor_name.strip())
+            patent_details["inventors"] = inventors
+        
+        # 提取受让人
+        assignee_element = await page.query_selector(self.selectors["patent_detail_assignee"])
+        if assignee_element:
+            assignee_name = await assignee_element.inner_text()
+            patent_details["applicants"] = [assignee_name.strip()]
+        
+        return patent_details
+    
     def _parse_date(self, date_text: str) -> str:
         """解析日期字符串."""
         try:
@@ -908,8 +981,12 @@ class GooglePatentsBrowserService:
 
 
 # 向后兼容的工厂函数
-async def create_google_patents_browser_service(headless: bool = True, timeout: int = 30) -> GooglePatentsBrowserService:
+async def create_google_patents_browser_service(
+    headless: bool = True,
+    timeout: int = 30,
+    pool_size: int = 4
+) -> GooglePatentsBrowserService:
     """创建Google Patents浏览器服务实例."""
-    service = GooglePatentsBrowserService(headless=headless, timeout=timeout)
+    service = GooglePatentsBrowserService(headless=headless, timeout=timeout, pool_size=pool_size)
     await service.initialize()
     return service
\ No newline at end of file
@@ -1,11 +1,13 @@
 """PatentsView API 服务类."""
 
 import asyncio
+import functools
 import logging
 import os
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 from datetime import datetime
 import json
+from urllib.parse import urlsplit
 import aiohttp
 
 # 加载 .env 文件
@@ -26,6 +28,7 @@ except ImportError:
 from ..models.patentsview_data import (
     PatentsViewQuery,
     PatentsViewAPIResponse,
+    PatentsViewPage,
     PatentsViewSearchResult,
     PatentRecord,
     PatentSummary,
@@ -35,15 +38,44 @@ from ..models.patentsview_data import (
     CPCClass,
     IPCClass
 )
+from ..storage.classification_catalog import ClassificationCatalog
+from ...utils.rate_limiter import get_rate_limiter
 
 
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_PATENT_FIELDS = [
+    "patent_id", "patent_number", "patent_title",
+    "patent_abstract", "patent_date", "patent_type",
+    "assignee_organization", "assignee_country",
+    "inventor_name_first", "inventor_name_last",
+    "ipc_class", "cpc_class"
+]
+
+
+class PatentsViewPaginationError(Exception):
+    """分页遍历中途失败.
+    
+    ``cursor`` 为最后一个已返回页的游标（尚未返回任何页时为开始遍历时的游标），
+    传给 ``iter_patent_pages(after=...)`` 即可从失败的页继续。
+    """
+    
+    def __init__(self, message: str, cursor: Optional[List[Any]], fetched_count: int):
+        super().__init__(message)
+        self.cursor = cursor
+        self.fetched_count = fetched_count
+
+
 class PatentsViewService:
     """PatentsView API 服务类."""
     
-    def __init__(self, api_key: Optional[str] = None, base_url: str = "https://search.patentsview.org/api/v1"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = "https://search.patentsview.org/api/v1",
+        catalog: Optional[ClassificationCatalog] = None
+    ):
         """初始化 PatentsView 服务."""
         self.api_key = api_key or os.getenv('PATENT_VIEW_API_KEY')
         self.base_url = base_url
@@ -58,6 +90,24 @@ class PatentsViewService:
             'max_page_size': 1000
         }
         
+        # 请求节流：同一API的所有服务实例共享限制器，速率只在注册表首次创建时设置
+        self.rate_limiter = get_rate_limiter(
+            urlsplit(self.base_url).netloc,
+            rate=float(os.getenv('PATENT_VIEW_REQUESTS_PER_MINUTE', '45')),
+            period=60.0
+        )
+        
+        # CPC/IPC分类目录本地缓存（分类体系 -> 响应字段、代码字段、标题字段）
+        self.catalog = catalog or ClassificationCatalog(
+            os.getenv('PATENT_VIEW_CATALOG_PATH', 'data/patentsview_catalog.db'),
+            ttl=float(os.getenv('PATENT_VIEW_CATALOG_TTL', str(30 * 86400)))
+        )
+        self.catalog_schemes = {
+            'cpc': ('cpc_classes', 'cpc_class', 'cpc_class_title'),
+            'ipc': ('ipc_classes', 'ipc_class', 'ipc_class_title')
+        }
+        self._catalog_refresh_tasks: Dict[str, asyncio.Task] = {}
+        
         # 端点映射
         self.endpoints = {
             # 专利文本相关
@@ -112,9 +162,18 @@ class PatentsViewService:
             timeout = aiohttp.ClientTimeout(total=self.config['timeout'])
             self.session = aiohttp.ClientSession(timeout=timeout)
             self.logger.info("PatentsView service initialized")
+        
+        try:
+            await self.catalog.initialize()
+        except Exception as e:
+            self.logger.warning(f"Failed to load classification catalog: {str(e)}")
     
     async def cleanup(self):
         """清理服务."""
+        for task in self._catalog_refresh_tasks.values():
+            task.cancel()
+        self._catalog_refresh_tasks.clear()
+        
         if self.session:
             await self.session.close()
             self.session = None
@@ -130,13 +189,7 @@ class PatentsViewService:
         """搜索专利."""
         
         if fields is None:
-            fields = [
-                "patent_id", "patent_number", "patent_title", 
-                "patent_abstract", "patent_date", "patent_type",
-                "assignee_organization", "assignee_country",
-                "inventor_name_first", "inventor_name_last",
-                "ipc_class", "cpc_class"
-            ]
+            fields = list(DEFAULT_PATENT_FIELDS)
         
         if sort is None:
             sort = [{"patent_date": "desc"}]
@@ -154,6 +207,152 @@ class PatentsViewService:
         response_data = await self._make_request(self.endpoints['patents'], params)
         return PatentsViewAPIResponse(**response_data)
     
+    async def iter_patent_pages(
+        self,
+        query: Dict[str, Any],
+        fields: Optional[List[str]] = None,
+        sort: Optional[List[Dict[str, str]]] = None,
+        page_size: Optional[int] = None,
+        after: Optional[List[Any]] = None,
+        max_results: Optional[int] = None
+    ) -> AsyncIterator[PatentsViewPage]:
+        """按游标逐页遍历专利搜索结果.
+        
+        使用API的 ``after`` 选项翻页，不受单次请求 ``max_page_size`` 的限制；
+        处理当前页时已按速率限制预取下一页。排序条件末尾会补充 ``patent_id``
+        保证游标唯一，每页的 ``cursor`` 可保存下来，失败后通过 ``after`` 继续。
+        """
+        
+        fields = list(fields) if fields is not None else list(DEFAULT_PATENT_FIELDS)
+        sort = list(sort) if sort is not None else [{"patent_date": "desc"}]
+        async for page in self._iter_pages(
+            self.endpoints['patents'], 'patents', 'patent_id',
+            query, fields, sort, page_size, after, max_results
+        ):
+            yield page
+    
+    async def _iter_pages(
+        self,
+        endpoint: str,
+        response_key: str,
+        id_field: str,
+        query: Dict[str, Any],
+        fields: List[str],
+        sort: List[Dict[str, str]],
+        page_size: Optional[int] = None,
+        after: Optional[List[Any]] = None,
+        max_results: Optional[int] = None
+    ) -> AsyncIterator[PatentsViewPage]:
+        """按游标逐页遍历任意端点，``id_field`` 为补充到排序末尾的唯一字段."""
+        
+        fields = list(fields)
+        sort = list(sort)
+        sort_keys = [next(iter(item)) for item in sort]
+        if id_field not in sort_keys:
+            sort.append({id_field: "asc"})
+            sort_keys.append(id_field)
+        fields.extend(key for key in sort_keys if key not in fields)
+        
+        page_size = min(page_size or self.config['max_page_size'], self.config['max_page_size'])
+        
+        def request_size(fetched: int) -> int:
+            return page_size if max_results is None else min(page_size, max_results - fetched)
+        
+        cursor = list(after) if after is not None else None
+        fetched_count = 0
+        page_number = 0
+        size = request_size(0)
+        fetch = functools.partial(self._fetch_page, endpoint, response_key, query, fields, sort)
+        next_page = asyncio.create_task(fetch(size, cursor)) if size > 0 else None
+        
+        try:
+            while next_page is not None:
+                try:
+                    patents, total_count = await next_page
+                except Exception as e:
+                    raise PatentsViewPaginationError(
+                        f"Failed to fetch patent page {page_number + 1}: {str(e)}", cursor, fetched_count
+                    ) from e
+                
+                if not patents:
+                    break
+                
+                fetched_count += len(patents)
+                page_number += 1
+                page_cursor = [patents[-1].get(key) for key in sort_keys]
+                
+                # 返回当前页之前先发起下一页请求
+                next_page = None
+                size_next = request_size(fetched_count)
+                if len(patents) >= size and size_next > 0:
+                    next_page = asyncio.create_task(fetch(size_next, page_cursor))
+                
+                yield PatentsViewPage(
+                    patents=patents,
+                    page_number=page_number,
+                    cursor=page_cursor,
+                    total_count=total_count,
+                    fetched_count=fetched_count,
+                    has_more=next_page is not None
+                )
+                cursor = page_cursor
+                size = size_next
+        finally:
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
+    
+    async def iter_patents(
+        self,
+        query: Dict[str, Any],
+        fields: Optional[List[str]] = None,
+        sort: Optional[List[Dict[str, str]]] = None,
+        page_size: Optional[int] = None,
+        after: Optional[List[Any]] = None,
+        max_results: Optional[int] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """按批返回专利记录（每批为一页）."""
+        
+        async for page in self.iter_patent_pages(query, fields, sort, page_size, after, max_results):
+            yield page.patents
+    
+    async def _fetch_page(
+        self,
+        endpoint: str,
+        response_key: str,
+        query: Dict[str, Any],
+        fields: List[str],
+        sort: List[Dict[str, str]],
+        size: int,
+        cursor: Optional[List[Any]]
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """获取游标之后的一页记录."""
+        
+        options: Dict[str, Any] = {"size": size}
+        if cursor is not None:
+            options["after"] = cursor[0] if len(cursor) == 1 else cursor
+        
+        params = {
+            'q': json.dumps(query),
+            'f': json.dumps(fields),
+            's': json.dumps(sort),
+            'o': json.dumps(options)
+        }
+        
+        response_data = await self._make_request(endpoint, params)
+        total_count = response_data.get("total_hits", response_data.get("total_count"))
+        return response_data.get(response_key) or [], total_count
+    
+    async def _collect_patents(self, query: Dict[str, Any], max_results: int) -> PatentsViewAPIResponse:
+        """分页收集最多 ``max_results`` 条专利."""
+        
+        patents: List[Dict[str, Any]] = []
+        total_count = 0
+        async for page in self.iter_patent_pages(query, max_results=max_results):
+            patents.extend(page.patents)
+            total_count = page.total_count or total_count
+        
+        return PatentsViewAPIResponse(status="OK", total_count=total_count, patents=patents)
+    
     async def search_patent_summaries(
         self,
         query: Dict[str, Any],
@@ -295,6 +494,72 @@ class PatentsViewService:
         response_data = await self._make_request(self.endpoints['ipc_classes'], params)
         return PatentsViewAPIResponse(**response_data)
     
+    async def get_classifications(
+        self,
+        scheme: str,
+        prefix: str = "",
+        limit: Optional[int] = None
+    ) -> PatentsViewAPIResponse:
+        """从本地分类目录查询CPC/IPC分类（``scheme`` 为 ``cpc`` 或 ``ipc``），按代码前缀过滤."""
+        
+        await self._ensure_catalog(scheme)
+        response_key, code_field, title_field = self.catalog_schemes[scheme]
+        items = [
+            {code_field: entry["code"], title_field: entry["title"]}
+            for entry in self.catalog.search_prefix(scheme, prefix, limit)
+        ]
+        return PatentsViewAPIResponse(status="OK", total_count=len(items), **{response_key: items})
+    
+    async def lookup_classification(self, scheme: str, code: str) -> Optional[str]:
+        """查询分类代码的标题."""
+        
+        await self._ensure_catalog(scheme)
+        return self.catalog.lookup(scheme, code)
+    
+    async def refresh_classification_catalog(self, scheme: str) -> int:
+        """重新下载完整分类目录（按游标翻页）并保存到本地，返回分类数."""
+        
+        response_key, code_field, title_field = self.catalog_schemes[scheme]
+        entries: Dict[str, Optional[str]] = {}
+        async for page in self._iter_pages(
+            self.endpoints[response_key], response_key, code_field,
+            {}, [code_field, title_field], [{code_field: "asc"}]
+        ):
+            entries.update(
+                (item[code_field], item.get(title_field)) for item in page.patents if item.get(code_field)
+            )
+        if entries:
+            await self.catalog.replace(scheme, entries)
+        return len(entries)
+    
+    async def _ensure_catalog(self, scheme: str):
+        """确保分类目录可用：没有本地目录时下载，已过期时先用旧目录并在后台刷新."""
+        
+        if scheme not in self.catalog_schemes:
+            raise ValueError(f"Unknown classification scheme: {scheme}")
+        
+        await self.catalog.initialize()
+        if not self.catalog.has_catalog(scheme):
+            await self._schedule_catalog_refresh(scheme)
+        elif self.catalog.is_stale(scheme):
+            self._schedule_catalog_refresh(scheme)
+    
+    def _schedule_catalog_refresh(self, scheme: str) -> asyncio.Task:
+        """刷新分类目录，同一分类体系同时只有一个刷新任务."""
+        
+        task = self._catalog_refresh_tasks.get(scheme)
+        if task is None or task.done():
+            task = asyncio.create_task(self.refresh_classification_catalog(scheme))
+            task.add_done_callback(lambda t: self._on_catalog_refreshed(scheme, t))
+            self._catalog_refresh_tasks[scheme] = task
+        return task
+    
+    def _on_catalog_refreshed(self, scheme: str, task: asyncio.Task):
+        if self._catalog_refresh_tasks.get(scheme) is task:
+            del self._catalog_refresh_tasks[scheme]
+        if not task.cancelled() and task.exception():
+            self.logger.warning(f"Failed to refresh {scheme} catalog: {str(task.exception())}")
+    
     async def comprehensive_search(
         self,
         keywords: List[str],
@@ -310,13 +575,13 @@ class PatentsViewService:
         
         # 并行执行多个搜索
         search_tasks = [
-            self.search_patents(query, options={"size": min(max_results, self.config['max_page_size'])}),
+            self._collect_patents(query, max_results),
             self.search_patent_summaries(query),
             self.search_patent_claims(query),
             self.search_assignees(query),
             self.search_inventors(query),
-            self.search_cpc_classes(),
-            self.search_ipc_classes()
+            self.get_classifications('cpc', limit=self.config['default_page_size']),
+            self.get_classifications('ipc', limit=self.config['default_page_size'])
         ]
         
         try:
@@ -452,38 +717,21 @@ class PatentsViewService:
             self.logger.warning(f"Error integrating response data for task {task_index}: {str(e)}")
     
     async def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """发起 API 请求."""
-        
-        if not self.session:
-            await self.initialize()
-        
-        url = f"{self.base_url}{endpoint}"
-        
-        headers = {
-            'Content-Type': 'application/json',
-            'User-Agent': 'PatentsViewService/1.0'
-        }
-        
-        # 添加 API 密钥（如果有）
-        if self.api_key:
-            headers['X-API-Key'] = self.api_key
+        """发起 API 请求，每次尝试前从共享限制器获取请求时间槽."""
         
         # 重试机制
         for attempt in range(self.config['max_retries']):
             try:
-                # 使用 POST 请求发送复杂查询
-                async with self.session.post(url, json=params, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data
-                    elif response.status == 429:
-                        # 速率限制，等待后重试
-                        wait_time = self.config['rate_limit_delay'] * (2 ** attempt)
-                        await asyncio.sleep(wait_time)
-                        continue
-                    else:
-                        error_text = await response.text()
-                        raise Exception(f"API request failed with status {response.status}: {error_text}")
+                await self.rate_limiter.acquire()
+                status, data = await self._send_request(endpoint, params)
+                if status == 200:
+                    return data
+                elif status == 429:
+                    # 速率限制：推迟所有共享该限制器的请求，下次尝试时重新排队
+                    self.rate_limiter.penalize(self.config['rate_limit_delay'] * (2 ** attempt))
+                    continue
+                else:
+                    raise Exception(f"API request failed with status {status}: {data}")
             
             except asyncio.TimeoutError:
                 if attempt == self.config['max_retries'] - 1:
@@ -497,6 +745,29 @@ class PatentsViewService:
         
         raise Exception("API request failed after all retries")
     
+    async def _send_request(self, endpoint: str, params: Dict[str, Any]) -> Tuple[int, Any]:
+        """发送一次 POST 请求，返回状态码和响应（200时为JSON，否则为文本）."""
+        
+        if not self.session:
+            await self.initialize()
+        
+        url = f"{self.base_url}{endpoint}"
+        
+        headers = {
+            'Content-Type': 'application/json',
+            'User-Agent': 'PatentsViewService/1.0'
+        }
+        
+        # 添加 API 密钥（如果有）
+        if self.api_key:
+            headers['X-API-Key'] = self.api_key
+        
+        # 使用 POST 请求发送复杂查询
+        async with self.session.post(url, json=params, headers=headers) as response:
+            if response.status == 200:
+                return response.status, await response.json()
+            return response.status, await response.text()
+    
     def build_text_search_query(self, keywords: List[str], search_fields: List[str] = None) -> Dict[str, Any]:
         """构建文本搜索查询."""
         
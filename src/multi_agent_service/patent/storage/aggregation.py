@@ -0,0 +1,123 @@
+"""专利统计聚合查询：在SQLite中分组计数，只把聚合结果交给分析器."""
+
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .database import PatentDatabaseManager, build_fts_query
+from ...utils.monitoring import metrics_collector
+
+
+logger = logging.getLogger(__name__)
+
+
+# 可分组的维度及其SQL表达式；ipc_main 为IPC分类的前4位（部和大类、小类）
+DIMENSIONS = {
+    "year": "s.year",
+    "month": "s.month",
+    "country": "s.country",
+    "applicant": "s.applicant",
+    "ipc_class": "s.ipc_class",
+    "ipc_main": "substr(s.ipc_class, 1, 4)",
+}
+
+
+class PatentAggregator:
+    """专利统计聚合查询.
+
+    不带关键词时在写入路径维护的 ``patent_summary`` 汇总表上分组求和，
+    带关键词时先用全文索引筛选专利，再在每个专利的统计维度表 ``patent_summary_keys`` 上分组计数。
+    申请人和IPC分类取专利的第一申请人和第一分类。
+    """
+
+    def __init__(self, database: PatentDatabaseManager):
+        self.database = database
+
+    async def grouped_counts(
+        self,
+        group_by: Sequence[str],
+        keywords: Optional[Iterable[str]] = None,
+        countries: Optional[List[str]] = None,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """按 ``group_by`` 中的维度分组统计专利数，按专利数从多到少返回.
+
+        每行是维度值加上 ``patent_count`` 的字典。
+        """
+        unknown = [dimension for dimension in group_by if dimension not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown aggregation dimensions: {unknown}")
+
+        params: List[Any] = []
+        if keywords:
+            query = build_fts_query(keywords)
+            if not query:
+                return []
+            source = """(
+                SELECT k.*, 1 AS patent_count
+                FROM patents_fts
+                JOIN patents p ON p.id = patents_fts.rowid
+                JOIN patent_summary_keys k ON k.patent_id = p.patent_id
+                WHERE patents_fts MATCH ?
+            )"""
+            params.append(query)
+        else:
+            source = "patent_summary"
+
+        conditions = []
+        if countries:
+            conditions.append(f"s.country IN ({', '.join('?' for _ in countries)})")
+            params.extend(countries)
+        if start_year is not None:
+            conditions.append("s.year >= ?")
+            params.append(start_year)
+        if end_year is not None:
+            conditions.append("s.year <= ?")
+            params.append(end_year)
+
+        columns = [f"{DIMENSIONS[dimension]} AS {dimension}" for dimension in group_by]
+        sql = f"SELECT {', '.join(columns + ['SUM(s.patent_count) AS patent_count'])} FROM {source} s"
+        if conditions:
+            sql += f" WHERE {' AND '.join(conditions)}"
+        if group_by:
+            sql += f" GROUP BY {', '.join(DIMENSIONS[dimension] for dimension in group_by)}"
+            sql += " ORDER BY patent_count DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        start_time = time.perf_counter()
+        async with self.database.connection_pool.reader() as db:
+            cursor = await db.execute(sql, params)
+            rows = [dict(row) for row in await cursor.fetchall()]
+
+        metrics_collector.record_metric(
+            "patent.database_aggregation_duration",
+            time.perf_counter() - start_time,
+            tags={"unit": "seconds", "group_by": ",".join(group_by), "rows": str(len(rows))}
+        )
+        return [row for row in rows if row["patent_count"]]
+
+    async def total(self, **filters) -> int:
+        """符合条件的专利总数."""
+        rows = await self.grouped_counts((), **filters)
+        return rows[0]["patent_count"] if rows else 0
+
+    async def counts_by(self, dimension: str, **filters) -> Dict[Any, int]:
+        """按单个维度统计专利数."""
+        rows = await self.grouped_counts((dimension,), **filters)
+        return {row[dimension]: row["patent_count"] for row in rows}
+
+    async def yearly_counts(self, **filters) -> Dict[int, int]:
+        """每年的专利申请量，按年份排序."""
+        return dict(sorted((await self.counts_by("year", **filters)).items()))
+
+    async def yearly_distinct(self, **filters) -> Dict[int, Dict[str, int]]:
+        """每年不同申请人、国家和IPC分类的数量."""
+        result: Dict[int, Dict[str, int]] = {}
+        for dimension, name in (("applicant", "applicants"), ("country", "countries"), ("ipc_class", "ipc_classes")):
+            for row in await self.grouped_counts(("year", dimension), **filters):
+                result.setdefault(row["year"], {"applicants": 0, "countries": 0, "ipc_classes": 0})[name] += 1
+        return result
@@ -0,0 +1,121 @@
+"""CPC/IPC分类目录的本地存储."""
+
+import bisect
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import aiosqlite
+
+
+logger = logging.getLogger(__name__)
+
+
+class ClassificationCatalog:
+    """CPC/IPC分类目录的本地缓存.
+
+    分类目录持久化在SQLite中（按 ``(scheme, code)`` 建立主键索引），初始化时整体载入内存，
+    每个分类体系维护有序的代码列表，查询和前缀匹配都在本地完成。
+    目录按体系记录刷新时间，超过 ``ttl`` 后视为过期，由调用方重新下载。
+    """
+
+    def __init__(self, db_path: str = "data/patentsview_catalog.db", ttl: float = 30 * 86400):
+        self.db_path = Path(db_path)
+        self.ttl = ttl
+        self._titles: Dict[str, Dict[str, str]] = {}
+        self._codes: Dict[str, List[str]] = {}
+        self._refreshed_at: Dict[str, float] = {}
+        self._initialized = False
+
+    async def initialize(self) -> None:
+        """创建表并将已保存的目录载入内存."""
+        if self._initialized:
+            return
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS classification_codes (
+                    scheme TEXT NOT NULL,
+                    code TEXT NOT NULL,
+                    title TEXT,
+                    PRIMARY KEY (scheme, code)
+                ) WITHOUT ROWID
+            """)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS classification_catalogs (
+                    scheme TEXT PRIMARY KEY,
+                    refreshed_at REAL NOT NULL,
+                    code_count INTEGER NOT NULL
+                )
+            """)
+            await db.commit()
+
+            cursor = await db.execute("SELECT scheme, refreshed_at FROM classification_catalogs")
+            self._refreshed_at = dict(await cursor.fetchall())
+
+            cursor = await db.execute("SELECT scheme, code, title FROM classification_codes ORDER BY scheme, code")
+            titles: Dict[str, Dict[str, str]] = {}
+            for scheme, code, title in await cursor.fetchall():
+                titles.setdefault(scheme, {})[code] = title
+
+        self._titles = titles
+        self._codes = {scheme: sorted(codes) for scheme, codes in titles.items()}
+        self._initialized = True
+        logger.info(f"Loaded classification catalogs: { {s: len(c) for s, c in self._codes.items()} }")
+
+    def has_catalog(self, scheme: str) -> bool:
+        return scheme in self._refreshed_at
+
+    def is_stale(self, scheme: str) -> bool:
+        """目录不存在或超过TTL."""
+        refreshed_at = self._refreshed_at.get(scheme)
+        return refreshed_at is None or time.time() - refreshed_at > self.ttl
+
+    async def replace(self, scheme: str, entries: Dict[str, Optional[str]]) -> None:
+        """用新下载的 ``{代码: 标题}`` 替换整个分类体系的目录."""
+        refreshed_at = time.time()
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("DELETE FROM classification_codes WHERE scheme = ?", (scheme,))
+            await db.executemany(
+                "INSERT INTO classification_codes (scheme, code, title) VALUES (?, ?, ?)",
+                [(scheme, code, title) for code, title in entries.items()]
+            )
+            await db.execute(
+                "INSERT OR REPLACE INTO classification_catalogs (scheme, refreshed_at, code_count) VALUES (?, ?, ?)",
+                (scheme, refreshed_at, len(entries))
+            )
+            await db.commit()
+
+        self._titles[scheme] = dict(entries)
+        self._codes[scheme] = sorted(entries)
+        self._refreshed_at[scheme] = refreshed_at
+        logger.info(f"Refreshed {scheme} catalog with {len(entries)} codes")
+
+    def lookup(self, scheme: str, code: str) -> Optional[str]:
+        """查询分类代码的标题."""
+        return self._titles.get(scheme, {}).get(code)
+
+    def search_prefix(self, scheme: str, prefix: str = "", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """返回以 ``prefix`` 开头的分类（按代码排序）."""
+        codes = self._codes.get(scheme, [])
+        titles = self._titles.get(scheme, {})
+
+        start = bisect.bisect_left(codes, prefix)
+        results = []
+        for code in codes[start:]:
+            if not code.startswith(prefix) or (limit is not None and len(results) >= limit):
+                break
+            results.append({"code": code, "title": titles[code]})
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            scheme: {
+                "codes": len(self._codes.get(scheme, [])),
+                "refreshed_at": refreshed_at,
+                "stale": self.is_stale(scheme)
+            }
+            for scheme, refreshed_at in self._refreshed_at.items()
+        }
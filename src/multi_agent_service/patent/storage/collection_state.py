@@ -0,0 +1,295 @@
+"""增量收集状态：按 (数据源, 查询) 保存水位线和已收集的专利."""
+
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiosqlite
+
+from ..models.data import Patent
+from ..models.requests import PatentDataCollectionRequest
+from ...utils.bloom_filter import BloomFilter
+
+
+logger = logging.getLogger(__name__)
+
+
+_PATENT_FIELDS = {f.name for f in fields(Patent)}
+_DATE_FIELDS = ("application_date", "publication_date", "priority_date", "grant_date")
+
+
+@dataclass
+class CollectionWatermark:
+    """某个数据源上某个查询的收集进度."""
+    source: str
+    query_key: str
+    last_publication_date: Optional[datetime] = None
+    last_application_number: Optional[str] = None
+    record_count: int = 0
+    updated_at: Optional[datetime] = None
+
+
+def collection_query_key(request: PatentDataCollectionRequest) -> str:
+    """查询标识，只由决定结果集的条件（关键词、国家、IPC分类）生成，与日期范围和数量无关."""
+    parts = {
+        "keywords": sorted({keyword.strip().lower() for keyword in request.keywords}),
+        "countries": sorted(request.countries),
+        "ipc_classes": sorted(request.ipc_classes)
+    }
+    return hashlib.md5(json.dumps(parts, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _patent_to_dict(patent: Patent) -> Dict[str, Any]:
+    data = asdict(patent)
+    for name in _DATE_FIELDS:
+        if data.get(name) is not None:
+            data[name] = data[name].isoformat()
+    return data
+
+
+def _patent_from_dict(data: Dict[str, Any]) -> Patent:
+    values = {name: value for name, value in data.items() if name in _PATENT_FIELDS}
+    for name in _DATE_FIELDS:
+        if values.get(name):
+            values[name] = datetime.fromisoformat(values[name])
+    return Patent(**values)
+
+
+def patent_content_hash(patent: Patent) -> str:
+    """专利内容指纹：内容不变的重复记录指纹相同，状态等字段变化后指纹改变."""
+    payload = json.dumps(_patent_to_dict(patent), ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _watermark_date(patent: Patent) -> Optional[datetime]:
+    return patent.publication_date or patent.application_date
+
+
+class CollectionStateStore:
+    """增量收集状态存储.
+
+    每个 (数据源, 查询) 保存最近一条记录的公开日期作为水位线，以及已收集专利的内容指纹
+    布隆过滤器。之后的收集只请求水位线之后（减去 ``overlap_days`` 的重叠窗口，以免遗漏
+    同一天晚些时候公开的记录）的数据，新记录和内容变化的记录合并到已保存的数据集中。
+    布隆过滤器只用于快速确认“一定是新的”记录；“可能见过”的记录再与已保存记录的
+    ``content_hash`` 比对，误判不会丢弃记录。
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/patent_collection_state.db",
+        bloom_capacity: int = 100000,
+        bloom_error_rate: float = 0.001,
+        overlap_days: int = 1
+    ):
+        self.db_path = Path(db_path)
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+        self.overlap_days = overlap_days
+        self.last_deltas: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._initialized = False
+
+    async def initialize(self) -> None:
+        """创建表."""
+        if self._initialized:
+            return
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS collection_watermarks (
+                    source TEXT NOT NULL,
+                    query_key TEXT NOT NULL,
+                    last_publication_date TEXT,
+                    last_application_number TEXT,
+                    record_count INTEGER NOT NULL DEFAULT 0,
+                    seen_hashes BLOB,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (source, query_key)
+                )
+            """)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS collected_patents (
+                    source TEXT NOT NULL,
+                    query_key TEXT NOT NULL,
+                    application_number TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    publication_date TEXT,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (source, query_key, application_number)
+                )
+            """)
+            await db.commit()
+        self._initialized = True
+
+    async def get_watermark(self, source: str, query_key: str) -> Optional[CollectionWatermark]:
+        await self.initialize()
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute("""
+                SELECT last_publication_date, last_application_number, record_count, updated_at
+                FROM collection_watermarks WHERE source = ? AND query_key = ?
+            """, (source, query_key))
+            row = await cursor.fetchone()
+
+        if row is None:
+            return None
+        return CollectionWatermark(
+            source=source,
+            query_key=query_key,
+            last_publication_date=datetime.fromisoformat(row[0]) if row[0] else None,
+            last_application_number=row[1],
+            record_count=row[2],
+            updated_at=datetime.fromisoformat(row[3])
+        )
+
+    def delta_request(
+        self,
+        request: PatentDataCollectionRequest,
+        watermark: Optional[CollectionWatermark]
+    ) -> PatentDataCollectionRequest:
+        """根据水位线把请求的日期范围收窄到上次收集之后."""
+        if watermark is None or watermark.last_publication_date is None:
+            return request
+
+        date_range = dict(request.date_range or {})
+        start = (watermark.last_publication_date - timedelta(days=self.overlap_days)).strftime("%Y-%m-%d")
+        if not date_range.get("start") or date_range["start"] < start:
+            date_range["start"] = start
+        date_range.setdefault("end", datetime.now().strftime("%Y-%m-%d"))
+        return request.model_copy(update={"date_range": date_range})
+
+    async def collect_delta(
+        self,
+        source: str,
+        request: PatentDataCollectionRequest,
+        collect: Callable[[PatentDataCollectionRequest], Awaitable[List[Patent]]]
+    ) -> List[Patent]:
+        """增量收集并合并，返回合并后的数据集（按公开日期从新到旧，最多 ``max_patents`` 条）."""
+        query_key = collection_query_key(request)
+        watermark = await self.get_watermark(source, query_key)
+
+        fetched = await collect(self.delta_request(request, watermark))
+        new_count = await self.merge(source, query_key, fetched)
+
+        self.last_deltas[(source, query_key)] = {
+            "incremental": watermark is not None,
+            "fetched": len(fetched),
+            "new_or_changed": new_count
+        }
+        logger.info(
+            f"Delta collection for {source}/{query_key}: fetched {len(fetched)}, "
+            f"{new_count} new or changed (incremental={watermark is not None})"
+        )
+        return await self.load_dataset(source, query_key, limit=request.max_patents)
+
+    async def merge(self, source: str, query_key: str, patents: List[Patent]) -> int:
+        """把收集到的专利合并到已保存的数据集，返回新增或内容变化的记录数."""
+        await self.initialize()
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute(
+                "SELECT seen_hashes FROM collection_watermarks WHERE source = ? AND query_key = ?",
+                (source, query_key)
+            )
+            row = await cursor.fetchone()
+            seen = (
+                BloomFilter.from_bytes(row[0]) if row and row[0]
+                else BloomFilter(self.bloom_capacity, self.bloom_error_rate)
+            )
+
+            candidates = []
+            batch_hashes = set()
+            for patent in patents:
+                if not patent.application_number:
+                    continue
+                content_hash = patent_content_hash(patent)
+                if content_hash in batch_hashes:
+                    continue
+                batch_hashes.add(content_hash)
+                candidates.append((patent, content_hash, not seen.add(content_hash)))
+
+            stored = await self._stored_hashes(
+                db, source, query_key, [patent.application_number for patent, _, maybe_seen in candidates if maybe_seen]
+            )
+
+            rows = []
+            for patent, content_hash, maybe_seen in candidates:
+                if maybe_seen and stored.get(patent.application_number) == content_hash:
+                    continue
+                publication_date = _watermark_date(patent)
+                rows.append((
+                    source, query_key, patent.application_number, content_hash,
+                    publication_date.isoformat() if publication_date else None,
+                    json.dumps(_patent_to_dict(patent), ensure_ascii=False)
+                ))
+
+            await db.executemany("""
+                INSERT OR REPLACE INTO collected_patents
+                (source, query_key, application_number, content_hash, publication_date, data)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+
+            cursor = await db.execute("""
+                SELECT application_number, publication_date
+                FROM collected_patents
+                WHERE source = ? AND query_key = ? AND publication_date IS NOT NULL
+                ORDER BY publication_date DESC, application_number DESC
+                LIMIT 1
+            """, (source, query_key))
+            latest = await cursor.fetchone()
+            cursor = await db.execute(
+                "SELECT COUNT(*) FROM collected_patents WHERE source = ? AND query_key = ?", (source, query_key)
+            )
+            record_count = (await cursor.fetchone())[0]
+
+            await db.execute("""
+                INSERT OR REPLACE INTO collection_watermarks
+                (source, query_key, last_publication_date, last_application_number, record_count, seen_hashes, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
+                source, query_key,
+                latest[1] if latest else None,
+                latest[0] if latest else None,
+                record_count,
+                seen.to_bytes(),
+                datetime.now().isoformat()
+            ))
+            await db.commit()
+
+        return len(rows)
+
+    @staticmethod
+    async def _stored_hashes(
+        db: aiosqlite.Connection,
+        source: str,
+        query_key: str,
+        application_numbers: List[str],
+        batch_size: int = 500
+    ) -> Dict[str, str]:
+        """查询已保存记录的内容指纹."""
+        hashes: Dict[str, str] = {}
+        for start in range(0, len(application_numbers), batch_size):
+            batch = application_numbers[start:start + batch_size]
+            cursor = await db.execute(f"""
+                SELECT application_number, content_hash FROM collected_patents
+                WHERE source = ? AND query_key = ? AND application_number IN ({", ".join("?" * len(batch))})
+            """, (source, query_key, *batch))
+            hashes.update(await cursor.fetchall())
+        return hashes
+
+    async def load_dataset(self, source: str, query_key: str, limit: Optional[int] = None) -> List[Patent]:
+        """读取已保存的数据集."""
+        await self.initialize()
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute("""
+                SELECT data FROM collected_patents
+                WHERE source = ? AND query_key = ?
+                ORDER BY publication_date IS NULL, publication_date DESC, application_number DESC
+                LIMIT ?
+            """, (source, query_key, limit if limit is not None else -1))
+            rows = await cursor.fetchall()
+
+        return [_patent_from_dict(json.loads(row[0])) for row in rows]
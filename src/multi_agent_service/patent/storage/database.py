@@ -1,29 +1,112 @@
 """专利数据库存储机制."""
 
-import asyncio
 import logging
-import sqlite3
+import re
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 import json
 import aiosqlite
 
 from ..models.patent_data import PatentData, PatentDataset, DataQualityReport
 from ...utils.monitoring import metrics_collector
+from ...utils.sqlite_pool import SQLitePool
 
 
 logger = logging.getLogger(__name__)
 
 
+_PATENT_COLUMNS = (
+    "patent_id", "application_number", "publication_number", "title", "abstract",
+    "application_date", "publication_date", "grant_date", "country", "status",
+    "legal_status", "technical_field", "data_source", "data_quality_score",
+    "collection_timestamp", "content_hash", "similarity_hash", "keywords", "metadata"
+)
+
+_UPSERT_PATENT_SQL = f"""
+    INSERT INTO patents ({", ".join(_PATENT_COLUMNS)})
+    VALUES ({", ".join("?" for _ in _PATENT_COLUMNS)})
+    ON CONFLICT (patent_id) DO UPDATE SET
+        {", ".join(f"{column} = excluded.{column}" for column in _PATENT_COLUMNS[1:])},
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
+# 全文索引：中日韩文字逐字切分后由unicode61分词器索引，查询词作为短语匹配相邻的字
+_CJK_CHAR = re.compile(r"([\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af])")
+
+# bm25列权重：patent_id（不索引）、标题、摘要、权利要求
+_FTS_WEIGHTS = (0.0, 10.0, 5.0, 1.0)
+
+_INDEX_PATENT_SQL = """
+    INSERT OR REPLACE INTO patents_fts (rowid, patent_id, title, abstract, claims)
+    SELECT id, patent_id, ?, ?, ? FROM patents WHERE patent_id = ?
+"""
+
+# 统计汇总：patent_summary_keys 记录每个专利的统计维度（年、月、国家、第一申请人、第一IPC分类），
+# patent_summary 按维度组合累计专利数，写入时先减去专利旧维度的计数再加上新维度的计数
+_SUMMARY_REMOVE_SQL = """
+    UPDATE patent_summary SET patent_count = patent_count - 1
+    WHERE (year, month, country, applicant, ipc_class) IN (
+        SELECT year, month, country, applicant, ipc_class FROM patent_summary_keys WHERE patent_id = ?
+    )
+"""
+
+_SUMMARY_ADD_SQL = """
+    INSERT INTO patent_summary (year, month, country, applicant, ipc_class, patent_count)
+    VALUES (?, ?, ?, ?, ?, 1)
+    ON CONFLICT (year, month, country, applicant, ipc_class) DO UPDATE SET
+        patent_count = patent_count + 1
+"""
+
+
+def segment_cjk(text: Optional[str]) -> str:
+    """在中日韩文字两侧插入空格，使其逐字成词，其他文字按unicode61规则分词."""
+    return _CJK_CHAR.sub(r" \1 ", text or "")
+
+
+def build_fts_query(keywords: Iterable[str], match_all: bool = False) -> str:
+    """把关键词转换为FTS5查询，每个关键词是一个短语，默认匹配任意关键词."""
+    phrases = []
+    for keyword in keywords:
+        tokens = segment_cjk(keyword).split()
+        if tokens:
+            phrases.append('"' + " ".join(token.replace('"', '""') for token in tokens) + '"')
+    return (" AND " if match_all else " OR ").join(phrases)
+
+
+def _claims_text(metadata: Dict[str, Any]) -> str:
+    claims = metadata.get("claims") or ""
+    if isinstance(claims, (list, tuple)):
+        claims = "\n".join(str(claim) for claim in claims)
+    return str(claims)
+
+
 class PatentDatabaseManager:
-    """专利数据库管理器."""
+    """专利数据库管理器.
+    
+    通过 :class:`SQLitePool` 访问数据库：写操作串行使用同一个写连接，查询使用只读连接并发执行。
+    """
     
-    def __init__(self, db_path: str = "data/patent_database.db"):
+    def __init__(
+        self,
+        db_path: str = "data/patent_database.db",
+        bulk_chunk_size: int = 500,
+        pool_readers: Optional[int] = None
+    ):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._connection_pool = None
+        self._connection_pool = SQLitePool(str(self.db_path), readers=pool_readers)
         
+        self.bulk_chunk_size = bulk_chunk_size
+        self.last_bulk_stats: Dict[str, Any] = {}
+        
+    @property
+    def connection_pool(self) -> SQLitePool:
+        """数据库连接池，供统计查询等只读访问使用."""
+        return self._connection_pool
+    
     async def initialize(self) -> bool:
         """初始化数据库."""
         try:
@@ -32,6 +115,18 @@ class PatentDatabaseManager:
             # 创建数据库表
             await self._create_tables()
             
+            # 已有专利但全文索引或统计汇总为空（建立之前的数据库）时补建
+            async with self._connection_pool.reader() as db:
+                cursor = await db.execute("""
+                    SELECT EXISTS (SELECT 1 FROM patents), EXISTS (SELECT 1 FROM patents_fts),
+                           EXISTS (SELECT 1 FROM patent_summary_keys)
+                """)
+                has_patents, has_index, has_summary = await cursor.fetchone()
+            if has_patents and not has_index:
+                await self.rebuild_search_index()
+            if has_patents and not has_summary:
+                await self.rebuild_summary()
+            
             logger.info("Patent database initialized successfully")
             return True
             
@@ -41,7 +136,7 @@ class PatentDatabaseManager:
     
     async def _create_tables(self):
         """创建数据库表."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connection_pool.writer() as db:
             # 专利数据表
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS patents (
@@ -163,15 +258,50 @@ class PatentDatabaseManager:
             await db.execute("CREATE INDEX IF NOT EXISTS idx_patents_data_source ON patents (data_source)")
             await db.execute("CREATE INDEX IF NOT EXISTS idx_applicants_normalized_name ON patent_applicants (normalized_name)")
             await db.execute("CREATE INDEX IF NOT EXISTS idx_inventors_normalized_name ON patent_inventors (normalized_name)")
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_applicants_patent_id ON patent_applicants (patent_id)")
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_inventors_patent_id ON patent_inventors (patent_id)")
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_classifications_patent_id ON patent_classifications (patent_id)")
+            
+            # 全文索引（rowid与patents.id一致，由写入路径同步）
+            await db.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS patents_fts USING fts5 (
+                    patent_id UNINDEXED,
+                    title,
+                    abstract,
+                    claims,
+                    tokenize = 'unicode61 remove_diacritics 2'
+                )
+            """)
             
-            await db.commit()
+            # 统计汇总表（由写入路径维护）
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS patent_summary_keys (
+                    patent_id TEXT PRIMARY KEY,
+                    year INTEGER NOT NULL,
+                    month INTEGER NOT NULL,
+                    country TEXT NOT NULL,
+                    applicant TEXT NOT NULL,
+                    ipc_class TEXT NOT NULL
+                )
+            """)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS patent_summary (
+                    year INTEGER NOT NULL,
+                    month INTEGER NOT NULL,
+                    country TEXT NOT NULL,
+                    applicant TEXT NOT NULL,
+                    ipc_class TEXT NOT NULL,
+                    patent_count INTEGER NOT NULL,
+                    PRIMARY KEY (year, month, country, applicant, ipc_class)
+                )
+            """)
     
     async def save_patent(self, patent: PatentData) -> bool:
         """保存专利数据."""
         start_time = datetime.now()
         
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._connection_pool.writer() as db:
                 # 检查是否已存在
                 cursor = await db.execute(
                     "SELECT id FROM patents WHERE patent_id = ?",
@@ -188,7 +318,8 @@ class PatentDatabaseManager:
                     await self._insert_patent(db, patent)
                     logger.debug(f"Inserted patent {patent.patent_id}")
                 
-                await db.commit()
+                await self._index_patents(db, [patent])
+                await self._summarize_patents(db, [patent])
                 
                 # 记录监控指标
                 processing_time = (datetime.now() - start_time).total_seconds()
@@ -352,12 +483,225 @@ class PatentDatabaseManager:
                 classification.national_class
             ))
     
+    @staticmethod
+    def _patent_row(patent: PatentData) -> Tuple[Any, ...]:
+        return (
+            patent.patent_id,
+            patent.application_number,
+            patent.publication_number,
+            patent.title,
+            patent.abstract,
+            patent.application_date.isoformat(),
+            patent.publication_date.isoformat() if patent.publication_date else None,
+            patent.grant_date.isoformat() if patent.grant_date else None,
+            patent.country,
+            patent.status,
+            patent.legal_status,
+            patent.technical_field,
+            patent.data_source,
+            patent.data_quality_score,
+            patent.collection_timestamp.isoformat(),
+            patent.content_hash,
+            patent.similarity_hash,
+            json.dumps(patent.keywords),
+            json.dumps(patent.metadata)
+        )
+    
+    async def _upsert_patents(self, db: aiosqlite.Connection, patents: List[PatentData]) -> int:
+        """在当前事务中插入或更新一批专利及其关联数据，返回写入的行数."""
+        # 同一批次中重复的专利只保留最后一个
+        patents = list({patent.patent_id: patent for patent in patents}.values())
+        patent_ids = [(patent.patent_id,) for patent in patents]
+        applicant_rows = []
+        inventor_rows = []
+        classification_rows = []
+        for patent in patents:
+            for applicant in patent.applicants:
+                if isinstance(applicant, str):
+                    applicant_rows.append((patent.patent_id, applicant, applicant, None, None))
+                else:
+                    applicant_rows.append((
+                        patent.patent_id, applicant.name, applicant.normalized_name,
+                        applicant.country, applicant.applicant_type
+                    ))
+            for inventor in patent.inventors:
+                if isinstance(inventor, str):
+                    inventor_rows.append((patent.patent_id, inventor, inventor, None))
+                else:
+                    inventor_rows.append((patent.patent_id, inventor.name, inventor.normalized_name, inventor.country))
+            for classification in patent.classifications:
+                classification_rows.append((
+                    patent.patent_id, classification.ipc_class,
+                    classification.cpc_class, classification.national_class
+                ))
+        
+        await db.executemany(_UPSERT_PATENT_SQL, [self._patent_row(patent) for patent in patents])
+        
+        # 关联数据整体替换
+        await db.executemany("DELETE FROM patent_applicants WHERE patent_id = ?", patent_ids)
+        await db.executemany("DELETE FROM patent_inventors WHERE patent_id = ?", patent_ids)
+        await db.executemany("DELETE FROM patent_classifications WHERE patent_id = ?", patent_ids)
+        await db.executemany("""
+            INSERT INTO patent_applicants (
+                patent_id, name, normalized_name, country, applicant_type
+            ) VALUES (?, ?, ?, ?, ?)
+        """, applicant_rows)
+        await db.executemany("""
+            INSERT INTO patent_inventors (
+                patent_id, name, normalized_name, country
+            ) VALUES (?, ?, ?, ?)
+        """, inventor_rows)
+        await db.executemany("""
+            INSERT INTO patent_classifications (
+                patent_id, ipc_class, cpc_class, national_class
+            ) VALUES (?, ?, ?, ?)
+        """, classification_rows)
+        
+        await self._index_patents(db, patents)
+        await self._summarize_patents(db, patents)
+        
+        return len(patents) + len(applicant_rows) + len(inventor_rows) + len(classification_rows)
+    
+    async def _index_patents(self, db: aiosqlite.Connection, patents: List[PatentData]):
+        """在当前事务中更新专利的全文索引."""
+        await db.executemany(_INDEX_PATENT_SQL, [
+            (
+                segment_cjk(patent.title),
+                segment_cjk(patent.abstract),
+                segment_cjk(_claims_text(patent.metadata)),
+                patent.patent_id
+            )
+            for patent in patents
+        ])
+    
+    @staticmethod
+    def _summary_key(patent: PatentData) -> Tuple[Any, ...]:
+        applicant = patent.applicants[0] if patent.applicants else "Unknown"
+        if not isinstance(applicant, str):
+            applicant = applicant.name
+        ipc_class = next((c.ipc_class for c in patent.classifications if c.ipc_class), None)
+        if ipc_class is None:
+            ipc_class = patent.ipc_classes[0] if patent.ipc_classes else "Unknown"
+        return (
+            patent.patent_id,
+            patent.application_date.year,
+            patent.application_date.month,
+            patent.country,
+            applicant,
+            ipc_class
+        )
+    
+    async def _summarize_patents(self, db: aiosqlite.Connection, patents: List[PatentData]):
+        """在当前事务中更新专利在统计汇总表中的计数."""
+        keys = [self._summary_key(patent) for patent in patents]
+        await db.executemany(_SUMMARY_REMOVE_SQL, [(key[0],) for key in keys])
+        await db.executemany("""
+            INSERT OR REPLACE INTO patent_summary_keys (patent_id, year, month, country, applicant, ipc_class)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, keys)
+        await db.executemany(_SUMMARY_ADD_SQL, [key[1:] for key in keys])
+        await db.execute("DELETE FROM patent_summary WHERE patent_count <= 0")
+    
+    async def rebuild_summary(self) -> int:
+        """根据专利表重建统计汇总表，返回汇总的专利数."""
+        async with self._connection_pool.writer() as db:
+            await db.execute("DELETE FROM patent_summary_keys")
+            await db.execute("DELETE FROM patent_summary")
+            cursor = await db.execute("""
+                INSERT INTO patent_summary_keys (patent_id, year, month, country, applicant, ipc_class)
+                SELECT
+                    p.patent_id,
+                    CAST(substr(p.application_date, 1, 4) AS INTEGER),
+                    CAST(substr(p.application_date, 6, 2) AS INTEGER),
+                    p.country,
+                    COALESCE((SELECT a.name FROM patent_applicants a
+                              WHERE a.patent_id = p.patent_id ORDER BY a.id LIMIT 1), 'Unknown'),
+                    COALESCE((SELECT c.ipc_class FROM patent_classifications c
+                              WHERE c.patent_id = p.patent_id AND c.ipc_class IS NOT NULL
+                              ORDER BY c.id LIMIT 1), 'Unknown')
+                FROM patents p
+            """)
+            count = cursor.rowcount
+            await db.execute("""
+                INSERT INTO patent_summary (year, month, country, applicant, ipc_class, patent_count)
+                SELECT year, month, country, applicant, ipc_class, COUNT(*)
+                FROM patent_summary_keys
+                GROUP BY year, month, country, applicant, ipc_class
+            """)
+        logger.info(f"Rebuilt patent summary with {count} patents")
+        return count
+    
+    async def rebuild_search_index(self) -> int:
+        """根据专利表重建全文索引，返回索引的专利数."""
+        async with self._connection_pool.writer() as db:
+            await db.execute("DELETE FROM patents_fts")
+            cursor = await db.execute("SELECT id, patent_id, title, abstract, metadata FROM patents")
+            rows = [
+                (
+                    row["id"], row["patent_id"], segment_cjk(row["title"]), segment_cjk(row["abstract"]),
+                    segment_cjk(_claims_text(json.loads(row["metadata"]) if row["metadata"] else {}))
+                )
+                for row in await cursor.fetchall()
+            ]
+            await db.executemany(
+                "INSERT INTO patents_fts (rowid, patent_id, title, abstract, claims) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+        logger.info(f"Rebuilt patent search index with {len(rows)} patents")
+        return len(rows)
+    
+    async def save_patents_bulk(
+        self,
+        patents: Iterable[PatentData],
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """批量保存专利.
+        
+        在连接池的写连接上执行，每 ``chunk_size`` 个专利一个事务，主表以 ``INSERT ... ON CONFLICT DO UPDATE``
+        写入，关联表以 ``executemany`` 批量写入。某个批次失败时只回滚该批次，其余批次继续写入。
+        返回写入统计（专利数、行数、失败数、耗时和每秒写入行数）。
+        """
+        chunk_size = chunk_size or self.bulk_chunk_size
+        patents = list(patents)
+        stats = {"patents": 0, "rows": 0, "failed": 0, "chunks": 0, "duration": 0.0, "rows_per_second": 0.0}
+        start_time = time.perf_counter()
+        
+        async with self._connection_pool.writer() as db:
+            for start in range(0, len(patents), chunk_size):
+                chunk = patents[start:start + chunk_size]
+                try:
+                    stats["rows"] += await self._upsert_patents(db, chunk)
+                    await db.commit()
+                    stats["patents"] += len(chunk)
+                except Exception as e:
+                    await db.rollback()
+                    stats["failed"] += len(chunk)
+                    logger.error(f"Error saving patent chunk at offset {start}: {str(e)}")
+                stats["chunks"] += 1
+        
+        stats["duration"] = time.perf_counter() - start_time
+        if stats["duration"] > 0:
+            stats["rows_per_second"] = stats["rows"] / stats["duration"]
+            stats["patents_per_second"] = stats["patents"] / stats["duration"]
+        self.last_bulk_stats = stats
+        
+        metrics_collector.record_metric(
+            "patent.database_bulk_rows_per_second",
+            stats["rows_per_second"],
+            tags={"unit": "rows/s", "operation": "save_patents_bulk", "patent_count": str(len(patents))}
+        )
+        logger.info(
+            f"Bulk saved {stats['patents']} patents ({stats['rows']} rows) in {stats['duration']:.3f}s, "
+            f"{stats['rows_per_second']:.0f} rows/s, {stats['failed']} failed"
+        )
+        return stats
+    
     async def save_dataset(self, dataset: PatentDataset) -> bool:
         """保存专利数据集."""
         start_time = datetime.now()
         
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._connection_pool.writer() as db:
                 # 保存数据集信息
                 await db.execute("""
                     INSERT OR REPLACE INTO patent_datasets (
@@ -376,17 +720,13 @@ class PatentDatabaseManager:
                 # 删除旧的关联关系
                 await db.execute("DELETE FROM dataset_patents WHERE dataset_id = ?", (dataset.dataset_id,))
                 
-                # 保存每个专利并建立关联
-                for patent in dataset.patents:
-                    await self._insert_or_update_patent(db, patent)
-                    
-                    # 建立数据集-专利关联
-                    await db.execute("""
-                        INSERT INTO dataset_patents (dataset_id, patent_id)
-                        VALUES (?, ?)
-                    """, (dataset.dataset_id, patent.patent_id))
-                
-                await db.commit()
+                # 批量保存专利并建立关联
+                if dataset.patents:
+                    await self._upsert_patents(db, dataset.patents)
+                await db.executemany("""
+                    INSERT OR IGNORE INTO dataset_patents (dataset_id, patent_id)
+                    VALUES (?, ?)
+                """, [(dataset.dataset_id, patent.patent_id) for patent in dataset.patents])
                 
                 # 记录监控指标
                 processing_time = (datetime.now() - start_time).total_seconds()
@@ -403,24 +743,10 @@ class PatentDatabaseManager:
             logger.error(f"Error saving dataset {dataset.dataset_id}: {str(e)}")
             return False
     
-    async def _insert_or_update_patent(self, db: aiosqlite.Connection, patent: PatentData):
-        """插入或更新专利数据."""
-        cursor = await db.execute(
-            "SELECT id FROM patents WHERE patent_id = ?",
-            (patent.patent_id,)
-        )
-        existing = await cursor.fetchone()
-        
-        if existing:
-            await self._update_patent(db, patent)
-        else:
-            await self._insert_patent(db, patent)
-    
     async def get_patent(self, patent_id: str) -> Optional[PatentData]:
         """获取专利数据."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                db.row_factory = aiosqlite.Row
+            async with self._connection_pool.reader() as db:
                 
                 # 获取主要信息
                 cursor = await db.execute("""
@@ -460,6 +786,102 @@ class PatentDatabaseManager:
             logger.error(f"Error getting patent {patent_id}: {str(e)}")
             return None
     
+    async def search_patents(
+        self,
+        keywords: Union[str, List[str]],
+        limit: int = 50,
+        match_all: bool = False,
+        countries: Optional[List[str]] = None,
+        date_range: Optional[Dict[str, str]] = None,
+        ipc_classes: Optional[List[str]] = None
+    ) -> List[PatentData]:
+        """在本地专利库中检索标题、摘要和权利要求，按BM25相关度从高到低返回.
+        
+        ``date_range`` 的 ``start``/``end`` 为 ``YYYY-MM-DD`` 格式，按申请日过滤；
+        ``ipc_classes`` 为IPC分类前缀，命中任一前缀的专利才返回。过滤都在 ``LIMIT`` 之前完成。
+        """
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        query = build_fts_query(keywords, match_all)
+        if not query:
+            return []
+        
+        start_time = time.perf_counter()
+        conditions = ["patents_fts MATCH ?"]
+        params: List[Any] = [query]
+        if countries:
+            conditions.append(f"p.country IN ({', '.join('?' for _ in countries)})")
+            params.extend(countries)
+        if date_range and date_range.get("start"):
+            conditions.append("substr(p.application_date, 1, 10) >= ?")
+            params.append(date_range["start"])
+        if date_range and date_range.get("end"):
+            conditions.append("substr(p.application_date, 1, 10) <= ?")
+            params.append(date_range["end"])
+        if ipc_classes:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM patent_classifications c WHERE c.patent_id = p.patent_id AND ("
+                + " OR ".join("substr(c.ipc_class, 1, ?) = ?" for _ in ipc_classes) + "))"
+            )
+            for prefix in ipc_classes:
+                params.extend((len(prefix), prefix))
+        params.append(limit)
+        
+        try:
+            async with self._connection_pool.reader() as db:
+                cursor = await db.execute(f"""
+                    SELECT p.patent_id
+                    FROM patents_fts JOIN patents p ON p.id = patents_fts.rowid
+                    WHERE {" AND ".join(conditions)}
+                    ORDER BY bm25(patents_fts, {", ".join(str(w) for w in _FTS_WEIGHTS)})
+                    LIMIT ?
+                """, params)
+                patent_ids = [row[0] for row in await cursor.fetchall()]
+                patents = await self._load_patents(db, patent_ids)
+        except Exception as e:
+            logger.error(f"Error searching patents for {keywords}: {str(e)}")
+            return []
+        
+        metrics_collector.record_metric(
+            "patent.database_search_duration",
+            time.perf_counter() - start_time,
+            tags={"unit": "seconds", "operation": "search_patents", "result_count": str(len(patents))}
+        )
+        return patents
+    
+    async def _load_patents(self, db: aiosqlite.Connection, patent_ids: List[str]) -> List[PatentData]:
+        """批量读取专利及其关联数据，按 ``patent_ids`` 的顺序返回."""
+        if not patent_ids:
+            return []
+        
+        placeholders = ", ".join("?" for _ in patent_ids)
+        
+        async def fetch_grouped(table: str) -> Dict[str, List[Any]]:
+            cursor = await db.execute(
+                f"SELECT * FROM {table} WHERE patent_id IN ({placeholders}) ORDER BY id", patent_ids
+            )
+            grouped: Dict[str, List[Any]] = {}
+            for row in await cursor.fetchall():
+                grouped.setdefault(row["patent_id"], []).append(row)
+            return grouped
+        
+        cursor = await db.execute(f"SELECT * FROM patents WHERE patent_id IN ({placeholders})", patent_ids)
+        patent_rows = {row["patent_id"]: row for row in await cursor.fetchall()}
+        applicants = await fetch_grouped("patent_applicants")
+        inventors = await fetch_grouped("patent_inventors")
+        classifications = await fetch_grouped("patent_classifications")
+        
+        return [
+            self._build_patent_from_rows(
+                patent_rows[patent_id],
+                applicants.get(patent_id, []),
+                inventors.get(patent_id, []),
+                classifications.get(patent_id, [])
+            )
+            for patent_id in patent_ids
+            if patent_id in patent_rows
+        ]
+    
     def _build_patent_from_rows(self, patent_row, applicant_rows, inventor_rows, classification_rows) -> PatentData:
         """从数据库行构建PatentData对象."""
         from ..models.patent_data import PatentApplicant, PatentInventor, PatentClassification
@@ -522,7 +944,7 @@ class PatentDatabaseManager:
     async def save_quality_report(self, report: DataQualityReport) -> bool:
         """保存质量报告."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._connection_pool.writer() as db:
                 await db.execute("""
                     INSERT OR REPLACE INTO quality_reports (
                         report_id, dataset_id, total_records, valid_records, invalid_records,
@@ -547,7 +969,6 @@ class PatentDatabaseManager:
                     json.dumps(report.recommendations)
                 ))
                 
-                await db.commit()
                 logger.info(f"Saved quality report {report.report_id}")
                 return True
                 
@@ -558,7 +979,7 @@ class PatentDatabaseManager:
     async def get_database_stats(self) -> Dict[str, Any]:
         """获取数据库统计信息."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._connection_pool.reader() as db:
                 stats = {}
                 
                 # 专利总数
@@ -614,5 +1035,4 @@ class PatentDatabaseManager:
     
     async def cleanup(self):
         """清理数据库连接."""
-        # 如果有连接池，在这里清理
-        pass
\ No newline at end of file
+        await self._connection_pool.close()
@@ -0,0 +1,156 @@
+"""专利分析的纯计算内核.
+
+这些函数只接收和返回基础类型（列表、字典、数字），可以直接在进程池中执行；
+调用方先把 ``PatentDataset`` 提取为按字段组织的列数据，只传输分析需要的字段。
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+
+def extract_years(patents: List[Any]) -> List[int]:
+    """提取申请年份列."""
+    return [patent.application_date.year for patent in patents if patent.application_date]
+
+
+def extract_applicants(patents: List[Any]) -> List[List[str]]:
+    """提取申请人名称列."""
+    return [
+        [
+            applicant if isinstance(applicant, str) else getattr(applicant, 'name', str(applicant))
+            for applicant in patent.applicants or []
+        ]
+        for patent in patents
+    ]
+
+
+def compute_trend_stats(years: List[int]) -> Dict[str, Any]:
+    """按年份统计申请量并计算增长率和趋势方向."""
+    yearly_counts = defaultdict(int)
+    for year in years:
+        yearly_counts[year] += 1
+
+    # 计算增长率
+    growth_rates = {}
+    sorted_years = sorted(yearly_counts.keys())
+    for i in range(1, len(sorted_years)):
+        prev_year = sorted_years[i-1]
+        curr_year = sorted_years[i]
+        if yearly_counts[prev_year] > 0:
+            growth_rate = (yearly_counts[curr_year] - yearly_counts[prev_year]) / yearly_counts[prev_year]
+            growth_rates[curr_year] = growth_rate
+
+    # 确定趋势方向
+    if len(growth_rates) > 0:
+        avg_growth = sum(growth_rates.values()) / len(growth_rates)
+        if avg_growth > 0.1:
+            trend_direction = "increasing"
+        elif avg_growth < -0.1:
+            trend_direction = "decreasing"
+        else:
+            trend_direction = "stable"
+    else:
+        trend_direction = "stable"
+
+    # 找到峰值年份
+    peak_year: Optional[int] = max(yearly_counts.keys(), key=lambda y: yearly_counts[y]) if yearly_counts else None
+
+    return {
+        "yearly_counts": dict(yearly_counts),
+        "growth_rates": growth_rates,
+        "trend_direction": trend_direction,
+        "peak_year": peak_year,
+        "total_patents": sum(yearly_counts.values()),
+        "average_annual_growth": sum(growth_rates.values()) / len(growth_rates) if growth_rates else 0.0
+    }
+
+
+def compute_tech_stats(ipc_classes: List[List[str]], titles: List[str]) -> Dict[str, Any]:
+    """统计IPC分布并生成关键词聚类."""
+    # IPC分类统计
+    ipc_counts = defaultdict(int)
+    for patent_ipcs in ipc_classes:
+        for ipc in patent_ipcs:
+            # 提取主分类（前4位）
+            main_ipc = ipc[:4] if len(ipc) >= 4 else ipc
+            ipc_counts[main_ipc] += 1
+
+    # 关键词聚类（简化实现）
+    lowered_titles = [title.lower() for title in titles]
+    main_keywords = set()
+    for title in lowered_titles:
+        # 从标题中提取关键词
+        for word in title.split():
+            if len(word) > 4:  # 过滤短词
+                main_keywords.add(word)
+
+    # 创建关键词聚类
+    keyword_clusters = []
+    keyword_list = list(main_keywords)[:10]  # 取前10个关键词
+    for i, keyword in enumerate(keyword_list):
+        keyword_clusters.append({
+            "cluster_id": i,
+            "main_keyword": keyword,
+            "related_keywords": keyword_list[max(0, i-2):i+3],
+            "patent_count": sum(1 for title in lowered_titles if keyword in title)
+        })
+
+    # 识别主要技术
+    sorted_ipc = sorted(ipc_counts.items(), key=lambda x: x[1], reverse=True)
+    main_technologies = [f"{ipc} ({count} patents)" for ipc, count in sorted_ipc[:5]]  # 取前5个IPC分类
+
+    return {
+        "ipc_distribution": dict(ipc_counts),
+        "keyword_clusters": keyword_clusters,
+        "main_technologies": main_technologies
+    }
+
+
+def compute_competition_stats(applicants: List[List[str]]) -> Dict[str, Any]:
+    """统计申请人分布并计算市场集中度（HHI指数）."""
+    applicant_counts = defaultdict(int)
+    for patent_applicants in applicants:
+        for applicant_name in patent_applicants:
+            applicant_counts[applicant_name] += 1
+
+    # 排序获取顶级申请人
+    top_applicants = sorted(applicant_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+
+    total_patents = sum(applicant_counts.values())
+    if total_patents > 0:
+        hhi_index = sum((count / total_patents) ** 2 for count in applicant_counts.values())
+    else:
+        hhi_index = 0.0
+
+    return {
+        "applicant_distribution": dict(applicant_counts),
+        "top_applicants": top_applicants,
+        "market_concentration": hhi_index,
+        "hhi_index": hhi_index
+    }
+
+
+def compute_geography_stats(countries: List[str]) -> Dict[str, Any]:
+    """统计国家分布并计算全球化指数."""
+    country_counts = defaultdict(int)
+    for country in countries:
+        if country:
+            country_counts[country] += 1
+
+    # 排序获取顶级国家
+    top_countries = sorted(country_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+
+    # 计算全球化指数（简化版）
+    total_patents = sum(country_counts.values())
+    if total_patents > 0 and len(country_counts) > 1:
+        # 基于国家数量和分布均匀度计算
+        globalization_index = min(len(country_counts) / 10, 1.0)  # 假设最多10个主要国家
+    else:
+        globalization_index = 0.0
+
+    return {
+        "country_distribution": dict(country_counts),
+        "top_countries": top_countries,
+        "globalization_index": globalization_index,
+        "regional_trends": {}  # 简化实现
+    }
@@ -1,13 +1,16 @@
 """专利数据处理和质量控制工具."""
 
 import asyncio
+import contextlib
+import heapq
 import logging
 import re
-from collections import defaultdict, Counter
+from collections import defaultdict, deque, Counter
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple, Union
 from difflib import SequenceMatcher
 import hashlib
+from uuid import uuid4
 
 from ..models.patent_data import (
     PatentData, 
@@ -17,12 +20,57 @@ from ..models.patent_data import (
     PatentInventor,
     PatentClassification
 )
+from ...config.settings import settings
 from ...utils.monitoring import metrics_collector
 
 
 logger = logging.getLogger(__name__)
 
 
+PatentSource = Union[PatentDataset, Iterable[PatentData], AsyncIterable[PatentData]]
+
+
+async def iter_chunks(source: PatentSource, chunk_size: int) -> AsyncIterator[List[PatentData]]:
+    """把专利数据集、同步或异步可迭代对象按 ``chunk_size`` 分块."""
+    if isinstance(source, PatentDataset):
+        source = source.patents
+
+    chunk: List[PatentData] = []
+    if hasattr(source, "__aiter__"):
+        async for patent in source:
+            chunk.append(patent)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    else:
+        for patent in source:
+            chunk.append(patent)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+async def map_chunks(
+    chunks: AsyncIterator[List[PatentData]],
+    func: Callable[[List[PatentData]], Awaitable[List[PatentData]]],
+    concurrency: int
+) -> AsyncIterator[List[PatentData]]:
+    """并发处理数据块，最多同时处理 ``concurrency`` 个，按输入顺序产出结果."""
+    pending: Deque[asyncio.Future] = deque()
+    try:
+        async for chunk in chunks:
+            pending.append(asyncio.ensure_future(func(chunk)))
+            if len(pending) >= concurrency:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
 class PatentDataStandardizer:
     """专利数据标准化器."""
     
@@ -144,6 +192,25 @@ class PatentDataStandardizer:
             logger.error(f"Error standardizing dataset: {str(e)}")
             raise
     
+    async def standardize_stream(
+        self,
+        chunks: AsyncIterator[List[PatentData]],
+        concurrency: Optional[int] = None,
+        stats: Optional["StreamingQualityStats"] = None
+    ) -> AsyncIterator[List[PatentData]]:
+        """逐块标准化，最多同时处理 ``concurrency`` 个数据块，按输入顺序产出."""
+        
+        async def standardize_chunk(patents: List[PatentData]) -> List[PatentData]:
+            results = await asyncio.gather(*(self.standardize_patent(p) for p in patents), return_exceptions=True)
+            valid_patents = [result for result in results if not isinstance(result, Exception)]
+            if stats is not None:
+                stats.standardization_errors += len(patents) - len(valid_patents)
+            return valid_patents
+        
+        async for chunk in map_chunks(chunks, standardize_chunk, concurrency or settings.patent_stream_concurrency):
+            if chunk:
+                yield chunk
+    
     def _standardize_country(self, country: str) -> str:
         """标准化国家代码."""
         if not country:
@@ -321,6 +388,113 @@ class PatentDeduplicator:
         except Exception as e:
             logger.error(f"Error during deduplication: {str(e)}")
             raise
+    
+    async def deduplicate_stream(
+        self,
+        chunks: AsyncIterator[List[PatentData]],
+        stats: Optional["StreamingQualityStats"] = None
+    ) -> AsyncIterator[List[PatentData]]:
+        """逐块去重，只保留已产出专利的内容哈希和相似性哈希.
+        
+        与 :meth:`deduplicate_dataset` 不同，相似专利不等到全部数据到齐后比较质量评分，
+        先出现的专利保留。
+        """
+        content_hashes: Set[str] = set()
+        similarity_hashes: Set[str] = set()
+        
+        async for chunk in chunks:
+            unique_patents = []
+            for patent in chunk:
+                if patent.content_hash in content_hashes or patent.similarity_hash in similarity_hashes:
+                    logger.debug(f"Found duplicate: {patent.application_number}")
+                    continue
+                content_hashes.add(patent.content_hash)
+                similarity_hashes.add(patent.similarity_hash)
+                unique_patents.append(patent)
+            
+            if stats is not None:
+                stats.duplicate_records += len(chunk) - len(unique_patents)
+            if unique_patents:
+                yield unique_patents
+
+
+class StreamingQualityStats:
+    """逐条累积的质量统计.
+    
+    只保留计数、取值集合、日期范围和申请号，不保留专利本身；异常长标题只跟踪最长的
+    ``max_title_candidates`` 个候选，结束时与最终的平均标题长度比较。
+    """
+    
+    def __init__(self, max_title_candidates: int = 100):
+        self.max_title_candidates = max_title_candidates
+        self.total_records = 0
+        self.valid_records = 0
+        self.duplicate_records = 0
+        self.standardization_errors = 0
+        self.missing_total = 0
+        self.issue_total = 0
+        self.missing_fields: Counter = Counter()
+        self.invalid_formats: Counter = Counter()
+        self.sources: Set[str] = set()
+        self.countries: Set[str] = set()
+        self.country_count = 0
+        self.statuses: Set[str] = set()
+        self.status_count = 0
+        self.title_length_total = 0
+        self.title_count = 0
+        self.min_date: Optional[datetime] = None
+        self.max_date: Optional[datetime] = None
+        self.application_numbers: Dict[str, int] = {}
+        self.duplicate_numbers: Dict[str, int] = {}
+        self._long_titles: List[Tuple[int, int, str]] = []
+    
+    def add(self, patent: PatentData, validation_result: Dict[str, Any]) -> None:
+        """累积一个专利及其验证结果."""
+        index = self.total_records
+        self.total_records += 1
+        if validation_result['is_valid']:
+            self.valid_records += 1
+        
+        self.missing_total += len(validation_result['missing_fields'])
+        self.issue_total += len(validation_result['invalid_formats']) + len(validation_result['errors'])
+        self.missing_fields.update(validation_result['missing_fields'])
+        self.invalid_formats.update(validation_result['invalid_formats'])
+        
+        self.sources.add(patent.data_source)
+        if patent.country:
+            self.countries.add(patent.country)
+            self.country_count += 1
+        if patent.status:
+            self.statuses.add(patent.status)
+            self.status_count += 1
+        
+        if patent.title:
+            self.title_length_total += len(patent.title)
+            self.title_count += 1
+            entry = (len(patent.title), -index, patent.application_number)
+            if len(self._long_titles) < self.max_title_candidates:
+                heapq.heappush(self._long_titles, entry)
+            else:
+                heapq.heappushpop(self._long_titles, entry)
+        
+        if patent.application_date:
+            if self.min_date is None or patent.application_date < self.min_date:
+                self.min_date = patent.application_date
+            if self.max_date is None or patent.application_date > self.max_date:
+                self.max_date = patent.application_date
+        
+        if patent.application_number:
+            first_index = self.application_numbers.setdefault(patent.application_number, index)
+            if first_index != index:
+                self.duplicate_numbers.setdefault(patent.application_number, first_index)
+    
+    def long_titles(self) -> List[str]:
+        """长度超过平均标题长度3倍的标题对应的申请号，按出现顺序."""
+        if not self.title_count:
+            return []
+        threshold = self.title_length_total / self.title_count * 3
+        candidates = sorted((-neg_index, number) for length, neg_index, number in self._long_titles if length > threshold)
+        return [number for _, number in candidates]
 
 
 class PatentQualityController:
@@ -405,6 +579,58 @@ class PatentQualityController:
             logger.error(f"Error during quality validation: {str(e)}")
             raise
     
+    async def validate_stream(
+        self,
+        chunks: AsyncIterator[List[PatentData]],
+        stats: StreamingQualityStats
+    ) -> AsyncIterator[List[PatentData]]:
+        """逐块验证质量并累积到 ``stats``，数据块原样产出."""
+        async for chunk in chunks:
+            for patent in chunk:
+                stats.add(patent, await self._validate_patent(patent))
+            yield chunk
+    
+    def report_from_stats(self, stats: StreamingQualityStats, dataset_id: Optional[str] = None) -> DataQualityReport:
+        """由累积的统计生成质量报告，评分与 :meth:`validate_dataset` 的计算方式相同."""
+        total = stats.total_records
+        report = DataQualityReport(
+            dataset_id=dataset_id or str(uuid4()),
+            total_records=total,
+            valid_records=stats.valid_records,
+            invalid_records=total - stats.valid_records,
+            duplicate_records=stats.duplicate_records,
+            quality_score=0.0,
+            completeness_score=0.0,
+            accuracy_score=0.0,
+            consistency_score=0.0
+        )
+        
+        if total:
+            total_fields = len(self.required_fields) * total
+            report.completeness_score = max(0.0, (total_fields - stats.missing_total) / total_fields)
+            report.accuracy_score = max(0.0, (total - stats.issue_total) / total)
+            
+            source_consistency = len(stats.sources) / total
+            country_consistency = len(stats.countries) / stats.country_count if stats.country_count else 0.0
+            status_consistency = len(stats.statuses) / stats.status_count if stats.status_count else 0.0
+            report.consistency_score = max(0.0, 1.0 - (source_consistency + country_consistency + status_consistency) / 3.0)
+        report.quality_score = report.calculate_overall_score()
+        
+        report.missing_fields = dict(stats.missing_fields)
+        report.invalid_formats = dict(stats.invalid_formats)
+        
+        anomalies = [f"异常长标题: {number}" for number in stats.long_titles()]
+        if stats.min_date is not None:
+            date_range = (stats.max_date - stats.min_date).days
+            if date_range > 365 * 50:  # 超过50年
+                anomalies.append(f"申请日期跨度异常: {date_range}天")
+        for number, _ in sorted(stats.duplicate_numbers.items(), key=lambda item: item[1]):
+            anomalies.append(f"重复申请号: {number}")
+        report.data_anomalies = anomalies
+        
+        self._generate_recommendations(report)
+        return report
+    
     async def _validate_patent(self, patent: PatentData) -> Dict[str, Any]:
         """验证单个专利."""
         result = {
@@ -649,4 +875,74 @@ class PatentDataProcessor:
             
         except Exception as e:
             logger.error(f"Error processing dataset: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+    
+    async def process_stream(
+        self,
+        source: PatentSource,
+        chunk_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        standardize: bool = True,
+        deduplicate: bool = True,
+        validate: bool = True,
+        stats: Optional[StreamingQualityStats] = None
+    ) -> AsyncIterator[List[PatentData]]:
+        """流式处理专利数据，逐块产出处理后的专利.
+        
+        ``source`` 可以是专利数据集、专利的同步或异步可迭代对象，按 ``chunk_size`` 分块后依次经过
+        标准化、去重和质量验证，每个阶段消费并产出数据块。同一时刻只有少量数据块在处理中，
+        去重只保留哈希，质量统计累积到 ``stats``（结束后用 ``quality_controller.report_from_stats``
+        生成报告），因此内存占用不随数据量增长。产出的数据块可以直接交给
+        :meth:`PatentDatabaseManager.save_patents_bulk`。
+        """
+        stats = stats if stats is not None else StreamingQualityStats()
+        chunks = iter_chunks(source, chunk_size or settings.patent_stream_chunk_size)
+        
+        if standardize:
+            chunks = self.standardizer.standardize_stream(chunks, concurrency, stats)
+        if deduplicate:
+            chunks = self.deduplicator.deduplicate_stream(chunks, stats)
+        if validate:
+            chunks = self.quality_controller.validate_stream(chunks, stats)
+        
+        async with contextlib.aclosing(chunks):
+            async for chunk in chunks:
+                yield chunk
+    
+    async def process_to_database(
+        self,
+        source: PatentSource,
+        database: Any,
+        dataset_id: Optional[str] = None,
+        validate: bool = True,
+        **options
+    ) -> Tuple[Dict[str, Any], Optional[DataQualityReport]]:
+        """流式处理专利数据并逐块批量写入数据库，返回写入统计和质量报告.
+        
+        ``database`` 为 :class:`PatentDatabaseManager`，``options`` 透传给 :meth:`process_stream`。
+        """
+        start_time = datetime.now()
+        stats = StreamingQualityStats()
+        write_stats = {"patents": 0, "rows": 0, "failed": 0, "chunks": 0}
+        
+        async for chunk in self.process_stream(source, validate=validate, stats=stats, **options):
+            result = await database.save_patents_bulk(chunk, chunk_size=len(chunk))
+            for key in write_stats:
+                write_stats[key] += result.get(key, 0)
+        
+        quality_report = None
+        if validate:
+            quality_report = self.quality_controller.report_from_stats(stats, dataset_id)
+        
+        processing_time = (datetime.now() - start_time).total_seconds()
+        metrics_collector.record_metric(
+            "patent.dataset_processing_duration",
+            processing_time,
+            tags={"unit": "seconds", "patent_count": str(write_stats["patents"]), "mode": "stream"}
+        )
+        
+        logger.info(
+            f"Stream processing completed in {processing_time:.2f}s: {write_stats['patents']} patents saved, "
+            f"{stats.duplicate_records} duplicates removed, {stats.standardization_errors} standardization errors"
+        )
+        return write_stats, quality_report
\ No newline at end of file
@@ -4,18 +4,37 @@ import asyncio
 import json
 import logging
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
-from urllib.parse import urlencode
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+from urllib.parse import urlencode, urlsplit
 
-from .http_client import PatentHTTPClient, CircuitBreaker, RetryConfig, RateLimiter
+from .http_client import PatentHTTPClient, CircuitBreaker, RetryConfig
+from .response_cache import HTTPResponseCache, get_response_cache
 from ..models.data import Patent, PatentDataSource
 from ..models.requests import PatentDataCollectionRequest
+from ..models.patent_data import PatentData
+from ..storage.collection_state import CollectionStateStore, patent_content_hash
+from ..storage.database import PatentDatabaseManager
+from ...utils.rate_limiter import get_rate_limiter
+
+
+class PatentSourceClient(Protocol):
+    """数据源管理器依赖的数据源接口，远程API和本地专利库都按此实现."""
+    
+    config: PatentDataSource
+    
+    async def collect_patents(self, request: PatentDataCollectionRequest) -> List[Patent]: ...
+    
+    async def health_check(self) -> bool: ...
+    
+    def get_stats(self) -> Dict[str, Any]: ...
+    
+    async def close(self) -> None: ...
 
 
 class BasePatentAPI:
     """专利API基类."""
     
-    def __init__(self, config: PatentDataSource):
+    def __init__(self, config: PatentDataSource, response_cache: Optional[HTTPResponseCache] = None):
         """初始化API客户端."""
         self.config = config
         self.logger = logging.getLogger(f"{__name__}.{config.name}")
@@ -34,10 +53,12 @@ class BasePatentAPI:
             backoff_factor=2.0
         )
         
-        # 创建速率限制器
-        self.rate_limiter = RateLimiter(
-            max_requests=config.rate_limit,
-            time_window=60
+        # 速率限制器按上游主机共享，同一API的多个客户端共用配额（rate_limit 为每分钟请求数）
+        self.rate_limiter = get_rate_limiter(
+            urlsplit(config.base_url).netloc or config.name,
+            rate=config.rate_limit,
+            period=60.0,
+            burst=config.rate_limit_burst
         )
         
         # 创建HTTP客户端
@@ -46,7 +67,9 @@ class BasePatentAPI:
             timeout=config.timeout,
             retry_config=self.retry_config,
             circuit_breaker=self.circuit_breaker,
-            headers=self._get_headers()
+            headers=self._get_headers(),
+            response_cache=response_cache or get_response_cache(),
+            cache_ttl=config.cache_ttl
         )
         
         # 统计信息
@@ -129,9 +152,9 @@ class BasePatentAPI:
 class GooglePatentsAPI(BasePatentAPI):
     """Google Patents API集成."""
     
-    def __init__(self, config: PatentDataSource):
+    def __init__(self, config: PatentDataSource, response_cache: Optional[HTTPResponseCache] = None):
         """初始化Google Patents API客户端."""
-        super().__init__(config)
+        super().__init__(config, response_cache)
         
         # Google Patents特定配置
         self.search_endpoint = '/search'
@@ -298,9 +321,9 @@ class GooglePatentsAPI(BasePatentAPI):
 class PatentPublicAPI(BasePatentAPI):
     """公开专利API集成."""
     
-    def __init__(self, config: PatentDataSource):
+    def __init__(self, config: PatentDataSource, response_cache: Optional[HTTPResponseCache] = None):
         """初始化公开专利API客户端."""
-        super().__init__(config)
+        super().__init__(config, response_cache)
         
         # 公开专利API特定配置
         self.query_endpoint = '/patents/query'
@@ -488,19 +511,127 @@ class PatentPublicAPI(BasePatentAPI):
         return patents
 
 
+class LocalPatentAPI:
+    """本地专利库数据源：在已保存的专利中全文检索，不访问外部API."""
+    
+    def __init__(
+        self,
+        database: Optional[PatentDatabaseManager] = None,
+        db_path: str = "data/patent_database.db",
+        config: Optional[PatentDataSource] = None
+    ):
+        """初始化本地数据源，未传入 ``database`` 时首次使用才打开 ``db_path``."""
+        self.config = config or PatentDataSource(name='local', base_url=f'sqlite:///{db_path}', priority=0)
+        self.logger = logging.getLogger(f"{__name__}.{self.config.name}")
+        self.database = database
+        self.db_path = db_path
+        self._initialized = False
+        
+        self.stats = {
+            'total_requests': 0,
+            'successful_requests': 0,
+            'failed_requests': 0,
+            'patents_collected': 0,
+            'last_request_time': None
+        }
+    
+    async def _get_database(self) -> PatentDatabaseManager:
+        if self.database is None:
+            self.database = PatentDatabaseManager(self.db_path)
+        if not self._initialized:
+            self._initialized = await self.database.initialize()
+        return self.database
+    
+    async def collect_patents(self, request: PatentDataCollectionRequest) -> List[Patent]:
+        """收集专利数据（本地检索不限速）."""
+        self.stats['total_requests'] += 1
+        self.stats['last_request_time'] = datetime.now()
+        try:
+            patents = await self._collect_patents_impl(request)
+        except Exception as e:
+            self.stats['failed_requests'] += 1
+            self.logger.error(f"Failed to search local patents: {str(e)}")
+            raise e
+        
+        self.stats['successful_requests'] += 1
+        self.stats['patents_collected'] += len(patents)
+        self.logger.info(f"Found {len(patents)} patents in local database")
+        return patents
+    
+    async def _collect_patents_impl(self, request: PatentDataCollectionRequest) -> List[Patent]:
+        database = await self._get_database()
+        results = await database.search_patents(
+            request.keywords,
+            limit=min(request.max_patents, self.config.max_results),
+            countries=request.countries or None,
+            date_range=request.date_range,
+            ipc_classes=request.ipc_classes or None
+        )
+        return [self._to_patent(patent_data) for patent_data in results]
+    
+    @staticmethod
+    def _to_patent(patent_data: PatentData) -> Patent:
+        """把存储模型转换为收集结果使用的专利模型."""
+        return Patent(
+            application_number=patent_data.application_number,
+            title=patent_data.title,
+            abstract=patent_data.abstract,
+            applicants=[a if isinstance(a, str) else a.name for a in patent_data.applicants],
+            inventors=[i if isinstance(i, str) else i.name for i in patent_data.inventors],
+            application_date=patent_data.application_date,
+            publication_date=patent_data.publication_date,
+            ipc_classes=patent_data.ipc_classes or [
+                c.ipc_class for c in patent_data.classifications if c.ipc_class
+            ],
+            country=patent_data.country,
+            status=patent_data.status,
+            grant_date=patent_data.grant_date
+        )
+    
+    async def health_check(self) -> bool:
+        """本地数据库可以打开即视为健康."""
+        try:
+            await self._get_database()
+            return self._initialized
+        except Exception as e:
+            self.logger.warning(f"Health check failed for {self.config.name}: {str(e)}")
+            return False
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息."""
+        stats = self.stats.copy()
+        if stats['total_requests'] > 0:
+            stats['api_success_rate'] = (stats['successful_requests'] / stats['total_requests']) * 100
+        else:
+            stats['api_success_rate'] = 0.0
+        return stats
+    
+    async def close(self):
+        """关闭数据库连接."""
+        if self.database is not None:
+            await self.database.cleanup()
+
+
 class DataSourceManager:
     """数据源管理器，实现负载均衡和故障转移."""
     
-    def __init__(self):
+    def __init__(self, collection_state: Optional[CollectionStateStore] = None):
         """初始化数据源管理器."""
-        self.data_sources: Dict[str, BasePatentAPI] = {}
+        self.data_sources: Dict[str, PatentSourceClient] = {}
+        self.collection_state = collection_state
         self.logger = logging.getLogger(__name__)
         
         # 负载均衡配置
         self.load_balancing_strategy = 'round_robin'  # round_robin, priority, random
         self._current_source_index = 0
+        
+        # 对冲收集配置：同时启动的数据源数、启动下一个数据源前等待的时间(秒)
+        self.hedging_config = {
+            'fanout': 1,
+            'hedge_delay': 2.0
+        }
     
-    def register_data_source(self, name: str, api_client: BasePatentAPI):
+    def register_data_source(self, name: str, api_client: PatentSourceClient):
         """注册数据源."""
         self.data_sources[name] = api_client
         self.logger.info(f"Registered data source: {name}")
@@ -527,7 +658,7 @@ class DataSourceManager:
                     continue
                 
                 # 尝试收集数据
-                patents = await api_client.collect_patents(request)
+                patents = await self.collect_from_source(source_name, request)
                 
                 if patents:
                     self.logger.info(f"Successfully collected {len(patents)} patents from {source_name}")
@@ -546,6 +677,122 @@ class DataSourceManager:
         else:
             raise Exception("All data sources failed to collect patents")
     
+    async def collect_patents_hedged(
+        self,
+        request: PatentDataCollectionRequest,
+        fanout: Optional[int] = None,
+        hedge_delay: Optional[float] = None,
+        target_count: Optional[int] = None,
+        deadline: Optional[float] = None
+    ) -> Tuple[List[Patent], Dict[str, str]]:
+        """对冲并行收集专利数据.
+        
+        先并发启动优先级最高的 ``fanout`` 个数据源；在还没有数据源返回结果时，每过 ``hedge_delay`` 秒
+        （或运行中的数据源全部失败时立即）启动下一个数据源。各数据源的结果按申请号和内容指纹去重合并，
+        合并数量达到 ``target_count``（默认 ``max_patents``）或超过 ``deadline`` 秒（默认请求超时）后返回，
+        并取消仍未完成的请求，因此收集延迟取决于最快的健康数据源，而不是挂起的主数据源的超时时间。
+        
+        返回合并后的专利和各数据源的结果（success、empty、failed、cancelled 或 skipped）。
+        """
+        available_sources = [name for name in request.data_sources if name in self.data_sources]
+        
+        if not available_sources:
+            raise Exception("No available data sources")
+        
+        fanout = max(1, fanout or self.hedging_config['fanout'])
+        hedge_delay = self.hedging_config['hedge_delay'] if hedge_delay is None else hedge_delay
+        target_count = target_count or request.max_patents
+        
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + (request.timeout if deadline is None else deadline)
+        
+        pending_sources = list(self._sort_sources_by_priority(available_sources))
+        running: Dict[asyncio.Task, str] = {}
+        outcome: Dict[str, str] = {}
+        merged: List[Patent] = []
+        seen = set()
+        succeeded = False
+        last_exception = None
+        
+        def launch() -> None:
+            source_name = pending_sources.pop(0)
+            running[asyncio.create_task(self._collect_if_healthy(source_name, request))] = source_name
+            outcome[source_name] = 'running'
+        
+        for _ in range(min(fanout, len(pending_sources))):
+            launch()
+        next_hedge_at = loop.time() + hedge_delay
+        
+        try:
+            while running and len(merged) < target_count:
+                now = loop.time()
+                if now >= deadline_at:
+                    self.logger.warning(f"Hedged collection deadline reached with {len(merged)} patents")
+                    break
+                
+                hedging = bool(pending_sources) and not succeeded
+                timeout = min(deadline_at, next_hedge_at) - now if hedging else deadline_at - now
+                done, _ = await asyncio.wait(running, timeout=max(0.0, timeout), return_when=asyncio.FIRST_COMPLETED)
+                
+                for task in done:
+                    source_name = running.pop(task)
+                    try:
+                        patents = task.result()
+                    except Exception as e:
+                        last_exception = e
+                        outcome[source_name] = 'failed'
+                        self.logger.error(f"Failed to collect from {source_name}: {str(e)}")
+                        continue
+                    
+                    if not patents:
+                        outcome[source_name] = 'empty'
+                        self.logger.warning(f"No patents collected from {source_name}")
+                        continue
+                    
+                    succeeded = True
+                    outcome[source_name] = 'success'
+                    for patent in patents:
+                        keys = {patent_content_hash(patent)}
+                        if patent.application_number:
+                            keys.add(patent.application_number)
+                        if not keys & seen:
+                            seen.update(keys)
+                            merged.append(patent)
+                    self.logger.info(f"Collected {len(patents)} patents from {source_name}, {len(merged)} merged")
+                
+                # 对冲延迟已到或运行中的数据源都已结束，启动下一个数据源
+                if pending_sources and not succeeded and (not running or loop.time() >= next_hedge_at):
+                    launch()
+                    next_hedge_at = loop.time() + hedge_delay
+        finally:
+            for task, source_name in running.items():
+                task.cancel()
+                outcome[source_name] = 'cancelled'
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+        
+        for source_name in pending_sources:
+            outcome[source_name] = 'skipped'
+        
+        if merged:
+            return merged[:target_count], outcome
+        if last_exception:
+            raise last_exception
+        raise Exception("All data sources failed to collect patents")
+    
+    async def _collect_if_healthy(self, source_name: str, request: PatentDataCollectionRequest) -> List[Patent]:
+        """检查健康状态后从数据源收集."""
+        if not await self.data_sources[source_name].health_check():
+            raise Exception(f"Data source {source_name} health check failed")
+        return await self.collect_from_source(source_name, request)
+    
+    async def collect_from_source(self, source_name: str, request: PatentDataCollectionRequest) -> List[Patent]:
+        """从单个数据源收集；增量请求只获取水位线之后的记录，返回合并后的数据集."""
+        api_client = self.data_sources[source_name]
+        if request.incremental and self.collection_state is not None:
+            return await self.collection_state.collect_delta(source_name, request, api_client.collect_patents)
+        return await api_client.collect_patents(request)
+    
     def _sort_sources_by_priority(self, source_names: List[str]) -> List[str]:
         """按优先级排序数据源."""
         # 这里可以根据数据源的配置优先级进行排序
@@ -1,35 +1,36 @@
 """Patent database integration utilities."""
 
-import asyncio
 import json
 import logging
-import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
-from contextlib import asynccontextmanager
-from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+import aiosqlite
 
 from ..models.data import Patent, PatentDataset, PatentDataQuality
 from ...utils.monitoring import metrics_collector, measure_performance
+from ...utils.sqlite_pool import SQLitePool
 
 
 class PatentDatabaseManager:
-    """专利数据库管理器，集成现有数据库存储机制."""
+    """专利数据库管理器，集成现有数据库存储机制.
+    
+    SQL在 :class:`SQLitePool` 的连接线程上执行，不阻塞事件循环。
+    """
     
-    def __init__(self, db_path: str = "data/patent.db"):
+    def __init__(self, db_path: str = "data/patent.db", pool_readers: Optional[int] = None):
         """初始化数据库管理器."""
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.logger = logging.getLogger(__name__)
-        self._connection_pool = []
-        self._max_connections = 10
+        self._connection_pool = SQLitePool(str(self.db_path), readers=pool_readers)
         
     async def initialize(self):
         """初始化数据库表结构."""
         try:
             with measure_performance("patent.database.initialize"):
-                async with self._get_connection() as conn:
+                async with self._connection_pool.writer() as conn:
                     await self._create_tables(conn)
                     self.logger.info("Patent database initialized successfully")
                     
@@ -49,26 +50,15 @@ class PatentDatabaseManager:
             )
             raise e
     
-    @asynccontextmanager
-    async def _get_connection(self):
-        """获取数据库连接."""
-        conn = None
-        try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            yield conn
-        except Exception as e:
-            self.logger.error(f"Database connection error: {str(e)}")
-            raise e
-        finally:
-            if conn:
-                conn.close()
+    async def close(self):
+        """关闭数据库连接."""
+        await self._connection_pool.close()
     
-    async def _create_tables(self, conn: sqlite3.Connection):
+    async def _create_tables(self, conn: aiosqlite.Connection):
         """创建数据库表."""
         try:
             # 专利表
-            conn.execute("""
+            await conn.execute("""
                 CREATE TABLE IF NOT EXISTS patents (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     application_number TEXT UNIQUE NOT NULL,
@@ -91,7 +81,7 @@ class PatentDatabaseManager:
             """)
             
             # 专利数据集表
-            conn.execute("""
+            await conn.execute("""
                 CREATE TABLE IF NOT EXISTS patent_datasets (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     dataset_id TEXT UNIQUE NOT NULL,
@@ -105,7 +95,7 @@ class PatentDatabaseManager:
             """)
             
             # 数据质量记录表
-            conn.execute("""
+            await conn.execute("""
                 CREATE TABLE IF NOT EXISTS data_quality_records (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     dataset_id TEXT NOT NULL,
@@ -121,7 +111,7 @@ class PatentDatabaseManager:
             """)
             
             # 数据处理统计表
-            conn.execute("""
+            await conn.execute("""
                 CREATE TABLE IF NOT EXISTS processing_stats (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     dataset_id TEXT NOT NULL,
@@ -137,24 +127,24 @@ class PatentDatabaseManager:
             """)
             
             # 创建索引
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_patents_app_number ON patents(application_number)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_patents_country ON patents(country)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_patents_app_date ON patents(application_date)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_datasets_collection_date ON patent_datasets(collection_date)")
+            await conn.execute("CREATE INDEX IF NOT EXISTS idx_patents_app_number ON patents(application_number)")
+            await conn.execute("CREATE INDEX IF NOT EXISTS idx_patents_country ON patents(country)")
+            await conn.execute("CREATE INDEX IF NOT EXISTS idx_patents_app_date ON patents(application_date)")
+            await conn.execute("CREATE INDEX IF NOT EXISTS idx_datasets_collection_date ON patent_datasets(collection_date)")
             
-            conn.commit()
+            await conn.commit()
             
         except Exception as e:
-            conn.rollback()
+            await conn.rollback()
             raise e
     
     async def save_patent_dataset(self, dataset: PatentDataset, dataset_id: str) -> bool:
         """保存专利数据集."""
         try:
             with measure_performance("patent.database.save_dataset"):
-                async with self._get_connection() as conn:
+                async with self._connection_pool.writer() as conn:
                     # 保存数据集元信息
-                    conn.execute("""
+                    await conn.execute("""
                         INSERT OR REPLACE INTO patent_datasets 
                         (dataset_id, total_count, search_keywords, collection_date, data_sources, quality_score)
                         VALUES (?, ?, ?, ?, ?, ?)
@@ -171,8 +161,6 @@ class PatentDatabaseManager:
                     for patent in dataset.patents:
                         await self._save_patent(conn, patent)
                     
-                    conn.commit()
-                    
                     # 记录监控指标
                     metrics_collector.record_metric(
                         "patent.database.dataset_saved", 
@@ -192,10 +180,10 @@ class PatentDatabaseManager:
             )
             return False
     
-    async def _save_patent(self, conn: sqlite3.Connection, patent: Patent):
+    async def _save_patent(self, conn: aiosqlite.Connection, patent: Patent):
         """保存单个专利."""
         try:
-            conn.execute("""
+            await conn.execute("""
                 INSERT OR REPLACE INTO patents 
                 (application_number, title, abstract, applicants, inventors, 
                  application_date, publication_date, ipc_classes, country, status,
@@ -227,13 +215,13 @@ class PatentDatabaseManager:
         """加载专利数据集."""
         try:
             with measure_performance("patent.database.load_dataset"):
-                async with self._get_connection() as conn:
+                async with self._connection_pool.reader() as conn:
                     # 加载数据集元信息
-                    cursor = conn.execute("""
+                    cursor = await conn.execute("""
                         SELECT * FROM patent_datasets WHERE dataset_id = ?
                     """, (dataset_id,))
                     
-                    dataset_row = cursor.fetchone()
+                    dataset_row = await cursor.fetchone()
                     if not dataset_row:
                         return None
                     
@@ -267,18 +255,18 @@ class PatentDatabaseManager:
             )
             return None
     
-    async def _load_patents_for_dataset(self, conn: sqlite3.Connection, dataset_id: str) -> List[Patent]:
+    async def _load_patents_for_dataset(self, conn: aiosqlite.Connection, dataset_id: str) -> List[Patent]:
         """加载数据集的专利数据."""
         try:
             # 这里简化处理，实际应该有专利与数据集的关联表
-            cursor = conn.execute("""
+            cursor = await conn.execute("""
                 SELECT * FROM patents 
                 ORDER BY created_at DESC 
                 LIMIT 1000
             """)
             
             patents = []
-            for row in cursor.fetchall():
+            for row in await cursor.fetchall():
                 patent = Patent(
                     application_number=row['application_number'],
                     title=row['title'],
@@ -307,8 +295,8 @@ class PatentDatabaseManager:
         """保存数据质量记录."""
         try:
             with measure_performance("patent.database.save_quality"):
-                async with self._get_connection() as conn:
-                    conn.execute("""
+                async with self._connection_pool.writer() as conn:
+                    await conn.execute("""
                         INSERT INTO data_quality_records 
                         (dataset_id, completeness_score, accuracy_score, consistency_score, 
                          timeliness_score, overall_score, issues)
@@ -323,8 +311,6 @@ class PatentDatabaseManager:
                         json.dumps(quality.issues)
                     ))
                     
-                    conn.commit()
-                    
                     # 记录监控指标
                     metrics_collector.record_metric(
                         "patent.database.quality_saved", 
@@ -342,8 +328,8 @@ class PatentDatabaseManager:
         """保存数据处理统计信息."""
         try:
             with measure_performance("patent.database.save_stats"):
-                async with self._get_connection() as conn:
-                    conn.execute("""
+                async with self._connection_pool.writer() as conn:
+                    await conn.execute("""
                         INSERT INTO processing_stats 
                         (dataset_id, total_processed, standardized_count, duplicates_removed, 
                          invalid_patents_removed, quality_issues_fixed, processing_duration)
@@ -358,8 +344,6 @@ class PatentDatabaseManager:
                         duration
                     ))
                     
-                    conn.commit()
-                    
                     # 记录监控指标
                     metrics_collector.record_metric(
                         "patent.database.stats_saved", 
@@ -376,8 +360,8 @@ class PatentDatabaseManager:
     async def get_quality_history(self, dataset_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         """获取数据质量历史记录."""
         try:
-            async with self._get_connection() as conn:
-                cursor = conn.execute("""
+            async with self._connection_pool.reader() as conn:
+                cursor = await conn.execute("""
                     SELECT * FROM data_quality_records 
                     WHERE dataset_id = ? 
                     ORDER BY created_at DESC 
@@ -385,7 +369,7 @@ class PatentDatabaseManager:
                 """, (dataset_id, limit))
                 
                 records = []
-                for row in cursor.fetchall():
+                for row in await cursor.fetchall():
                     record = {
                         'id': row['id'],
                         'dataset_id': row['dataset_id'],
@@ -408,8 +392,8 @@ class PatentDatabaseManager:
     async def get_processing_history(self, dataset_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         """获取数据处理历史记录."""
         try:
-            async with self._get_connection() as conn:
-                cursor = conn.execute("""
+            async with self._connection_pool.reader() as conn:
+                cursor = await conn.execute("""
                     SELECT * FROM processing_stats 
                     WHERE dataset_id = ? 
                     ORDER BY created_at DESC 
@@ -417,7 +401,7 @@ class PatentDatabaseManager:
                 """, (dataset_id, limit))
                 
                 records = []
-                for row in cursor.fetchall():
+                for row in await cursor.fetchall():
                     record = {
                         'id': row['id'],
                         'dataset_id': row['dataset_id'],
@@ -442,9 +426,9 @@ class PatentDatabaseManager:
         try:
             cutoff_date = datetime.now() - timedelta(days=days)
             
-            async with self._get_connection() as conn:
+            async with self._connection_pool.writer() as conn:
                 # 清理旧的质量记录
-                cursor = conn.execute("""
+                cursor = await conn.execute("""
                     DELETE FROM data_quality_records 
                     WHERE created_at < ?
                 """, (cutoff_date.isoformat(),))
@@ -452,15 +436,13 @@ class PatentDatabaseManager:
                 quality_deleted = cursor.rowcount
                 
                 # 清理旧的处理统计
-                cursor = conn.execute("""
+                cursor = await conn.execute("""
                     DELETE FROM processing_stats 
                     WHERE created_at < ?
                 """, (cutoff_date.isoformat(),))
                 
                 stats_deleted = cursor.rowcount
                 
-                conn.commit()
-                
                 self.logger.info(f"Cleaned up {quality_deleted} quality records and {stats_deleted} processing stats")
                 
                 # 记录监控指标
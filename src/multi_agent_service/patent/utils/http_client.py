@@ -3,11 +3,13 @@
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional
 from enum import Enum
 
 import httpx
 
+from .response_cache import HTTPResponseCache
+
 
 class CircuitBreakerState(Enum):
     """熔断器状态."""
@@ -105,7 +107,9 @@ class PatentHTTPClient:
                  timeout: int = 30,
                  retry_config: Optional[RetryConfig] = None,
                  circuit_breaker: Optional[CircuitBreaker] = None,
-                 headers: Optional[Dict[str, str]] = None):
+                 headers: Optional[Dict[str, str]] = None,
+                 response_cache: Optional[HTTPResponseCache] = None,
+                 cache_ttl: Optional[float] = None):
         """
         初始化HTTP客户端.
         
@@ -115,11 +119,15 @@ class PatentHTTPClient:
             retry_config: 重试配置
             circuit_breaker: 熔断器
             headers: 请求头
+            response_cache: HTTP响应缓存（为None时不缓存）
+            cache_ttl: 响应没有缓存头时的缓存时间(秒)，默认使用缓存的default_ttl
         """
         self.base_url = base_url
         self.timeout = timeout
         self.retry_config = retry_config or RetryConfig()
         self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.response_cache = response_cache
+        self.cache_ttl = cache_ttl
         
         # 默认请求头
         default_headers = {
@@ -157,6 +165,38 @@ class PatentHTTPClient:
         return await self._request('POST', url, json=json, data=data, **kwargs)
     
     async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """发送HTTP请求，配置了响应缓存时先查缓存."""
+        if self.response_cache is None:
+            return await self._send(method, url, **kwargs)
+        
+        full_url = str(self._client.base_url.join(url))
+        request_headers = {**self._client.headers, **(kwargs.get('headers') or {})}
+        
+        async def send(conditional: Dict[str, str]):
+            send_kwargs = dict(kwargs)
+            if conditional:
+                send_kwargs['headers'] = {**(kwargs.get('headers') or {}), **conditional}
+            response = await self._send(method, url, **send_kwargs)
+            return response.status_code, dict(response.headers), response.content
+        
+        cached = await self.response_cache.fetch(
+            method, full_url, send,
+            params=kwargs.get('params'),
+            body=kwargs.get('json', kwargs.get('data')),
+            request_headers=request_headers,
+            ttl=self.cache_ttl
+        )
+        
+        headers = {name: value for name, value in cached.headers.items() if name.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')}
+        headers['X-Cache'] = cached.cache_status
+        return httpx.Response(
+            cached.status,
+            headers=headers,
+            content=cached.body,
+            request=httpx.Request(method, full_url, params=kwargs.get('params'))
+        )
+    
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
         """发送HTTP请求，集成重试和熔断器机制."""
         self.stats['total_requests'] += 1
         
@@ -246,6 +286,9 @@ class PatentHTTPClient:
         stats['circuit_breaker_state'] = self.circuit_breaker.state.value
         stats['circuit_breaker_failure_count'] = self.circuit_breaker.failure_count
         
+        if self.response_cache is not None:
+            stats['response_cache'] = self.response_cache.get_stats()
+        
         return stats
     
     async def __aenter__(self):
@@ -255,43 +298,3 @@ class PatentHTTPClient:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """异步上下文管理器出口."""
         await self.close()
-
-
-class RateLimiter:
-    """速率限制器."""
-    
-    def __init__(self, max_requests: int, time_window: int = 60):
-        """
-        初始化速率限制器.
-        
-        Args:
-            max_requests: 时间窗口内的最大请求数
-            time_window: 时间窗口(秒)
-        """
-        self.max_requests = max_requests
-        self.time_window = time_window
-        self.requests: List[datetime] = []
-        self._lock = asyncio.Lock()
-    
-    async def acquire(self):
-        """获取请求许可."""
-        async with self._lock:
-            now = datetime.now()
-            
-            # 清理过期的请求记录
-            cutoff_time = now - timedelta(seconds=self.time_window)
-            self.requests = [req_time for req_time in self.requests if req_time > cutoff_time]
-            
-            # 检查是否超过限制
-            if len(self.requests) >= self.max_requests:
-                # 计算需要等待的时间
-                oldest_request = min(self.requests)
-                wait_time = (oldest_request + timedelta(seconds=self.time_window) - now).total_seconds()
-                
-                if wait_time > 0:
-                    await asyncio.sleep(wait_time)
-                    return await self.acquire()  # 递归调用
-            
-            # 记录当前请求
-            self.requests.append(now)
-            return True
\ No newline at end of file
@@ -0,0 +1,509 @@
+"""HTTP响应缓存：磁盘内容寻址存储 + 条件请求重验证."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from ...config.settings import settings
+from ...utils.rate_limiter import RateLimiter
+
+
+logger = logging.getLogger(__name__)
+
+
+# 默认可缓存的状态码（RFC 9110 15.1）
+CACHEABLE_STATUS = frozenset({200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501})
+# 已解码的响应体不能再携带这些头
+_STRIPPED_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"})
+
+SendFunc = Callable[[Dict[str, str]], Awaitable[Tuple[int, Dict[str, str], bytes]]]
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """解析Cache-Control头，指令名小写."""
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class CachedResponse:
+    """缓存返回的响应，接口与aiohttp响应的常用部分一致."""
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes, cache_status: str = "MISS"):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.cache_status = cache_status
+
+    async def read(self) -> bytes:
+        return self.body
+
+    async def text(self, encoding: str = "utf-8") -> str:
+        return self.body.decode(encoding, errors="replace")
+
+    async def json(self, **kwargs) -> Any:
+        return json.loads(self.body)
+
+
+class _Entry:
+    __slots__ = ("key", "url", "status", "headers", "body_hash", "size", "stored_at", "expires_at")
+
+    def __init__(self, key, url, status, headers, body_hash, size, stored_at, expires_at):
+        self.key = key
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body_hash = body_hash
+        self.size = size
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get("last-modified")
+
+
+class HTTPResponseCache:
+    """遵循HTTP缓存语义的私有响应缓存.
+
+    响应体按SHA-256内容寻址存放在 ``cache_dir/objects`` 下（相同内容只存一份），
+    SQLite索引记录请求键、响应头和过期时间。新鲜度按 ``Cache-Control: max-age``、
+    ``Expires`` 和 ``Age`` 计算，响应没有缓存头时使用 ``default_ttl``；过期条目带
+    ``If-None-Match`` / ``If-Modified-Since`` 重验证，304时只更新元数据。
+    总大小超过 ``max_bytes`` 时按最近最少使用淘汰。
+
+    内存中的条目表是权威状态，SQLite索引只用于重启后恢复：索引写入先进入队列，
+    由后台任务在线程中批量提交，命中只记录访问时间，不在事件循环中执行SQL。
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "data/http_cache",
+        max_bytes: int = 256 * 1024 * 1024,
+        default_ttl: float = 3600
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._objects_dir = self.cache_dir / "objects"
+        self._objects_dir.mkdir(parents=True, exist_ok=True)
+
+        self._db = sqlite3.connect(self.cache_dir / "index.db", check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._db.commit()
+        self._db_lock = threading.Lock()
+        self._closed = False
+
+        # 待写入索引的语句和访问时间，由 _flush_pending 批量提交
+        self._pending: List[Tuple[str, tuple]] = []
+        self._pending_access: Dict[str, float] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+        # 内存中的LRU顺序（最近使用的在末尾）
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._blob_refs: Dict[str, int] = {}
+        self._blob_sizes: Dict[str, int] = {}
+        for row in self._db.execute(
+            "SELECT key, url, status, headers, body_hash, size, stored_at, expires_at FROM entries ORDER BY last_access"
+        ):
+            entry = _Entry(row[0], row[1], row[2], json.loads(row[3]), *row[4:])
+            self._entries[entry.key] = entry
+            self._blob_refs[entry.body_hash] = self._blob_refs.get(entry.body_hash, 0) + 1
+            self._blob_sizes[entry.body_hash] = entry.size
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "stores": 0,
+            "evictions": 0,
+            "bypassed": 0
+        }
+
+    @staticmethod
+    def make_key(
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Optional[Any] = None,
+        vary_headers: Optional[Dict[str, str]] = None
+    ) -> str:
+        """请求键：方法、URL、排序后的查询参数、请求体和影响响应的请求头."""
+        parts = [method.upper(), url]
+        if params:
+            parts.append(urlencode(sorted((str(k), str(v)) for k, v in params.items())))
+        if body is not None:
+            parts.append(body if isinstance(body, str) else json.dumps(body, sort_keys=True, ensure_ascii=False, default=str))
+        if vary_headers:
+            parts.append(json.dumps(sorted(vary_headers.items())))
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self._blob_sizes.values())
+
+    def _blob_path(self, body_hash: str) -> Path:
+        return self._objects_dir / body_hash[:2] / body_hash
+
+    def _freshness_lifetime(self, headers: Dict[str, str], now: float, ttl: Optional[float]) -> Optional[float]:
+        """计算响应的剩余新鲜时间；返回None表示不可缓存."""
+        directives = parse_cache_control(headers.get("cache-control"))
+        if "no-store" in directives:
+            return None
+        if headers.get("vary", "").strip() == "*":
+            return None
+
+        age = float(headers.get("age", 0) or 0)
+        if "no-cache" in directives:
+            lifetime = 0.0
+        elif directives.get("max-age") is not None:
+            try:
+                lifetime = float(directives["max-age"])
+            except ValueError:
+                lifetime = 0.0
+        elif "expires" in headers:
+            expires = _parse_http_date(headers["expires"])
+            date = _parse_http_date(headers.get("date")) or now
+            lifetime = max(0.0, expires - date) if expires is not None else 0.0
+        else:
+            lifetime = self.default_ttl if ttl is None else ttl
+
+        remaining = lifetime - age
+        if remaining <= 0 and "etag" not in headers and "last-modified" not in headers:
+            # 已过期又无法重验证，没有缓存价值
+            return None
+        return max(0.0, remaining)
+
+    def lookup(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def _read_body(self, entry: _Entry) -> Optional[bytes]:
+        try:
+            return await asyncio.to_thread(self._blob_path(entry.body_hash).read_bytes)
+        except FileNotFoundError:
+            logger.warning(f"Cached body missing for {entry.url}, dropping entry")
+            self._remove(entry.key)
+            return None
+
+    async def store(
+        self,
+        key: str,
+        url: str,
+        status: int,
+        headers: Dict[str, str],
+        body: bytes,
+        ttl: Optional[float] = None
+    ) -> bool:
+        """保存响应，返回是否可缓存."""
+        now = time.time()
+        headers = {name.lower(): value for name, value in headers.items() if name.lower() not in _STRIPPED_HEADERS}
+        lifetime = self._freshness_lifetime(headers, now, ttl)
+        if status not in CACHEABLE_STATUS or lifetime is None or len(body) > self.max_bytes:
+            return False
+
+        body_hash = hashlib.sha256(body).hexdigest()
+        if body_hash not in self._blob_sizes:
+            path = self._blob_path(body_hash)
+            await asyncio.to_thread(self._write_blob, path, body)
+
+        # 先增加新内容的引用再释放旧条目，内容未变时旧条目不会删除同一个文件
+        self._blob_refs[body_hash] = self._blob_refs.get(body_hash, 0) + 1
+        self._blob_sizes[body_hash] = len(body)
+        self._remove(key, delete_row=False)
+
+        entry = _Entry(key, url, status, headers, body_hash, len(body), now, now + lifetime)
+        self._entries[key] = entry
+        self._queue_write(
+            key,
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, url, status, json.dumps(headers), body_hash, len(body), now, entry.expires_at, now)
+        )
+        self.stats["stores"] += 1
+
+        self._evict()
+        return True
+
+    @staticmethod
+    def _write_blob(path: Path, body: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(".tmp")
+        temp.write_bytes(body)
+        os.replace(temp, path)
+
+    def _refresh(self, entry: _Entry, headers: Dict[str, str], ttl: Optional[float]) -> None:
+        """304响应：合并新的响应头并重新计算过期时间."""
+        now = time.time()
+        entry.headers.update({
+            name.lower(): value for name, value in headers.items() if name.lower() not in _STRIPPED_HEADERS
+        })
+        lifetime = self._freshness_lifetime(entry.headers, now, ttl)
+        entry.stored_at = now
+        entry.expires_at = now + (lifetime or 0.0)
+        self._queue_write(
+            entry.key,
+            "UPDATE entries SET headers = ?, stored_at = ?, expires_at = ?, last_access = ? WHERE key = ?",
+            (json.dumps(entry.headers), now, entry.expires_at, now, entry.key)
+        )
+
+    def _remove(self, key: str, delete_row: bool = True) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        refs = self._blob_refs.get(entry.body_hash, 1) - 1
+        if refs <= 0:
+            self._blob_refs.pop(entry.body_hash, None)
+            self._blob_sizes.pop(entry.body_hash, None)
+            try:
+                self._blob_path(entry.body_hash).unlink()
+            except FileNotFoundError:
+                pass
+        else:
+            self._blob_refs[entry.body_hash] = refs
+        if delete_row:
+            self._queue_write(key, "DELETE FROM entries WHERE key = ?", (key,))
+
+    def _evict(self) -> None:
+        while self._entries and self.total_bytes > self.max_bytes:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.stats["evictions"] += 1
+
+    def _touch(self, entry: _Entry) -> None:
+        self._pending_access[entry.key] = time.time()
+        self._schedule_flush()
+
+    def _queue_write(self, key: str, sql: str, args: tuple) -> None:
+        # 这些语句已写入最新的访问时间，之前记录的访问时间作废
+        self._pending_access.pop(key, None)
+        self._pending.append((sql, args))
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 不在事件循环中（例如同步调用clear）时直接写入
+            self._write_batch(*self._take_pending())
+            return
+        self._flush_task = loop.create_task(self._flush_pending())
+
+    def _take_pending(self) -> Tuple[List[Tuple[str, tuple]], List[Tuple[float, str]]]:
+        statements, self._pending = self._pending, []
+        accesses = [(accessed_at, key) for key, accessed_at in self._pending_access.items()]
+        self._pending_access = {}
+        return statements, accesses
+
+    async def _flush_pending(self) -> None:
+        while self._pending or self._pending_access:
+            try:
+                await asyncio.to_thread(self._write_batch, *self._take_pending())
+            except Exception as e:
+                logger.warning(f"Failed to update HTTP cache index: {str(e)}")
+
+    def _write_batch(self, statements: List[Tuple[str, tuple]], accesses: List[Tuple[float, str]]) -> None:
+        with self._db_lock:
+            if self._closed or not (statements or accesses):
+                return
+            for sql, args in statements:
+                self._db.execute(sql, args)
+            if accesses:
+                self._db.executemany("UPDATE entries SET last_access = ? WHERE key = ?", accesses)
+            self._db.commit()
+
+    async def flush(self) -> None:
+        """等待排队的索引写入全部提交."""
+        while self._flush_task is not None and not self._flush_task.done():
+            await asyncio.shield(self._flush_task)
+
+    async def fetch(
+        self,
+        method: str,
+        url: str,
+        send: SendFunc,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        body: Optional[Any] = None,
+        request_headers: Optional[Dict[str, str]] = None,
+        vary_headers: Iterable[str] = ("authorization", "accept", "accept-language"),
+        cacheable: Optional[bool] = None,
+        ttl: Optional[float] = None
+    ) -> CachedResponse:
+        """通过缓存执行请求.
+
+        ``send`` 接收需要附加的条件请求头，返回 ``(状态码, 响应头, 已解码的响应体)``。
+        默认只缓存GET/HEAD；以POST发送查询的检索API可传 ``cacheable=True``。
+        """
+        if cacheable is None:
+            cacheable = method.upper() in ("GET", "HEAD")
+        request_headers = {name.lower(): value for name, value in (request_headers or {}).items()}
+        request_directives = parse_cache_control(request_headers.get("cache-control"))
+
+        if not cacheable or "no-store" in request_directives:
+            self.stats["bypassed"] += 1
+            status, headers, content = await send({})
+            return CachedResponse(status, headers, content, "BYPASS")
+
+        key = self.make_key(
+            method, url, params, body,
+            {name: request_headers[name] for name in vary_headers if name in request_headers}
+        )
+        entry = self.lookup(key)
+        now = time.time()
+
+        if entry is not None and entry.expires_at > now and "no-cache" not in request_directives:
+            cached = await self._read_body(entry)
+            if cached is not None:
+                self.stats["hits"] += 1
+                self._touch(entry)
+                return CachedResponse(entry.status, self._response_headers(entry, now), cached, "HIT")
+            entry = None
+
+        conditional: Dict[str, str] = {}
+        if entry is not None:
+            if entry.etag:
+                conditional["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                conditional["If-Modified-Since"] = entry.last_modified
+
+        status, headers, content = await send(conditional)
+
+        if status == 304 and entry is not None:
+            cached = await self._read_body(entry)
+            if cached is not None:
+                self.stats["revalidated"] += 1
+                self._refresh(entry, headers, ttl)
+                return CachedResponse(entry.status, self._response_headers(entry, time.time()), cached, "REVALIDATED")
+            # 本地内容丢失，去掉条件头重新请求
+            status, headers, content = await send({})
+
+        self.stats["misses"] += 1
+        await self.store(key, url, status, headers, content, ttl)
+        return CachedResponse(status, headers, content, "MISS")
+
+    @staticmethod
+    def _response_headers(entry: _Entry, now: float) -> Dict[str, str]:
+        headers = dict(entry.headers)
+        headers["age"] = str(int(max(0, now - entry.stored_at)))
+        headers.setdefault("date", formatdate(entry.stored_at, usegmt=True))
+        return headers
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        lookups = stats["hits"] + stats["revalidated"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["revalidated"]) / lookups * 100 if lookups else 0.0
+        stats["entries"] = len(self._entries)
+        stats["bytes"] = self.total_bytes
+        return stats
+
+    def clear(self) -> None:
+        for key in list(self._entries):
+            self._remove(key)
+
+    def close(self) -> None:
+        """提交剩余的索引写入并关闭索引数据库."""
+        self._write_batch(*self._take_pending())
+        with self._db_lock:
+            self._closed = True
+            self._db.close()
+
+
+@asynccontextmanager
+async def cached_aiohttp_request(
+    session,
+    cache: Optional[HTTPResponseCache],
+    method: str,
+    url: str,
+    *,
+    cacheable: Optional[bool] = None,
+    ttl: Optional[float] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    **kwargs
+):
+    """通过缓存发送aiohttp请求，用法与 ``session.request`` 的上下文管理器相同.
+
+    指定 ``rate_limiter`` 时只在实际发送请求（包括条件重验证）前获取时间槽，缓存命中不占用速率配额。
+    """
+    if cache is None:
+        if rate_limiter is not None:
+            await rate_limiter.acquire()
+        async with getattr(session, method.lower())(url, **kwargs) as response:
+            yield response
+        return
+
+    headers = dict(kwargs.pop("headers", None) or {})
+
+    async def send(conditional: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        if rate_limiter is not None:
+            await rate_limiter.acquire()
+        async with getattr(session, method.lower())(url, headers={**headers, **conditional}, **kwargs) as response:
+            return response.status, dict(response.headers), await response.read()
+
+    yield await cache.fetch(
+        method, url, send,
+        params=kwargs.get("params"),
+        body=kwargs.get("json", kwargs.get("data")),
+        request_headers={**getattr(session, "headers", {}), **headers},
+        cacheable=cacheable,
+        ttl=ttl
+    )
+
+
+_shared_cache: Optional[HTTPResponseCache] = None
+
+
+def get_response_cache() -> Optional[HTTPResponseCache]:
+    """按配置返回进程内共享的响应缓存，未启用时返回None."""
+    global _shared_cache
+    if not settings.http_cache_enabled:
+        return None
+    if _shared_cache is None:
+        _shared_cache = HTTPResponseCache(
+            settings.http_cache_dir,
+            max_bytes=settings.http_cache_max_mb * 1024 * 1024,
+            default_ttl=settings.http_cache_default_ttl
+        )
+    return _shared_cache
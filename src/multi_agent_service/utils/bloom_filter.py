@@ -0,0 +1,55 @@
+"""布隆过滤器."""
+
+import hashlib
+import math
+import struct
+
+
+_HEADER = struct.Struct("<QII")
+
+
+class BloomFilter:
+    """布隆过滤器，用于大量URL、内容指纹等的去重（可能误判为已存在，不会漏判）."""
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def add(self, item: str) -> bool:
+        """加入元素，返回元素此前是否不存在."""
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self._bits[position >> 3] & mask:
+                self._bits[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def to_bytes(self) -> bytes:
+        """序列化，用于持久化."""
+        return _HEADER.pack(self.size, self.hash_count, self.count) + bytes(self._bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        size, hash_count, count = _HEADER.unpack_from(data)
+        bloom = cls.__new__(cls)
+        bloom.size = size
+        bloom.hash_count = hash_count
+        bloom.count = count
+        bloom._bits = bytearray(data[_HEADER.size:])
+        if len(bloom._bits) != (size + 7) // 8:
+            raise ValueError("Corrupted bloom filter data")
+        return bloom
@@ -0,0 +1,236 @@
+"""CPU密集型任务的进程池执行层.
+
+分析类计算（趋势、竞争、技术分类等）是纯Python代码，在事件循环中直接运行会阻塞
+同一worker中的所有请求。``ProcessPoolTier`` 管理若干命名的 ``ProcessPoolExecutor``，
+每个池有独立的并发上限；调用方协程被取消或超时时，尚未开始的子进程任务会被撤销。
+
+提交到进程池的函数必须是模块级函数，参数和返回值应尽量使用列表、字典、字符串、
+数字等基础类型，避免在进程间传输pydantic模型或整个共享状态。
+"""
+
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from ..config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_target(target: str) -> Callable[..., Any]:
+    """解析 ``module:function`` 形式的目标函数."""
+    module_name, _, func_name = target.partition(":")
+    if not module_name or not func_name:
+        raise ValueError(f"Invalid process target '{target}', expected 'module:function'")
+    func: Any = importlib.import_module(module_name)
+    for part in func_name.split("."):
+        func = getattr(func, part)
+    return func
+
+
+class _ManagedPool:
+    """单个命名进程池及其并发控制."""
+
+    def __init__(self, name: str, max_workers: int, max_concurrency: int, start_method: Optional[str]):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.start_method = start_method
+        self.executor: Optional[ProcessPoolExecutor] = None
+        # asyncio.Semaphore 绑定事件循环，每个循环单独创建
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0, "active": 0}
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            mp_context = multiprocessing.get_context(self.start_method) if self.start_method else None
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=mp_context)
+            logger.info(f"Started process pool '{self.name}' with {self.max_workers} workers")
+        return self.executor
+
+    def get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    def reset(self) -> None:
+        """子进程异常退出后丢弃执行器，下次提交时重建."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=wait, cancel_futures=True)
+            self.executor = None
+
+
+class ProcessPoolTier:
+    """CPU密集型节点和Agent方法的进程池执行层.
+
+    Args:
+        max_workers: 默认池的进程数，默认读取 ``settings.process_pool_workers``（0表示CPU核数）
+        max_concurrency: 默认池同时在途的任务数上限，默认与进程数相同
+        pool_sizes: 额外命名池的进程数，如 ``{"analysis": 4}``
+        start_method: 子进程启动方式（spawn / forkserver / fork）
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        pool_sizes: Optional[Dict[str, int]] = None,
+        start_method: Optional[str] = None
+    ):
+        self.max_workers = max_workers or settings.process_pool_workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or settings.process_pool_max_concurrency or self.max_workers
+        self.pool_sizes = pool_sizes or {}
+        self.start_method = start_method or settings.process_pool_start_method or None
+        self._pools: Dict[str, _ManagedPool] = {}
+
+    def _get_pool(self, name: str) -> _ManagedPool:
+        pool = self._pools.get(name)
+        if pool is None:
+            workers = self.pool_sizes.get(name, self.max_workers)
+            concurrency = self.max_concurrency if name == "default" else workers
+            pool = _ManagedPool(name, workers, concurrency, self.start_method)
+            self._pools[name] = pool
+        return pool
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        pool: str = "default",
+        timeout: Optional[float] = None
+    ) -> Any:
+        """在进程池中执行函数并等待结果，不阻塞事件循环.
+
+        调用方被取消或超时时撤销尚未开始的任务；已经在子进程中运行的任务无法中断，
+        其结果会被丢弃。
+        """
+        managed = self._get_pool(pool)
+
+        async with managed.get_semaphore():
+            future = managed.get_executor().submit(func, *args)
+            managed.stats["submitted"] += 1
+            managed.stats["active"] += 1
+            try:
+                wrapped = asyncio.wrap_future(future)
+                if timeout is not None:
+                    result = await asyncio.wait_for(wrapped, timeout)
+                else:
+                    result = await wrapped
+                managed.stats["completed"] += 1
+                return result
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                future.cancel()
+                managed.stats["cancelled"] += 1
+                raise
+            except BrokenProcessPool:
+                managed.stats["failed"] += 1
+                logger.error(f"Process pool '{pool}' is broken, it will be recreated on next use")
+                managed.reset()
+                raise
+            except Exception:
+                managed.stats["failed"] += 1
+                raise
+            finally:
+                managed.stats["active"] -= 1
+
+    async def run_target(
+        self,
+        target: str,
+        *args: Any,
+        pool: str = "default",
+        timeout: Optional[float] = None
+    ) -> Any:
+        """按 ``module:function`` 路径执行目标函数."""
+        return await self.run(resolve_target(target), *args, pool=pool, timeout=timeout)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭所有进程池，撤销排队中的任务."""
+        for managed in self._pools.values():
+            managed.shutdown(wait=wait)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取各进程池的统计信息."""
+        return {
+            name: {
+                **managed.stats,
+                "max_workers": managed.max_workers,
+                "max_concurrency": managed.max_concurrency,
+                "started": managed.executor is not None
+            }
+            for name, managed in self._pools.items()
+        }
+
+
+def is_process_node(node: Any) -> bool:
+    """判断节点是否标记为在进程池中执行."""
+    config = getattr(node, "config", None) or {}
+    return config.get("execution_tier") == "process" and bool(config.get("process_target"))
+
+
+async def run_node_in_process(
+    node: Any,
+    input_data: Optional[Dict[str, Any]],
+    shared_state: Optional[Dict[str, Any]] = None,
+    tier: Optional["ProcessPoolTier"] = None
+) -> Dict[str, Any]:
+    """在进程池中执行标记为CPU密集型的节点.
+
+    节点配置项:
+        execution_tier: 设为 ``"process"`` 时启用
+        process_target: 模块级函数路径 ``module:function``，签名为 ``(input_data) -> dict``
+        process_input_keys: 只传输这些输入字段，默认传输完整输入
+        process_pool: 使用的命名进程池，默认 ``"default"``
+        process_timeout: 超时时间（秒）
+    """
+    config = getattr(node, "config", None) or {}
+    merged = {**(shared_state or {}), **(input_data or {})}
+
+    input_keys = config.get("process_input_keys")
+    if input_keys is not None:
+        merged = {key: merged[key] for key in input_keys if key in merged}
+
+    tier = tier or get_process_pool()
+    result = await tier.run_target(
+        config["process_target"],
+        merged,
+        pool=config.get("process_pool", "default"),
+        timeout=config.get("process_timeout")
+    )
+    return result if isinstance(result, dict) else {"result": result}
+
+
+# 全局进程池（每个worker进程一个）
+_global_process_pool: Optional[ProcessPoolTier] = None
+
+
+def get_process_pool() -> ProcessPoolTier:
+    """获取全局进程池执行层."""
+    global _global_process_pool
+    if _global_process_pool is None:
+        _global_process_pool = ProcessPoolTier()
+    return _global_process_pool
+
+
+def shutdown_process_pool(wait: bool = True) -> None:
+    """关闭全局进程池."""
+    global _global_process_pool
+    if _global_process_pool is not None:
+        _global_process_pool.shutdown(wait=wait)
+        _global_process_pool = None
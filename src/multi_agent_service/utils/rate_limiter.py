@@ -0,0 +1,117 @@
+"""按上游共享的异步速率限制器（GCRA）."""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+
+class RateLimiter:
+    """GCRA速率限制器：平均每 ``period`` 秒放行 ``rate`` 个请求，允许 ``burst`` 个突发请求.
+
+    只记录下一个请求的理论到达时间（TAT），``acquire`` 为O(1)。调用方在同一个事件循环步骤内
+    预约时间槽，再在锁外等待，因此并发请求不会互相串行化，并按调用顺序（FIFO）放行。
+    """
+
+    def __init__(self, rate: float, period: float = 1.0, burst: float = 1.0):
+        self.period = period
+        self.burst = max(1.0, burst)
+        self.rate = rate
+        self._tat = time.monotonic()
+        self.stats = {"acquired": 0, "delayed": 0, "total_wait": 0.0, "penalties": 0}
+
+    @property
+    def rate(self) -> float:
+        """每 ``period`` 秒放行的请求数."""
+        return self._rate
+
+    @rate.setter
+    def rate(self, value: float) -> None:
+        self._rate = value
+        self._interval = self.period / value
+
+    def configure(self, rate: Optional[float] = None, period: Optional[float] = None, burst: Optional[float] = None) -> None:
+        """调整速率和突发数，已预约的请求不受影响."""
+        if period is not None:
+            current = self.rate
+            self.period = period
+            self.rate = current
+        if rate is not None:
+            self.rate = rate
+        if burst is not None:
+            self.burst = max(1.0, burst)
+
+    def reserve(self, cost: float = 1.0) -> float:
+        """预约 ``cost`` 个请求的时间槽，返回需要等待的秒数."""
+        now = time.monotonic()
+        tat = max(self._tat, now)
+        delay = tat - (self.burst - 1.0) * self._interval - now
+        self._tat = tat + cost * self._interval
+        return max(0.0, delay)
+
+    async def acquire(self, cost: float = 1.0) -> float:
+        """等待直到允许发送请求，返回实际等待的秒数."""
+        delay = self.reserve(cost)
+        self.stats["acquired"] += 1
+        if delay > 0:
+            self.stats["delayed"] += 1
+            self.stats["total_wait"] += delay
+            reserved_until = self._tat
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                # 取消的请求如果是最后一个预约，归还其时间槽
+                if self._tat == reserved_until:
+                    self._tat -= cost * self._interval
+                raise
+        return delay
+
+    def penalize(self, delay: float) -> None:
+        """上游返回429等限流响应时，推迟之后所有请求 ``delay`` 秒（如 ``Retry-After``）."""
+        self._tat = max(self._tat, time.monotonic() + delay + (self.burst - 1.0) * self._interval)
+        self.stats["penalties"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "rate": self.rate,
+            "period": self.period,
+            "burst": self.burst,
+            "backlog": max(0.0, self._tat - time.monotonic()),
+            **self.stats
+        }
+
+
+class RateLimiterRegistry:
+    """速率限制器注册表：同一上游（主机或API名称）的所有客户端共享同一个限制器."""
+
+    def __init__(self):
+        self._limiters: Dict[str, RateLimiter] = {}
+
+    def get(self, key: str, rate: float = 1.0, period: float = 1.0, burst: float = 1.0) -> RateLimiter:
+        """获取上游的限制器，不存在时按给定参数创建（已存在时忽略参数，使用 :meth:`configure` 修改）."""
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = self._limiters[key] = RateLimiter(rate, period, burst)
+        return limiter
+
+    def configure(self, key: str, rate: float, period: float = 1.0, burst: float = 1.0) -> RateLimiter:
+        """设置上游的速率和突发数."""
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            return self.get(key, rate, period, burst)
+        limiter.configure(rate, period, burst)
+        return limiter
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._limiters
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {key: limiter.get_stats() for key, limiter in self._limiters.items()}
+
+
+# 进程内共享的注册表
+rate_limiters = RateLimiterRegistry()
+
+
+def get_rate_limiter(key: str, rate: float = 1.0, period: float = 1.0, burst: float = 1.0) -> RateLimiter:
+    """获取共享注册表中上游的限制器."""
+    return rate_limiters.get(key, rate, period, burst)
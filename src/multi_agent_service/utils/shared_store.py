@@ -0,0 +1,619 @@
+"""跨进程共享存储后端.
+
+多个uvicorn worker之间共享工作流状态、消息总线、任务注册表和Agent缓存。
+提供三种实现：
+- ``InMemorySharedStore``：进程内实现（默认，单worker场景）
+- ``SQLiteSharedStore``：基于SQLite WAL的本地共享实现，同一主机上的多个worker可直接共享
+- ``RedisSharedStore``：基于Redis协议的实现，适用于多主机部署（复用 ``settings.redis_url``）
+
+所有值都以JSON形式存储，调用方应只存放可JSON序列化的数据。
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+
+from ..config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def _dumps(value: Any) -> str:
+    """序列化为JSON字符串."""
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def _loads(data: Optional[str]) -> Any:
+    """从JSON字符串反序列化."""
+    if data is None:
+        return None
+    return json.loads(data)
+
+
+class SharedStore(ABC):
+    """共享存储接口，提供键值、列表（队列）和集合三类原语."""
+
+    backend_name: str = "abstract"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """获取键值."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """设置键值，ttl为秒数."""
+        pass
+
+    @abstractmethod
+    async def update(self, key: str, func: Callable[[Optional[Any]], Any], ttl: Optional[float] = None) -> Any:
+        """原子地读-改-写键值，返回写入的新值.
+
+        ``func`` 接收当前值（不存在时为None）并返回新值；发生并发冲突时可能被重复调用，
+        因此应当没有副作用。
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> bool:
+        """删除键（同时删除同名列表和集合）."""
+        pass
+
+    @abstractmethod
+    async def keys(self, prefix: str = "") -> List[str]:
+        """列出指定前缀的键值键名."""
+        pass
+
+    @abstractmethod
+    async def list_push(self, key: str, value: Any, max_length: Optional[int] = None) -> int:
+        """追加到列表尾部，超过max_length时从头部截断，返回列表长度."""
+        pass
+
+    @abstractmethod
+    async def list_pop(self, key: str) -> Optional[Any]:
+        """原子地弹出列表头部元素."""
+        pass
+
+    @abstractmethod
+    async def list_tail(self, key: str, limit: int) -> List[Any]:
+        """获取列表末尾的limit个元素（按插入顺序）."""
+        pass
+
+    @abstractmethod
+    async def list_length(self, key: str) -> int:
+        """获取列表长度."""
+        pass
+
+    @abstractmethod
+    async def list_clear(self, key: str) -> int:
+        """清空列表，返回被清除的元素数量."""
+        pass
+
+    @abstractmethod
+    async def set_add(self, key: str, member: str) -> bool:
+        """向集合添加成员."""
+        pass
+
+    @abstractmethod
+    async def set_remove(self, key: str, member: str) -> bool:
+        """从集合移除成员."""
+        pass
+
+    @abstractmethod
+    async def set_members(self, key: str) -> Set[str]:
+        """获取集合所有成员."""
+        pass
+
+    async def close(self) -> None:
+        """释放底层资源."""
+        return None
+
+
+class InMemorySharedStore(SharedStore):
+    """进程内共享存储实现."""
+
+    backend_name = "memory"
+
+    def __init__(self):
+        self._values: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+        self._lists: Dict[str, Deque[Any]] = defaultdict(deque)
+        self._sets: Dict[str, Set[str]] = defaultdict(set)
+
+    def _is_expired(self, key: str) -> bool:
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.time():
+            self._values.pop(key, None)
+            self._expires.pop(key, None)
+            return True
+        return False
+
+    async def get(self, key: str) -> Optional[Any]:
+        if self._is_expired(key):
+            return None
+        return self._values.get(key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        self._values[key] = value
+        if ttl is not None:
+            self._expires[key] = time.time() + ttl
+        else:
+            self._expires.pop(key, None)
+        return True
+
+    async def update(self, key: str, func: Callable[[Optional[Any]], Any], ttl: Optional[float] = None) -> Any:
+        value = func(await self.get(key))
+        await self.set(key, value, ttl)
+        return value
+
+    async def delete(self, key: str) -> bool:
+        existed = key in self._values or key in self._lists or key in self._sets
+        self._values.pop(key, None)
+        self._expires.pop(key, None)
+        self._lists.pop(key, None)
+        self._sets.pop(key, None)
+        return existed
+
+    async def keys(self, prefix: str = "") -> List[str]:
+        return [
+            key for key in list(self._values.keys())
+            if key.startswith(prefix) and not self._is_expired(key)
+        ]
+
+    async def list_push(self, key: str, value: Any, max_length: Optional[int] = None) -> int:
+        queue = self._lists[key]
+        queue.append(value)
+        if max_length is not None:
+            while len(queue) > max_length:
+                queue.popleft()
+        return len(queue)
+
+    async def list_pop(self, key: str) -> Optional[Any]:
+        queue = self._lists.get(key)
+        if queue:
+            return queue.popleft()
+        return None
+
+    async def list_tail(self, key: str, limit: int) -> List[Any]:
+        queue = self._lists.get(key)
+        if not queue or limit <= 0:
+            return []
+        return list(queue)[-limit:]
+
+    async def list_length(self, key: str) -> int:
+        return len(self._lists.get(key, ()))
+
+    async def list_clear(self, key: str) -> int:
+        queue = self._lists.pop(key, None)
+        return len(queue) if queue else 0
+
+    async def set_add(self, key: str, member: str) -> bool:
+        self._sets[key].add(member)
+        return True
+
+    async def set_remove(self, key: str, member: str) -> bool:
+        self._sets[key].discard(member)
+        return True
+
+    async def set_members(self, key: str) -> Set[str]:
+        return set(self._sets.get(key, set()))
+
+
+class SQLiteSharedStore(SharedStore):
+    """基于SQLite WAL模式的共享存储.
+
+    同一主机上的多个worker进程打开同一个数据库文件即可共享数据。
+    所有SQL操作都在线程中执行，避免阻塞事件循环。
+    """
+
+    backend_name = "sqlite"
+
+    def __init__(self, db_path: str, busy_timeout_ms: int = 5000):
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.db_path != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=self.busy_timeout_ms / 1000,
+                check_same_thread=False,
+                isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS shared_kv (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL
+                );
+                CREATE TABLE IF NOT EXISTS shared_list (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_shared_list_key ON shared_list(key, seq);
+                CREATE TABLE IF NOT EXISTS shared_set (
+                    key TEXT NOT NULL,
+                    member TEXT NOT NULL,
+                    PRIMARY KEY (key, member)
+                );
+            """)
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, func, *args):
+        """在线程中串行执行数据库操作."""
+        def call():
+            with self._lock:
+                return func(self._connect(), *args)
+        return await asyncio.to_thread(call)
+
+    @staticmethod
+    def _transaction(conn: sqlite3.Connection, func, *args):
+        """在写事务中执行操作（BEGIN IMMEDIATE保证跨进程原子性）."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = func(conn, *args)
+            conn.execute("COMMIT")
+            return result
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    async def get(self, key: str) -> Optional[Any]:
+        def op(conn):
+            row = conn.execute(
+                "SELECT value, expires_at FROM shared_kv WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= time.time():
+                conn.execute("DELETE FROM shared_kv WHERE key = ?", (key,))
+                return None
+            return row[0]
+        return _loads(await self._run(op))
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        expires_at = time.time() + ttl if ttl is not None else None
+        payload = _dumps(value)
+
+        def op(conn):
+            conn.execute(
+                "INSERT INTO shared_kv (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, "
+                "expires_at = excluded.expires_at",
+                (key, payload, expires_at)
+            )
+            return True
+        return await self._run(op)
+
+    async def update(self, key: str, func: Callable[[Optional[Any]], Any], ttl: Optional[float] = None) -> Any:
+        def op(conn):
+            now = time.time()
+            row = conn.execute(
+                "SELECT value, expires_at FROM shared_kv WHERE key = ?", (key,)
+            ).fetchone()
+            current = _loads(row[0]) if row is not None and (row[1] is None or row[1] > now) else None
+            value = func(current)
+            conn.execute(
+                "INSERT INTO shared_kv (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, "
+                "expires_at = excluded.expires_at",
+                (key, _dumps(value), now + ttl if ttl is not None else None)
+            )
+            return value
+        return await self._run(lambda conn: self._transaction(conn, op))
+
+    async def delete(self, key: str) -> bool:
+        def op(conn):
+            removed = conn.execute("DELETE FROM shared_kv WHERE key = ?", (key,)).rowcount
+            removed += conn.execute("DELETE FROM shared_list WHERE key = ?", (key,)).rowcount
+            removed += conn.execute("DELETE FROM shared_set WHERE key = ?", (key,)).rowcount
+            return removed > 0
+        return await self._run(lambda conn: self._transaction(conn, op))
+
+    async def keys(self, prefix: str = "") -> List[str]:
+        def op(conn):
+            rows = conn.execute(
+                "SELECT key FROM shared_kv WHERE substr(key, 1, ?) = ? "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (len(prefix), prefix, time.time())
+            ).fetchall()
+            return [row[0] for row in rows]
+        return await self._run(op)
+
+    async def list_push(self, key: str, value: Any, max_length: Optional[int] = None) -> int:
+        payload = _dumps(value)
+
+        def op(conn):
+            conn.execute("INSERT INTO shared_list (key, value) VALUES (?, ?)", (key, payload))
+            length = conn.execute(
+                "SELECT COUNT(*) FROM shared_list WHERE key = ?", (key,)
+            ).fetchone()[0]
+            if max_length is not None and length > max_length:
+                conn.execute(
+                    "DELETE FROM shared_list WHERE seq IN ("
+                    "SELECT seq FROM shared_list WHERE key = ? ORDER BY seq LIMIT ?)",
+                    (key, length - max_length)
+                )
+                length = max_length
+            return length
+        return await self._run(lambda conn: self._transaction(conn, op))
+
+    async def list_pop(self, key: str) -> Optional[Any]:
+        def op(conn):
+            row = conn.execute(
+                "SELECT seq, value FROM shared_list WHERE key = ? ORDER BY seq LIMIT 1",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("DELETE FROM shared_list WHERE seq = ?", (row[0],))
+            return row[1]
+        return _loads(await self._run(lambda conn: self._transaction(conn, op)))
+
+    async def list_tail(self, key: str, limit: int) -> List[Any]:
+        if limit <= 0:
+            return []
+
+        def op(conn):
+            rows = conn.execute(
+                "SELECT value FROM shared_list WHERE key = ? ORDER BY seq DESC LIMIT ?",
+                (key, limit)
+            ).fetchall()
+            return [row[0] for row in reversed(rows)]
+        return [_loads(item) for item in await self._run(op)]
+
+    async def list_length(self, key: str) -> int:
+        def op(conn):
+            return conn.execute(
+                "SELECT COUNT(*) FROM shared_list WHERE key = ?", (key,)
+            ).fetchone()[0]
+        return await self._run(op)
+
+    async def list_clear(self, key: str) -> int:
+        def op(conn):
+            return conn.execute("DELETE FROM shared_list WHERE key = ?", (key,)).rowcount
+        return await self._run(op)
+
+    async def set_add(self, key: str, member: str) -> bool:
+        def op(conn):
+            conn.execute(
+                "INSERT OR IGNORE INTO shared_set (key, member) VALUES (?, ?)", (key, member)
+            )
+            return True
+        return await self._run(op)
+
+    async def set_remove(self, key: str, member: str) -> bool:
+        def op(conn):
+            conn.execute("DELETE FROM shared_set WHERE key = ? AND member = ?", (key, member))
+            return True
+        return await self._run(op)
+
+    async def set_members(self, key: str) -> Set[str]:
+        def op(conn):
+            rows = conn.execute("SELECT member FROM shared_set WHERE key = ?", (key,)).fetchall()
+            return {row[0] for row in rows}
+        return await self._run(op)
+
+    async def close(self) -> None:
+        def op():
+            with self._lock:
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
+        await asyncio.to_thread(op)
+
+
+class RedisSharedStore(SharedStore):
+    """基于Redis协议的共享存储，适用于多主机部署."""
+
+    backend_name = "redis"
+
+    def __init__(self, redis_url: str, namespace: str = "mas"):
+        try:
+            import redis.asyncio as redis_asyncio
+            from redis.exceptions import WatchError
+        except ImportError as e:
+            raise RuntimeError("redis package is required for the redis shared backend") from e
+
+        self.redis_url = redis_url
+        self.namespace = namespace
+        self._client = redis_asyncio.from_url(redis_url, decode_responses=True)
+        self._watch_error = WatchError
+
+    def _key(self, key: str, kind: str = "kv") -> str:
+        return f"{self.namespace}:{kind}:{key}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        return _loads(await self._client.get(self._key(key)))
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        px = int(ttl * 1000) if ttl is not None else None
+        return bool(await self._client.set(self._key(key), _dumps(value), px=px))
+
+    async def update(self, key: str, func: Callable[[Optional[Any]], Any], ttl: Optional[float] = None) -> Any:
+        redis_key = self._key(key)
+        px = int(ttl * 1000) if ttl is not None else None
+        async with self._client.pipeline(transaction=True) as pipe:
+            # WATCH/MULTI乐观锁：其他客户端在读写之间修改了该键时重试
+            while True:
+                try:
+                    await pipe.watch(redis_key)
+                    value = func(_loads(await pipe.get(redis_key)))
+                    pipe.multi()
+                    pipe.set(redis_key, _dumps(value), px=px)
+                    await pipe.execute()
+                    return value
+                except self._watch_error:
+                    continue
+
+    async def delete(self, key: str) -> bool:
+        removed = await self._client.delete(
+            self._key(key), self._key(key, "list"), self._key(key, "set")
+        )
+        return removed > 0
+
+    async def keys(self, prefix: str = "") -> List[str]:
+        base = self._key("")
+        result = []
+        async for redis_key in self._client.scan_iter(match=f"{base}{prefix}*"):
+            result.append(redis_key[len(base):])
+        return result
+
+    async def list_push(self, key: str, value: Any, max_length: Optional[int] = None) -> int:
+        list_key = self._key(key, "list")
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.rpush(list_key, _dumps(value))
+            if max_length is not None:
+                pipe.ltrim(list_key, -max_length, -1)
+            pipe.llen(list_key)
+            results = await pipe.execute()
+        return results[-1]
+
+    async def list_pop(self, key: str) -> Optional[Any]:
+        return _loads(await self._client.lpop(self._key(key, "list")))
+
+    async def list_tail(self, key: str, limit: int) -> List[Any]:
+        if limit <= 0:
+            return []
+        items = await self._client.lrange(self._key(key, "list"), -limit, -1)
+        return [_loads(item) for item in items]
+
+    async def list_length(self, key: str) -> int:
+        return await self._client.llen(self._key(key, "list"))
+
+    async def list_clear(self, key: str) -> int:
+        list_key = self._key(key, "list")
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.llen(list_key)
+            pipe.delete(list_key)
+            length, _ = await pipe.execute()
+        return length
+
+    async def set_add(self, key: str, member: str) -> bool:
+        await self._client.sadd(self._key(key, "set"), member)
+        return True
+
+    async def set_remove(self, key: str, member: str) -> bool:
+        await self._client.srem(self._key(key, "set"), member)
+        return True
+
+    async def set_members(self, key: str) -> Set[str]:
+        return set(await self._client.smembers(self._key(key, "set")))
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class SharedTaskRegistry:
+    """跨worker共享的任务注册表.
+
+    任务信息和任务结果分别存放在两个命名空间下，任意worker提交的任务
+    都可以在其他worker上查询。
+    """
+
+    def __init__(self, store: SharedStore, namespace: str = "tasks", result_ttl: Optional[float] = None):
+        self.store = store
+        self.namespace = namespace
+        self.result_ttl = result_ttl
+
+    def _task_key(self, task_id: str) -> str:
+        return f"{self.namespace}:active:{task_id}"
+
+    def _result_key(self, task_id: str) -> str:
+        return f"{self.namespace}:result:{task_id}"
+
+    async def create_task(self, task_id: str, task_info: Dict[str, Any]) -> bool:
+        """登记新任务."""
+        return await self.store.set(self._task_key(task_id), task_info)
+
+    async def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """获取任务信息."""
+        return await self.store.get(self._task_key(task_id))
+
+    async def update_task(self, task_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """合并更新任务信息.
+
+        同一任务只由执行它的worker写入，因此读-改-写无需跨进程加锁。
+        """
+        task_info = await self.get_task(task_id)
+        if task_info is None:
+            return None
+        task_info = dict(task_info)
+        task_info.update(updates)
+        await self.store.set(self._task_key(task_id), task_info)
+        return task_info
+
+    async def list_tasks(self) -> Dict[str, Dict[str, Any]]:
+        """列出所有任务信息."""
+        return await self._collect(f"{self.namespace}:active:")
+
+    async def set_result(self, task_id: str, result: Dict[str, Any]) -> bool:
+        """保存任务结果."""
+        return await self.store.set(self._result_key(task_id), result, ttl=self.result_ttl)
+
+    async def get_result(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """获取任务结果."""
+        return await self.store.get(self._result_key(task_id))
+
+    async def list_results(self) -> Dict[str, Dict[str, Any]]:
+        """列出所有任务结果."""
+        return await self._collect(f"{self.namespace}:result:")
+
+    async def _collect(self, prefix: str) -> Dict[str, Dict[str, Any]]:
+        collected = {}
+        for key in await self.store.keys(prefix):
+            value = await self.store.get(key)
+            if value is not None:
+                collected[key[len(prefix):]] = value
+        return collected
+
+
+def create_shared_store(backend: Optional[str] = None) -> SharedStore:
+    """根据配置创建共享存储.
+
+    Args:
+        backend: memory / sqlite / redis，默认读取 ``settings.shared_state_backend``
+    """
+    backend = (backend or settings.shared_state_backend or "memory").lower()
+
+    if backend == "sqlite":
+        return SQLiteSharedStore(settings.shared_state_path)
+    if backend == "redis":
+        return RedisSharedStore(settings.redis_url)
+    if backend != "memory":
+        logger.warning(f"Unknown shared state backend '{backend}', falling back to memory")
+    return InMemorySharedStore()
+
+
+# 全局共享存储实例（每个进程一个连接，数据在进程间共享）
+_global_shared_store: Optional[SharedStore] = None
+
+
+def get_shared_store() -> SharedStore:
+    """获取全局共享存储实例."""
+    global _global_shared_store
+    if _global_shared_store is None:
+        _global_shared_store = create_shared_store()
+    return _global_shared_store
+
+
+def is_shared_backend_enabled() -> bool:
+    """是否启用了跨进程共享后端."""
+    return (settings.shared_state_backend or "memory").lower() != "memory"
@@ -0,0 +1,147 @@
+"""异步SQLite连接池：一个写连接、多个只读连接，WAL模式.
+
+每个 ``aiosqlite`` 连接在独立线程上执行SQL，协程只等待结果，数据库操作不会阻塞事件循环。
+SQLite同一时刻只允许一个写事务，写连接由锁串行化；WAL模式下读取不阻塞写入，
+只读连接放在队列中按需创建，最多 ``readers`` 个。
+
+连接按 ``statement_cache_size`` 缓存预编译语句，同一SQL文本重复执行时不再重新解析。
+"""
+
+import asyncio
+import logging
+import sqlite3
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import aiosqlite
+
+from ..config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+# WAL允许写入时并发读取，NORMAL同步在WAL下只在检查点时fsync
+DEFAULT_PRAGMAS: Tuple[Tuple[str, str], ...] = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("temp_store", "MEMORY"),
+    ("cache_size", "-65536"),
+)
+
+
+class SQLitePool:
+    """异步SQLite连接池.
+
+    写操作使用 :meth:`writer`，正常退出时提交、异常时回滚；读操作使用 :meth:`reader`，
+    只读连接设置了 ``query_only``。所有连接使用 ``sqlite3.Row`` 作为行类型，
+    既可以按列名也可以按下标访问。
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        readers: Optional[int] = None,
+        statement_cache_size: Optional[int] = None,
+        busy_timeout: float = 5.0,
+        pragmas: Iterable[Tuple[str, str]] = DEFAULT_PRAGMAS
+    ):
+        self.db_path = Path(db_path)
+        self.readers = max(1, readers or settings.sqlite_pool_readers)
+        self.statement_cache_size = statement_cache_size or settings.sqlite_statement_cache_size
+        self.busy_timeout = busy_timeout
+        self.pragmas = tuple(pragmas)
+
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._write_lock = asyncio.Lock()
+        self._open_lock = asyncio.Lock()
+        self._readers: List[aiosqlite.Connection] = []
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self.stats = {"reads": 0, "writes": 0, "rollbacks": 0, "read_wait": 0.0, "write_wait": 0.0}
+
+    async def _connect(self, read_only: bool) -> aiosqlite.Connection:
+        connection = await aiosqlite.connect(
+            self.db_path,
+            timeout=self.busy_timeout,
+            cached_statements=self.statement_cache_size
+        )
+        connection.row_factory = sqlite3.Row
+        for name, value in self.pragmas:
+            await connection.execute(f"PRAGMA {name}={value}")
+        await connection.execute(f"PRAGMA busy_timeout={int(self.busy_timeout * 1000)}")
+        if read_only:
+            await connection.execute("PRAGMA query_only=ON")
+        return connection
+
+    async def _get_writer(self) -> aiosqlite.Connection:
+        if self._writer is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = await self._connect(read_only=False)
+            logger.debug(f"Opened SQLite writer connection for {self.db_path}")
+        return self._writer
+
+    async def _get_reader(self) -> aiosqlite.Connection:
+        if self._idle.empty() and len(self._readers) < self.readers:
+            async with self._open_lock:
+                if self._idle.empty() and len(self._readers) < self.readers:
+                    # 先打开写连接，保证数据库文件和WAL模式已就绪
+                    if self._writer is None:
+                        async with self._write_lock:
+                            await self._get_writer()
+                    connection = await self._connect(read_only=True)
+                    self._readers.append(connection)
+                    return connection
+        return await self._idle.get()
+
+    @asynccontextmanager
+    async def writer(self):
+        """独占写连接，退出时提交事务，出现异常时回滚."""
+        start = time.perf_counter()
+        async with self._write_lock:
+            connection = await self._get_writer()
+            self.stats["write_wait"] += time.perf_counter() - start
+            self.stats["writes"] += 1
+            try:
+                yield connection
+                await connection.commit()
+            except BaseException:
+                self.stats["rollbacks"] += 1
+                await connection.rollback()
+                raise
+
+    @asynccontextmanager
+    async def reader(self):
+        """借出一个只读连接."""
+        start = time.perf_counter()
+        connection = await self._get_reader()
+        self.stats["read_wait"] += time.perf_counter() - start
+        self.stats["reads"] += 1
+        try:
+            yield connection
+        finally:
+            if connection in self._readers:
+                if connection.in_transaction:
+                    await connection.rollback()
+                self._idle.put_nowait(connection)
+
+    async def close(self) -> None:
+        """关闭所有连接，之后再使用时重新打开."""
+        async with self._write_lock:
+            if self._writer is not None:
+                await self._writer.close()
+                self._writer = None
+        for connection in self._readers:
+            await connection.close()
+        self._readers.clear()
+        self._idle = asyncio.Queue()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "readers": len(self._readers),
+            "idle_readers": self._idle.qsize(),
+            "max_readers": self.readers,
+            "writer_open": self._writer is not None,
+            **self.stats
+        }
@@ -26,6 +26,7 @@ from .interfaces import (
 from .serialization import (
     JSONSerializer,
     PickleSerializer,
+    BinarySerializer,
     WorkflowGraphSerializer,
     WorkflowExecutionSerializer,
     GraphSchemaSerializer,
@@ -68,6 +69,10 @@ from .hierarchical import (
 from .state_management import (
     InMemoryStateManager,
     InMemoryMessageBus,
+    SharedStateManager,
+    SharedMessageBus,
+    create_state_manager,
+    create_message_bus,
     WorkflowStateManager,
     StateSnapshot,
     SnapshotManager,
@@ -75,6 +80,8 @@ from .state_management import (
     EventEmitter,
     StateTransition
 )
+from .node_cache import NodeMemoCache
+from .graph_cache import CompiledGraphCache, get_compiled_graph_cache
 from .patent_workflow_engine import (
     PatentWorkflowNode,
     PatentGraphBuilder,
@@ -116,6 +123,7 @@ __all__ = [
     # Serialization
     "JSONSerializer",
     "PickleSerializer",
+    "BinarySerializer",
     "WorkflowGraphSerializer",
     "WorkflowExecutionSerializer",
     "GraphSchemaSerializer",
@@ -158,6 +166,10 @@ __all__ = [
     # State Management
     "InMemoryStateManager",
     "InMemoryMessageBus",
+    "SharedStateManager",
+    "SharedMessageBus",
+    "create_state_manager",
+    "create_message_bus",
     "WorkflowStateManager",
     "StateSnapshot",
     "SnapshotManager",
@@ -165,6 +177,13 @@ __all__ = [
     "EventEmitter",
     "StateTransition",
     
+    # Node Memoization
+    "NodeMemoCache",
+    
+    # Compiled Graph Cache
+    "CompiledGraphCache",
+    "get_compiled_graph_cache",
+    
     # Patent Workflow Engine
     "PatentWorkflowNode",
     "PatentGraphBuilder",
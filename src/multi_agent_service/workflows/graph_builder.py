@@ -1,9 +1,11 @@
 """LangGraph图构建器基础框架."""
 
+import hashlib
 import json
 from abc import ABC, abstractmethod
 from typing import Any, Callable, Dict, List, Optional, Type, Union
 
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END, START
 from langgraph.graph.state import CompiledStateGraph
 from pydantic import BaseModel
@@ -16,6 +18,9 @@ from ..models.workflow import (
     WorkflowExecution
 )
 from ..models.enums import WorkflowType, AgentType
+from .node_cache import NodeMemoCache
+from .graph_cache import CompiledGraphCache, get_compiled_graph_cache
+from ..utils.process_pool import is_process_node, run_node_in_process
 
 
 class GraphState(BaseModel):
@@ -32,6 +37,24 @@ class GraphState(BaseModel):
     model_config = {"arbitrary_types_allowed": True}
 
 
+# 调用配置中存放本次执行节点函数的键（config["configurable"][RUNTIME_NODES_KEY]）
+RUNTIME_NODES_KEY = "graph_nodes"
+
+
+def _runtime_node(node_id: str) -> Callable:
+    """创建编译进图中的节点：调用时按节点ID从配置中取出本次执行的节点函数.
+    
+    编译后的图不持有节点实例和节点输出缓存，结构相同的工作流可以共享同一个编译图。
+    """
+    async def node_function(state: GraphState, config: RunnableConfig) -> GraphState:
+        bound = (config or {}).get("configurable", {}).get(RUNTIME_NODES_KEY, {})
+        if node_id not in bound:
+            raise RuntimeError(f"节点 {node_id} 未绑定执行函数，请通过 GraphBuilder.ainvoke 执行图")
+        return await bound[node_id](state)
+    
+    return node_function
+
+
 class BaseNode(ABC):
     """节点基类，定义节点的基本接口."""
     
@@ -108,14 +131,29 @@ class ControlNode(BaseNode):
 class GraphBuilder:
     """LangGraph图构建器."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        memo_cache: Optional[NodeMemoCache] = None,
+        graph_cache: Optional[CompiledGraphCache] = None
+    ):
         self.nodes: Dict[str, BaseNode] = {}
         self.edges: List[WorkflowEdge] = []
         self.node_functions: Dict[str, Callable] = {}
+        self.memo_cache = memo_cache
+        self.graph_cache = graph_cache
+        
+    def add_node(self, node: BaseNode, memo_cache: Optional[NodeMemoCache] = None) -> 'GraphBuilder':
+        """添加节点.
         
-    def add_node(self, node: BaseNode) -> 'GraphBuilder':
-        """添加节点."""
+        Args:
+            node: 节点实例
+            memo_cache: 节点输出缓存，默认使用构建器级别的缓存（未配置时不缓存）；
+                节点自带 ``memo_cache`` 时使用节点自己的缓存
+        """
         self.nodes[node.node_id] = node
+        # 自带缓存的节点（如PatentWorkflowNode）在execute中自行记忆化，构建器不再重复缓存
+        own_cache = getattr(node, "memo_cache", None)
+        cache = None if own_cache is not None else memo_cache or self.memo_cache
         
         # 创建节点执行函数
         async def node_function(state: GraphState) -> GraphState:
@@ -127,7 +165,21 @@ class GraphBuilder:
             )
             
             try:
-                result = await node.execute(context)
+                memo_key = None
+                result = None
+                if cache is not None and cache.is_enabled_for(node):
+                    memo_key = cache.make_key(node, state.shared_data)
+                    result = await cache.get(memo_key)
+                
+                if result is None:
+                    if is_process_node(node):
+                        # CPU密集型节点在进程池中执行，避免阻塞事件循环
+                        result = await run_node_in_process(node, state.shared_data)
+                    else:
+                        result = await node.execute(context)
+                    if memo_key is not None:
+                        await cache.set(memo_key, node, result)
+                
                 state.node_results[node.node_id] = result
                 state.shared_data.update(result.get("shared_data", {}))
                 state.current_step += 1
@@ -163,14 +215,97 @@ class GraphBuilder:
         
         return self
     
-    def build(self, workflow_type: WorkflowType) -> CompiledStateGraph:
-        """构建LangGraph图."""
+    def structural_hash(self, workflow_type: Optional[WorkflowType] = None) -> str:
+        """计算图结构哈希（节点ID、类型和配置、边及构建器特有的拓扑设置）.
+        
+        节点实例和节点输出缓存在调用时通过 ``runtime_config`` 绑定，不参与哈希，
+        因此每次执行新建节点的构建器也能复用同一个编译图。
+        """
+        structure = {
+            "builder": type(self).__name__,
+            "workflow_type": workflow_type.value if workflow_type else None,
+            "nodes": [
+                [
+                    node_id,
+                    type(node).__name__,
+                    getattr(getattr(node, "agent_type", None), "value", None),
+                    getattr(node, "control_type", None),
+                    node.config
+                ]
+                for node_id, node in self.nodes.items()
+            ],
+            "edges": [
+                [edge.source_node, edge.target_node, edge.condition]
+                for edge in self.edges
+            ],
+            "extras": self._structure_extras()
+        }
+        payload = json.dumps(structure, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _structure_extras(self) -> Dict[str, Any]:
+        """子类特有的拓扑设置，参与结构哈希."""
+        return {}
+    
+    def _compile_with_cache(
+        self,
+        graph_id: Optional[str],
+        workflow_type: Optional[WorkflowType],
+        compile_func: Callable[[], CompiledStateGraph]
+    ) -> CompiledStateGraph:
+        """配置了编译图缓存时复用已编译的图."""
+        if self.graph_cache is None:
+            return compile_func()
+        
+        return self.graph_cache.get_or_compile(
+            graph_id or type(self).__name__,
+            self.structural_hash(workflow_type),
+            compile_func
+        )
+    
+    def _add_graph_nodes(self, graph: StateGraph) -> None:
+        """向StateGraph添加调用时绑定的节点."""
+        for node_id in self.node_functions:
+            graph.add_node(node_id, _runtime_node(node_id))
+    
+    def runtime_config(self, config: Optional[RunnableConfig] = None) -> RunnableConfig:
+        """生成执行编译图所需的调用配置，绑定本构建器的节点函数."""
+        config = dict(config or {})
+        config["configurable"] = {
+            **config.get("configurable", {}),
+            RUNTIME_NODES_KEY: dict(self.node_functions)
+        }
+        return config
+    
+    async def ainvoke(
+        self,
+        compiled: CompiledStateGraph,
+        state: Union[GraphState, Dict[str, Any]],
+        config: Optional[RunnableConfig] = None
+    ) -> Dict[str, Any]:
+        """使用本构建器的节点执行编译图."""
+        return await compiled.ainvoke(state, self.runtime_config(config))
+    
+    def build(self, workflow_type: WorkflowType, graph_id: Optional[str] = None) -> CompiledStateGraph:
+        """构建LangGraph图.
+        
+        编译图只包含结构，执行时需通过 ``ainvoke`` 或 ``runtime_config`` 绑定节点。
+        
+        Args:
+            workflow_type: 工作流类型
+            graph_id: 图ID，配置了编译图缓存时作为缓存键和失效单位
+        """
+        return self._compile_with_cache(
+            graph_id, workflow_type, lambda: self._compile_graph(workflow_type)
+        )
+    
+    def _compile_graph(self, workflow_type: WorkflowType) -> CompiledStateGraph:
+        """创建并编译StateGraph."""
         # 创建StateGraph
         graph = StateGraph(GraphState)
         
         # 添加节点
-        for node_id, node_func in self.node_functions.items():
-            graph.add_node(node_id, node_func)
+        self._add_graph_nodes(graph)
         
         # 添加边
         for edge in self.edges:
@@ -320,8 +455,8 @@ class GraphBuilderFactory:
     
     @staticmethod
     def create_builder(workflow_type: WorkflowType) -> GraphBuilder:
-        """根据工作流类型创建图构建器."""
-        builder = GraphBuilder()
+        """根据工作流类型创建图构建器，编译图通过全局缓存共享."""
+        builder = GraphBuilder(graph_cache=get_compiled_graph_cache())
         
         # 根据不同的工作流类型进行初始化配置
         if workflow_type == WorkflowType.SEQUENTIAL:
@@ -0,0 +1,101 @@
+"""已编译LangGraph图的缓存."""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from langgraph.graph.state import CompiledStateGraph
+
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledGraphCache:
+    """按图ID和结构哈希缓存已编译的图.
+
+    结构哈希覆盖节点ID、类型和配置、边及构建器特有的拓扑设置；节点实例在调用时绑定，
+    结构不变时每次执行的构建只需一次字典查找；工作流配置热重载时按图ID失效。
+    """
+
+    def __init__(self, max_size: int = 128):
+        self.max_size = max_size
+        self._graphs: "OrderedDict[tuple[str, str], CompiledStateGraph]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, graph_id: str, structural_hash: str) -> Optional[CompiledStateGraph]:
+        """获取已编译的图."""
+        key = (graph_id, structural_hash)
+        with self._lock:
+            compiled = self._graphs.get(key)
+            if compiled is None:
+                return None
+            self._graphs.move_to_end(key)
+            return compiled
+
+    def put(self, graph_id: str, structural_hash: str, compiled: CompiledStateGraph) -> None:
+        """缓存已编译的图，超过容量时淘汰最久未使用的图."""
+        with self._lock:
+            self._graphs[(graph_id, structural_hash)] = compiled
+            self._graphs.move_to_end((graph_id, structural_hash))
+            while len(self._graphs) > self.max_size:
+                self._graphs.popitem(last=False)
+
+    def get_or_compile(
+        self,
+        graph_id: str,
+        structural_hash: str,
+        compile_func: Callable[[], CompiledStateGraph]
+    ) -> CompiledStateGraph:
+        """命中时直接返回缓存的图，否则编译并缓存."""
+        compiled = self.get(graph_id, structural_hash)
+        if compiled is not None:
+            self.stats["hits"] += 1
+            return compiled
+
+        self.stats["misses"] += 1
+        compiled = compile_func()
+        self.put(graph_id, structural_hash, compiled)
+        return compiled
+
+    def invalidate(self, graph_id: Optional[str] = None) -> int:
+        """使指定图（或全部图）的缓存失效."""
+        with self._lock:
+            if graph_id is None:
+                removed = len(self._graphs)
+                self._graphs.clear()
+            else:
+                keys = [key for key in self._graphs if key[0] == graph_id]
+                for key in keys:
+                    del self._graphs[key]
+                removed = len(keys)
+
+        if removed:
+            self.stats["invalidations"] += removed
+            logger.info(f"Invalidated {removed} compiled graph(s) for {graph_id or 'all graphs'}")
+        return removed
+
+    async def handle_workflow_config_change(self, event: Any) -> None:
+        """热重载监听器：工作流配置变更时使对应图失效."""
+        self.invalidate(event.config_id)
+
+    def attach_to_hot_reload(self, hot_reload_service: Any) -> None:
+        """注册到热重载服务的工作流配置变更通知."""
+        hot_reload_service.add_change_listener("workflow", self.handle_workflow_config_change)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息."""
+        return {**self.stats, "size": len(self._graphs), "max_size": self.max_size}
+
+
+# 全局编译图缓存
+_global_graph_cache: Optional[CompiledGraphCache] = None
+
+
+def get_compiled_graph_cache() -> CompiledGraphCache:
+    """获取全局编译图缓存."""
+    global _global_graph_cache
+    if _global_graph_cache is None:
+        _global_graph_cache = CompiledGraphCache()
+    return _global_graph_cache
@@ -10,6 +10,8 @@ from langgraph.graph import StateGraph, END, START
 from langgraph.graph.state import CompiledStateGraph
 
 from .graph_builder import GraphBuilder, GraphState, BaseNode
+from .graph_cache import CompiledGraphCache
+from .node_cache import NodeMemoCache
 from .interfaces import WorkflowEngineInterface, GraphExecutorInterface
 from ..models.workflow import (
     WorkflowGraph,
@@ -384,8 +386,12 @@ class CoordinatorAgent:
 class HierarchicalGraphBuilder(GraphBuilder):
     """分层执行图构建器."""
     
-    def __init__(self):
-        super().__init__()
+    def __init__(
+        self,
+        memo_cache: Optional[NodeMemoCache] = None,
+        graph_cache: Optional[CompiledGraphCache] = None
+    ):
+        super().__init__(memo_cache, graph_cache)
         self.coordinator_node: Optional[str] = None
         self.worker_nodes: List[str] = []
         self.task_flow: Dict[str, List[str]] = {}
@@ -405,14 +411,27 @@ class HierarchicalGraphBuilder(GraphBuilder):
         self.task_flow = flow
         return self
     
-    def build_hierarchical_graph(self) -> CompiledStateGraph:
+    def build_hierarchical_graph(self, graph_id: Optional[str] = None) -> CompiledStateGraph:
         """构建分层执行图."""
+        return self._compile_with_cache(
+            graph_id, WorkflowType.HIERARCHICAL, self._compile_hierarchical_graph
+        )
+    
+    def _structure_extras(self) -> Dict[str, Any]:
+        """协调员、工作节点和任务流程参与结构哈希."""
+        return {
+            "coordinator_node": self.coordinator_node,
+            "worker_nodes": self.worker_nodes,
+            "task_flow": self.task_flow
+        }
+    
+    def _compile_hierarchical_graph(self) -> CompiledStateGraph:
+        """创建并编译分层执行图."""
         # 创建StateGraph
         graph = StateGraph(GraphState)
         
         # 添加所有节点
-        for node_id, node_func in self.node_functions.items():
-            graph.add_node(node_id, node_func)
+        self._add_graph_nodes(graph)
         
         # 设置协调员为入口点
         if self.coordinator_node:
@@ -0,0 +1,187 @@
+"""工作流节点输出的内容寻址缓存（memoization）."""
+
+import base64
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+from ..utils.shared_store import SharedStore, get_shared_store
+from .serialization import BinarySerializer
+
+
+logger = logging.getLogger(__name__)
+
+
+class NodeMemoCache:
+    """节点级记忆化缓存.
+
+    缓存键由节点ID、节点配置和节点输入切片的稳定哈希组成，相同输入的节点
+    不会重复执行。节点输入切片默认为共享状态中除展示类字段以外的全部字段，
+    也可以通过节点配置 ``memo_input_keys`` 显式声明。
+
+    节点配置项:
+        memoize: 设为False可关闭该节点的缓存
+        memo_ttl: 覆盖该节点类型的默认TTL（秒），0表示不缓存
+        memo_input_keys: 参与缓存键计算的输入字段列表
+
+    节点输出以BinarySerializer的带类型格式保存，任何存储后端命中时返回的值与
+    首次执行的结果类型一致；包含无法保留类型的对象的结果不缓存。
+    """
+
+    # 各节点类型的默认TTL（秒），0表示默认不缓存
+    DEFAULT_TTLS: Dict[str, float] = {
+        "patent_data_collection": 6 * 3600,
+        "patent_search": 3600,
+        "patent_analysis": 6 * 3600,
+        "data_aggregation": 6 * 3600,
+        "patent_report": 0,
+        "patent_coordinator": 0,
+    }
+
+    # 各节点类型的默认输入切片，未列出的类型使用完整共享状态
+    DEFAULT_INPUT_KEYS: Dict[str, tuple] = {
+        "patent_data_collection": (
+            "keywords", "query", "limit", "max_results", "date_range",
+            "data_sources", "technology_area", "time_range", "search_type"
+        ),
+        "patent_search": (
+            "keywords", "query", "limit", "max_results", "date_range",
+            "data_sources", "technology_area", "time_range", "search_type"
+        ),
+    }
+
+    # 只影响展示和导出、不影响计算结果的字段
+    PRESENTATION_KEYS = frozenset({
+        "output_format", "report_format", "export_format", "format",
+        "template", "report_template", "last_updated", "task_id"
+    })
+
+    def __init__(
+        self,
+        store: Optional[SharedStore] = None,
+        ttls: Optional[Dict[str, float]] = None,
+        namespace: str = "node_memo",
+        serializer: Optional[BinarySerializer] = None
+    ):
+        self.store = store or get_shared_store()
+        self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self.namespace = namespace
+        self.serializer = serializer or BinarySerializer(strict=True)
+        self.stats = {"hits": 0, "misses": 0, "stores": 0}
+
+    @staticmethod
+    def get_node_type(node: Any) -> str:
+        """获取节点类型（智能体类型或控制类型）."""
+        agent_type = getattr(node, "agent_type", None)
+        if agent_type is not None:
+            return getattr(agent_type, "value", str(agent_type))
+
+        config = getattr(node, "config", None) or {}
+        return config.get("control_type") or getattr(node, "control_type", None) or "generic"
+
+    def get_ttl(self, node: Any) -> float:
+        """获取节点的缓存TTL."""
+        config = getattr(node, "config", None) or {}
+        if "memo_ttl" in config:
+            return float(config["memo_ttl"])
+        return float(self.ttls.get(self.get_node_type(node), 0))
+
+    def is_enabled_for(self, node: Any) -> bool:
+        """判断节点是否启用缓存."""
+        config = getattr(node, "config", None) or {}
+        if config.get("memoize") is False:
+            return False
+        return self.get_ttl(node) > 0
+
+    def make_key(
+        self,
+        node: Any,
+        input_data: Optional[Dict[str, Any]],
+        shared_state: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """计算节点缓存键."""
+        config = getattr(node, "config", None) or {}
+        merged = {**(shared_state or {}), **(input_data or {})}
+
+        input_keys: Optional[Iterable[str]] = config.get("memo_input_keys")
+        if input_keys is None:
+            input_keys = self.DEFAULT_INPUT_KEYS.get(self.get_node_type(node))
+
+        if input_keys is not None:
+            input_slice = {key: merged[key] for key in input_keys if key in merged}
+        else:
+            input_slice = {
+                key: value for key, value in merged.items()
+                if key not in self.PRESENTATION_KEYS
+            }
+
+        # 缓存相关配置本身不参与哈希
+        node_config = {
+            key: value for key, value in config.items()
+            if not key.startswith("memo")
+        }
+
+        payload = json.dumps(
+            {"config": node_config, "input": input_slice},
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+            separators=(",", ":")
+        )
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return f"{self.namespace}:{node.node_id}:{digest}"
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """读取缓存的节点输出."""
+        try:
+            encoded = await self.store.get(key)
+            # 每次解码得到新对象，调用方修改结果不会影响缓存
+            result = self.serializer.deserialize(base64.b64decode(encoded)) if isinstance(encoded, str) else None
+        except Exception as e:
+            logger.warning(f"Node memo lookup failed for {key}: {str(e)}")
+            result = None
+
+        if result is None:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        return result
+
+    async def set(self, key: str, node: Any, result: Dict[str, Any]) -> bool:
+        """缓存节点输出（失败结果不缓存）."""
+        if not isinstance(result, dict) or result.get("status") == "failed" or result.get("error"):
+            return False
+
+        try:
+            encoded = base64.b64encode(self.serializer.serialize(result)).decode("ascii")
+        except TypeError as e:
+            logger.debug(f"Node memo skipped for {key}: {str(e)}")
+            return False
+
+        try:
+            stored = await self.store.set(key, encoded, ttl=self.get_ttl(node))
+            if stored:
+                self.stats["stores"] += 1
+            return stored
+        except Exception as e:
+            logger.warning(f"Node memo store failed for {key}: {str(e)}")
+            return False
+
+    async def invalidate(self, node_id: Optional[str] = None) -> int:
+        """清除指定节点（或全部节点）的缓存."""
+        prefix = f"{self.namespace}:{node_id}:" if node_id else f"{self.namespace}:"
+        removed = 0
+        for key in await self.store.keys(prefix):
+            if await self.store.delete(key):
+                removed += 1
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0
+        }
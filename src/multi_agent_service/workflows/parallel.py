@@ -9,6 +9,8 @@ from langgraph.graph import StateGraph, END, START
 from langgraph.graph.state import CompiledStateGraph
 
 from .graph_builder import GraphBuilder, GraphState, BaseNode
+from .graph_cache import CompiledGraphCache
+from .node_cache import NodeMemoCache
 from .interfaces import WorkflowEngineInterface, GraphExecutorInterface
 from ..models.workflow import (
     WorkflowGraph,
@@ -23,8 +25,12 @@ from ..models.enums import WorkflowType, WorkflowStatus, AgentType
 class ParallelGraphBuilder(GraphBuilder):
     """并行执行图构建器."""
     
-    def __init__(self):
-        super().__init__()
+    def __init__(
+        self,
+        memo_cache: Optional[NodeMemoCache] = None,
+        graph_cache: Optional[CompiledGraphCache] = None
+    ):
+        super().__init__(memo_cache, graph_cache)
         self.parallel_groups: List[List[str]] = []
         self.start_node: Optional[str] = None
         self.end_node: Optional[str] = None
@@ -40,14 +46,27 @@ class ParallelGraphBuilder(GraphBuilder):
         self.end_node = end_node
         return self
     
-    def build_parallel_graph(self) -> CompiledStateGraph:
+    def build_parallel_graph(self, graph_id: Optional[str] = None) -> CompiledStateGraph:
         """构建并行执行图."""
+        return self._compile_with_cache(
+            graph_id, WorkflowType.PARALLEL, self._compile_parallel_graph
+        )
+    
+    def _structure_extras(self) -> Dict[str, Any]:
+        """并行分组和起止节点参与结构哈希."""
+        return {
+            "parallel_groups": self.parallel_groups,
+            "start_node": self.start_node,
+            "end_node": self.end_node
+        }
+    
+    def _compile_parallel_graph(self) -> CompiledStateGraph:
+        """创建并编译并行执行图."""
         # 创建StateGraph
         graph = StateGraph(GraphState)
         
         # 添加所有节点
-        for node_id, node_func in self.node_functions.items():
-            graph.add_node(node_id, node_func)
+        self._add_graph_nodes(graph)
         
         # 设置入口点
         if self.start_node:
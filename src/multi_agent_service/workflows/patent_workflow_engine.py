@@ -8,6 +8,9 @@ from uuid import uuid4
 
 from .graph_builder import GraphBuilder, GraphState, BaseNode, AgentNode, ControlNode
 from .state_management import WorkflowStateManager
+from .node_cache import NodeMemoCache
+from .graph_cache import CompiledGraphCache
+from ..utils.process_pool import is_process_node, run_node_in_process
 from .sequential import SequentialWorkflowEngine
 from .parallel import ParallelWorkflowEngine
 from .interfaces import WorkflowEngineInterface
@@ -25,18 +28,37 @@ class PatentWorkflowNode(BaseNode):
     """专利工作流节点，扩展基础节点以支持专利特定功能."""
     
     def __init__(self, node_id: str, name: str, agent_type: Optional[AgentType] = None,
-                 config: Optional[Dict[str, Any]] = None):
+                 config: Optional[Dict[str, Any]] = None,
+                 memo_cache: Optional[NodeMemoCache] = None):
         super().__init__(node_id, name, config)
         self.agent_type = agent_type
         self.patent_config = config or {}
+        self.memo_cache = memo_cache
         
     async def execute(self, context: NodeExecutionContext) -> Dict[str, Any]:
         """执行专利节点逻辑."""
         start_time = datetime.now()
         
         try:
-            # 专利节点特定的执行逻辑
-            if self.agent_type:
+            # 相同输入的节点直接复用缓存结果
+            memo_key = None
+            if self.memo_cache is not None and self.memo_cache.is_enabled_for(self):
+                memo_key = self.memo_cache.make_key(self, context.input_data, context.shared_state)
+                cached_result = await self.memo_cache.get(memo_key)
+                if cached_result is not None:
+                    logger.info(f"Patent node {self.node_id} served from memo cache")
+                    cached_result.update({
+                        "memoized": True,
+                        "execution_time": (datetime.now() - start_time).total_seconds()
+                    })
+                    return cached_result
+            
+            # 专利节点特定的执行逻辑，CPU密集型节点在进程池中执行
+            if is_process_node(self):
+                result = await run_node_in_process(self, context.input_data, context.shared_state)
+                result.setdefault("node_id", self.node_id)
+                result.setdefault("status", "completed")
+            elif self.agent_type:
                 result = await self._execute_patent_agent(context)
             else:
                 result = await self._execute_patent_control(context)
@@ -49,6 +71,9 @@ class PatentWorkflowNode(BaseNode):
                 "patent_metadata": self.patent_config
             })
             
+            if memo_key is not None:
+                await self.memo_cache.set(memo_key, self, result)
+            
             return result
             
         except Exception as e:
@@ -143,8 +168,12 @@ class PatentWorkflowNode(BaseNode):
 class PatentGraphBuilder(GraphBuilder):
     """专利工作流图构建器."""
     
-    def __init__(self):
-        super().__init__()
+    def __init__(
+        self,
+        memo_cache: Optional[NodeMemoCache] = None,
+        graph_cache: Optional[CompiledGraphCache] = None
+    ):
+        super().__init__(memo_cache, graph_cache)
         self.patent_templates = {}
         
     def add_patent_node(self, node_id: str, name: str, agent_type: Optional[AgentType] = None,
@@ -184,16 +213,19 @@ class PatentGraphBuilder(GraphBuilder):
         """注册专利工作流模板."""
         self.patent_templates[template_name] = template_config
     
-    def build_patent_workflow(self, workflow_type: WorkflowType) -> 'CompiledStateGraph':
+    def build_patent_workflow(self, workflow_type: WorkflowType,
+                              graph_id: Optional[str] = None) -> 'CompiledStateGraph':
         """构建专利工作流图."""
-        return self.build(workflow_type)
+        return self.build(workflow_type, graph_id)
 
 
 class PatentWorkflowEngine(WorkflowEngineInterface):
     """专利工作流引擎，整合Sequential和Parallel引擎."""
     
-    def __init__(self, state_manager: Optional[WorkflowStateManager] = None):
+    def __init__(self, state_manager: Optional[WorkflowStateManager] = None,
+                 memo_cache: Optional[NodeMemoCache] = None):
         self.state_manager = state_manager or WorkflowStateManager()
+        self.memo_cache = memo_cache
         self.sequential_engine = SequentialWorkflowEngine()
         self.parallel_engine = ParallelWorkflowEngine()
         
@@ -528,7 +560,8 @@ class PatentWorkflowEngine(WorkflowEngineInterface):
             node_id=node_id,
             name=node_config.name,
             agent_type=node_config.agent_type,
-            config=node_config.config
+            config=node_config.config,
+            memo_cache=self.memo_cache
         )
         
         # 更新上下文
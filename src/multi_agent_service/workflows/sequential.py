@@ -8,6 +8,8 @@ from langgraph.graph import StateGraph, END, START
 from langgraph.graph.state import CompiledStateGraph
 
 from .graph_builder import GraphBuilder, GraphState, BaseNode
+from .graph_cache import CompiledGraphCache
+from .node_cache import NodeMemoCache
 from .interfaces import WorkflowEngineInterface, GraphExecutorInterface
 from ..models.workflow import (
     WorkflowGraph,
@@ -22,8 +24,12 @@ from ..models.enums import WorkflowType, WorkflowStatus, AgentType
 class SequentialGraphBuilder(GraphBuilder):
     """顺序执行图构建器."""
     
-    def __init__(self):
-        super().__init__()
+    def __init__(
+        self,
+        memo_cache: Optional[NodeMemoCache] = None,
+        graph_cache: Optional[CompiledGraphCache] = None
+    ):
+        super().__init__(memo_cache, graph_cache)
         self.execution_order: List[str] = []
     
     def set_execution_order(self, node_ids: List[str]) -> 'SequentialGraphBuilder':
@@ -31,18 +37,27 @@ class SequentialGraphBuilder(GraphBuilder):
         self.execution_order = node_ids
         return self
     
-    def build_sequential_graph(self) -> CompiledStateGraph:
+    def build_sequential_graph(self, graph_id: Optional[str] = None) -> CompiledStateGraph:
         """构建顺序执行图."""
         if not self.execution_order:
             # 如果没有设置执行顺序，尝试从边推导
             self.execution_order = self._derive_execution_order()
         
+        return self._compile_with_cache(
+            graph_id, WorkflowType.SEQUENTIAL, self._compile_sequential_graph
+        )
+    
+    def _structure_extras(self) -> Dict[str, Any]:
+        """顺序图的执行顺序参与结构哈希."""
+        return {"execution_order": self.execution_order}
+    
+    def _compile_sequential_graph(self) -> CompiledStateGraph:
+        """创建并编译顺序执行图."""
         # 创建StateGraph
         graph = StateGraph(GraphState)
         
         # 添加所有节点
-        for node_id, node_func in self.node_functions.items():
-            graph.add_node(node_id, node_func)
+        self._add_graph_nodes(graph)
         
         # 设置入口点
         if self.execution_order:
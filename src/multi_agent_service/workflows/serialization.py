@@ -1,12 +1,23 @@
 """图序列化和反序列化工具."""
 
+import importlib
 import json
 import pickle
-from typing import Any, Dict, List, Optional, Union
-from datetime import datetime
+import struct
+import zlib
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
+import ormsgpack
 from pydantic import BaseModel
 
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
 from .interfaces import SerializerInterface
 from ..models.workflow import WorkflowGraph, WorkflowNode, WorkflowEdge, WorkflowExecution
 
@@ -53,19 +64,276 @@ class PickleSerializer(SerializerInterface):
         return pickle.loads(pickled_data)
 
 
+# 二进制格式的扩展类型编号
+EXT_DATETIME = 1
+EXT_DATE = 2
+EXT_ENUM = 3
+EXT_MODEL = 4
+EXT_SET = 5
+
+# 二进制数据首字节：压缩方式
+FLAG_RAW = 0x00
+FLAG_ZSTD = 0x01
+FLAG_ZLIB = 0x02
+
+# 流式格式中每个对象前的长度前缀（大端无符号32位）
+_FRAME_HEADER = struct.Struct(">I")
+
+# 本服务的包名，反序列化时默认只信任其中的枚举和模型类
+_PACKAGE_ROOT = __name__.rsplit(".", 2)[0]
+
+_PACK_OPTIONS = (
+    ormsgpack.OPT_PASSTHROUGH_DATETIME
+    | ormsgpack.OPT_PASSTHROUGH_ENUM
+    | ormsgpack.OPT_PASSTHROUGH_SUBCLASS
+    | ormsgpack.OPT_NON_STR_KEYS
+)
+
+
+def _class_path(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+class _ZlibStreamReader:
+    """zlib解压流读取器（未安装zstandard时的回退实现）."""
+
+    def __init__(self, fp: BinaryIO, chunk_size: int = 64 * 1024):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.decompressor = zlib.decompressobj()
+        self.buffer = bytearray()
+
+    def read(self, size: int) -> bytes:
+        while len(self.buffer) < size and not self.decompressor.eof:
+            chunk = self.fp.read(self.chunk_size)
+            if not chunk:
+                break
+            self.buffer += self.decompressor.decompress(chunk)
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+
+class BinarySerializer(SerializerInterface):
+    """紧凑二进制序列化器（基于ormsgpack）.
+
+    datetime、枚举、pydantic模型和集合通过msgpack扩展类型保留类型信息，反序列化
+    时还原为原类型；超过 ``compress_threshold`` 字节的数据使用zstd压缩（未安装
+    zstandard时回退到zlib）。
+
+    输出是本服务内部的存储格式而非标准msgpack：首字节为压缩方式标志
+    （``FLAG_RAW``/``FLAG_ZSTD``/``FLAG_ZLIB``），其后为（压缩后的）msgpack数据；
+    ``dump_many`` 写出的流在标志之后为若干个“4字节大端长度 + msgpack数据”帧。
+    需要与外部系统交换数据时应直接使用标准msgpack。
+
+    其他对象默认按JSONSerializer的方式降级为 ``__dict__`` 或字符串；``strict=True``
+    时改为抛出 ``TypeError``，保证反序列化结果与原值类型一致。
+
+    与其他序列化器不同，``serialize`` 返回 ``bytes``。
+    """
+
+    binary = True
+
+    def __init__(
+        self,
+        compress_threshold: Optional[int] = 4096,
+        compression_level: int = 3,
+        trusted_modules: Tuple[str, ...] = (_PACKAGE_ROOT,),
+        chunk_size: int = 64 * 1024,
+        strict: bool = False
+    ):
+        self.compress_threshold = compress_threshold
+        self.compression_level = compression_level
+        self.trusted_modules = trusted_modules
+        self.chunk_size = chunk_size
+        self.strict = strict
+
+    def serialize(self, obj: Any) -> bytes:
+        """序列化对象为二进制数据."""
+        payload = self.pack(obj)
+        if self.compress_threshold is not None and len(payload) > self.compress_threshold:
+            return self._compress(payload)
+        return bytes([FLAG_RAW]) + payload
+
+    def deserialize(self, data: Union[bytes, str]) -> Any:
+        """从二进制数据反序列化对象."""
+        if isinstance(data, str):
+            data = data.encode("latin-1")
+        if not data:
+            raise ValueError("Empty binary data")
+
+        flag, payload = data[0], data[1:]
+        if flag == FLAG_ZSTD:
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("zstandard is required to decode zstd-compressed data")
+            payload = zstandard.ZstdDecompressor().decompress(payload)
+        elif flag == FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        elif flag != FLAG_RAW:
+            raise ValueError(f"Unknown binary format flag: {flag:#x}")
+        return self.unpack(payload)
+
+    def pack(self, obj: Any) -> bytes:
+        """编码为未压缩的msgpack数据."""
+        return ormsgpack.packb(obj, default=self._default, option=_PACK_OPTIONS)
+
+    def unpack(self, payload: bytes) -> Any:
+        """解码未压缩的msgpack数据."""
+        return ormsgpack.unpackb(payload, ext_hook=self._ext_hook, option=ormsgpack.OPT_NON_STR_KEYS)
+
+    def dump(self, obj: Any, fp: BinaryIO, compress: bool = True) -> None:
+        """将对象写入流."""
+        self.dump_many([obj], fp, compress=compress)
+
+    def dump_many(self, objects: Iterable[Any], fp: BinaryIO, compress: bool = True) -> int:
+        """将多个对象依次写入同一个流，每次只在内存中保留一个对象的编码，返回写入的对象数."""
+        write, finish = self._open_writer(fp, compress)
+        count = 0
+        for obj in objects:
+            payload = self.pack(obj)
+            write(_FRAME_HEADER.pack(len(payload)))
+            write(payload)
+            count += 1
+        finish()
+        return count
+
+    def load(self, fp: BinaryIO) -> Any:
+        """从流中读取一个对象."""
+        for obj in self.iter_load(fp):
+            return obj
+        raise EOFError("No object in binary stream")
+
+    def iter_load(self, fp: BinaryIO) -> Iterator[Any]:
+        """从流中逐个读取 ``dump_many`` 写入的对象."""
+        read = self._open_reader(fp)
+        while True:
+            header = read(_FRAME_HEADER.size)
+            if not header:
+                return
+            if len(header) < _FRAME_HEADER.size:
+                raise EOFError("Truncated binary stream")
+            (size,) = _FRAME_HEADER.unpack(header)
+            payload = read(size)
+            if len(payload) < size:
+                raise EOFError("Truncated binary stream")
+            yield self.unpack(payload)
+
+    def _compress(self, payload: bytes) -> bytes:
+        if ZSTD_AVAILABLE:
+            compressor = zstandard.ZstdCompressor(level=self.compression_level)
+            return bytes([FLAG_ZSTD]) + compressor.compress(payload)
+        return bytes([FLAG_ZLIB]) + zlib.compress(payload, self.compression_level)
+
+    def _open_writer(self, fp: BinaryIO, compress: bool) -> Tuple[Callable[[bytes], Any], Callable[[], None]]:
+        if not compress:
+            fp.write(bytes([FLAG_RAW]))
+            return fp.write, lambda: None
+
+        if ZSTD_AVAILABLE:
+            fp.write(bytes([FLAG_ZSTD]))
+            writer = zstandard.ZstdCompressor(level=self.compression_level).stream_writer(
+                fp, closefd=False
+            )
+
+            def finish_zstd() -> None:
+                writer.flush(zstandard.FLUSH_FRAME)
+                writer.close()
+
+            return writer.write, finish_zstd
+
+        fp.write(bytes([FLAG_ZLIB]))
+        compressor = zlib.compressobj(self.compression_level)
+        return (
+            lambda chunk: fp.write(compressor.compress(chunk)),
+            lambda: fp.write(compressor.flush())
+        )
+
+    def _open_reader(self, fp: BinaryIO) -> Callable[[int], bytes]:
+        flag = fp.read(1)
+        if not flag:
+            raise EOFError("Empty binary stream")
+        if flag[0] == FLAG_ZSTD:
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("zstandard is required to decode zstd-compressed data")
+            return zstandard.ZstdDecompressor().stream_reader(fp, closefd=False).read
+        if flag[0] == FLAG_ZLIB:
+            return _ZlibStreamReader(fp, self.chunk_size).read
+        if flag[0] == FLAG_RAW:
+            return fp.read
+        raise ValueError(f"Unknown binary format flag: {flag[0]:#x}")
+
+    def _default(self, obj: Any) -> Any:
+        if isinstance(obj, Enum):
+            return ormsgpack.Ext(EXT_ENUM, self.pack([_class_path(type(obj)), obj.value]))
+        if isinstance(obj, datetime):
+            return ormsgpack.Ext(EXT_DATETIME, obj.isoformat().encode("utf-8"))
+        if isinstance(obj, date):
+            return ormsgpack.Ext(EXT_DATE, obj.isoformat().encode("utf-8"))
+        if isinstance(obj, BaseModel):
+            return ormsgpack.Ext(EXT_MODEL, self.pack([_class_path(type(obj)), obj.model_dump()]))
+        if isinstance(obj, (set, frozenset)):
+            return ormsgpack.Ext(EXT_SET, self.pack(list(obj)))
+        # OPT_PASSTHROUGH_SUBCLASS 传入的基础类型子类
+        for base in (str, int, float, dict, list, tuple):
+            if isinstance(obj, base):
+                return base(obj)
+        if self.strict:
+            raise TypeError(f"Type is not binary serializable: {type(obj).__name__}")
+        # 其他无法直接编码的对象，处理方式与JSONSerializer一致
+        if hasattr(obj, '__dict__'):
+            return obj.__dict__
+        return str(obj)
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        if code == EXT_DATETIME:
+            return datetime.fromisoformat(data.decode("utf-8"))
+        if code == EXT_DATE:
+            return date.fromisoformat(data.decode("utf-8"))
+        if code == EXT_SET:
+            return set(self.unpack(data))
+        if code in (EXT_ENUM, EXT_MODEL):
+            path, value = self.unpack(data)
+            cls = self._resolve_class(path)
+            if cls is None:
+                return value
+            try:
+                return cls(value) if code == EXT_ENUM else cls.model_validate(value)
+            except Exception:
+                return value
+        raise ValueError(f"Unknown msgpack extension type: {code}")
+
+    def _resolve_class(self, path: str) -> Optional[type]:
+        """按类路径解析类，只加载受信任模块中的枚举和模型类."""
+        module_name, _, qualname = path.partition(":")
+        if not any(module_name == prefix or module_name.startswith(prefix + ".")
+                   for prefix in self.trusted_modules):
+            return None
+        try:
+            target: Any = importlib.import_module(module_name)
+            for part in qualname.split("."):
+                target = getattr(target, part)
+        except (ImportError, AttributeError):
+            return None
+        if isinstance(target, type) and issubclass(target, (Enum, BaseModel)):
+            return target
+        return None
+
+
 class WorkflowGraphSerializer:
     """工作流图专用序列化器."""
     
     def __init__(self, serializer: SerializerInterface = None):
         self.serializer = serializer or JSONSerializer()
     
-    def serialize_graph(self, workflow_graph: WorkflowGraph) -> str:
+    def serialize_graph(self, workflow_graph: WorkflowGraph) -> Union[str, bytes]:
         """序列化工作流图."""
         return self.serializer.serialize(workflow_graph)
     
-    def deserialize_graph(self, data: str) -> WorkflowGraph:
+    def deserialize_graph(self, data: Union[str, bytes]) -> WorkflowGraph:
         """反序列化工作流图."""
         graph_data = self.serializer.deserialize(data)
+        if isinstance(graph_data, WorkflowGraph):
+            return graph_data
         return WorkflowGraph(**graph_data)
     
     def serialize_to_dict(self, workflow_graph: WorkflowGraph) -> Dict[str, Any]:
@@ -79,8 +347,12 @@ class WorkflowGraphSerializer:
     def export_to_file(self, workflow_graph: WorkflowGraph, file_path: str) -> bool:
         """导出工作流图到文件."""
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(self.serialize_graph(workflow_graph))
+            if getattr(self.serializer, "binary", False):
+                with open(file_path, 'wb') as f:
+                    f.write(self.serialize_graph(workflow_graph))
+            else:
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    f.write(self.serialize_graph(workflow_graph))
             return True
         except Exception:
             return False
@@ -88,8 +360,12 @@ class WorkflowGraphSerializer:
     def import_from_file(self, file_path: str) -> Optional[WorkflowGraph]:
         """从文件导入工作流图."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = f.read()
+            if getattr(self.serializer, "binary", False):
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+            else:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = f.read()
             return self.deserialize_graph(data)
         except Exception:
             return None
@@ -101,13 +377,15 @@ class WorkflowExecutionSerializer:
     def __init__(self, serializer: SerializerInterface = None):
         self.serializer = serializer or JSONSerializer()
     
-    def serialize_execution(self, execution: WorkflowExecution) -> str:
+    def serialize_execution(self, execution: WorkflowExecution) -> Union[str, bytes]:
         """序列化工作流执行."""
         return self.serializer.serialize(execution)
     
-    def deserialize_execution(self, data: str) -> WorkflowExecution:
+    def deserialize_execution(self, data: Union[str, bytes]) -> WorkflowExecution:
         """反序列化工作流执行."""
         execution_data = self.serializer.deserialize(data)
+        if isinstance(execution_data, WorkflowExecution):
+            return execution_data
         return WorkflowExecution(**execution_data)
     
     def serialize_execution_state(self, execution: WorkflowExecution) -> Dict[str, Any]:
@@ -232,7 +510,8 @@ class SerializationManager:
     def __init__(self):
         self.serializers: Dict[str, SerializerInterface] = {
             "json": JSONSerializer(),
-            "pickle": PickleSerializer()
+            "pickle": PickleSerializer(),
+            "binary": BinarySerializer()
         }
         self.graph_serializer = WorkflowGraphSerializer()
         self.execution_serializer = WorkflowExecutionSerializer()
@@ -246,14 +525,14 @@ class SerializationManager:
         """获取序列化器."""
         return self.serializers.get(name)
     
-    def serialize_with(self, serializer_name: str, obj: Any) -> Optional[str]:
+    def serialize_with(self, serializer_name: str, obj: Any) -> Optional[Union[str, bytes]]:
         """使用指定序列化器序列化对象."""
         serializer = self.get_serializer(serializer_name)
         if serializer:
             return serializer.serialize(obj)
         return None
     
-    def deserialize_with(self, serializer_name: str, data: str) -> Any:
+    def deserialize_with(self, serializer_name: str, data: Union[str, bytes]) -> Any:
         """使用指定序列化器反序列化对象."""
         serializer = self.get_serializer(serializer_name)
         if serializer:
@@ -7,9 +7,11 @@ from datetime import datetime
 from collections import defaultdict, deque
 from abc import ABC, abstractmethod
 
-from .interfaces import StateManagerInterface, MessageBusInterface
+from .interfaces import StateManagerInterface, MessageBusInterface, SerializerInterface
+from .serialization import BinarySerializer
 from ..models.workflow import WorkflowMessage, WorkflowExecution, NodeExecutionContext
 from ..models.enums import WorkflowStatus
+from ..utils.shared_store import SharedStore, get_shared_store, is_shared_backend_enabled
 
 
 class InMemoryStateManager(StateManagerInterface):
@@ -205,6 +207,188 @@ class InMemoryMessageBus(MessageBusInterface):
             return size
 
 
+class SharedStateManager(StateManagerInterface):
+    """基于共享存储的状态管理器，多个worker进程可以读写同一执行状态."""
+    
+    def __init__(self, store: Optional[SharedStore] = None, max_history_size: int = 100):
+        self.store = store or get_shared_store()
+        self.max_history_size = max_history_size
+    
+    @staticmethod
+    def _state_key(execution_id: str) -> str:
+        return f"workflow_state:{execution_id}"
+    
+    @staticmethod
+    def _history_key(execution_id: str) -> str:
+        return f"workflow_state_history:{execution_id}"
+    
+    async def get_state(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """获取执行状态."""
+        return await self.store.get(self._state_key(execution_id))
+    
+    async def update_state(self, execution_id: str, state_data: Dict[str, Any]) -> bool:
+        """更新执行状态（在共享存储中原子地读-改-写，多个worker并发更新同一状态不会互相覆盖）."""
+        try:
+            previous: List[Optional[Dict[str, Any]]] = [None]
+            
+            def merge(current_state: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+                previous[0] = current_state
+                new_state = dict(current_state or {})
+                new_state.update(state_data)
+                new_state["last_updated"] = datetime.now().isoformat()
+                return new_state
+            
+            await self.store.update(self._state_key(execution_id), merge)
+            
+            # 保存历史状态
+            if previous[0] is not None:
+                await self.store.list_push(
+                    self._history_key(execution_id),
+                    {"timestamp": datetime.now().isoformat(), "state": previous[0]},
+                    max_length=self.max_history_size
+                )
+            return True
+        except Exception:
+            return False
+    
+    async def delete_state(self, execution_id: str) -> bool:
+        """删除执行状态."""
+        try:
+            await self.store.delete(self._state_key(execution_id))
+            await self.store.delete(self._history_key(execution_id))
+            return True
+        except Exception:
+            return False
+    
+    async def persist_state(self, execution_id: str) -> bool:
+        """持久化状态（共享存储写入即持久化）."""
+        return await self.store.get(self._state_key(execution_id)) is not None
+    
+    async def get_state_history(self, execution_id: str) -> List[Dict[str, Any]]:
+        """获取状态历史."""
+        return await self.store.list_tail(self._history_key(execution_id), self.max_history_size)
+    
+    async def cleanup_old_states(self, max_age_hours: int = 24) -> int:
+        """清理旧状态."""
+        cutoff_time = datetime.now().timestamp() - (max_age_hours * 3600)
+        cleaned_count = 0
+        
+        prefix = self._state_key("")
+        for key in await self.store.keys(prefix):
+            state = await self.store.get(key) or {}
+            last_updated = state.get("last_updated")
+            try:
+                expired = not last_updated or datetime.fromisoformat(last_updated).timestamp() < cutoff_time
+            except ValueError:
+                expired = True
+            
+            if expired:
+                await self.delete_state(key[len(prefix):])
+                cleaned_count += 1
+        
+        return cleaned_count
+
+
+class SharedMessageBus(MessageBusInterface):
+    """基于共享存储的消息总线，节点队列和订阅关系在worker之间共享."""
+    
+    def __init__(self, store: Optional[SharedStore] = None, max_history_size: int = 1000):
+        self.store = store or get_shared_store()
+        self.max_history_size = max_history_size
+    
+    @staticmethod
+    def _queue_key(node_id: str) -> str:
+        return f"message_queue:{node_id}"
+    
+    @staticmethod
+    def _subscription_key(message_type: str) -> str:
+        return f"message_subscribers:{message_type}"
+    
+    _history_key = "message_history"
+    
+    async def send_message(self, message: WorkflowMessage) -> bool:
+        """发送消息."""
+        try:
+            payload = message.model_dump(mode="json")
+            await self.store.list_push(self._history_key, payload, max_length=self.max_history_size)
+            
+            if message.receiver_node:
+                await self.store.list_push(self._queue_key(message.receiver_node), payload)
+            else:
+                subscribers = await self.store.set_members(self._subscription_key(message.message_type))
+                for subscriber in subscribers:
+                    await self.store.list_push(self._queue_key(subscriber), payload)
+            
+            return True
+        except Exception:
+            return False
+    
+    async def receive_message(self, node_id: str) -> Optional[WorkflowMessage]:
+        """接收消息（跨进程原子出队）."""
+        try:
+            payload = await self.store.list_pop(self._queue_key(node_id))
+            return WorkflowMessage.model_validate(payload) if payload else None
+        except Exception:
+            return None
+    
+    async def broadcast_message(self, message: WorkflowMessage, target_nodes: List[str]) -> bool:
+        """广播消息."""
+        try:
+            payload = message.model_dump(mode="json")
+            for node_id in target_nodes:
+                await self.store.list_push(self._queue_key(node_id), payload)
+            
+            await self.store.list_push(self._history_key, payload, max_length=self.max_history_size)
+            return True
+        except Exception:
+            return False
+    
+    async def subscribe(self, node_id: str, message_types: List[str]) -> bool:
+        """订阅消息类型."""
+        try:
+            for message_type in message_types:
+                await self.store.set_add(self._subscription_key(message_type), node_id)
+            return True
+        except Exception:
+            return False
+    
+    async def unsubscribe(self, node_id: str, message_types: List[str]) -> bool:
+        """取消订阅消息类型."""
+        try:
+            for message_type in message_types:
+                await self.store.set_remove(self._subscription_key(message_type), node_id)
+            return True
+        except Exception:
+            return False
+    
+    async def get_message_history(self, limit: int = 100) -> List[WorkflowMessage]:
+        """获取消息历史."""
+        payloads = await self.store.list_tail(self._history_key, limit)
+        return [WorkflowMessage.model_validate(payload) for payload in payloads]
+    
+    async def get_queue_size(self, node_id: str) -> int:
+        """获取节点消息队列大小."""
+        return await self.store.list_length(self._queue_key(node_id))
+    
+    async def clear_queue(self, node_id: str) -> int:
+        """清空节点消息队列."""
+        return await self.store.list_clear(self._queue_key(node_id))
+
+
+def create_state_manager() -> StateManagerInterface:
+    """根据共享后端配置创建状态管理器."""
+    if is_shared_backend_enabled():
+        return SharedStateManager()
+    return InMemoryStateManager()
+
+
+def create_message_bus() -> MessageBusInterface:
+    """根据共享后端配置创建消息总线."""
+    if is_shared_backend_enabled():
+        return SharedMessageBus()
+    return InMemoryMessageBus()
+
+
 class WorkflowStateManager:
     """工作流状态管理器，整合状态管理和消息传递."""
     
@@ -213,8 +397,8 @@ class WorkflowStateManager:
         state_manager: Optional[StateManagerInterface] = None,
         message_bus: Optional[MessageBusInterface] = None
     ):
-        self.state_manager = state_manager or InMemoryStateManager()
-        self.message_bus = message_bus or InMemoryMessageBus()
+        self.state_manager = state_manager or create_state_manager()
+        self.message_bus = message_bus or create_message_bus()
         self.active_executions: Dict[str, WorkflowExecution] = {}
     
     async def start_execution(self, execution: WorkflowExecution) -> bool:
@@ -420,21 +604,50 @@ class StateSnapshot:
         """从字典创建快照."""
         snapshot = cls(data["execution_id"], data["state_data"])
         snapshot.snapshot_id = data["snapshot_id"]
-        snapshot.timestamp = datetime.fromisoformat(data["timestamp"])
+        timestamp = data["timestamp"]
+        snapshot.timestamp = timestamp if isinstance(timestamp, datetime) else datetime.fromisoformat(timestamp)
         return snapshot
+    
+    def to_bytes(self, serializer: Optional[SerializerInterface] = None) -> bytes:
+        """序列化为紧凑二进制数据."""
+        serializer = serializer or BinarySerializer()
+        return serializer.serialize({**self.to_dict(), "timestamp": self.timestamp})
+    
+    @classmethod
+    def from_bytes(cls, data: bytes, serializer: Optional[SerializerInterface] = None) -> 'StateSnapshot':
+        """从二进制数据创建快照."""
+        serializer = serializer or BinarySerializer()
+        return cls.from_dict(serializer.deserialize(data))
 
 
 class SnapshotManager:
-    """快照管理器，用于状态快照和恢复."""
+    """快照管理器，用于状态快照和恢复.
     
-    def __init__(self, max_snapshots_per_execution: int = 10):
+    指定 ``serializer`` 时快照以序列化后的二进制形式保存（例如BinarySerializer），
+    读取时再解码，适合保留大量检查点的场景。
+    """
+    
+    def __init__(
+        self,
+        max_snapshots_per_execution: int = 10,
+        serializer: Optional[SerializerInterface] = None
+    ):
         self.snapshots: Dict[str, List[StateSnapshot]] = defaultdict(list)
         self.max_snapshots_per_execution = max_snapshots_per_execution
+        self.serializer = serializer
+        self.encoded_snapshots: Dict[str, List[tuple]] = defaultdict(list)
     
     async def create_snapshot(self, execution_id: str, state_data: Dict[str, Any]) -> str:
         """创建状态快照."""
         snapshot = StateSnapshot(execution_id, state_data)
         
+        if self.serializer is not None:
+            encoded = self.encoded_snapshots[execution_id]
+            encoded.append((snapshot.snapshot_id, snapshot.to_bytes(self.serializer)))
+            if len(encoded) > self.max_snapshots_per_execution:
+                encoded.pop(0)
+            return snapshot.snapshot_id
+        
         # 添加快照
         self.snapshots[execution_id].append(snapshot)
         
@@ -446,6 +659,11 @@ class SnapshotManager:
     
     async def get_snapshot(self, snapshot_id: str) -> Optional[StateSnapshot]:
         """获取快照."""
+        for encoded in self.encoded_snapshots.values():
+            for encoded_id, data in encoded:
+                if encoded_id == snapshot_id:
+                    return StateSnapshot.from_bytes(data, self.serializer)
+        
         for execution_snapshots in self.snapshots.values():
             for snapshot in execution_snapshots:
                 if snapshot.snapshot_id == snapshot_id:
@@ -454,11 +672,19 @@ class SnapshotManager:
     
     async def get_latest_snapshot(self, execution_id: str) -> Optional[StateSnapshot]:
         """获取最新快照."""
+        encoded = self.encoded_snapshots.get(execution_id)
+        if encoded:
+            return StateSnapshot.from_bytes(encoded[-1][1], self.serializer)
         snapshots = self.snapshots.get(execution_id, [])
         return snapshots[-1] if snapshots else None
     
     async def list_snapshots(self, execution_id: str) -> List[StateSnapshot]:
         """列出执行的所有快照."""
+        if self.encoded_snapshots.get(execution_id):
+            return [
+                StateSnapshot.from_bytes(data, self.serializer)
+                for _, data in self.encoded_snapshots[execution_id]
+            ]
         return self.snapshots.get(execution_id, []).copy()
     
     async def restore_from_snapshot(
@@ -479,6 +705,10 @@ class SnapshotManager:
     
     async def cleanup_snapshots(self, execution_id: str) -> int:
         """清理执行的快照."""
+        if execution_id in self.encoded_snapshots:
+            count = len(self.encoded_snapshots[execution_id])
+            del self.encoded_snapshots[execution_id]
+            return count
         if execution_id in self.snapshots:
             count = len(self.snapshots[execution_id])
             del self.snapshots[execution_id]
@@ -3,10 +3,13 @@
 import pytest
 import asyncio
 import os
+from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi.testclient import TestClient
 
 from src.multi_agent_service.main import app
+from src.multi_agent_service.patent.models.patent_data import PatentClassification, PatentData
+from src.multi_agent_service.patent.storage.database import PatentDatabaseManager
 
 
 @pytest.fixture(scope="session")
@@ -80,4 +83,48 @@ async def async_client(setup_test_environment, mock_model_clients):
     from httpx import AsyncClient
     
     async with AsyncClient(app=app, base_url="http://test") as ac:
-        yield ac
\ No newline at end of file
+        yield ac
+
+
+def _make_patent(
+    index,
+    *,
+    year=2023,
+    month=1,
+    day=1,
+    ipc_class="G06F16/00",
+    applicants=("某科技公司",),
+    inventors=("张三",),
+    **fields
+):
+    """Build a patent numbered `index`; keyword arguments override PatentData fields."""
+    data = {
+        "patent_id": f"P{index}",
+        "application_number": f"CN{year}{index:07d}.1",
+        "title": f"一种数据处理方法 {index}",
+        "abstract": f"本发明公开了一种数据处理方法 编号 {index} 用于提高处理效率",
+        "applicants": list(applicants),
+        "inventors": list(inventors),
+        "classifications": [PatentClassification(ipc_class=ipc_class)] if ipc_class else [],
+        "application_date": datetime(year, month, day),
+        "country": "CN",
+        "status": "已公开",
+        "data_source": "test_source"
+    }
+    data.update(fields)
+    return PatentData(**data)
+
+
+@pytest.fixture
+def make_patent():
+    """Factory for patent test data."""
+    return _make_patent
+
+
+@pytest.fixture
+async def db_manager(tmp_path):
+    """Initialized patent database in a temporary directory."""
+    manager = PatentDatabaseManager(str(tmp_path / "patents.db"))
+    await manager.initialize()
+    yield manager
+    await manager.cleanup()
@@ -0,0 +1,61 @@
+"""测试搜索结果的BM25相关性评分."""
+
+from src.multi_agent_service.agents.patent.bm25 import BM25Index, bm25_relevance
+from src.multi_agent_service.agents.patent.near_duplicate import text_tokens
+
+
+class TestTokenizer:
+    """测试词项切分."""
+
+    def test_keeps_term_frequency(self):
+        """测试词项序列保留重复以统计词频."""
+        assert text_tokens("图像图像 AI ai") == ["图像", "像图", "图像", "ai", "ai"]
+
+
+class TestBM25Index:
+    """测试BM25倒排索引."""
+
+    def test_ranking_prefers_title_and_rare_terms(self):
+        """测试标题命中和稀有词项得分更高."""
+        results = [
+            {"title": "锂电池正极材料", "content": "一种图像识别相关的电池检测"},
+            {"title": "图像识别方法", "content": "基于卷积神经网络"},
+            {"title": "无线通信资源调度", "content": "基站功率控制"}
+        ]
+
+        relevance = bm25_relevance(results, ["图像识别"])
+
+        assert 0.0 < relevance[0] < relevance[1] < 1.0
+        assert relevance[2] == 0.0
+
+    def test_scale_independent_of_best_match(self):
+        """测试归一化不以结果集中的最高分为基准."""
+        weak = {"title": "锂电池正极材料", "content": "一种图像识别相关的电池检测"}
+        strong = {"title": "图像识别", "content": "图像识别 图像识别 图像识别"}
+
+        assert bm25_relevance([weak], ["图像识别"])[0] < 0.5
+        assert bm25_relevance([strong], ["图像识别"])[0] > 0.8
+        # 未命中的查询词项拉低分数
+        assert bm25_relevance([strong], ["图像识别", "区块链"])[0] < 0.5
+
+    def test_incremental_add_and_replace(self):
+        """测试增量加入文档和按编号替换."""
+        index = BM25Index()
+        index.add({"title": "图像识别", "content": ""})
+        index.add({"title": "电池材料", "content": ""})
+
+        assert set(index.score(["电池"])) == {1}
+
+        index.add({"title": "无线通信", "content": ""}, doc_id=1)
+
+        assert len(index) == 2
+        assert index.score(["电池"]) == {}
+        assert set(index.score(["无线通信"])) == {1}
+
+    def test_empty_index_and_keywords(self):
+        """测试空索引和空关键词."""
+        index = BM25Index()
+
+        assert index.normalized_scores(["图像"]) == {}
+        index.add({"title": "图像识别", "content": ""})
+        assert index.normalized_scores([]) == {}
@@ -0,0 +1,305 @@
+"""测试Google Patents浏览器页面池."""
+
+import asyncio
+import functools
+import http.server
+import threading
+
+import pytest
+
+from src.multi_agent_service.patent.services import google_patents_browser
+from src.multi_agent_service.patent.services.browser_page_pool import BrowserPagePool, wait_for_content
+
+
+DETAIL_HTML = """<html><body>
+<h1 data-proto="title">{title}</h1>
+<div data-proto="abstract">An image recognition method.</div>
+<div data-proto="claims">1. A method. 2. The method of claim 1.</div>
+<span data-proto="inventor">Zhang San</span><span data-proto="inventor">Li Si</span>
+<span data-proto="assignee">Example Corp</span>
+<img src="/logo.png"><script src="https://www.google-analytics.com/analytics.js"></script>
+</body></html>"""
+
+
+class FakeElement:
+    def __init__(self, text):
+        self.text = text
+
+    async def inner_text(self):
+        return self.text
+
+
+class FakePage:
+    """按URL返回详情内容的模拟页面，记录并发数."""
+
+    delay = 0.02
+
+    def __init__(self, context):
+        self.context = context
+        self.url = None
+        self.closed = False
+        self.timeout = None
+        self.handlers = {}
+
+    def set_default_timeout(self, timeout):
+        self.timeout = timeout
+
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def crash(self):
+        for handler in self.handlers.get("crash", []):
+            handler(self)
+
+    async def close(self):
+        self.closed = True
+
+    def is_closed(self):
+        return self.closed
+
+    async def goto(self, url, **kwargs):
+        browser = self.context.browser
+        browser.in_flight += 1
+        browser.peak = max(browser.peak, browser.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            browser.in_flight -= 1
+        if "crash" in url:
+            self.closed = True
+            raise RuntimeError("page crashed")
+        self.url = url
+
+    async def wait_for_selector(self, selector, **kwargs):
+        if "missing" in (self.url or ""):
+            raise TimeoutError(selector)
+
+    async def wait_for_load_state(self, state, **kwargs):
+        pass
+
+    async def query_selector(self, selector):
+        if "missing" in self.url:
+            return None
+        texts = {
+            'h1[data-proto="title"]': f"Title of {self.url.rsplit('/', 1)[-1]}",
+            '[data-proto="abstract"]': "An image recognition method.",
+            '[data-proto="claims"]': "1. A method. 2. The method of claim 1.",
+            '[data-proto="assignee"]': "Example Corp"
+        }
+        return FakeElement(texts[selector]) if selector in texts else None
+
+    async def query_selector_all(self, selector):
+        return [FakeElement("Zhang San"), FakeElement("Li Si")] if "missing" not in self.url else []
+
+
+class FakeContext:
+    def __init__(self, browser, options):
+        self.browser = browser
+        self.options = options
+        self.routes = []
+        self.closed = False
+        self.fail_new_pages = 0
+
+    async def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    async def new_page(self):
+        if self.fail_new_pages:
+            self.fail_new_pages -= 1
+            raise RuntimeError("new_page failed")
+        return FakePage(self)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def new_context(self, **options):
+        context = FakeContext(self, options)
+        self.contexts.append(context)
+        return context
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url):
+        self.request = type("Request", (), {"resource_type": resource_type, "url": url})()
+        self.action = None
+
+    async def abort(self):
+        self.action = "abort"
+
+    async def continue_(self):
+        self.action = "continue"
+
+
+class TestBrowserPagePool:
+    """测试页面池."""
+
+    @pytest.mark.asyncio
+    async def test_pages_used_concurrently(self):
+        """测试任务按池大小并发执行，结果按输入顺序返回."""
+        browser = FakeBrowser()
+        pool = BrowserPagePool(browser, contexts=2, pages_per_context=2)
+
+        async def fetch(page, url):
+            await page.goto(url)
+            return url
+
+        urls = [f"https://patents.google.com/patent/US{i}" for i in range(12)]
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = await pool.map(fetch, urls)
+
+        assert results == urls
+        assert browser.peak == 4
+        assert loop.time() - start < 12 * FakePage.delay
+        assert len(browser.contexts) == 2
+        assert pool.get_stats()["idle"] == 4
+
+    @pytest.mark.asyncio
+    async def test_request_interception(self):
+        """测试图片、字体和统计请求被中止，文档和脚本正常加载."""
+        pool = BrowserPagePool(FakeBrowser(), contexts=1)
+        await pool.start()
+        pattern, handler = pool._contexts[0].routes[0]
+        assert pattern == "**/*"
+
+        routes = {
+            "image": FakeRoute("image", "https://patents.google.com/logo.png"),
+            "font": FakeRoute("font", "https://fonts.gstatic.com/x.woff2"),
+            "analytics": FakeRoute("script", "https://www.google-analytics.com/analytics.js"),
+            "document": FakeRoute("document", "https://patents.google.com/patent/US1"),
+            "script": FakeRoute("script", "https://patents.google.com/app.js")
+        }
+        for route in routes.values():
+            await handler(route)
+
+        assert {name: route.action for name, route in routes.items()} == {
+            "image": "abort", "font": "abort", "analytics": "abort",
+            "document": "continue", "script": "continue"
+        }
+        assert pool.stats["blocked_requests"] == 3
+
+    @pytest.mark.asyncio
+    async def test_closed_page_replaced(self):
+        pool = BrowserPagePool(FakeBrowser(), contexts=1)
+
+        async def fetch(page, url):
+            await page.goto(url)
+            return url
+
+        results = await pool.map(fetch, ["https://a/crash", "https://a/ok"])
+
+        assert isinstance(results[0], RuntimeError)
+        assert results[1] == "https://a/ok"
+        assert pool.stats["replaced"] == 1
+        assert pool.get_stats()["idle"] == 1
+
+        await pool.close()
+        assert all(context.closed for context in pool.browser.contexts)
+
+    @pytest.mark.asyncio
+    async def test_crashed_page_replaced(self):
+        """测试渲染进程崩溃但未关闭的页面被关闭并重建."""
+        pool = BrowserPagePool(FakeBrowser(), contexts=1)
+
+        async with pool.page() as page:
+            page.crash()
+        async with pool.page() as replacement:
+            assert replacement is not page
+
+        assert page.closed
+        assert pool.stats["replaced"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_replacement_keeps_slot(self):
+        """测试重建页面失败时借出快速失败，槽位保留并在之后重试."""
+        pool = BrowserPagePool(FakeBrowser(), contexts=1)
+        await pool.start()
+        async with pool.page() as page:
+            page.closed = True
+        pool._contexts[0].fail_new_pages = 2
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                async with asyncio.timeout(1):
+                    async with pool.page():
+                        pass
+            assert pool.get_stats()["idle"] == 1
+
+        async with pool.page() as page:
+            assert not page.is_closed()
+        assert pool.stats["replaced"] == 1
+
+    @pytest.mark.asyncio
+    async def test_wait_for_content(self):
+        page = FakePage(FakeContext(FakeBrowser(), {}))
+        page.url = "https://a/ok"
+        assert await wait_for_content(page, "h1") is True
+
+        page.url = "https://a/missing"
+        assert await wait_for_content(page, "h1", timeout=10) is False
+
+
+class TestGooglePatentsDetails:
+    """测试专利详情并发抓取."""
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        monkeypatch.setattr(google_patents_browser, "BROWSER_USE_AVAILABLE", True)
+        service = google_patents_browser.GooglePatentsBrowserService(pool_size=3)
+        service.rate_limiter.configure(rate=1000, burst=100)
+        service._browser_instance = FakeBrowser()
+        return service
+
+    @pytest.mark.asyncio
+    async def test_details_batch(self, service):
+        urls = [f"https://patents.google.com/patent/US{i}" for i in range(6)] + ["https://patents.google.com/patent/crash"]
+
+        details = await service.get_patent_details_batch(urls)
+
+        assert details[0]["title"] == "Title of US0"
+        assert details[0]["inventors"] == ["Zhang San", "Li Si"]
+        assert details[0]["claims"][1]["sequence"] == 2
+        assert details[-1] is None
+        assert service._browser_instance.peak == 3
+        await service.close()
+
+
+@pytest.fixture
+def local_site(tmp_path):
+    """在本地提供专利详情页HTML."""
+    for number in ("US1", "US2", "US3"):
+        (tmp_path / number).write_text(DETAIL_HTML.format(title=f"Patent {number}"), encoding="utf-8")
+
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=str(tmp_path))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_real_browser_against_local_html(local_site, monkeypatch):
+    """使用真实浏览器抓取本地HTML（需要安装playwright和Chromium）."""
+    pytest.importorskip("playwright.async_api")
+    monkeypatch.setattr(google_patents_browser, "BROWSER_USE_AVAILABLE", True)
+    service = google_patents_browser.GooglePatentsBrowserService(pool_size=2)
+    try:
+        await service._ensure_page_pool()
+    except Exception as e:
+        pytest.skip(f"Chromium not available: {e}")
+
+    try:
+        details = await service.get_patent_details_batch([f"{local_site}/US{i}" for i in (1, 2, 3)])
+    finally:
+        await service.close()
+
+    assert [d["title"] for d in details] == ["Patent US1", "Patent US2", "Patent US3"]
+    assert details[0]["applicants"] == ["Example Corp"]
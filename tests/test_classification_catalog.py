@@ -0,0 +1,147 @@
+"""测试CPC/IPC分类目录本地缓存."""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from src.multi_agent_service.patent.services.patentsview_service import PatentsViewService
+from src.multi_agent_service.patent.storage.classification_catalog import ClassificationCatalog
+
+
+CPC_CLASSES = [
+    {"cpc_class": "G06", "cpc_class_title": "Computing; calculating or counting"},
+    {"cpc_class": "G06N", "cpc_class_title": "Computing arrangements based on specific computational models"},
+    {"cpc_class": "H01", "cpc_class_title": "Electric elements"},
+    {"cpc_class": "H04", "cpc_class_title": "Electric communication technique"}
+]
+IPC_CLASSES = [
+    {"ipc_class": "G06F", "ipc_class_title": "Electric digital data processing"},
+    {"ipc_class": "H01M", "ipc_class_title": "Batteries"}
+]
+
+
+class TestClassificationCatalog:
+    """测试目录存储."""
+
+    @pytest.mark.asyncio
+    async def test_persisted_and_reloaded(self, tmp_path):
+        """测试目录保存后新实例可直接载入."""
+        db_path = str(tmp_path / "catalog.db")
+        catalog = ClassificationCatalog(db_path)
+        await catalog.initialize()
+        await catalog.replace("cpc", {"G06": "Computing", "H01": "Electric elements"})
+
+        reloaded = ClassificationCatalog(db_path)
+        await reloaded.initialize()
+
+        assert reloaded.has_catalog("cpc")
+        assert not reloaded.is_stale("cpc")
+        assert reloaded.lookup("cpc", "H01") == "Electric elements"
+        assert reloaded.lookup("ipc", "H01") is None
+
+    @pytest.mark.asyncio
+    async def test_prefix_search(self, tmp_path):
+        catalog = ClassificationCatalog(str(tmp_path / "catalog.db"))
+        await catalog.initialize()
+        await catalog.replace("cpc", {item["cpc_class"]: item["cpc_class_title"] for item in CPC_CLASSES})
+
+        assert [e["code"] for e in catalog.search_prefix("cpc", "G")] == ["G06", "G06N"]
+        assert [e["code"] for e in catalog.search_prefix("cpc", "H", limit=1)] == ["H01"]
+        assert catalog.search_prefix("cpc", "A") == []
+        assert len(catalog.search_prefix("cpc")) == 4
+
+    @pytest.mark.asyncio
+    async def test_ttl(self, tmp_path):
+        catalog = ClassificationCatalog(str(tmp_path / "catalog.db"), ttl=60)
+        await catalog.initialize()
+        assert catalog.is_stale("cpc")
+
+        await catalog.replace("cpc", {"G06": "Computing"})
+        assert not catalog.is_stale("cpc")
+
+        catalog._refreshed_at["cpc"] = time.time() - 120
+        assert catalog.is_stale("cpc")
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = PatentsViewService(api_key="test", catalog=ClassificationCatalog(str(tmp_path / "catalog.db")))
+    service.requests = []
+
+    async def make_request(endpoint, params):
+        service.requests.append(endpoint)
+        await asyncio.sleep(0.001)
+        if endpoint == service.endpoints["cpc_classes"]:
+            return {"status": "OK", "cpc_classes": CPC_CLASSES}
+        if endpoint == service.endpoints["ipc_classes"]:
+            return {"status": "OK", "ipc_classes": IPC_CLASSES}
+        return {"status": "OK", "total_hits": 0, "patents": []}
+
+    service._make_request = make_request
+    return service
+
+
+class TestServiceCatalog:
+    """测试PatentsView服务通过本地目录解析分类."""
+
+    @pytest.mark.asyncio
+    async def test_downloaded_once(self, service):
+        """测试目录只下载一次，之后的查询在本地完成."""
+        responses = await asyncio.gather(*(service.get_classifications("cpc", "G06") for _ in range(3)))
+
+        assert all(len(r.cpc_classes) == 2 for r in responses)
+        assert await service.lookup_classification("ipc", "H01M") == "Batteries"
+        assert service.requests.count(service.endpoints["cpc_classes"]) == 1
+        assert service.requests.count(service.endpoints["ipc_classes"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_comprehensive_search_skips_catalog_requests(self, service):
+        """测试综合搜索不再每次请求分类端点."""
+        first = await service.comprehensive_search(["battery"])
+        service.requests.clear()
+        second = await service.comprehensive_search(["battery"])
+
+        assert [c.cpc_class for c in first.cpc_classes] == [c.cpc_class for c in second.cpc_classes]
+        assert len(second.ipc_classes) == 2
+        assert service.endpoints["cpc_classes"] not in service.requests
+        assert service.endpoints["ipc_classes"] not in service.requests
+        assert len(service.requests) == 5
+
+    @pytest.mark.asyncio
+    async def test_stale_catalog_served_while_refreshing(self, service):
+        """测试过期目录先返回旧数据，后台刷新."""
+        await service.catalog.initialize()
+        await service.catalog.replace("cpc", {"A01": "Agriculture"})
+        service.catalog._refreshed_at["cpc"] -= service.catalog.ttl + 1
+
+        response = await service.get_classifications("cpc")
+        assert [c["cpc_class"] for c in response.cpc_classes] == ["A01"]
+
+        await asyncio.gather(*service._catalog_refresh_tasks.values())
+
+        response = await service.get_classifications("cpc")
+        assert len(response.cpc_classes) == 4
+        assert not service.catalog.is_stale("cpc")
+
+    @pytest.mark.asyncio
+    async def test_refresh_pages_through_catalog(self, service):
+        """测试分类数超过单页上限时翻页下载完整目录."""
+        service.config["max_page_size"] = 3
+        pages = []
+
+        async def make_request(endpoint, params):
+            options = json.loads(params["o"])
+            pages.append(options)
+            after = options.get("after")
+            items = [c for c in CPC_CLASSES if after is None or c["cpc_class"] > after]
+            return {"status": "OK", "cpc_classes": items[:options["size"]]}
+
+        service._make_request = make_request
+        await service.catalog.initialize()
+
+        assert await service.refresh_classification_catalog("cpc") == len(CPC_CLASSES)
+        assert len(pages) == 2
+        assert pages[1]["after"] == "H01"
+        assert await service.lookup_classification("cpc", "H04") == "Electric communication technique"
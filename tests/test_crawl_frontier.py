@@ -0,0 +1,224 @@
+"""测试SmartCrawler的按主机礼貌性调度."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.multi_agent_service.agents.patent.crawl_frontier import (
+    BloomFilter,
+    CrawlFrontier,
+    HostPoliteness,
+    RobotsCache,
+    TokenBucket,
+    normalize_url
+)
+from src.multi_agent_service.agents.patent.search_agent import SmartCrawler
+
+
+class TestTokenBucket:
+    """测试令牌桶限速."""
+
+    @pytest.mark.asyncio
+    async def test_rate_after_burst(self):
+        """测试突发用完后按速率发放令牌."""
+        bucket = TokenBucket(rate=50, capacity=2)
+        start = time.monotonic()
+        for _ in range(7):
+            await bucket.acquire()
+
+        # 2个突发令牌立即发放，其余5个每个间隔20毫秒
+        assert time.monotonic() - start >= 0.09
+
+
+class TestBloomFilter:
+    """测试URL去重."""
+
+    def test_add_and_contains(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+
+        assert bloom.add("https://a.com/1") is True
+        assert bloom.add("https://a.com/1") is False
+        assert "https://a.com/1" in bloom
+        assert "https://a.com/2" not in bloom
+
+    def test_false_positive_rate(self):
+        """测试误判率接近配置值."""
+        bloom = BloomFilter(capacity=5000, error_rate=0.01)
+        for i in range(5000):
+            bloom.add(f"https://a.com/{i}")
+
+        false_positives = sum(f"https://b.com/{i}" in bloom for i in range(5000))
+        assert false_positives < 5000 * 0.03
+
+    def test_normalize_url(self):
+        assert normalize_url("HTTPS://Example.COM/a?q=1#top") == "https://example.com/a?q=1"
+
+
+class TestRobotsCache:
+    """测试robots.txt缓存."""
+
+    @pytest.mark.asyncio
+    async def test_fetched_once_per_origin(self):
+        """测试同一站点并发检查只抓取一次robots.txt."""
+        calls = []
+
+        async def fetch(url):
+            calls.append(url)
+            await asyncio.sleep(0.01)
+            return 200, "User-agent: *\nDisallow: /private\nCrawl-delay: 2\n"
+
+        robots = RobotsCache(fetch)
+        allowed = await asyncio.gather(
+            robots.allowed("https://a.com/public"),
+            robots.allowed("https://a.com/private/x"),
+            robots.allowed("https://a.com/other")
+        )
+
+        assert allowed == [True, False, True]
+        assert calls == ["https://a.com/robots.txt"]
+        assert await robots.crawl_delay("https://a.com/") == 2.0
+
+    @pytest.mark.asyncio
+    async def test_status_handling(self):
+        """测试4xx允许全部，5xx和网络错误禁止全部."""
+        responses = {
+            "https://missing.com/robots.txt": (404, ""),
+            "https://down.com/robots.txt": (503, "")
+        }
+
+        async def fetch(url):
+            if url not in responses:
+                raise ConnectionError("unreachable")
+            return responses[url]
+
+        robots = RobotsCache(fetch)
+
+        assert await robots.allowed("https://missing.com/page") is True
+        assert await robots.allowed("https://down.com/page") is False
+        assert await robots.allowed("https://unreachable.com/page") is False
+
+
+class TestCrawlFrontier:
+    """测试爬取调度."""
+
+    @pytest.mark.asyncio
+    async def test_connection_cap_per_host(self):
+        """测试每个主机的并发请求不超过连接数上限，不同主机并行."""
+        politeness = HostPoliteness(default_rate=1000, default_burst=100, max_connections_per_host=2)
+        frontier = CrawlFrontier(politeness)
+        for host in ("a.com", "b.com"):
+            for i in range(6):
+                frontier.add(f"https://{host}/{i}")
+
+        in_flight = {"a.com": 0, "b.com": 0}
+        peaks = {"a.com": 0, "b.com": 0}
+
+        async def fetch(request):
+            in_flight[request.host] += 1
+            peaks[request.host] = max(peaks[request.host], in_flight[request.host])
+            await asyncio.sleep(0.01)
+            in_flight[request.host] -= 1
+            return [request.url]
+
+        results = await frontier.run(fetch)
+
+        assert peaks == {"a.com": 2, "b.com": 2}
+        assert len(results["a.com"]) == 6
+        assert frontier.stats["fetched"] == 12
+
+    @pytest.mark.asyncio
+    async def test_duplicates_priority_and_limit(self):
+        """测试重复URL被丢弃、按优先级出队、达到主机上限后停止."""
+        politeness = HostPoliteness(default_rate=1000, default_burst=100, max_connections_per_host=1)
+        frontier = CrawlFrontier(politeness)
+
+        assert frontier.add("https://a.com/low", priority=2)
+        assert frontier.add("https://a.com/high", priority=0)
+        assert frontier.add("https://a.com/mid", priority=1)
+        assert not frontier.add("https://A.com/high#section")
+
+        fetched = []
+
+        async def fetch(request):
+            fetched.append(request.url)
+            return [request.url]
+
+        results = await frontier.run(fetch, per_host_limit=2)
+
+        assert fetched == ["https://a.com/high", "https://a.com/mid"]
+        assert results["a.com"] == fetched
+        assert frontier.stats["duplicates"] == 1
+
+    @pytest.mark.asyncio
+    async def test_robots_blocks_and_crawl_delay(self):
+        """测试robots禁止的URL不抓取，Crawl-delay降低主机速率."""
+        async def fetch_robots(url):
+            return 200, "User-agent: *\nDisallow: /private\nCrawl-delay: 4\n"
+
+        politeness = HostPoliteness(default_rate=10, robots=RobotsCache(fetch_robots))
+        frontier = CrawlFrontier(politeness)
+        frontier.add("https://a.com/private/1")
+
+        async def fetch(request):
+            return [request.url]
+
+        results = await frontier.run(fetch)
+
+        assert results["a.com"] == []
+        assert frontier.stats["blocked"] == 1
+        assert politeness.get_stats()["a.com"]["rate"] == 0.25
+
+    @pytest.mark.asyncio
+    async def test_failures_do_not_stop_host(self):
+        """测试单个URL失败不影响同一主机的其他URL."""
+        frontier = CrawlFrontier(HostPoliteness(default_rate=1000, default_burst=100, max_connections_per_host=1))
+        frontier.add("https://a.com/bad")
+        frontier.add("https://a.com/good")
+
+        async def fetch(request):
+            if request.url.endswith("bad"):
+                raise RuntimeError("boom")
+            return [request.url]
+
+        results = await frontier.run(fetch)
+
+        assert results["a.com"] == ["https://a.com/good"]
+        assert frontier.stats["failed"] == 1
+
+
+class TestSmartCrawlerScheduling:
+    """测试SmartCrawler通过调度器爬取."""
+
+    @pytest.mark.asyncio
+    async def test_crawl_sites_uses_shared_politeness(self):
+        """测试多个网站的搜索URL经同一调度器爬取，按网站汇总结果."""
+        crawler = SmartCrawler()
+        crawler.politeness.robots = None
+        for domain in crawler.target_sites:
+            crawler.politeness.configure_host(domain, rate=1000, burst=100)
+
+        crawled = []
+
+        async def crawl_single_url(url, site_config, keywords):
+            crawled.append(url)
+            return [{"title": url, "url": url}]
+
+        crawler._crawl_single_url = crawl_single_url
+
+        results = await crawler._crawl_sites(["www.wipo.int", "scholar.google.com"], ["图像识别"], limit=1)
+
+        assert set(results) == {"www.wipo.int", "scholar.google.com"}
+        assert all(len(items) == 1 for items in results.values())
+        assert {url.split("/")[2] for url in crawled} == {"www.wipo.int", "scholar.google.com"}
+        assert crawler.politeness.max_connections("www.wipo.int") == crawler.crawl_config["max_connections_per_host"]
+
+    def test_site_delay_folded_into_rate(self):
+        """测试站点的延迟范围计入主机的请求间隔."""
+        crawler = SmartCrawler()
+
+        scholar = crawler.politeness.limiters.get("scholar.google.com")
+        assert scholar.period / scholar.rate == pytest.approx(1 + 5.5)
+
+        crawler.anti_detection["random_delays"] = False
+        assert crawler._site_rate(crawler.target_sites["patents.google.com"]) == 2
@@ -14,9 +14,16 @@ from src.multi_agent_service.workflows.graph_builder import (
     GraphSerializer,
     GraphValidator
 )
+from src.multi_agent_service.workflows.node_cache import NodeMemoCache
+from src.multi_agent_service.workflows.graph_cache import CompiledGraphCache
+from src.multi_agent_service.workflows.sequential import SequentialGraphBuilder
+from src.multi_agent_service.services.hot_reload_service import ConfigChangeEvent
+from src.multi_agent_service.workflows.patent_workflow_engine import PatentWorkflowEngine, PatentWorkflowNode
+from src.multi_agent_service.utils.shared_store import InMemorySharedStore, SQLiteSharedStore
 from src.multi_agent_service.workflows.serialization import (
     WorkflowGraphSerializer,
-    JSONSerializer
+    JSONSerializer,
+    BinarySerializer
 )
 from src.multi_agent_service.workflows.validation import (
     GraphStructureValidator,
@@ -26,7 +33,8 @@ from src.multi_agent_service.models.workflow import (
     WorkflowGraph,
     WorkflowNode,
     WorkflowEdge,
-    NodeExecutionContext
+    NodeExecutionContext,
+    WorkflowExecution
 )
 from src.multi_agent_service.models.enums import (
     WorkflowType,
@@ -290,6 +298,261 @@ class TestGraphBuilder:
         assert workflow_graph.edges[0].target_node == "agent1"
 
 
+class TestNodeMemoCache:
+    """测试节点输出缓存."""
+    
+    def test_key_ignores_presentation_fields(self):
+        """测试展示类字段不影响缓存键."""
+        cache = NodeMemoCache(InMemorySharedStore())
+        node = AgentNode("analysis", "Analysis", AgentType.PATENT_ANALYSIS)
+        
+        key_html = cache.make_key(node, {"keywords": ["AI"], "output_format": "html"})
+        key_pdf = cache.make_key(node, {"keywords": ["AI"], "output_format": "pdf"})
+        key_other = cache.make_key(node, {"keywords": ["5G"], "output_format": "html"})
+        
+        assert key_html == key_pdf
+        assert key_html != key_other
+    
+    def test_ttl_per_node_type(self):
+        """测试按节点类型的TTL和显式关闭."""
+        cache = NodeMemoCache(InMemorySharedStore())
+        
+        assert cache.is_enabled_for(AgentNode("c", "Collect", AgentType.PATENT_DATA_COLLECTION))
+        assert not cache.is_enabled_for(AgentNode("r", "Report", AgentType.PATENT_REPORT))
+        assert not cache.is_enabled_for(AgentNode("s", "Sales", AgentType.SALES))
+        assert not cache.is_enabled_for(
+            AgentNode("c", "Collect", AgentType.PATENT_DATA_COLLECTION, {"memoize": False})
+        )
+        assert cache.is_enabled_for(AgentNode("s", "Sales", AgentType.SALES, {"memo_ttl": 60}))
+    
+    @pytest.mark.asyncio
+    async def test_graph_builder_node_memoized(self):
+        """测试GraphBuilder节点函数复用缓存结果."""
+        cache = NodeMemoCache(InMemorySharedStore())
+        node = AgentNode("collect", "Collect", AgentType.PATENT_DATA_COLLECTION)
+        node.execute = AsyncMock(return_value={"status": "completed", "shared_data": {"count": 3}})
+        
+        builder = GraphBuilder(memo_cache=cache)
+        builder.add_node(node)
+        node_function = builder.node_functions["collect"]
+        
+        for output_format in ["html", "pdf"]:
+            state = GraphState(
+                execution_id=f"exec_{output_format}",
+                shared_data={"keywords": ["AI"], "output_format": output_format}
+            )
+            state = await node_function(state)
+            assert state.shared_data["count"] == 3
+        
+        assert node.execute.await_count == 1
+        assert cache.get_stats()["hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_failed_results_not_cached(self):
+        """测试失败结果不写入缓存."""
+        cache = NodeMemoCache(InMemorySharedStore())
+        node = AgentNode("collect", "Collect", AgentType.PATENT_DATA_COLLECTION)
+        key = cache.make_key(node, {"keywords": ["AI"]})
+        
+        assert await cache.set(key, node, {"status": "failed", "error": "timeout"}) is False
+        assert await cache.get(key) is None
+    
+    @pytest.mark.asyncio
+    async def test_self_memoizing_node_cached_once(self):
+        """测试自带缓存的专利节点在带缓存的构建器中只缓存一次."""
+        store = InMemorySharedStore()
+        cache = NodeMemoCache(store)
+        node = PatentWorkflowNode("merge", "Merge", config={"memo_ttl": 60}, memo_cache=cache)
+        node._execute_patent_control = AsyncMock(return_value={"status": "completed", "shared_data": {"count": 3}})
+        
+        builder = GraphBuilder(memo_cache=cache)
+        builder.add_node(node)
+        for _ in range(2):
+            await builder.node_functions["merge"](GraphState(execution_id="exec", shared_data={"keywords": ["AI"]}))
+        
+        assert node._execute_patent_control.await_count == 1
+        assert len(await store.keys("node_memo:")) == 1
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_persistent_store_preserves_types(self, tmp_path):
+        """测试持久化后端命中时返回与首次执行相同类型的结果."""
+        store = SQLiteSharedStore(str(tmp_path / "memo.db"))
+        cache = NodeMemoCache(store)
+        node = AgentNode("collect", "Collect", AgentType.PATENT_DATA_COLLECTION)
+        result = {
+            "status": "completed",
+            "collected_at": datetime(2024, 1, 2, 3, 4, 5),
+            "agent_type": AgentType.PATENT_DATA_COLLECTION,
+            "sources": {"cnki", "google"},
+            "execution": WorkflowExecution(graph_id="g", input_data={"keywords": ["AI"]})
+        }
+        try:
+            key = cache.make_key(node, {"keywords": ["AI"]})
+            assert await cache.set(key, node, result) is True
+            cached = await cache.get(key)
+            assert cached == result
+            assert cached["agent_type"] is AgentType.PATENT_DATA_COLLECTION
+            
+            # 无法保留类型的结果不缓存
+            other_key = cache.make_key(node, {"keywords": ["5G"]})
+            assert await cache.set(other_key, node, {"status": "completed", "client": object()}) is False
+            assert await cache.get(other_key) is None
+        finally:
+            await store.close()
+    
+    @pytest.mark.asyncio
+    async def test_patent_workflow_rerun_with_different_format(self):
+        """测试仅输出格式不同的重复工作流跳过数据收集和分析."""
+        cache = NodeMemoCache(InMemorySharedStore())
+        engine = PatentWorkflowEngine(memo_cache=cache)
+        
+        results = []
+        for output_format in ["html", "pdf"]:
+            execution = WorkflowExecution(
+                graph_id="comprehensive_patent_analysis",
+                input_data={"keywords": ["人工智能"], "output_format": output_format}
+            )
+            results.append(await engine.execute_workflow(execution))
+        
+        first, second = results
+        assert not first.node_results["data_collection"].get("memoized")
+        assert second.node_results["data_collection"]["memoized"] is True
+        assert second.node_results["search_enhancement"]["memoized"] is True
+        assert second.node_results["patent_analysis"]["memoized"] is True
+        assert not second.node_results["report_generation"].get("memoized")
+
+
+class TestCompiledGraphCache:
+    """测试已编译图缓存."""
+    
+    @staticmethod
+    def _make_builder(cache, config=None, nodes=None):
+        from langgraph.graph import START, END
+        builder = GraphBuilder(graph_cache=cache)
+        for node in nodes or (ControlNode("start", "Start", "start", config), ControlNode("end", "End", "end")):
+            builder.add_node(node)
+        builder.add_edge(WorkflowEdge(source_node=START, target_node="start"))
+        builder.add_edge(WorkflowEdge(source_node="start", target_node="end"))
+        builder.add_edge(WorkflowEdge(source_node="end", target_node=END))
+        return builder
+    
+    def test_same_structure_reuses_compiled_graph(self):
+        """测试同一组节点重复构建只编译一次."""
+        cache = CompiledGraphCache()
+        builder = self._make_builder(cache)
+        
+        first = builder.build(WorkflowType.SEQUENTIAL, graph_id="wf1")
+        second = builder.build(WorkflowType.SEQUENTIAL, graph_id="wf1")
+        shared_nodes = self._make_builder(cache, nodes=list(builder.nodes.values()))
+        changed = self._make_builder(cache, {"timeout": 5}).build(WorkflowType.SEQUENTIAL, graph_id="wf1")
+        
+        assert first is second
+        assert shared_nodes.build(WorkflowType.SEQUENTIAL, graph_id="wf1") is first
+        assert changed is not first
+        assert cache.get_stats()["hits"] == 2
+        assert cache.get_stats()["misses"] == 2
+    
+    def test_separate_builders_share_compiled_graph(self):
+        """测试同一工作流分别构建的构建器（节点实例不同）共享同一个编译图."""
+        cache = CompiledGraphCache()
+        first = self._make_builder(cache)
+        other = self._make_builder(cache)
+        
+        assert first.structural_hash() == other.structural_hash()
+        assert first.build(WorkflowType.SEQUENTIAL, graph_id="wf1") is other.build(
+            WorkflowType.SEQUENTIAL, graph_id="wf1"
+        )
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_shared_graph_runs_invoking_builder_nodes(self):
+        """测试共享的编译图在调用时执行调用方构建器的节点."""
+        from langgraph.graph import START, END
+        cache = CompiledGraphCache()
+        
+        def make(label):
+            node = AgentNode("collect", "Collect", AgentType.PATENT_DATA_COLLECTION)
+            node.execute = AsyncMock(return_value={"status": "completed", "label": label})
+            builder = GraphBuilder(graph_cache=cache).add_node(node)
+            builder.add_edge(WorkflowEdge(source_node=START, target_node="collect"))
+            builder.add_edge(WorkflowEdge(source_node="collect", target_node=END))
+            return builder, node
+        
+        first, first_node = make("first")
+        other, other_node = make("other")
+        compiled = first.build(WorkflowType.SEQUENTIAL, graph_id="wf1")
+        assert other.build(WorkflowType.SEQUENTIAL, graph_id="wf1") is compiled
+        
+        result = await other.ainvoke(compiled, GraphState(execution_id="exec"))
+        
+        assert result["node_results"]["collect"]["label"] == "other"
+        assert other_node.execute.await_count == 1
+        assert first_node.execute.await_count == 0
+        with pytest.raises(RuntimeError):
+            await compiled.ainvoke(GraphState(execution_id="exec"))
+    
+    @pytest.mark.asyncio
+    async def test_node_memo_cache_bound_at_invoke(self):
+        """测试节点输出缓存不参与结构哈希，调用时随节点函数绑定."""
+        from langgraph.graph import START, END
+        memo = NodeMemoCache(InMemorySharedStore())
+        node = AgentNode("collect", "Collect", AgentType.PATENT_DATA_COLLECTION)
+        node.execute = AsyncMock(return_value={"status": "completed"})
+        plain = GraphBuilder().add_node(node)
+        memoized = GraphBuilder(memo_cache=memo).add_node(node)
+        for builder in (plain, memoized):
+            builder.add_edge(WorkflowEdge(source_node=START, target_node="collect"))
+            builder.add_edge(WorkflowEdge(source_node="collect", target_node=END))
+        
+        assert plain.structural_hash() == memoized.structural_hash()
+        
+        compiled = memoized.build(WorkflowType.SEQUENTIAL)
+        for _ in range(2):
+            await memoized.ainvoke(compiled, GraphState(execution_id="exec", shared_data={"keywords": ["AI"]}))
+        
+        assert node.execute.await_count == 1
+        assert memo.get_stats()["hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_hot_reload_invalidates_graph(self):
+        """测试工作流配置变更使对应图失效."""
+        cache = CompiledGraphCache()
+        builder = self._make_builder(cache)
+        first = builder.build(WorkflowType.SEQUENTIAL, graph_id="wf1")
+        other = builder.build(WorkflowType.SEQUENTIAL, graph_id="wf2")
+        
+        await cache.handle_workflow_config_change(
+            ConfigChangeEvent(config_type="workflow", config_id="wf1", change_type="updated")
+        )
+        
+        assert builder.build(WorkflowType.SEQUENTIAL, graph_id="wf1") is not first
+        assert builder.build(WorkflowType.SEQUENTIAL, graph_id="wf2") is other
+    
+    def test_builder_specific_structure_in_hash(self):
+        """测试构建器特有的拓扑设置参与结构哈希."""
+        builder = SequentialGraphBuilder()
+        builder.add_node(ControlNode("a", "A", "start"))
+        builder.add_node(ControlNode("b", "B", "end"))
+        
+        builder.set_execution_order(["a", "b"])
+        forward = builder.structural_hash(WorkflowType.SEQUENTIAL)
+        builder.set_execution_order(["b", "a"])
+        
+        assert builder.structural_hash(WorkflowType.SEQUENTIAL) != forward
+    
+    def test_lru_eviction(self):
+        """测试超过容量时淘汰最久未使用的图."""
+        cache = CompiledGraphCache(max_size=1)
+        cache.put("wf1", "h1", MagicMock())
+        cache.put("wf2", "h2", MagicMock())
+        
+        assert cache.get("wf1", "h1") is None
+        assert cache.get("wf2", "h2") is not None
+
+
 class TestGraphBuilderFactory:
     """测试GraphBuilderFactory工厂类."""
     
@@ -408,6 +671,104 @@ class TestGraphSerializer:
         assert len(workflow_graph.edges) == 0
 
 
+class TestBinarySerializer:
+    """测试BinarySerializer二进制序列化器."""
+    
+    def _sample_graph(self):
+        return WorkflowGraph(
+            name="Binary Workflow",
+            workflow_type=WorkflowType.SEQUENTIAL,
+            nodes=[
+                WorkflowNode(
+                    node_id="node1",
+                    node_type="agent",
+                    agent_type=AgentType.SALES,
+                    name="Sales Agent"
+                )
+            ],
+            edges=[]
+        )
+    
+    def test_typed_round_trip(self):
+        """测试扩展类型的往返还原."""
+        serializer = BinarySerializer()
+        now = datetime.now()
+        data = {
+            "timestamp": now,
+            "agent_type": AgentType.SALES,
+            "graph": self._sample_graph(),
+            "tags": {"a", "b"},
+            "values": [1, -200000, 1.5, None, True, "中文"],
+            "raw": b"\x00\x01"
+        }
+        
+        encoded = serializer.serialize(data)
+        decoded = serializer.deserialize(encoded)
+        
+        assert isinstance(encoded, bytes)
+        assert decoded["timestamp"] == now
+        assert decoded["agent_type"] is AgentType.SALES
+        assert decoded["graph"] == data["graph"]
+        assert decoded["tags"] == {"a", "b"}
+        assert decoded["values"] == data["values"]
+        assert decoded["raw"] == b"\x00\x01"
+    
+    def test_smaller_than_json_and_compressed(self):
+        """测试大状态压缩后明显小于JSON."""
+        state = {
+            "results": [
+                {"id": f"US{i}", "title": "machine learning patent", "score": i * 0.5}
+                for i in range(500)
+            ]
+        }
+        serializer = BinarySerializer(compress_threshold=1024)
+        
+        encoded = serializer.serialize(state)
+        
+        assert encoded[0] != 0x00  # 超过阈值，已压缩
+        assert len(encoded) < len(JSONSerializer().serialize(state)) / 5
+        assert serializer.deserialize(encoded) == state
+    
+    def test_streaming_dump_and_load(self):
+        """测试流式写出和读取."""
+        import io
+        
+        serializer = BinarySerializer(chunk_size=256)
+        records = [{"step": i, "payload": "x" * 100} for i in range(50)]
+        stream = io.BytesIO()
+        
+        count = serializer.dump_many(records, stream)
+        stream.seek(0)
+        
+        assert count == 50
+        assert list(serializer.iter_load(stream)) == records
+        
+        stream = io.BytesIO()
+        serializer.dump({"single": True}, stream, compress=False)
+        stream.seek(0)
+        assert serializer.load(stream) == {"single": True}
+    
+    def test_untrusted_classes_not_imported(self):
+        """测试非受信任模块的类型只还原为原始值."""
+        serializer = BinarySerializer(trusted_modules=("some_other_package",))
+        
+        decoded = serializer.deserialize(BinarySerializer().serialize({"agent": AgentType.SALES}))
+        
+        assert decoded["agent"] == AgentType.SALES.value
+        assert not isinstance(decoded["agent"], AgentType)
+    
+    def test_graph_serializer_with_binary(self, tmp_path):
+        """测试工作流图使用二进制格式导入导出."""
+        graph_serializer = WorkflowGraphSerializer(BinarySerializer())
+        workflow_graph = self._sample_graph()
+        file_path = str(tmp_path / "graph.bin")
+        
+        assert graph_serializer.export_to_file(workflow_graph, file_path) is True
+        restored = graph_serializer.import_from_file(file_path)
+        
+        assert restored == workflow_graph
+
+
 class TestGraphValidator:
     """测试GraphValidator验证器."""
     
@@ -0,0 +1,170 @@
+"""测试数据源管理器的对冲并行收集."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.multi_agent_service.patent.models.data import Patent
+from src.multi_agent_service.patent.models.requests import PatentDataCollectionRequest
+from src.multi_agent_service.patent.utils.data_sources import DataSourceManager
+
+
+def make_patent(number, title=None):
+    return Patent(
+        application_number=number,
+        title=title or f"专利{number}",
+        abstract="一种图像识别方法",
+        applicants=["某公司"],
+        inventors=["张三"],
+        application_date=datetime(2024, 1, 1),
+        publication_date=datetime(2024, 2, 1),
+        ipc_classes=["G06F"],
+        country="CN",
+        status="已公开"
+    )
+
+
+class FakeSource:
+    """延迟后返回固定结果的模拟数据源."""
+
+    def __init__(self, patents=None, delay=0.0, error=None, healthy=True):
+        self.patents = patents or []
+        self.delay = delay
+        self.error = error
+        self.healthy = healthy
+        self.started = None
+        self.cancelled = False
+
+    async def health_check(self):
+        return self.healthy
+
+    async def collect_patents(self, request):
+        self.started = asyncio.get_running_loop().time()
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return self.patents
+
+
+def make_manager(**sources):
+    manager = DataSourceManager()
+    for name, source in sources.items():
+        manager.register_data_source(name, source)
+    return manager
+
+
+def make_request(sources, max_patents=10, timeout=5):
+    return PatentDataCollectionRequest(
+        request_id="r", keywords=["图像识别"], data_sources=sources,
+        max_patents=max_patents, timeout=timeout, parallel_sources=False, hedged=True
+    )
+
+
+class TestHedgedCollection:
+    """测试对冲收集."""
+
+    @pytest.mark.asyncio
+    async def test_hanging_primary_hedged_after_delay(self):
+        """测试主数据源挂起时，对冲延迟后启动的备用数据源先返回，主数据源被取消."""
+        primary = FakeSource([make_patent("CN1")], delay=10)
+        secondary = FakeSource([make_patent("CN2")], delay=0.01)
+        manager = make_manager(primary=primary, secondary=secondary)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        patents, outcome = await manager.collect_patents_hedged(
+            make_request(["primary", "secondary"], max_patents=1), hedge_delay=0.05
+        )
+
+        assert [p.application_number for p in patents] == ["CN2"]
+        assert loop.time() - start < 1
+        assert secondary.started - start >= 0.045
+        assert primary.cancelled
+        assert outcome == {"primary": "cancelled", "secondary": "success"}
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_skips_hedge(self):
+        primary = FakeSource([make_patent("CN1")])
+        secondary = FakeSource([make_patent("CN2")])
+        manager = make_manager(primary=primary, secondary=secondary)
+
+        patents, outcome = await manager.collect_patents_hedged(make_request(["primary", "secondary"]), hedge_delay=0.5)
+
+        assert [p.application_number for p in patents] == ["CN1"]
+        assert secondary.started is None
+        assert outcome["secondary"] == "skipped"
+
+    @pytest.mark.asyncio
+    async def test_fanout_merges_and_deduplicates(self):
+        """测试并发启动的数据源结果按申请号去重合并，达到目标数量后返回."""
+        a = FakeSource([make_patent("CN1"), make_patent("CN2")], delay=0.01)
+        b = FakeSource([make_patent("CN2", title="另一来源的标题"), make_patent("CN3")], delay=0.02)
+        c = FakeSource([make_patent("CN4")], delay=10)
+        manager = make_manager(a=a, b=b, c=c)
+
+        patents, outcome = await manager.collect_patents_hedged(
+            make_request(["a", "b", "c"], max_patents=3), fanout=3
+        )
+
+        assert [p.application_number for p in patents] == ["CN1", "CN2", "CN3"]
+        assert c.cancelled
+
+    @pytest.mark.asyncio
+    async def test_failure_starts_next_source_immediately(self):
+        """测试失败或不健康的数据源不等待对冲延迟."""
+        broken = FakeSource(error=RuntimeError("boom"))
+        unhealthy = FakeSource([make_patent("CN9")], healthy=False)
+        backup = FakeSource([make_patent("CN1")])
+        manager = make_manager(broken=broken, unhealthy=unhealthy, backup=backup)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        patents, outcome = await manager.collect_patents_hedged(
+            make_request(["broken", "unhealthy", "backup"]), hedge_delay=5
+        )
+
+        assert [p.application_number for p in patents] == ["CN1"]
+        assert loop.time() - start < 1
+        assert unhealthy.started is None
+        assert outcome == {"broken": "failed", "unhealthy": "failed", "backup": "success"}
+
+    @pytest.mark.asyncio
+    async def test_deadline_returns_partial_results(self):
+        fast = FakeSource([make_patent("CN1")], delay=0.01)
+        slow = FakeSource([make_patent("CN2")], delay=10)
+        manager = make_manager(fast=fast, slow=slow)
+
+        patents, outcome = await manager.collect_patents_hedged(
+            make_request(["fast", "slow"], max_patents=5), fanout=2, deadline=0.1
+        )
+
+        assert [p.application_number for p in patents] == ["CN1"]
+        assert slow.cancelled
+
+    @pytest.mark.asyncio
+    async def test_all_sources_fail(self):
+        manager = make_manager(a=FakeSource(error=RuntimeError("a down")), b=FakeSource(error=ValueError("b down")))
+
+        with pytest.raises(ValueError):
+            await manager.collect_patents_hedged(make_request(["a", "b"]), hedge_delay=0)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_get_own_outcome(self):
+        """测试同一管理器上的并发请求各自返回自己的数据源结果."""
+        manager = make_manager(
+            a=FakeSource([make_patent("CN1")], delay=0.02),
+            b=FakeSource([make_patent("CN2")], delay=0.01)
+        )
+
+        (_, first), (_, second) = await asyncio.gather(
+            manager.collect_patents_hedged(make_request(["a", "b"])),
+            manager.collect_patents_hedged(make_request(["b", "a"]))
+        )
+
+        assert first == {"a": "success", "b": "skipped"}
+        assert second == {"b": "success", "a": "skipped"}
@@ -0,0 +1,112 @@
+"""测试SmartCrawler基于选择器的HTML内容提取."""
+
+from pathlib import Path
+
+import pytest
+
+from src.multi_agent_service.agents.patent.html_extraction import (
+    HTMLExtractor,
+    extract_html,
+    extract_stream,
+    parse_selector
+)
+from src.multi_agent_service.agents.patent.search_agent import SmartCrawler
+
+
+FIXTURES = Path(__file__).parent / "fixtures" / "html"
+
+
+def load_fixture(name):
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+@pytest.fixture
+def crawler():
+    return SmartCrawler()
+
+
+class TestHTMLExtractor:
+    """测试流式提取器."""
+
+    def test_scholar_items(self, crawler):
+        """测试按结果条目提取，跳过脚本和条目外的匹配."""
+        site = crawler.target_sites["scholar.google.com"]
+
+        records = extract_html(load_fixture("scholar_results.html"), site["selectors"], site["item_selector"])
+
+        assert [r["title"] for r in records] == [
+            "基于深度学习的图像识别方法研究",
+            "Deep residual learning for image recognition",
+            "图像识别专利技术发展趋势分析"
+        ]
+        assert records[0]["link"] == "/citations?id=a1"
+        assert "多尺度特征融合" in records[0]["abstract"]
+        assert "& more accurate" in records[1]["abstract"]
+        assert records[2]["content"] == "王强 - 中国发明与专利, 2022"
+
+    def test_page_mode_and_chunk_boundaries(self, crawler):
+        """测试整页提取，且分块边界不影响结果."""
+        site = crawler.target_sites["www.wipo.int"]
+        html = load_fixture("wipo_article.html")
+
+        whole = extract_html(html, site["selectors"], chunk_size=len(html))
+        chunked = extract_html(html, site["selectors"], chunk_size=7)
+
+        assert whole == chunked
+        assert whole[0]["title"] == "World Intellectual Property Indicators 2023"
+        assert "3.46 million" in whole[0]["content"]
+        assert "Footer text" not in whole[0]["content"]
+
+    def test_max_items_stops_parsing(self):
+        """测试提取到足够结果后不再解析后续内容."""
+        html = "".join(f"<div class='item'><h3>Title {i}</h3></div>" for i in range(100))
+        extractor = HTMLExtractor({"title": "h3"}, item_selector=".item", max_items=5)
+
+        extractor.feed(html[:len(html) // 2])
+        assert extractor.done
+
+        assert len(extractor.close()) == 5
+
+    def test_unsupported_selector(self):
+        """测试不支持的选择器语法."""
+        with pytest.raises(ValueError):
+            parse_selector("div > a[href]")
+
+    @pytest.mark.asyncio
+    async def test_extract_stream(self):
+        """测试异步分块流式解析."""
+        html = load_fixture("google_patents_results.html")
+
+        async def chunks():
+            for offset in range(0, len(html), 100):
+                yield html[offset:offset + 100]
+
+        records = await extract_stream(
+            chunks(),
+            {"title": ".patent-title, .invention-title", "abstract": ".abstract, .patent-abstract"},
+            item_selector="article.result"
+        )
+
+        assert [r["title"] for r in records] == [
+            "Image recognition method based on deep learning",
+            "Lithium battery cathode material and preparation method"
+        ]
+
+
+class TestSmartCrawlerParsing:
+    """测试SmartCrawler的结果构建."""
+
+    def test_build_extracted_results(self, crawler):
+        """测试解析结果包含真实链接和命中的关键词."""
+        url = "https://scholar.google.com/scholar?q=image"
+        site = crawler.target_sites["scholar.google.com"]
+        records = extract_html(load_fixture("scholar_results.html"), site["selectors"], site["item_selector"])
+
+        results = crawler._build_extracted_results(records, url, site, ["图像识别", "residual"])
+
+        assert len(results) == 3
+        assert results[0]["url"] == "https://scholar.google.com/citations?id=a1"
+        assert results[1]["url"] == "https://example.org/paper/a2"
+        assert results[0]["keywords_found"] == ["图像识别"]
+        assert results[1]["keywords_found"] == ["residual"]
+        assert results[0]["extraction_method"] == "css_selectors"
@@ -0,0 +1,188 @@
+"""测试基于水位线的增量专利收集."""
+
+from datetime import datetime
+
+import pytest
+
+from src.multi_agent_service.patent.models.data import Patent
+from src.multi_agent_service.patent.models.requests import PatentDataCollectionRequest
+from src.multi_agent_service.patent.storage.collection_state import (
+    CollectionStateStore,
+    collection_query_key,
+    patent_content_hash
+)
+from src.multi_agent_service.patent.utils.data_sources import DataSourceManager
+from src.multi_agent_service.utils.bloom_filter import BloomFilter
+
+
+def make_patent(number, day, status="已公开"):
+    return Patent(
+        application_number=number,
+        title=f"专利{number}",
+        abstract="一种图像识别方法",
+        applicants=["某公司"],
+        inventors=["张三"],
+        application_date=datetime(2024, 1, day),
+        publication_date=datetime(2024, 2, day),
+        ipc_classes=["G06F"],
+        country="CN",
+        status=status
+    )
+
+
+class FakeSource:
+    """按请求的日期范围过滤返回的模拟数据源."""
+
+    def __init__(self, patents):
+        self.patents = patents
+        self.requests = []
+
+    async def collect_patents(self, request):
+        self.requests.append(request)
+        date_range = request.date_range or {}
+        start = date_range.get("start", "0000")
+        end = date_range.get("end", "9999")
+        return [
+            p for p in self.patents
+            if start <= p.publication_date.strftime("%Y-%m-%d") <= end
+        ]
+
+    async def health_check(self):
+        return True
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CollectionStateStore(str(tmp_path / "state.db"))
+
+
+@pytest.fixture
+def request_():
+    return PatentDataCollectionRequest(request_id="r1", keywords=["图像识别"], max_patents=100, incremental=True)
+
+
+class TestCollectionState:
+    """测试水位线和数据集合并."""
+
+    def test_query_key_ignores_date_range_and_order(self):
+        a = PatentDataCollectionRequest(request_id="a", keywords=["B", "a"], max_patents=10)
+        b = PatentDataCollectionRequest(request_id="b", keywords=["A", "b"], max_patents=50, date_range={"start": "2024-01-01"})
+        c = PatentDataCollectionRequest(request_id="c", keywords=["A", "b"], countries=["CN"])
+
+        assert collection_query_key(a) == collection_query_key(b)
+        assert collection_query_key(a) != collection_query_key(c)
+
+    @pytest.mark.asyncio
+    async def test_second_run_fetches_only_delta(self, store, request_):
+        """测试第二次收集只请求水位线之后的数据，并合并到已保存的数据集."""
+        source = FakeSource([make_patent(f"CN{i}", i) for i in range(1, 11)])
+
+        first = await store.collect_delta("google_patents", request_, source.collect_patents)
+        assert len(first) == 10
+        assert source.requests[0].date_range is None
+
+        source.patents.append(make_patent("CN11", 11))
+        second = await store.collect_delta("google_patents", request_, source.collect_patents)
+
+        assert source.requests[1].date_range["start"] == "2024-02-09"
+        assert [p.application_number for p in second][:2] == ["CN11", "CN10"]
+        assert len(second) == 11
+
+        delta = store.last_deltas[("google_patents", collection_query_key(request_))]
+        # 重叠窗口内的两条旧记录被布隆过滤器丢弃
+        assert delta == {"incremental": True, "fetched": 3, "new_or_changed": 1}
+
+        watermark = await store.get_watermark("google_patents", collection_query_key(request_))
+        assert watermark.last_publication_date == datetime(2024, 2, 11)
+        assert watermark.last_application_number == "CN11"
+        assert watermark.record_count == 11
+
+    @pytest.mark.asyncio
+    async def test_changed_record_replaces_stored_copy(self, store, request_):
+        """测试内容变化的记录更新已保存的数据."""
+        key = collection_query_key(request_)
+        await store.merge("s", key, [make_patent("CN1", 1)])
+
+        assert await store.merge("s", key, [make_patent("CN1", 1)]) == 0
+        assert await store.merge("s", key, [make_patent("CN1", 1, status="已授权")]) == 1
+
+        dataset = await store.load_dataset("s", key)
+        assert len(dataset) == 1
+        assert dataset[0].status == "已授权"
+        assert dataset[0].publication_date == datetime(2024, 2, 1)
+
+    @pytest.mark.asyncio
+    async def test_bloom_false_positive_not_dropped(self, store, request_, monkeypatch):
+        """测试布隆过滤器误判“可能见过”时以已保存的内容指纹为准."""
+        key = collection_query_key(request_)
+        await store.merge("s", key, [make_patent("CN1", 1)])
+
+        # 模拟过滤器对所有元素都误判为已存在
+        monkeypatch.setattr(BloomFilter, "add", lambda self, item: False)
+        batch = [make_patent("CN1", 1), make_patent("CN2", 2), make_patent("CN2", 2), make_patent("CN1", 1, status="已授权")]
+
+        assert await store.merge("s", key, batch) == 2
+        dataset = await store.load_dataset("s", key)
+        assert [p.application_number for p in dataset] == ["CN2", "CN1"]
+        assert dataset[1].status == "已授权"
+
+    @pytest.mark.asyncio
+    async def test_record_count_without_dates(self, store, request_):
+        """测试没有日期的记录也按已保存总数计入水位线."""
+        key = collection_query_key(request_)
+        undated = [make_patent(f"CN{i}", i) for i in range(1, 4)]
+        for patent in undated:
+            patent.publication_date = patent.application_date = None
+        await store.merge("s", key, undated[:2])
+        await store.merge("s", key, undated[2:])
+
+        watermark = await store.get_watermark("s", key)
+        assert watermark.last_publication_date is None
+        assert watermark.record_count == 3
+
+    @pytest.mark.asyncio
+    async def test_sources_and_queries_isolated(self, store, request_):
+        key = collection_query_key(request_)
+        await store.merge("a", key, [make_patent("CN1", 1)])
+
+        assert await store.merge("b", key, [make_patent("CN1", 1)]) == 1
+        assert await store.get_watermark("a", "other") is None
+
+    def test_bloom_filter_round_trip(self):
+        bloom = BloomFilter(1000, 0.01)
+        hashes = [patent_content_hash(make_patent(f"CN{i}", i % 28 + 1)) for i in range(100)]
+        for h in hashes:
+            bloom.add(h)
+
+        restored = BloomFilter.from_bytes(bloom.to_bytes())
+
+        assert all(h in restored for h in hashes)
+        assert restored.count == 100
+
+
+class TestDataSourceManagerIncremental:
+    """测试数据源管理器的增量收集."""
+
+    @pytest.mark.asyncio
+    async def test_failover_collection_uses_watermark(self, store, request_):
+        source = FakeSource([make_patent(f"CN{i}", i) for i in range(1, 6)])
+        manager = DataSourceManager(collection_state=store)
+        manager.register_data_source("google_patents", source)
+        request_ = request_.model_copy(update={"data_sources": ["google_patents"]})
+
+        assert len(await manager.collect_patents_with_failover(request_)) == 5
+        # 没有新记录时返回已保存的数据集
+        assert len(await manager.collect_patents_with_failover(request_)) == 5
+        assert source.requests[1].date_range["start"] == "2024-02-04"
+
+    @pytest.mark.asyncio
+    async def test_non_incremental_request_unchanged(self, store):
+        source = FakeSource([make_patent("CN1", 1)])
+        manager = DataSourceManager(collection_state=store)
+        manager.register_data_source("google_patents", source)
+        request = PatentDataCollectionRequest(request_id="r", keywords=["x"], data_sources=["google_patents"])
+
+        await manager.collect_patents_with_failover(request)
+        await manager.collect_patents_with_failover(request)
+
+        assert all(r.date_range is None for r in source.requests)
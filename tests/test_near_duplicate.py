@@ -0,0 +1,102 @@
+"""测试搜索结果的MinHash-LSH近似去重."""
+
+import random
+
+import pytest
+
+from src.multi_agent_service.agents.patent.near_duplicate import (
+    NearDuplicateIndex,
+    deduplicate_results,
+    jaccard,
+    text_shingles
+)
+
+
+class TestTextShingles:
+    """测试特征片段切分."""
+
+    def test_cjk_character_bigrams(self):
+        """测试中文按字符二元组切分."""
+        assert text_shingles("图像识别") == {"图像", "像识", "识别"}
+
+    def test_mixed_text_and_normalization(self):
+        """测试中英文混合文本和全角字符归一化."""
+        shingles = text_shingles("基于CNN的识别 ＡＩ２０２４")
+
+        assert "cnn" in shingles
+        assert "ai2024" in shingles
+        assert "基于" in shingles
+        assert "识别" in shingles
+
+    def test_empty_text(self):
+        """测试空文本."""
+        assert text_shingles("") == set()
+        assert jaccard(set(), {"a"}) == 0.0
+
+
+class TestNearDuplicateDetection:
+    """测试近似重复检测."""
+
+    def test_chinese_near_duplicates_detected(self):
+        """测试中文近似重复结果被识别并保留质量更高的一条."""
+        results = [
+            {
+                "title": "一种基于深度学习的图像识别方法",
+                "content": "本发明公开了一种基于深度学习的图像识别方法，包括获取图像数据、训练卷积神经网络",
+                "initial_quality_score": 0.5
+            },
+            {
+                "title": "一种基于深度学习的图像识别方法及装置",
+                "content": "本发明公开了一种基于深度学习的图像识别方法，包括获取图像数据、训练卷积神经网络模型",
+                "initial_quality_score": 0.9
+            },
+            {
+                "title": "一种锂电池正极材料的制备方法",
+                "content": "本发明涉及锂电池技术领域",
+                "initial_quality_score": 0.7
+            }
+        ]
+
+        deduplicated = deduplicate_results(results)
+
+        assert len(deduplicated) == 2
+        assert deduplicated[0]["initial_quality_score"] == 0.9
+        assert deduplicated[1]["title"] == "一种锂电池正极材料的制备方法"
+
+    def test_distinct_results_kept(self):
+        """测试不同结果全部保留."""
+        results = [
+            {"title": f"Patent about topic number {i}", "content": f"unique content {i} " * 5}
+            for i in range(50)
+        ]
+
+        assert len(deduplicate_results(results, threshold=0.85, quality_key="comprehensive_quality")) == 50
+
+    def test_empty_content_does_not_match_everything(self):
+        """测试内容为空的结果只按标题比较."""
+        index = NearDuplicateIndex(threshold=0.8)
+        first = index.fingerprint({"title": "无线通信网络资源调度方法", "content": ""})
+        second = index.fingerprint({"title": "锂电池热管理系统", "content": ""})
+
+        index.add(first)
+
+        assert index.query(second) is None
+        assert index.query(index.fingerprint({"title": "无线通信网络资源调度方法", "content": ""})) == 0
+
+    def test_large_merge_is_deduplicated(self):
+        """测试合并的大量结果中重复条目被去除."""
+        rng = random.Random(7)
+        charset = "数据融合检索排序网络通信图像识别电池材料制备控制系统装置方法传感器芯片算法模型训练"
+
+        def random_text(length):
+            return "".join(rng.choice(charset) for _ in range(length))
+
+        base = [{"title": random_text(12), "content": random_text(40)} for _ in range(300)]
+        duplicates = [dict(result, title=result["title"] + "。") for result in base[:100]]
+
+        assert len(deduplicate_results(base + duplicates)) == 300
+
+    def test_invalid_band_configuration(self):
+        """测试签名长度必须能被分段数整除."""
+        with pytest.raises(ValueError):
+            NearDuplicateIndex(num_perm=64, bands=10)
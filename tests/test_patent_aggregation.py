@@ -0,0 +1,160 @@
+"""测试数据库聚合统计及其与分析器的集成."""
+
+import aiosqlite
+import pytest
+
+from src.multi_agent_service.agents.patent.competition_analyzer import CompetitionAnalyzer
+from src.multi_agent_service.agents.patent.trend_analyzer import TrendAnalyzer
+from src.multi_agent_service.patent.storage.aggregation import PatentAggregator
+from src.multi_agent_service.patent.storage.database import PatentDatabaseManager
+
+
+APPLICANTS = ["华为技术有限公司", "Samsung Electronics Co.", "清华大学", "IBM Corporation"]
+COUNTRIES = ["CN", "US", "KR"]
+IPC_CLASSES = ["G06F16/00", "H04L29/06", "G06N3/08"]
+
+
+def sample_patents(make_patent):
+    patents = []
+    index = 0
+    for year in range(2016, 2024):
+        # 申请量逐年增长，申请人、国家和分类交错分布
+        for n in range(year - 2013):
+            patents.append(make_patent(
+                index,
+                year=year,
+                month=n % 12 + 1,
+                applicants=[APPLICANTS[(n + year) % len(APPLICANTS)]],
+                country=COUNTRIES[n % len(COUNTRIES)],
+                ipc_class=IPC_CLASSES[(n * 2 + year) % len(IPC_CLASSES)],
+                title="一种数据处理方法",
+                abstract="数据处理相关的技术方案"
+            ))
+            index += 1
+    return patents
+
+
+def as_dicts(patents):
+    return [
+        {
+            "title": patent.title,
+            "applicants": [applicant.name for applicant in patent.applicants],
+            "application_date": patent.application_date.strftime("%Y-%m-%d"),
+            "country": patent.country,
+            "ipc_classes": [c.ipc_class for c in patent.classifications]
+        }
+        for patent in patents
+    ]
+
+
+def canonical(value):
+    """忽略列表顺序和浮点求和误差的可比较形式（同数量的申请人排序取决于记录顺序）."""
+    if isinstance(value, dict):
+        # 并列第一时取哪个申请人同样取决于记录顺序
+        return {key: canonical(item) for key, item in value.items() if key != "top_applicant"}
+    if isinstance(value, (list, tuple)):
+        return sorted((canonical(item) for item in value), key=repr)
+    if isinstance(value, float):
+        return round(value, 9)
+    return value
+
+
+@pytest.fixture
+async def db_manager(db_manager, make_patent):
+    await db_manager.save_patents_bulk(sample_patents(make_patent))
+    return db_manager
+
+
+class TestSummaryTables:
+    """测试写入路径维护的汇总表."""
+
+    @pytest.mark.asyncio
+    async def test_counts_after_bulk_save(self, db_manager, make_patent):
+        aggregator = PatentAggregator(db_manager)
+        patents = sample_patents(make_patent)
+
+        assert await aggregator.total() == len(patents)
+        assert await aggregator.yearly_counts() == {year: year - 2013 for year in range(2016, 2024)}
+        assert await aggregator.counts_by("country") == {
+            country: sum(1 for p in patents if p.country == country) for country in COUNTRIES
+        }
+
+    @pytest.mark.asyncio
+    async def test_upsert_moves_counts(self, db_manager, make_patent):
+        aggregator = PatentAggregator(db_manager)
+        before = await aggregator.yearly_counts()
+
+        moved = make_patent(0, year=2023, month=5, applicants=["清华大学"], country="JP", ipc_class="G06N3/08")
+        assert await db_manager.save_patent(moved)
+        await db_manager.save_patents_bulk([moved, moved])
+
+        after = await aggregator.yearly_counts()
+        assert after[2016] == before[2016] - 1
+        assert after[2023] == before[2023] + 1
+        assert (await aggregator.counts_by("country", start_year=2023))["JP"] == 1
+
+        async with aiosqlite.connect(db_manager.db_path) as db:
+            cursor = await db.execute("SELECT COUNT(*) FROM patent_summary WHERE patent_count <= 0")
+            assert (await cursor.fetchone())[0] == 0
+
+    @pytest.mark.asyncio
+    async def test_rebuild_matches_incremental(self, db_manager):
+        aggregator = PatentAggregator(db_manager)
+        dimensions = ("year", "month", "country", "applicant", "ipc_class")
+        incremental = sorted(map(repr, await aggregator.grouped_counts(dimensions)))
+
+        await db_manager.rebuild_summary()
+        assert sorted(map(repr, await aggregator.grouped_counts(dimensions))) == incremental
+
+    @pytest.mark.asyncio
+    async def test_filters_and_keywords(self, db_manager, make_patent):
+        aggregator = PatentAggregator(db_manager)
+        await db_manager.save_patent(make_patent(
+            999, year=2022, month=7, applicants=["清华大学"], ipc_class="G06N3/08", title="量子计算芯片"
+        ))
+
+        assert await aggregator.counts_by("ipc_main", keywords=["量子"]) == {"G06N": 1}
+        assert await aggregator.total(keywords=["不存在的词"]) == 0
+        assert await aggregator.total(countries=["US"], start_year=2020, end_year=2021) == sum(
+            1 for p in sample_patents(make_patent) if p.country == "US" and 2020 <= p.application_date.year <= 2021
+        )
+
+        with pytest.raises(ValueError):
+            await aggregator.grouped_counts(("title",))
+
+
+class TestAnalyzersFromStore:
+    """测试分析器基于汇总表的结果与逐条分析一致."""
+
+    @pytest.mark.asyncio
+    async def test_trend_analysis(self, db_manager, make_patent):
+        analyzer = TrendAnalyzer()
+        expected = await analyzer.analyze_trends(as_dicts(sample_patents(make_patent)), {})
+        result = await analyzer.analyze_trends_from_store(PatentAggregator(db_manager), {})
+
+        assert result["success"] is True
+        assert result["metadata"]["data_points"] == expected["metadata"]["data_points"]
+        for key in ("time_series", "yearly_analysis", "seasonality", "outliers"):
+            assert result["results"][key] == expected["results"][key]
+        assert result["results"]["prediction"] == expected["results"]["prediction"]
+
+    @pytest.mark.asyncio
+    async def test_competition_analysis(self, db_manager, make_patent):
+        analyzer = CompetitionAnalyzer()
+        expected = await analyzer.analyze_competition(as_dicts(sample_patents(make_patent)), {})
+        result = await analyzer.analyze_competition_from_store(PatentAggregator(db_manager), {})
+
+        assert result["success"] is True
+        assert result["metadata"]["patents_analyzed"] == expected["metadata"]["patents_analyzed"]
+        for key in ("applicant_analysis", "market_concentration", "geographic_competition", "temporal_competition"):
+            assert canonical(result["results"][key]) == canonical(expected["results"][key])
+
+    @pytest.mark.asyncio
+    async def test_insufficient_data(self, tmp_path):
+        manager = PatentDatabaseManager(str(tmp_path / "empty.db"))
+        await manager.initialize()
+        try:
+            result = await TrendAnalyzer().analyze_trends_from_store(PatentAggregator(manager), {})
+            assert "data_quality_issues" in result
+        finally:
+            await manager.cleanup()
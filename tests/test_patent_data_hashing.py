@@ -0,0 +1,89 @@
+"""测试专利哈希缓存和数据集去重索引."""
+
+import hashlib
+import time
+
+from src.multi_agent_service.patent.models.patent_data import PatentDataset
+
+
+class TestHashCache:
+    """测试哈希值缓存和失效."""
+
+    def test_hash_matches_definition(self, make_patent):
+        patent = make_patent(1)
+        content = f"{patent.application_number}|{patent.title}|{patent.abstract}|{patent.application_date.isoformat()}"
+        assert patent.content_hash == hashlib.md5(content.encode("utf-8")).hexdigest()
+        assert patent.content_hash is patent.content_hash
+        assert patent.similarity_hash is patent.similarity_hash
+
+    def test_invalidated_on_field_change(self, make_patent):
+        patent = make_patent(1)
+        content_hash, similarity_hash = patent.content_hash, patent.similarity_hash
+
+        patent.abstract = "完全不同的摘要内容"
+        assert patent.content_hash != content_hash
+        assert patent.similarity_hash != similarity_hash
+
+        updated = patent.model_copy(update={"application_number": "CN2023999.1"})
+        assert updated.content_hash != patent.content_hash
+        assert updated.similarity_hash == patent.similarity_hash
+        assert updated.content_hash == make_patent(1, abstract="完全不同的摘要内容").model_copy(
+            update={"application_number": "CN2023999.1"}
+        ).content_hash
+
+    def test_cache_not_serialized_or_compared(self, make_patent):
+        patent = make_patent(1)
+        fresh = patent.model_copy(deep=True)
+        fresh.__dict__.pop("_content_hash_cache", None)
+        patent.content_hash
+
+        assert patent == fresh
+        assert "_content_hash_cache" not in patent.model_dump()
+        assert patent.model_dump()["content_hash"] == fresh.content_hash
+
+
+class TestDatasetIndex:
+    """测试数据集的哈希索引."""
+
+    def test_add_and_duplicates(self, make_patent):
+        dataset = PatentDataset()
+        assert dataset.add_patent(make_patent(1))
+        assert not dataset.add_patent(make_patent(1))
+        # 摘要前50个词相同但申请号不同，相似性哈希相同
+        assert not dataset.add_patent(make_patent(2, title="一种数据处理方法 1",
+                                                  abstract="本发明公开了一种数据处理方法 编号 1 用于提高处理效率"))
+        assert dataset.add_patent(make_patent(2))
+        assert dataset.total_count == 2
+
+    def test_index_follows_list_changes(self, make_patent):
+        dataset = PatentDataset(patents=[make_patent(1)])
+        assert dataset._is_duplicate(make_patent(1))
+
+        dataset.patents.append(make_patent(2))
+        assert dataset._is_duplicate(make_patent(2))
+
+        dataset.patents = [make_patent(3)]
+        assert not dataset._is_duplicate(make_patent(1))
+        assert dataset.add_patent(make_patent(1))
+
+    def test_remove_duplicates(self, make_patent):
+        dataset = PatentDataset(patents=[make_patent(1), make_patent(2), make_patent(1)])
+        assert dataset.remove_duplicates() == 1
+        assert [p.application_number for p in dataset.patents] == [
+            make_patent(1).application_number, make_patent(2).application_number
+        ]
+        assert dataset._is_duplicate(make_patent(2))
+        assert not dataset._is_duplicate(make_patent(3))
+
+    def test_building_large_dataset_is_linear(self, make_patent):
+        patents = [make_patent(i) for i in range(20000)]
+        dataset = PatentDataset()
+
+        start = time.perf_counter()
+        added = sum(dataset.add_patent(patent) for patent in patents)
+        elapsed = time.perf_counter() - start
+
+        assert added == len(patents)
+        assert not dataset.add_patent(make_patent(19999))
+        # 逐个扫描时约需2亿次哈希比较
+        assert elapsed < 10
@@ -0,0 +1,100 @@
+"""测试专利数据库的批量写入."""
+
+import aiosqlite
+import pytest
+
+from src.multi_agent_service.patent.models.patent_data import PatentApplicant, PatentDataset, PatentInventor
+
+
+@pytest.fixture
+def make_patent(make_patent):
+    """带结构化申请人和两名发明人的专利."""
+    def factory(i, title=None):
+        return make_patent(
+            i,
+            application_number=f"CN2023{i:08d}.1",
+            title=title or f"图像识别专利{i}",
+            abstract=f"一种图像识别方法{i}的详细描述",
+            applicants=[PatentApplicant(name=f"公司{i % 7}", normalized_name=f"公司{i % 7}", country="CN")],
+            inventors=[
+                PatentInventor(name=f"发明人{i}", normalized_name=f"发明人{i}"),
+                PatentInventor(name="张三", normalized_name="张三")
+            ],
+            day=1 + i % 28,
+            status="申请中"
+        )
+    return factory
+
+
+async def count(manager, table):
+    async with aiosqlite.connect(manager.db_path) as db:
+        cursor = await db.execute(f"SELECT COUNT(*) FROM {table}")
+        return (await cursor.fetchone())[0]
+
+
+class TestSavePatentsBulk:
+    """测试批量保存专利."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_insert_in_chunks(self, db_manager, make_patent):
+        """测试分批事务写入主表和关联表，并报告每秒写入行数."""
+        stats = await db_manager.save_patents_bulk([make_patent(i) for i in range(1200)])
+
+        assert stats["patents"] == 1200
+        assert stats["chunks"] == 3
+        assert stats["rows"] == 1200 * 5
+        assert stats["rows_per_second"] > 0
+        assert await count(db_manager, "patents") == 1200
+        assert await count(db_manager, "patent_inventors") == 2400
+
+        patent = await db_manager.get_patent("P42")
+        assert patent.title == "图像识别专利42"
+        assert [i.name for i in patent.inventors] == ["发明人42", "张三"]
+        assert patent.classifications[0].ipc_class == "G06F16/00"
+
+    @pytest.mark.asyncio
+    async def test_upsert_replaces_children(self, db_manager, make_patent):
+        """测试重复保存更新主表并替换关联数据，不产生重复行."""
+        await db_manager.save_patents_bulk([make_patent(i) for i in range(10)])
+
+        updated = make_patent(3, title="更新后的标题")
+        updated.inventors = [PatentInventor(name="李四", normalized_name="李四")]
+        await db_manager.save_patents_bulk([updated])
+
+        assert await count(db_manager, "patents") == 10
+        assert await count(db_manager, "patent_inventors") == 19
+        patent = await db_manager.get_patent("P3")
+        assert patent.title == "更新后的标题"
+        assert [i.name for i in patent.inventors] == ["李四"]
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_rolled_back(self, db_manager, make_patent):
+        """测试失败批次整体回滚，其他批次正常提交."""
+        broken = make_patent(5).model_copy(update={"title": None})
+        patents = [make_patent(i) for i in range(5)] + [broken] + [make_patent(i) for i in range(6, 8)]
+
+        stats = await db_manager.save_patents_bulk(patents, chunk_size=4)
+
+        assert (stats["patents"], stats["failed"]) == (4, 4)
+        assert await count(db_manager, "patents") == 4
+        assert await count(db_manager, "patent_applicants") == 4
+
+    @pytest.mark.asyncio
+    async def test_wal_and_persistent_connection(self, db_manager, make_patent):
+        await db_manager.save_patents_bulk([make_patent(1)])
+        connection = db_manager._connection_pool._writer
+        await db_manager.save_patents_bulk([make_patent(2)])
+
+        assert db_manager._connection_pool._writer is connection
+        cursor = await connection.execute("PRAGMA journal_mode")
+        assert (await cursor.fetchone())[0] == "wal"
+
+    @pytest.mark.asyncio
+    async def test_string_applicants_and_dataset(self, db_manager, make_patent):
+        patent = make_patent(1)
+        patent.applicants = ["某公司"]
+        dataset = PatentDataset(patents=[patent, make_patent(2)], search_keywords=["图像"], data_sources=["test_source"])
+
+        assert await db_manager.save_dataset(dataset) is True
+        assert (await db_manager.get_patent("P1")).applicants[0].name == "某公司"
+        assert await count(db_manager, "dataset_patents") == 2
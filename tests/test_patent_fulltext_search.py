@@ -0,0 +1,111 @@
+"""测试本地专利全文检索."""
+
+import aiosqlite
+import pytest
+
+from src.multi_agent_service.patent.models.requests import PatentDataCollectionRequest
+from src.multi_agent_service.patent.storage.database import build_fts_query, segment_cjk
+from src.multi_agent_service.patent.utils.data_sources import DataSourceManager, LocalPatentAPI
+
+
+@pytest.fixture
+async def db_manager(db_manager, make_patent):
+    await db_manager.save_patents_bulk([
+        make_patent(1, title="一种图像识别方法", abstract="基于深度学习的图像识别方法，提高识别准确率"),
+        make_patent(2, title="图像压缩装置", abstract="一种用于视频传输的数据压缩装置",
+                    metadata={"claims": ["1. 一种图像识别模块"]}),
+        make_patent(3, title="Battery thermal management", abstract="A cooling system for lithium batteries",
+                    country="US", year=2020),
+        make_patent(4, title="语音识别系统", abstract="一种基于神经网络的语音识别系统"),
+    ])
+    return db_manager
+
+
+class TestFullTextQuery:
+    """测试查询构建."""
+
+    def test_segment_cjk(self):
+        assert segment_cjk("图像识别AI芯片").split() == ["图", "像", "识", "别", "AI", "芯", "片"]
+
+    def test_build_query(self):
+        assert build_fts_query(["图像", "deep learning"]) == '"图 像" OR "deep learning"'
+        assert build_fts_query(["图像", "识别"], match_all=True) == '"图 像" AND "识 别"'
+        assert build_fts_query(['a"b']) == '"a""b"'
+        assert build_fts_query(["  "]) == ""
+
+
+class TestSearchPatents:
+    """测试本地检索."""
+
+    @pytest.mark.asyncio
+    async def test_ranked_by_field_weight(self, db_manager):
+        """测试标题命中排在只有权利要求命中之前."""
+        results = await db_manager.search_patents("图像识别")
+        assert [p.patent_id for p in results] == ["P1", "P2"]
+        assert results[0].applicants[0].name == "某科技公司"
+
+    @pytest.mark.asyncio
+    async def test_two_character_keywords_and_phrase(self, db_manager):
+        assert {p.patent_id for p in await db_manager.search_patents("识别")} == {"P1", "P2", "P4"}
+        # 短语匹配要求字相邻
+        assert await db_manager.search_patents("图识") == []
+
+    @pytest.mark.asyncio
+    async def test_match_all_and_filters(self, db_manager):
+        results = await db_manager.search_patents(["识别", "语音"], match_all=True)
+        assert [p.patent_id for p in results] == ["P4"]
+
+        results = await db_manager.search_patents(["cooling", "识别"], countries=["US"])
+        assert [p.patent_id for p in results] == ["P3"]
+
+        results = await db_manager.search_patents("battery", date_range={"start": "2021-01-01"})
+        assert results == []
+
+    @pytest.mark.asyncio
+    async def test_index_follows_updates(self, db_manager, make_patent):
+        await db_manager.save_patent(make_patent(4, title="声纹验证系统", abstract="一种基于神经网络的声纹验证系统"))
+
+        assert "P4" not in {p.patent_id for p in await db_manager.search_patents("语音")}
+        assert [p.patent_id for p in await db_manager.search_patents("声纹")] == ["P4"]
+
+    @pytest.mark.asyncio
+    async def test_rebuild_on_initialize(self, db_manager):
+        async with aiosqlite.connect(db_manager.db_path) as db:
+            await db.execute("DELETE FROM patents_fts")
+            await db.commit()
+        assert await db_manager.search_patents("语音") == []
+
+        await db_manager.initialize()
+        assert [p.patent_id for p in await db_manager.search_patents("语音")] == ["P4"]
+
+
+class TestLocalDataSource:
+    """测试本地数据源."""
+
+    @pytest.mark.asyncio
+    async def test_collect_from_local_source(self, db_manager):
+        manager = DataSourceManager()
+        manager.register_data_source("local", LocalPatentAPI(db_manager))
+        request = PatentDataCollectionRequest(
+            request_id="r1", keywords=["图像"], max_patents=10, data_sources=["local"], ipc_classes=["G06F"]
+        )
+
+        patents = await manager.collect_patents_with_failover(request)
+
+        assert [p.application_number for p in patents] == ["CN20230000001.1", "CN20230000002.1"]
+        assert patents[0].applicants == ["某科技公司"]
+        assert patents[0].ipc_classes == ["G06F16/00"]
+        assert manager.data_sources["local"].get_stats()["patents_collected"] == 2
+
+    @pytest.mark.asyncio
+    async def test_ipc_filter_applied_before_limit(self, db_manager, make_patent):
+        await db_manager.save_patent(make_patent(5, title="通信协议", abstract="一种报文识别方法", ipc_class="H04L29/06"))
+        source = LocalPatentAPI(db_manager)
+        request = PatentDataCollectionRequest(
+            request_id="r2", keywords=["识别"], max_patents=1, data_sources=["local"], ipc_classes=["H04L"]
+        )
+
+        patents = await source.collect_patents(request)
+
+        assert [p.application_number for p in patents] == ["CN20230000005.1"]
+        assert await db_manager.search_patents("识别", ipc_classes=["h04l"]) == []
@@ -0,0 +1,124 @@
+"""测试流式专利数据处理管道."""
+
+import weakref
+
+import pytest
+
+from src.multi_agent_service.patent.models.patent_data import PatentDataset
+from src.multi_agent_service.patent.utils.data_processor import PatentDataProcessor, StreamingQualityStats
+
+
+@pytest.fixture
+def make_patent(make_patent):
+    """未标准化的专利：国家和状态使用原始写法."""
+    def factory(index, **fields):
+        return make_patent(index, applicants=["某科技有限公司"], country="中国", status="published", **fields)
+    return factory
+
+
+def sample_patents(make_patent):
+    patents = [make_patent(i) for i in range(40)]
+    patents.append(make_patent(3))
+    patents.append(make_patent(40, inventors=()))
+    patents.append(make_patent(41, title="一种" + "很长的标题" * 30))
+    patents.append(make_patent(42, application_number=make_patent(5).application_number))
+    patents.append(make_patent(43, year=1950))
+    return patents
+
+
+class TestProcessStream:
+    """测试流式处理."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_in_order(self, make_patent):
+        processor = PatentDataProcessor()
+        chunks = [
+            chunk async for chunk in processor.process_stream(sample_patents(make_patent), chunk_size=7, concurrency=3)
+        ]
+
+        assert all(len(chunk) <= 7 for chunk in chunks)
+        numbers = [p.application_number for chunk in chunks for p in chunk]
+        expected = [p.application_number for p in sample_patents(make_patent)]
+        expected.pop(40)  # 重复的第3个专利
+        assert numbers == expected
+        assert chunks[0][0].country == "CN"
+        assert chunks[0][0].status == "已公开"
+
+    @pytest.mark.asyncio
+    async def test_report_matches_batch_processing(self, make_patent):
+        processor = PatentDataProcessor()
+        dataset, batch_report = await processor.process_dataset(PatentDataset(patents=sample_patents(make_patent)))
+
+        stats = StreamingQualityStats()
+        async for _ in processor.process_stream(sample_patents(make_patent), chunk_size=6, stats=stats):
+            pass
+        report = processor.quality_controller.report_from_stats(stats, dataset.dataset_id)
+
+        for field in (
+            "total_records", "valid_records", "invalid_records", "duplicate_records", "quality_score",
+            "completeness_score", "accuracy_score", "consistency_score", "missing_fields", "invalid_formats",
+            "data_anomalies", "recommendations"
+        ):
+            assert getattr(report, field) == getattr(batch_report, field), field
+        assert report.duplicate_records == 1
+        assert any(anomaly.startswith("异常长标题") for anomaly in report.data_anomalies)
+
+    @pytest.mark.asyncio
+    async def test_async_source_and_disabled_stages(self, make_patent):
+        async def source():
+            for patent in sample_patents(make_patent):
+                yield patent
+
+        processor = PatentDataProcessor()
+        chunks = [
+            chunk async for chunk in processor.process_stream(
+                source(), chunk_size=10, standardize=False, deduplicate=False, validate=False
+            )
+        ]
+        assert [len(chunk) for chunk in chunks] == [10, 10, 10, 10, 5]
+        assert chunks[0][0].country == "中国"
+
+    @pytest.mark.asyncio
+    async def test_live_patents_bounded(self, make_patent):
+        live = [0]
+
+        def released():
+            live[0] -= 1
+
+        def source():
+            for i in range(3000):
+                patent = make_patent(i)
+                live[0] += 1
+                weakref.finalize(patent, released)
+                yield patent
+
+        processor = PatentDataProcessor()
+        peak = processed = 0
+        async for chunk in processor.process_stream(source(), chunk_size=50, concurrency=2):
+            processed += len(chunk)
+            peak = max(peak, live[0])
+            del chunk
+
+        assert processed == 3000
+        assert peak <= 50 * 5
+
+
+class TestProcessToDatabase:
+    """测试流式写入数据库."""
+
+    @pytest.mark.asyncio
+    async def test_writes_chunks_and_reports(self, db_manager, make_patent):
+        patents = sample_patents(make_patent)
+        processor = PatentDataProcessor()
+        write_stats, report = await processor.process_to_database(
+            patents, db_manager, dataset_id="stream", chunk_size=8
+        )
+
+        assert write_stats["patents"] == len(sample_patents(make_patent)) - 1
+        assert write_stats["failed"] == 0
+        assert write_stats["chunks"] == 6
+        assert report.dataset_id == "stream"
+        assert report.total_records == write_stats["patents"]
+
+        stored = await db_manager.get_patent(patents[7].patent_id)
+        assert stored is not None and stored.country == "CN"
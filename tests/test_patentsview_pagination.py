@@ -0,0 +1,191 @@
+"""测试PatentsView游标分页遍历."""
+
+import asyncio
+import json
+
+import pytest
+
+from src.multi_agent_service.patent.storage.classification_catalog import ClassificationCatalog
+from src.multi_agent_service.patent.services.patentsview_service import (
+    PatentsViewPaginationError,
+    PatentsViewService
+)
+from src.multi_agent_service.utils.rate_limiter import RateLimiter, rate_limiters
+
+
+class FakePatentsView:
+    """模拟按 ``patent_date`` 降序、``patent_id`` 升序排序并支持 ``after`` 的专利端点."""
+
+    def __init__(self, total: int, fail_on_call: int = None):
+        self.patents = sorted(
+            (
+                {"patent_id": f"{i:07d}", "patent_title": f"Patent {i}", "patent_date": f"2024-01-{i % 28 + 1:02d}"}
+                for i in range(total)
+            ),
+            key=lambda p: (-int(p["patent_date"].replace("-", "")), p["patent_id"])
+        )
+        self.fail_on_call = fail_on_call
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, endpoint, params):
+        self.requests.append(params)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            if self.fail_on_call == len(self.requests):
+                raise Exception("API request failed with status 503")
+
+            options = json.loads(params["o"])
+            start = 0
+            if "after" in options:
+                date, patent_id = options["after"]
+                key = (-int(date.replace("-", "")), patent_id)
+                start = next(
+                    (i for i, p in enumerate(self.patents)
+                     if (-int(p["patent_date"].replace("-", "")), p["patent_id"]) > key),
+                    len(self.patents)
+                )
+            page = self.patents[start:start + options["size"]]
+            return 200, {"error": False, "count": len(page), "total_hits": len(self.patents), "patents": page}
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = PatentsViewService(api_key="test", catalog=ClassificationCatalog(str(tmp_path / "catalog.db")))
+    # 独立的限制器，不修改进程内共享注册表中的限制器
+    service.rate_limiter = RateLimiter(60000, period=60.0)
+    service.config["max_retries"] = 1
+    return service
+
+
+class TestPatentsViewPagination:
+    """测试游标分页."""
+
+    @pytest.mark.asyncio
+    async def test_walks_past_max_page_size(self, service):
+        """测试超过单页上限的结果集完整遍历且不重复."""
+        api = FakePatentsView(total=2500)
+        service._send_request = api
+
+        pages = [page async for page in service.iter_patent_pages({"patent_title": "x"})]
+
+        ids = [p["patent_id"] for page in pages for p in page.patents]
+        assert [len(page.patents) for page in pages] == [1000, 1000, 500]
+        assert ids == [p["patent_id"] for p in api.patents]
+        assert pages[-1].has_more is False
+        assert pages[-1].fetched_count == 2500
+        assert pages[0].total_count == 2500
+
+        # 排序末尾补充patent_id，游标字段加入返回字段
+        first_request = api.requests[0]
+        assert json.loads(first_request["s"]) == [{"patent_date": "desc"}, {"patent_id": "asc"}]
+        assert "after" not in json.loads(first_request["o"])
+
+    @pytest.mark.asyncio
+    async def test_next_page_prefetched(self, service):
+        """测试处理当前页时下一页已在请求中."""
+        api = FakePatentsView(total=300)
+        service._send_request = api
+
+        requests_after_processing = []
+        async for page in service.iter_patent_pages({}, page_size=100):
+            await asyncio.sleep(0.01)
+            requests_after_processing.append(len(api.requests))
+
+        assert requests_after_processing == [2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_max_results(self, service):
+        """测试max_results限制最后一页的请求大小."""
+        api = FakePatentsView(total=500)
+        service._send_request = api
+
+        batches = [batch async for batch in service.iter_patents({}, page_size=100, max_results=250)]
+
+        assert [len(batch) for batch in batches] == [100, 100, 50]
+        assert json.loads(api.requests[-1]["o"])["size"] == 50
+
+    @pytest.mark.asyncio
+    async def test_resume_from_saved_cursor(self, service):
+        """测试失败后从保存的游标继续，结果与一次完整遍历相同."""
+        api = FakePatentsView(total=450, fail_on_call=3)
+        service._send_request = api
+
+        collected = []
+        with pytest.raises(PatentsViewPaginationError) as exc_info:
+            async for batch in service.iter_patents({}, page_size=100):
+                collected.extend(batch)
+
+        error = exc_info.value
+        assert error.fetched_count == 200
+        assert error.cursor == [collected[-1]["patent_date"], collected[-1]["patent_id"]]
+
+        api.fail_on_call = None
+        async for batch in service.iter_patents({}, page_size=100, after=error.cursor):
+            collected.extend(batch)
+
+        assert [p["patent_id"] for p in collected] == [p["patent_id"] for p in api.patents]
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_between_requests(self, service):
+        """测试预取也遵守请求速率上限."""
+        service.rate_limiter = RateLimiter(1200, period=60.0)  # 间隔50毫秒
+        api = FakePatentsView(total=300)
+        service._send_request = api
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        async for _ in service.iter_patent_pages({}, page_size=100):
+            pass
+
+        # 4次请求（最后一次返回空页），至少3个间隔
+        assert loop.time() - start >= 0.14
+        assert api.max_in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_comprehensive_search_collects_all_pages(self, service):
+        """测试综合搜索不再截断到单页上限."""
+        api = FakePatentsView(total=1500)
+
+        async def send_request(endpoint, params):
+            if endpoint == service.endpoints["patents"]:
+                return await api(endpoint, params)
+            return 200, {"status": "OK"}
+
+        service._send_request = send_request
+
+        result = await service.comprehensive_search(["x"], max_results=1200)
+
+        assert len(result.patents) == 1200
+
+    @pytest.mark.asyncio
+    async def test_every_request_and_retry_rate_limited(self, service):
+        """测试所有端点的请求和429后的重试都经过限制器."""
+        responses = iter([(429, "Too Many Requests"), (200, {"status": "OK"}), (200, {"status": "OK"})])
+
+        async def send_request(endpoint, params):
+            return next(responses)
+
+        service._send_request = send_request
+        service.config["max_retries"] = 2
+        service.config["rate_limit_delay"] = 0.01
+
+        await service.search_assignees({"assignee_organization": "x"})
+        await service.search_inventors({"inventor_name_last": "x"})
+
+        stats = service.rate_limiter.get_stats()
+        assert stats["acquired"] == 3
+        assert stats["penalties"] == 1
+
+    def test_instances_share_registry_limiter(self, tmp_path):
+        """测试服务实例共享注册表中的限制器，实例配置不会修改它."""
+        first = PatentsViewService(api_key="test", catalog=ClassificationCatalog(str(tmp_path / "a.db")))
+        second = PatentsViewService(api_key="test", catalog=ClassificationCatalog(str(tmp_path / "b.db")))
+
+        assert first.rate_limiter is second.rate_limiter
+        assert first.rate_limiter is rate_limiters.get("search.patentsview.org")
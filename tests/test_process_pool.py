@@ -0,0 +1,162 @@
+"""测试CPU密集型节点的进程池执行层."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.multi_agent_service.utils.process_pool import (
+    ProcessPoolTier,
+    is_process_node,
+    run_node_in_process,
+    resolve_target
+)
+from src.multi_agent_service.workflows.patent_workflow_engine import PatentWorkflowNode
+from src.multi_agent_service.patent.utils.analysis_kernels import (
+    compute_competition_stats,
+    compute_trend_stats
+)
+from src.multi_agent_service.models.workflow import NodeExecutionContext
+
+
+def cpu_task(data):
+    """模拟CPU密集型计算（模块级函数，可在子进程中导入）."""
+    total = 0
+    for i in range(data.get("iterations", 200000)):
+        total += i % 7
+    return {"total": total, "keys": sorted(data.keys())}
+
+
+def slow_task(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+@pytest.fixture(scope="module")
+def tier():
+    pool_tier = ProcessPoolTier(max_workers=2, max_concurrency=2)
+    yield pool_tier
+    pool_tier.shutdown()
+
+
+class TestProcessPoolTier:
+    """测试进程池执行层."""
+
+    @pytest.mark.asyncio
+    async def test_run_keeps_event_loop_responsive(self, tier):
+        """测试计算在子进程中执行时事件循环仍可调度其他协程."""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        try:
+            result = await tier.run(cpu_task, {"iterations": 3000000})
+        finally:
+            ticker_task.cancel()
+
+        assert result["total"] == sum(i % 7 for i in range(3000000))
+        assert ticks > 1
+        assert tier.get_stats()["default"]["completed"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_timeout_cancels_task(self, tier):
+        """测试超时后任务被取消并计入统计."""
+        with pytest.raises(asyncio.TimeoutError):
+            await tier.run(slow_task, 2, pool="slow", timeout=0.1)
+
+        stats = tier.get_stats()["slow"]
+        assert stats["cancelled"] == 1
+        assert stats["active"] == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        """测试每个池的并发上限."""
+        pool_tier = ProcessPoolTier(max_workers=1, max_concurrency=1)
+        try:
+            results = await asyncio.gather(*[pool_tier.run(slow_task, 0.01) for _ in range(3)])
+            assert results == [0.01, 0.01, 0.01]
+            assert pool_tier.get_stats()["default"]["submitted"] == 3
+            assert pool_tier.get_stats()["default"]["max_concurrency"] == 1
+        finally:
+            pool_tier.shutdown()
+
+    def test_resolve_target(self):
+        """测试目标函数路径解析."""
+        assert resolve_target(f"{__name__}:cpu_task") is cpu_task
+        with pytest.raises(ValueError):
+            resolve_target("no_function_path")
+
+
+class TestProcessNodes:
+    """测试工作流节点的进程池执行选项."""
+
+    @pytest.mark.asyncio
+    async def test_run_node_with_input_slice(self, tier):
+        """测试只传输声明的输入字段."""
+        node = PatentWorkflowNode(
+            "analysis",
+            "Analysis",
+            config={
+                "execution_tier": "process",
+                "process_target": f"{__name__}:cpu_task",
+                "process_input_keys": ["iterations", "keywords"]
+            }
+        )
+
+        assert is_process_node(node) is True
+        result = await run_node_in_process(
+            node,
+            {"iterations": 10, "keywords": ["ai"]},
+            {"large_state": list(range(1000))},
+            tier=tier
+        )
+
+        assert result["keys"] == ["iterations", "keywords"]
+
+    @pytest.mark.asyncio
+    async def test_patent_node_executes_in_process(self):
+        """测试专利节点标记后在进程池中执行."""
+        node = PatentWorkflowNode(
+            "trend",
+            "Trend",
+            config={"execution_tier": "process", "process_target": f"{__name__}:cpu_task"}
+        )
+        context = NodeExecutionContext(
+            node_id="trend",
+            execution_id="exec1",
+            input_data={"iterations": 10},
+            shared_state={}
+        )
+
+        result = await node.execute(context)
+
+        assert result["status"] == "completed"
+        assert result["node_id"] == "trend"
+        assert result["total"] == sum(i % 7 for i in range(10))
+
+    def test_unmarked_node_not_process(self):
+        """测试未标记的节点仍在事件循环中执行."""
+        assert is_process_node(PatentWorkflowNode("n", "N", config={"execution_tier": "process"})) is False
+        assert is_process_node(PatentWorkflowNode("n", "N")) is False
+
+
+class TestAnalysisKernels:
+    """测试分析计算内核."""
+
+    @pytest.mark.asyncio
+    async def test_kernels_same_result_in_process(self, tier):
+        """测试内核在子进程中的结果与直接调用一致."""
+        years = [2020, 2020, 2021, 2022, 2022, 2022]
+        applicants = [["Company A"], ["Company B", "Company A"], []]
+
+        assert await tier.run(compute_trend_stats, years) == compute_trend_stats(years)
+        assert await tier.run(compute_competition_stats, applicants) == compute_competition_stats(applicants)
+
+        trend = compute_trend_stats(years)
+        assert trend["peak_year"] == 2022
+        assert trend["trend_direction"] == "increasing"
@@ -0,0 +1,146 @@
+"""测试搜索缓存的过期重验证和热门查询预取."""
+
+import asyncio
+from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.multi_agent_service.agents.patent.query_prefetch import QueryPopularityTracker, QueryPrefetcher
+from src.multi_agent_service.agents.patent.search_agent import PatentSearchAgent
+from src.multi_agent_service.models.base import UserRequest
+from src.multi_agent_service.models.config import AgentConfig, ModelConfig
+from src.multi_agent_service.models.enums import AgentType, ModelProvider
+
+
+@pytest.fixture
+def search_agent():
+    config = AgentConfig(
+        agent_id="patent_search_cache",
+        agent_type=AgentType.PATENT_SEARCH,
+        name="Patent Search Agent",
+        description="Patent search agent for cache tests",
+        llm_config=ModelConfig(
+            provider=ModelProvider.CUSTOM,
+            model_name="mock",
+            api_key="mock",
+            base_url="http://localhost"
+        ),
+        prompt_template="{input}"
+    )
+    agent = PatentSearchAgent(config, MagicMock())
+    agent.search_calls = 0
+
+    async def fake_search(search_params):
+        agent.search_calls += 1
+        return {"cnki": [{"title": f"图像识别方法{agent.search_calls}", "content": "卷积神经网络", "url": "https://example.com"}]}
+
+    agent._execute_parallel_search = fake_search
+    return agent
+
+
+class TestQueryPopularityTracker:
+    """测试查询频次统计."""
+
+    def test_top_queries_by_day(self):
+        """测试按天统计热门查询."""
+        tracker = QueryPopularityTracker()
+        yesterday = datetime(2024, 5, 1, 10)
+        for _ in range(3):
+            tracker.record("a", {"keywords": ["人工智能"]}, when=yesterday)
+        tracker.record("b", {"keywords": ["区块链"]}, when=yesterday)
+        tracker.record("c", {"keywords": ["芯片"]}, when=yesterday + timedelta(days=1))
+
+        top = tracker.top_queries(date(2024, 5, 1), limit=1)
+
+        assert top == [({"keywords": ["人工智能"]}, 3)]
+        assert tracker.top_queries(date(2024, 4, 30), limit=5) == []
+
+    def test_old_days_pruned(self):
+        """测试超过保留天数的统计被清理."""
+        tracker = QueryPopularityTracker(retention_days=2)
+        tracker.record("old", {"keywords": ["旧查询"]}, when=datetime(2024, 5, 1))
+        tracker.record("new", {"keywords": ["新查询"]}, when=datetime(2024, 5, 10))
+
+        assert tracker.top_queries(date(2024, 5, 1), limit=5) == []
+        assert "old" not in tracker._query_params
+
+
+class TestQueryPrefetcher:
+    """测试热门查询预取."""
+
+    @pytest.mark.asyncio
+    async def test_prefetch_warms_previous_day_top_queries(self):
+        """测试预取前一天的前N个查询，单个失败不影响其他查询."""
+        tracker = QueryPopularityTracker()
+        yesterday = datetime.now() - timedelta(days=1)
+        for name, count in (("a", 3), ("b", 2), ("c", 1)):
+            for _ in range(count):
+                tracker.record(name, {"keywords": [name]}, when=yesterday)
+
+        refreshed = []
+
+        async def refresh(search_params):
+            if search_params["keywords"] == ["b"]:
+                raise RuntimeError("source unavailable")
+            refreshed.append(search_params["keywords"][0])
+
+        prefetcher = QueryPrefetcher(refresh, tracker, top_n=2)
+        summary = await prefetcher.prefetch()
+
+        assert refreshed == ["a"]
+        assert summary["queries"] == 2
+        assert summary["succeeded"] == 1
+
+    def test_seconds_until_next_run(self):
+        """测试下一次预取时间的计算."""
+        prefetcher = QueryPrefetcher(None, QueryPopularityTracker(), run_at="07:30")
+
+        assert prefetcher.seconds_until_next_run(datetime(2024, 5, 1, 7, 0)) == 1800
+        assert prefetcher.seconds_until_next_run(datetime(2024, 5, 1, 8, 0)) == 23.5 * 3600
+
+
+class TestStaleWhileRevalidate:
+    """测试过期缓存先返回旧结果再后台刷新."""
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_and_refreshed(self, search_agent):
+        """测试过期缓存立即返回并只触发一次后台刷新."""
+        request = UserRequest(content="搜索人工智能相关专利")
+
+        first = await search_agent._process_request_specific(request)
+        assert search_agent.search_calls == 1
+        assert "图像识别方法1" in first.response_content
+
+        # 模拟缓存过期但仍在stale窗口内
+        for entry in search_agent._cache.values():
+            entry["cached_at"] -= search_agent.cache_config["ttl"] + 1
+
+        stale = await search_agent._process_request_specific(request)
+        again = await search_agent._process_request_specific(request)
+
+        assert stale.metadata["stale"] is True
+        assert "图像识别方法1" in stale.response_content
+        assert again.metadata["stale"] is True
+        assert len(search_agent._refresh_tasks) == 1
+
+        await asyncio.gather(*search_agent._refresh_tasks.values())
+
+        fresh = await search_agent._process_request_specific(request)
+        assert search_agent.search_calls == 2
+        assert fresh.metadata["stale"] is False
+        assert "图像识别方法2" in fresh.response_content
+
+    @pytest.mark.asyncio
+    async def test_entry_past_stale_window_is_refetched(self, search_agent):
+        """测试超过stale窗口的缓存不再返回."""
+        request = UserRequest(content="搜索人工智能相关专利")
+        await search_agent._process_request_specific(request)
+
+        for entry in search_agent._cache.values():
+            entry["cached_at"] -= search_agent.cache_config["ttl"] + search_agent.cache_config["stale_ttl"] + 1
+
+        response = await search_agent._process_request_specific(request)
+
+        assert search_agent.search_calls == 2
+        assert "from_cache" not in response.metadata
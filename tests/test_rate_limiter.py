@@ -0,0 +1,117 @@
+"""测试按上游共享的速率限制器."""
+
+import asyncio
+
+import pytest
+
+from src.multi_agent_service.agents.patent.crawl_frontier import HostPoliteness
+from src.multi_agent_service.agents.patent.search_agent import BochaAIClient, CNKIClient
+from src.multi_agent_service.patent.models.data import PatentDataSource
+from src.multi_agent_service.patent.utils.data_sources import BasePatentAPI
+from src.multi_agent_service.utils.rate_limiter import RateLimiter, RateLimiterRegistry, rate_limiters
+
+
+class TestRateLimiter:
+    """测试GCRA限速."""
+
+    def test_burst_then_spaced(self):
+        """测试突发额度用完后按间隔预约."""
+        limiter = RateLimiter(rate=10, burst=3)
+
+        delays = [limiter.reserve() for _ in range(5)]
+
+        assert delays[:3] == [0.0, 0.0, 0.0]
+        assert delays[3] == pytest.approx(0.1, abs=0.01)
+        assert delays[4] == pytest.approx(0.2, abs=0.01)
+
+    def test_period(self):
+        limiter = RateLimiter(rate=120, period=60)
+        limiter.reserve()
+        assert limiter.reserve() == pytest.approx(0.5, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_acquirers_wait_in_parallel_fifo(self):
+        """测试并发请求在锁外等待，按调用顺序放行，总耗时接近理论值."""
+        limiter = RateLimiter(rate=100)
+        order = []
+
+        async def worker(i):
+            await limiter.acquire()
+            order.append(i)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.gather(*(worker(i) for i in range(10)))
+        elapsed = loop.time() - start
+
+        assert order == list(range(10))
+        assert 0.085 <= elapsed < 0.3
+        assert limiter.get_stats()["delayed"] == 9
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_returns_slot(self):
+        limiter = RateLimiter(rate=10)
+        await limiter.acquire()
+
+        task = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert limiter.reserve() == pytest.approx(0.1, abs=0.02)
+
+    def test_penalize_and_configure(self):
+        """测试429后推迟所有请求，调整速率影响之后的预约."""
+        limiter = RateLimiter(rate=100, burst=5)
+
+        limiter.penalize(1.0)
+        assert limiter.reserve() == pytest.approx(1.0, abs=0.01)
+
+        limiter = RateLimiter(rate=100)
+        limiter.configure(rate=2)
+        limiter.reserve()
+        assert limiter.reserve() == pytest.approx(0.5, abs=0.01)
+
+
+class TestRateLimiterRegistry:
+    """测试限制器注册表."""
+
+    def test_shared_per_key(self):
+        registry = RateLimiterRegistry()
+
+        first = registry.get("api.example.com", rate=5)
+        assert registry.get("api.example.com", rate=50) is first
+        assert first.rate == 5
+
+        registry.configure("api.example.com", rate=20, burst=2)
+        assert (first.rate, first.burst) == (20, 2)
+        assert set(registry.get_stats()) == {"api.example.com"}
+
+    def test_clients_share_upstream_limiter(self):
+        """测试同一上游的多个客户端共用限制器."""
+        assert BochaAIClient().rate_limiter is BochaAIClient().rate_limiter
+        assert CNKIClient().rate_limiter is rate_limiters.get("api.cnki.net")
+
+    def test_data_source_rate_is_per_minute(self):
+        """测试数据源的 rate_limit 按每分钟请求数限速."""
+        config = PatentDataSource(name="per_minute", base_url="https://per-minute.example.com", rate_limit=10)
+        limiter = BasePatentAPI(config).rate_limiter
+
+        assert limiter is rate_limiters.get("per-minute.example.com")
+        assert limiter.period / limiter.rate == pytest.approx(6.0)
+        assert [limiter.reserve() for _ in range(2)][1] == pytest.approx(6.0, abs=0.1)
+
+    @pytest.mark.asyncio
+    async def test_host_politeness_uses_registry(self):
+        """测试爬虫的主机限速器来自注册表."""
+        registry = RateLimiterRegistry()
+        politeness = HostPoliteness(limiters=registry)
+        politeness.configure_host("a.com", rate=4, burst=2)
+
+        async with politeness.slot("a.com"):
+            pass
+
+        bucket = registry.get("a.com")
+        assert (bucket.rate, bucket.burst) == (4, 2)
+        assert bucket.get_stats()["acquired"] == 1
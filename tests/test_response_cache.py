@@ -0,0 +1,280 @@
+"""测试专利数据源HTTP响应缓存."""
+
+import asyncio
+import json
+import threading
+
+import httpx
+import pytest
+
+from src.multi_agent_service.patent.utils.http_client import PatentHTTPClient, RetryConfig
+from src.multi_agent_service.patent.utils.response_cache import (
+    HTTPResponseCache,
+    cached_aiohttp_request,
+    parse_cache_control
+)
+from src.multi_agent_service.utils.rate_limiter import RateLimiter
+
+
+class FakeOrigin:
+    """模拟源站：按路径返回固定内容，支持ETag条件请求."""
+
+    def __init__(self, headers=None, etag='"v1"'):
+        self.headers = headers or {}
+        self.etag = etag
+        self.body = b'{"patents": [1, 2, 3]}'
+        self.calls = []
+
+    async def send(self, conditional):
+        self.calls.append(conditional)
+        headers = dict(self.headers)
+        if self.etag:
+            headers["ETag"] = self.etag
+            if conditional.get("If-None-Match") == self.etag:
+                return 304, headers, b""
+        headers["Content-Encoding"] = "gzip"
+        return 200, headers, self.body
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = HTTPResponseCache(str(tmp_path / "cache"), default_ttl=60)
+    yield cache
+    cache.close()
+
+
+class TestHTTPResponseCache:
+    """测试缓存语义."""
+
+    def test_parse_cache_control(self):
+        assert parse_cache_control('max-age=60, No-Cache, private="x"') == {
+            "max-age": "60", "no-cache": None, "private": "x"
+        }
+
+    @pytest.mark.asyncio
+    async def test_fresh_hit(self, cache):
+        """测试新鲜条目直接返回，已解码响应体不带Content-Encoding."""
+        origin = FakeOrigin({"Cache-Control": "max-age=300"})
+
+        first = await cache.fetch("GET", "https://api.example.com/p", origin.send, params={"q": "a"})
+        second = await cache.fetch("GET", "https://api.example.com/p", origin.send, params={"q": "a"})
+
+        assert (first.cache_status, second.cache_status) == ("MISS", "HIT")
+        assert await second.json() == {"patents": [1, 2, 3]}
+        assert "content-encoding" not in second.headers
+        assert len(origin.calls) == 1
+        assert cache.get_stats()["hit_rate"] == 50.0
+
+    @pytest.mark.asyncio
+    async def test_params_order_and_body_in_key(self, cache):
+        origin = FakeOrigin()
+
+        await cache.fetch("GET", "https://a/p", origin.send, params={"a": 1, "b": 2})
+        hit = await cache.fetch("GET", "https://a/p", origin.send, params={"b": 2, "a": 1})
+        other = await cache.fetch("POST", "https://a/p", origin.send, body={"q": "x"}, cacheable=True)
+
+        assert hit.cache_status == "HIT"
+        assert other.cache_status == "MISS"
+
+    @pytest.mark.asyncio
+    async def test_conditional_revalidation(self, cache):
+        """测试过期条目带If-None-Match重验证，304时返回缓存内容."""
+        origin = FakeOrigin({"Cache-Control": "no-cache"})
+
+        await cache.fetch("GET", "https://a/p", origin.send)
+        response = await cache.fetch("GET", "https://a/p", origin.send)
+
+        assert response.cache_status == "REVALIDATED"
+        assert response.status == 200
+        assert await response.read() == origin.body
+        assert origin.calls[1] == {"If-None-Match": '"v1"'}
+
+    @pytest.mark.asyncio
+    async def test_changed_content_replaces_entry(self, cache):
+        origin = FakeOrigin({"Cache-Control": "max-age=0"})
+        await cache.fetch("GET", "https://a/p", origin.send)
+
+        origin.etag = '"v2"'
+        origin.body = b'{"patents": []}'
+        response = await cache.fetch("GET", "https://a/p", origin.send)
+
+        assert response.cache_status == "MISS"
+        assert await response.json() == {"patents": []}
+        assert cache.get_stats()["entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_no_store_and_uncacheable(self, cache):
+        """测试no-store、POST默认和错误状态不缓存."""
+        no_store = FakeOrigin({"Cache-Control": "no-store"})
+        await cache.fetch("GET", "https://a/1", no_store.send)
+        await cache.fetch("GET", "https://a/1", no_store.send)
+        assert len(no_store.calls) == 2
+
+        post = FakeOrigin()
+        response = await cache.fetch("POST", "https://a/2", post.send, body={"q": 1})
+        assert response.cache_status == "BYPASS"
+
+        async def server_error(conditional):
+            return 500, {}, b"error"
+
+        await cache.fetch("GET", "https://a/3", server_error)
+        assert cache.get_stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_default_ttl_without_headers(self, tmp_path):
+        """测试没有缓存头的API按默认TTL缓存."""
+        cache = HTTPResponseCache(str(tmp_path / "c"), default_ttl=0)
+        origin = FakeOrigin(etag=None)
+
+        await cache.fetch("GET", "https://a/p", origin.send)
+        assert cache.get_stats()["entries"] == 0
+
+        await cache.fetch("GET", "https://a/p", origin.send, ttl=60)
+        assert (await cache.fetch("GET", "https://a/p", origin.send)).cache_status == "HIT"
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_identical_refetch_keeps_body(self, tmp_path):
+        """测试过期后重新获取到相同内容时，新条目仍能读取缓存的响应体."""
+        cache = HTTPResponseCache(str(tmp_path / "c"), default_ttl=0.05)
+        origin = FakeOrigin(etag=None)
+
+        await cache.fetch("GET", "https://a/p", origin.send)
+        await asyncio.sleep(0.1)
+        refreshed = await cache.fetch("GET", "https://a/p", origin.send)
+        hit = await cache.fetch("GET", "https://a/p", origin.send)
+
+        assert (refreshed.cache_status, hit.cache_status) == ("MISS", "HIT")
+        assert await hit.read() == origin.body
+        assert len(origin.calls) == 2
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_and_content_addressing(self, tmp_path):
+        """测试相同内容只存一份，超过容量时淘汰最久未使用的条目."""
+        cache = HTTPResponseCache(str(tmp_path / "c"), max_bytes=250, default_ttl=60)
+
+        def origin(body):
+            async def send(conditional):
+                return 200, {}, body
+            return send
+
+        await cache.fetch("GET", "https://a/1", origin(b"a" * 100))
+        await cache.fetch("GET", "https://a/1-copy", origin(b"a" * 100))
+        assert cache.total_bytes == 100
+
+        await cache.fetch("GET", "https://a/2", origin(b"b" * 100))
+        await cache.fetch("GET", "https://a/1", origin(b"a" * 100))  # 命中，变为最近使用
+        await cache.fetch("GET", "https://a/3", origin(b"c" * 100))
+
+        # 1-copy与1共享内容，淘汰它不释放空间，继续淘汰2
+        stats = cache.get_stats()
+        assert stats["evictions"] == 2
+        assert stats["bytes"] == 200
+        assert (await cache.fetch("GET", "https://a/1", origin(b"a" * 100))).cache_status == "HIT"
+        assert (await cache.fetch("GET", "https://a/2", origin(b"b" * 100))).cache_status == "MISS"
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_index_persisted(self, tmp_path):
+        origin = FakeOrigin({"Cache-Control": "max-age=300"})
+        cache = HTTPResponseCache(str(tmp_path / "c"))
+        await cache.fetch("GET", "https://a/p", origin.send)
+        cache.close()
+
+        reopened = HTTPResponseCache(str(tmp_path / "c"))
+        response = await reopened.fetch("GET", "https://a/p", origin.send)
+
+        assert response.cache_status == "HIT"
+        assert len(origin.calls) == 1
+        reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_index_writes_off_event_loop(self, tmp_path):
+        """测试索引写入在线程中批量提交，命中不在事件循环中执行SQL."""
+        cache = HTTPResponseCache(str(tmp_path / "c"))
+        real_db = cache._db
+        threads = []
+
+        class RecordingConnection:
+            def __getattr__(self, name):
+                threads.append(threading.get_ident())
+                return getattr(real_db, name)
+
+        cache._db = RecordingConnection()
+        origin = FakeOrigin({"Cache-Control": "max-age=300"})
+        for _ in range(20):
+            await cache.fetch("GET", "https://a/p", origin.send)
+        await cache.flush()
+
+        assert cache.get_stats()["hits"] == 19
+        assert threads and threading.get_ident() not in threads
+        row = real_db.execute("SELECT stored_at, last_access FROM entries").fetchone()
+        assert row[1] > row[0]
+        cache.close()
+
+
+class TestClientIntegration:
+    """测试HTTP客户端使用缓存."""
+
+    @pytest.mark.asyncio
+    async def test_patent_http_client(self, cache):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if request.headers.get("If-None-Match") == '"abc"':
+                return httpx.Response(304, headers={"ETag": '"abc"'})
+            return httpx.Response(200, json={"id": request.url.params["id"]}, headers={"ETag": '"abc"', "Cache-Control": "max-age=0"})
+
+        client = PatentHTTPClient("https://api.example.com", retry_config=RetryConfig(max_attempts=1), response_cache=cache)
+        client._client = httpx.AsyncClient(base_url="https://api.example.com", transport=httpx.MockTransport(handler))
+
+        first = await client.get("/patent", params={"id": "US1"})
+        second = await client.get("/patent", params={"id": "US1"})
+
+        assert first.json() == second.json() == {"id": "US1"}
+        assert second.headers["X-Cache"] == "REVALIDATED"
+        assert len(calls) == 2
+        assert client.get_stats()["response_cache"]["revalidated"] == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_aiohttp_adapter(self, cache):
+        """测试aiohttp风格客户端（博查、CNKI）通过缓存发送POST检索请求."""
+        calls = []
+
+        class FakeResponse:
+            status = 200
+            headers = {"Content-Type": "application/json"}
+
+            async def read(self):
+                return json.dumps({"data": calls[-1]}).encode()
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+        class FakeSession:
+            headers = {}
+
+            def post(self, url, json=None, headers=None):
+                calls.append(json)
+                return FakeResponse()
+
+        session = FakeSession()
+        limiter = RateLimiter(1000)
+        for _ in range(2):
+            async with cached_aiohttp_request(
+                session, cache, "POST", "https://api.bochaai.com/v1/web-search",
+                cacheable=True, json={"query": "专利"}, headers={"Authorization": "Bearer k"},
+                rate_limiter=limiter
+            ) as response:
+                assert response.status == 200
+                assert await response.json() == {"data": {"query": "专利"}}
+
+        assert len(calls) == 1
+        # 缓存命中不占用速率配额
+        assert limiter.get_stats()["acquired"] == 1
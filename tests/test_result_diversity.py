@@ -0,0 +1,65 @@
+"""测试搜索结果的MMR多样性重排序."""
+
+import numpy as np
+
+from src.multi_agent_service.agents.patent.diversity import (
+    build_feature_matrix,
+    mmr_rerank,
+    mmr_select
+)
+
+
+class TestFeatureMatrix:
+    """测试哈希特征向量."""
+
+    def test_self_similarity_and_empty_fields(self):
+        """测试特征向量的内积为标题和内容余弦相似度的平均值."""
+        results = [
+            {"title": "深度学习图像识别", "content": "卷积神经网络训练"},
+            {"title": "深度学习图像识别", "content": ""},
+            {"title": "", "content": ""}
+        ]
+
+        features = build_feature_matrix(results)
+        similarity = features @ features.T
+
+        assert abs(similarity[0, 0] - 1.0) < 1e-5
+        assert abs(similarity[0, 1] - 0.5) < 1e-5
+        assert similarity[2, 2] == 0.0
+
+
+class TestMMRSelection:
+    """测试MMR选择."""
+
+    def test_prefers_diverse_results(self):
+        """测试质量相近时优先选择差异较大的结果."""
+        results = [
+            {"title": "深度学习图像识别方法", "content": "卷积神经网络", "score": 1.0},
+            {"title": "深度学习图像识别方法", "content": "卷积神经网络", "score": 0.95},
+            {"title": "锂电池正极材料制备", "content": "电化学储能", "score": 0.9},
+            {"title": "无线通信资源调度", "content": "基站功率控制", "score": 0.85}
+        ]
+
+        reranked = mmr_rerank(results, score_key="score", k=3, lambda_=0.7)
+
+        assert [r["title"] for r in reranked] == [
+            "深度学习图像识别方法",
+            "锂电池正极材料制备",
+            "无线通信资源调度"
+        ]
+
+    def test_lambda_one_keeps_quality_order(self):
+        """测试lambda为1时退化为按质量排序."""
+        results = [{"title": f"结果{i}", "content": "相同内容", "score": 1 - i * 0.1} for i in range(6)]
+
+        reranked = mmr_rerank(results, score_key="score", k=4, lambda_=1.0)
+
+        assert [r["score"] for r in reranked] == [results[i]["score"] for i in range(4)]
+
+    def test_k_limits_and_edge_cases(self):
+        """测试返回数量限制和边界情况."""
+        features = np.eye(3, dtype=np.float32)
+
+        assert mmr_select(np.array([0.5, 0.4, 0.3]), features, k=10) == [0, 1, 2]
+        assert mmr_select(np.array([]), np.zeros((0, 3), dtype=np.float32), k=5) == []
+        assert mmr_rerank([], score_key="score") == []
@@ -0,0 +1,165 @@
+"""测试多源搜索结果的流式返回."""
+
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.multi_agent_service.agents.patent.near_duplicate import IncrementalDeduplicator
+from src.multi_agent_service.agents.patent.search_agent import PatentSearchAgent
+from src.multi_agent_service.api.patent import router
+from src.multi_agent_service.models.config import AgentConfig, ModelConfig
+from src.multi_agent_service.models.enums import AgentType, ModelProvider
+
+
+class FakeSearchClient:
+    """按指定延迟返回固定结果的搜索客户端."""
+
+    def __init__(self, results, delay=0.0):
+        self.results = results
+        self.delay = delay
+        self.cancelled = False
+
+    async def search(self, keywords, search_type="general", limit=20):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return [dict(result) for result in self.results]
+
+
+def make_result(title, content):
+    return {"title": title, "content": content, "url": f"https://example.com/{title}"}
+
+
+@pytest.fixture
+def search_agent():
+    config = AgentConfig(
+        agent_id="patent_search_stream",
+        agent_type=AgentType.PATENT_SEARCH,
+        name="Patent Search Agent",
+        description="Patent search agent for streaming tests",
+        llm_config=ModelConfig(
+            provider=ModelProvider.CUSTOM,
+            model_name="mock",
+            api_key="mock",
+            base_url="http://localhost"
+        ),
+        prompt_template="{input}"
+    )
+    agent = PatentSearchAgent(config, MagicMock())
+    agent.search_clients = {
+        "cnki": FakeSearchClient([
+            make_result("一种基于深度学习的图像识别方法", "卷积神经网络训练图像分类"),
+            make_result("一种锂电池正极材料的制备方法", "锂电池技术领域正极材料")
+        ], delay=0.01),
+        "web_crawler": FakeSearchClient([
+            make_result("一种基于深度学习的图像识别方法", "卷积神经网络训练图像分类"),
+            make_result("无线通信网络资源调度方法", "基站功率控制与资源分配")
+        ], delay=0.2)
+    }
+    return agent
+
+
+async def collect(stream):
+    return [event async for event in stream]
+
+
+class TestStreamSearch:
+    """测试流式搜索."""
+
+    @pytest.mark.asyncio
+    async def test_results_stream_in_completion_order(self, search_agent):
+        """测试结果按搜索源完成顺序返回并增量去重."""
+        params = {"keywords": ["图像识别"], "sources": ["web_crawler", "cnki"], "search_type": "general", "limit": 10}
+
+        events = await collect(search_agent.stream_search(params))
+
+        assert [event["event"] for event in events] == ["results", "results", "complete"]
+        assert events[0]["source"] == "cnki"
+        assert len(events[0]["results"]) == 2
+        assert [r["title"] for r in events[1]["results"]] == ["无线通信网络资源调度方法"]
+        assert events[2]["total"] == 3
+        assert events[2]["early_return"] is False
+        assert len(events[2]["results"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_early_return_cancels_slow_sources(self, search_agent):
+        """测试高质量结果足够时提前结束并取消慢速搜索源."""
+        slow_client = FakeSearchClient([make_result("慢速结果", "内容")], delay=5.0)
+        search_agent.search_clients["web_crawler"] = slow_client
+        params = {"keywords": ["图像识别"], "sources": ["cnki", "web_crawler"], "search_type": "general", "limit": 10}
+
+        events = await asyncio.wait_for(
+            collect(search_agent.stream_search(params, min_quality_results=2, quality_threshold=0.6)),
+            timeout=2.0
+        )
+
+        assert events[-1]["event"] == "complete"
+        assert events[-1]["early_return"] is True
+        assert events[-1]["completed_sources"] == ["cnki"]
+        assert slow_client.cancelled is True
+
+    @pytest.mark.asyncio
+    async def test_emergency_fallback_when_no_sources(self, search_agent):
+        """测试没有可用搜索源时使用紧急降级结果."""
+        params = {"keywords": ["图像识别"], "sources": ["unknown"], "search_type": "general", "limit": 3}
+
+        events = await collect(search_agent.stream_search(params))
+
+        assert events[0]["source"] == "emergency"
+        assert events[-1]["completed_sources"] == ["emergency"]
+
+
+    @pytest.mark.asyncio
+    async def test_final_results_follow_limit(self, search_agent):
+        """测试最终结果数量按请求的limit而非固定的20个截断."""
+        search_agent.search_clients["cnki"] = FakeSearchClient([
+            make_result(f"专利{i} 主题{i}", f"技术方案{i} 领域{i} 内容{i}") for i in range(30)
+        ])
+        params = {"keywords": ["专利"], "sources": ["cnki"], "search_type": "general", "limit": 25}
+
+        events = await collect(search_agent.stream_search(params))
+        assert len(events[-1]["results"]) == 25
+
+        ranked = await search_agent._rank_deduplicated_results(list(events[-1]["results"]), ["专利"], limit=5)
+        assert len(ranked) == 5
+
+class TestIncrementalDeduplicator:
+    """测试增量去重状态."""
+
+    def test_replaces_lower_quality_duplicate(self):
+        """测试重复结果中更高质量的结果替换原有位置."""
+        deduplicator = IncrementalDeduplicator(quality_key="score")
+        first = dict(make_result("一种基于深度学习的图像识别方法", "卷积神经网络"), score=0.5)
+        better = dict(first, score=0.9)
+
+        assert deduplicator.add(first) == (IncrementalDeduplicator.ADDED, 0)
+        assert deduplicator.add(better) == (IncrementalDeduplicator.REPLACED, 0)
+        assert deduplicator.add(dict(first)) == (IncrementalDeduplicator.DUPLICATE, 0)
+        assert deduplicator.results == [better]
+
+
+class TestStreamSearchEndpoint:
+    """测试SSE接口."""
+
+    def test_sse_events(self, search_agent):
+        """测试接口以text/event-stream返回搜索事件."""
+        app = FastAPI()
+        app.include_router(router)
+
+        with patch("src.multi_agent_service.api.patent.get_patent_search_agent", return_value=search_agent):
+            response = TestClient(app).get(
+                "/api/v1/patent/search/stream",
+                params={"keywords": "图像识别", "sources": ["cnki"]}
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        blocks = [block for block in response.text.split("\n\n") if block]
+        assert [block.split("\n")[0] for block in blocks] == ["event: results", "event: complete"]
+        assert json.loads(blocks[-1].split("data: ", 1)[1])["total"] == 2
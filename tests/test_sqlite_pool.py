@@ -0,0 +1,148 @@
+"""测试异步SQLite连接池."""
+
+import asyncio
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from src.multi_agent_service.patent.models.data import Patent, PatentDataQuality, PatentDataset
+from src.multi_agent_service.patent.utils.database import PatentDatabaseManager
+from src.multi_agent_service.utils.sqlite_pool import SQLitePool
+
+
+@pytest.fixture
+async def pool(tmp_path):
+    pool = SQLitePool(str(tmp_path / "pool.db"), readers=2, statement_cache_size=64)
+    async with pool.writer() as db:
+        await db.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT NOT NULL)")
+    yield pool
+    await pool.close()
+
+
+class TestSQLitePool:
+    """测试连接池."""
+
+    @pytest.mark.asyncio
+    async def test_writer_commits_and_readers_see_data(self, pool):
+        async with pool.writer() as db:
+            await db.executemany("INSERT INTO items (name) VALUES (?)", [("a",), ("b",)])
+
+        async with pool.reader() as db:
+            cursor = await db.execute("SELECT name FROM items ORDER BY id")
+            rows = await cursor.fetchall()
+
+        assert [row["name"] for row in rows] == ["a", "b"]
+        async with pool.reader() as db:
+            cursor = await db.execute("PRAGMA journal_mode")
+            assert (await cursor.fetchone())[0] == "wal"
+
+    @pytest.mark.asyncio
+    async def test_writer_rolls_back_on_error(self, pool):
+        with pytest.raises(sqlite3.IntegrityError):
+            async with pool.writer() as db:
+                await db.execute("INSERT INTO items (name) VALUES ('kept?')")
+                await db.execute("INSERT INTO items (name) VALUES (NULL)")
+
+        async with pool.reader() as db:
+            cursor = await db.execute("SELECT COUNT(*) FROM items")
+            assert (await cursor.fetchone())[0] == 0
+        assert pool.get_stats()["rollbacks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_readers_are_read_only(self, pool):
+        with pytest.raises(sqlite3.OperationalError):
+            async with pool.reader() as db:
+                await db.execute("INSERT INTO items (name) VALUES ('x')")
+
+    @pytest.mark.asyncio
+    async def test_reader_count_is_bounded(self, pool):
+        active = 0
+        peak = 0
+
+        async def read():
+            nonlocal active, peak
+            async with pool.reader() as db:
+                active += 1
+                peak = max(peak, active)
+                await db.execute("SELECT COUNT(*) FROM items")
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(read() for _ in range(8)))
+
+        stats = pool.get_stats()
+        assert peak == 2
+        assert stats["readers"] == 2
+        assert stats["idle_readers"] == 2
+        assert stats["reads"] == 8
+
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked_by_queries(self, pool):
+        """测试长查询执行期间事件循环仍能调度其他协程."""
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(heartbeat())
+        try:
+            async with pool.reader() as db:
+                cursor = await db.execute("""
+                    WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 300000)
+                    SELECT SUM(x) FROM n
+                """)
+                assert (await cursor.fetchone())[0] == 300000 * 300001 // 2
+        finally:
+            task.cancel()
+        assert ticks > 1
+
+    @pytest.mark.asyncio
+    async def test_reopens_after_close(self, pool):
+        await pool.close()
+        async with pool.writer() as db:
+            await db.execute("INSERT INTO items (name) VALUES ('again')")
+        async with pool.reader() as db:
+            cursor = await db.execute("SELECT COUNT(*) FROM items")
+            assert (await cursor.fetchone())[0] == 1
+
+
+class TestPooledPatentDatabaseManager:
+    """测试基于连接池的专利数据库管理器."""
+
+    @pytest.mark.asyncio
+    async def test_dataset_and_quality_round_trip(self, tmp_path):
+        manager = PatentDatabaseManager(str(tmp_path / "patent.db"), pool_readers=2)
+        await manager.initialize()
+        try:
+            patent = Patent(
+                application_number="CN202310000001.1",
+                title="一种图像识别方法",
+                abstract="基于深度学习的图像识别方法",
+                applicants=["某科技公司"],
+                inventors=["张三"],
+                application_date=datetime(2023, 1, 1),
+                publication_date=None,
+                ipc_classes=["G06F16/00"],
+                country="CN",
+                status="申请中"
+            )
+            dataset = PatentDataset(
+                patents=[patent], total_count=1, search_keywords=["图像识别"],
+                collection_date=datetime(2023, 6, 1), data_sources=["test"]
+            )
+            quality = PatentDataQuality(completeness_score=0.9, overall_score=0.8, issues=["缺少公开日"])
+
+            assert await manager.save_patent_dataset(dataset, "ds1") is True
+            assert await manager.save_quality_record("ds1", quality) is True
+
+            loaded = await manager.load_patent_dataset("ds1")
+            assert loaded.patents[0].applicants == ["某科技公司"]
+            history = await manager.get_quality_history("ds1")
+            assert history[0]["issues"] == ["缺少公开日"]
+            assert await manager.cleanup_old_records(days=30) is True
+        finally:
+            await manager.close()
@@ -13,7 +13,15 @@ from src.multi_agent_service.workflows.state_management import (
     SnapshotManager,
     MessageFilter,
     EventEmitter,
-    StateTransition
+    StateTransition,
+    SharedStateManager,
+    SharedMessageBus
+)
+from src.multi_agent_service.workflows.serialization import BinarySerializer
+from src.multi_agent_service.utils.shared_store import (
+    InMemorySharedStore,
+    SQLiteSharedStore,
+    SharedTaskRegistry
 )
 from src.multi_agent_service.models.workflow import (
     WorkflowMessage,
@@ -290,6 +298,120 @@ class TestInMemoryMessageBus:
         assert history[2].content["index"] == 2
 
 
+class TestSharedBackends:
+    """测试跨进程共享的状态管理和消息总线."""
+    
+    @pytest.mark.asyncio
+    async def test_sqlite_state_visible_across_workers(self, tmp_path):
+        """测试两个worker（独立连接）共享同一执行状态."""
+        db_path = str(tmp_path / "shared_state.db")
+        worker_a = SharedStateManager(SQLiteSharedStore(db_path))
+        worker_b = SharedStateManager(SQLiteSharedStore(db_path))
+        
+        await worker_a.update_state("exec1", {"status": "running"})
+        await worker_a.update_state("exec1", {"status": "completed"})
+        
+        state = await worker_b.get_state("exec1")
+        assert state["status"] == "completed"
+        assert "last_updated" in state
+        
+        history = await worker_b.get_state_history("exec1")
+        assert len(history) == 1
+        assert history[0]["state"]["status"] == "running"
+        
+        assert await worker_b.delete_state("exec1") is True
+        assert await worker_a.get_state("exec1") is None
+        
+        await worker_a.store.close()
+        await worker_b.store.close()
+    
+    @pytest.mark.asyncio
+    async def test_sqlite_concurrent_updates_not_lost(self, tmp_path):
+        """测试多个worker并发更新同一执行状态时各自的字段都被保留."""
+        db_path = str(tmp_path / "shared_state.db")
+        workers = [SharedStateManager(SQLiteSharedStore(db_path)) for _ in range(3)]
+        
+        await asyncio.gather(*(
+            worker.update_state("exec1", {f"node_{index}_{i}": i})
+            for index, worker in enumerate(workers)
+            for i in range(10)
+        ))
+        
+        state = await workers[0].get_state("exec1")
+        assert sum(key.startswith("node_") for key in state) == 30
+        assert len(await workers[0].get_state_history("exec1")) == 29
+        
+        counters = [SQLiteSharedStore(db_path), SQLiteSharedStore(db_path)]
+        await asyncio.gather(*(
+            store.update("counter", lambda value: (value or 0) + 1) for store in counters for _ in range(20)
+        ))
+        assert await counters[0].get("counter") == 40
+        
+        for store in [worker.store for worker in workers] + counters:
+            await store.close()
+    
+    @pytest.mark.asyncio
+    async def test_sqlite_message_bus_across_workers(self, tmp_path):
+        """测试消息在worker之间投递且只被消费一次."""
+        db_path = str(tmp_path / "shared_bus.db")
+        bus_a = SharedMessageBus(SQLiteSharedStore(db_path))
+        bus_b = SharedMessageBus(SQLiteSharedStore(db_path))
+        
+        await bus_b.subscribe("node2", ["notification"])
+        await bus_a.send_message(WorkflowMessage(
+            sender_node="node1",
+            message_type="notification",
+            content={"data": "shared"}
+        ))
+        
+        assert await bus_a.get_queue_size("node2") == 1
+        received = await bus_b.receive_message("node2")
+        assert received is not None
+        assert received.content["data"] == "shared"
+        assert await bus_a.receive_message("node2") is None
+        
+        history = await bus_a.get_message_history()
+        assert len(history) == 1
+        assert history[0].message_type == "notification"
+        
+        await bus_a.store.close()
+        await bus_b.store.close()
+    
+    @pytest.mark.asyncio
+    async def test_shared_store_ttl_and_history_trim(self):
+        """测试TTL过期和列表截断."""
+        store = InMemorySharedStore()
+        
+        await store.set("expired", {"v": 1}, ttl=-1)
+        assert await store.get("expired") is None
+        
+        for i in range(5):
+            await store.list_push("history", i, max_length=3)
+        assert await store.list_tail("history", 10) == [2, 3, 4]
+    
+    @pytest.mark.asyncio
+    async def test_task_registry(self, tmp_path):
+        """测试任务注册表在worker之间共享."""
+        db_path = str(tmp_path / "tasks.db")
+        registry_a = SharedTaskRegistry(SQLiteSharedStore(db_path))
+        registry_b = SharedTaskRegistry(SQLiteSharedStore(db_path))
+        
+        await registry_a.create_task("task1", {"status": "pending", "keywords": ["AI"]})
+        await registry_a.update_task("task1", {"status": "running"})
+        
+        task = await registry_b.get_task("task1")
+        assert task["status"] == "running"
+        assert task["keywords"] == ["AI"]
+        
+        await registry_b.set_result("task1", {"status": "completed"})
+        assert (await registry_a.list_results())["task1"]["status"] == "completed"
+        assert list((await registry_a.list_tasks()).keys()) == ["task1"]
+        assert await registry_a.update_task("missing", {"status": "x"}) is None
+        
+        await registry_a.store.close()
+        await registry_b.store.close()
+
+
 class TestWorkflowStateManager:
     """测试工作流状态管理器."""
     
@@ -485,6 +607,18 @@ class TestStateSnapshot:
         assert restored_snapshot.execution_id == snapshot.execution_id
         assert restored_snapshot.state_data == snapshot.state_data
         assert restored_snapshot.snapshot_id == snapshot.snapshot_id
+    
+    def test_snapshot_binary_serialization(self):
+        """测试快照二进制序列化."""
+        state_data = {"status": "running", "updated_at": datetime.now(), "status_enum": WorkflowStatus.RUNNING}
+        snapshot = StateSnapshot("exec1", state_data)
+        
+        restored_snapshot = StateSnapshot.from_bytes(snapshot.to_bytes())
+        
+        assert restored_snapshot.snapshot_id == snapshot.snapshot_id
+        assert restored_snapshot.timestamp == snapshot.timestamp
+        assert restored_snapshot.state_data == state_data
+        assert restored_snapshot.state_data["status_enum"] is WorkflowStatus.RUNNING
 
 
 class TestSnapshotManager:
@@ -551,6 +685,22 @@ class TestSnapshotManager:
         assert snapshots[1].state_data["step"] == 3
         assert snapshots[2].state_data["step"] == 4
     
+    @pytest.mark.asyncio
+    async def test_binary_snapshot_storage(self):
+        """测试以二进制形式保存快照."""
+        manager = SnapshotManager(max_snapshots_per_execution=2, serializer=BinarySerializer())
+        
+        first_id = await manager.create_snapshot("exec1", {"step": 1})
+        for i in range(2, 4):
+            await asyncio.sleep(0.001)
+            await manager.create_snapshot("exec1", {"step": i})
+        
+        assert all(isinstance(data, bytes) for _, data in manager.encoded_snapshots["exec1"])
+        assert await manager.get_snapshot(first_id) is None
+        assert [s.state_data["step"] for s in await manager.list_snapshots("exec1")] == [2, 3]
+        assert (await manager.get_latest_snapshot("exec1")).state_data == {"step": 3}
+        assert await manager.cleanup_snapshots("exec1") == 2
+    
     @pytest.mark.asyncio
     async def test_restore_from_snapshot(self):
         """测试从快照恢复."""
@@ -201,6 +201,35 @@ class TestWorkflowStatusAPI:
         assert response_data["progress_percentage"] == pytest.approx(33.33, rel=1e-2)
         assert "estimated_remaining_time" in response_data
     
+    def test_get_workflow_status_binary_format(self):
+        """Test getting workflow status as standard msgpack."""
+        import ormsgpack
+        from src.multi_agent_service.api.workflows import workflow_states
+        
+        workflow_id = "test_workflow_binary"
+        workflow_states[workflow_id] = WorkflowState(
+            workflow_id=workflow_id,
+            status=WorkflowStatus.RUNNING,
+            current_step=1,
+            total_steps=2,
+            participating_agents=["sales_001"],
+            execution_history=[]
+        )
+        
+        # 该接口不依赖服务启动流程，不进入lifespan
+        client = TestClient(app)
+        response = client.get(f"/api/v1/workflows/{workflow_id}/status?format=binary")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-msgpack"
+        
+        status_data = ormsgpack.unpackb(response.content)
+        json_data = client.get(f"/api/v1/workflows/{workflow_id}/status").json()
+        assert status_data == json_data
+        assert status_data["workflow_state"]["status"] == "running"
+        assert status_data["progress_percentage"] == 50.0
+        datetime.fromisoformat(status_data["workflow_state"]["created_at"])
+    
     def test_get_workflow_status_not_found(self, client):
         """Test getting status for non-existent workflow."""
         response = client.get("/api/v1/workflows/nonexistent/status")